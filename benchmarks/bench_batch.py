@@ -0,0 +1,69 @@
+"""Benchmark: vektorisierte Taupunkt-/Ampelberechnung gegen die skalare Schleife.
+
+Aufruf auf dem Host:
+
+    python benchmarks/bench_batch.py [anzahl]
+"""
+
+import math
+import pathlib
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src" / "taupunkt"))
+
+import numpy as np
+
+import batch
+
+
+def berechne_taupunkt(temp, rh):
+    a, b = 17.27, 237.7
+    alpha = ((a * temp) / (b + temp)) + math.log(rh / 100.0)
+    return (b * alpha) / (a - alpha)
+
+
+def skalare_schleife(innen_t, innen_rh, aussen_t, aussen_rh, grenze=2.0):
+    ergebnis = []
+    for werte in zip(innen_t, innen_rh, aussen_t, aussen_rh):
+        tp_innen = berechne_taupunkt(werte[0], werte[1])
+        tp_aussen = berechne_taupunkt(werte[2], werte[3])
+        if tp_aussen < (tp_innen - grenze):
+            status = batch.GRUEN
+        elif tp_aussen >= tp_innen:
+            status = batch.ROT
+        else:
+            status = batch.GELB
+        ergebnis.append((tp_innen, tp_aussen, status))
+    return ergebnis
+
+
+def messe(funktion, *args, wiederholungen=3):
+    beste = float("inf")
+    for _ in range(wiederholungen):
+        start = time.perf_counter()
+        funktion(*args)
+        beste = min(beste, time.perf_counter() - start)
+    return beste
+
+
+def main():
+    anzahl = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(0)
+    innen_t = rng.uniform(15, 25, anzahl)
+    innen_rh = rng.uniform(30, 70, anzahl)
+    aussen_t = rng.uniform(-10, 30, anzahl)
+    aussen_rh = rng.uniform(20, 100, anzahl)
+
+    listen = [x.tolist() for x in (innen_t, innen_rh, aussen_t, aussen_rh)]
+    t_skalar = messe(skalare_schleife, *listen, wiederholungen=1)
+    t_batch = messe(batch.werte_aus, innen_t, innen_rh, aussen_t, aussen_rh)
+
+    print(f"Messungen:        {anzahl}")
+    print(f"skalare Schleife: {t_skalar * 1e3:9.1f} ms ({t_skalar / anzahl * 1e9:7.1f} ns/Messung)")
+    print(f"batch.werte_aus:  {t_batch * 1e3:9.1f} ms ({t_batch / anzahl * 1e9:7.1f} ns/Messung)")
+    print(f"Beschleunigung:   {t_skalar / t_batch:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
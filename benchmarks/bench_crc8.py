@@ -0,0 +1,83 @@
+"""Benchmark: bitweiser gegen tabellengesteuerten CRC8 (SHT4x/AHT20).
+
+Prüft zufällige 6-Byte-Rahmen des SHT4x (2x Messwort + CRC) mit beiden
+Verfahren.  Läuft auf dem Host und per ``mpremote run`` auf dem Pico
+(crc8.py muss auf dem Gerät liegen):
+
+    python benchmarks/bench_crc8.py [anzahl]
+"""
+
+import sys
+import time
+
+try:
+    import pathlib
+    sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src" / "taupunkt"))
+except (ImportError, NameError):
+    pass  # MicroPython
+
+try:
+    import random
+    _zufall = random.getrandbits
+except (ImportError, AttributeError):
+    import os
+
+    def _zufall(bits):
+        return os.urandom(1)[0]
+
+from crc8 import crc8, crc8_bitweise
+
+try:
+    _jetzt = time.perf_counter
+
+    def _dauer(start):
+        return time.perf_counter() - start
+except AttributeError:
+    def _jetzt():
+        return time.ticks_us()
+
+    def _dauer(start):
+        return time.ticks_diff(time.ticks_us(), start) / 1e6
+
+
+def erzeuge_rahmen(anzahl):
+    rahmen = []
+    for _ in range(anzahl):
+        daten = bytearray(6)
+        for i in (0, 1, 3, 4):
+            daten[i] = _zufall(8)
+        daten[2] = crc8(daten, 0, 2)
+        daten[5] = crc8(daten, 3, 2)
+        rahmen.append(daten)
+    return rahmen
+
+
+def pruefe_bitweise(rahmen):
+    for daten in rahmen:
+        if crc8_bitweise(daten[0:2]) != daten[2] or crc8_bitweise(daten[3:5]) != daten[5]:
+            raise ValueError("CRC")
+
+
+def pruefe_tabelle(rahmen):
+    for daten in rahmen:
+        if crc8(daten, 0, 2) != daten[2] or crc8(daten, 3, 2) != daten[5]:
+            raise ValueError("CRC")
+
+
+def main():
+    anzahl = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rahmen = erzeuge_rahmen(anzahl)
+    start = _jetzt()
+    pruefe_bitweise(rahmen)
+    t_bitweise = _dauer(start)
+    start = _jetzt()
+    pruefe_tabelle(rahmen)
+    t_tabelle = _dauer(start)
+    print("Rahmen:   %d" % anzahl)
+    print("bitweise: %8.1f ms  %8.0f Rahmen/s" % (t_bitweise * 1e3, anzahl / t_bitweise))
+    print("Tabelle:  %8.1f ms  %8.0f Rahmen/s" % (t_tabelle * 1e3, anzahl / t_tabelle))
+    print("Faktor:   %8.1fx" % (t_bitweise / t_tabelle))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Benchmark: Dashboard-Aufbau und -Aktualisierung im ST7789-Emulator.
+
+Zählt Bytes und Panelbefehle und schätzt daraus die SPI-Zeit, einmal direkt
+gezeichnet und einmal über den Palettenpuffer. Läuft ohne Hardware.
+
+Aufruf auf dem Host:
+
+    python benchmarks/bench_dashboard_emulator.py [baudrate]
+"""
+
+import importlib
+import pathlib
+import sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src" / "taupunkt"))
+
+import st7789_emulator as emu
+
+DATEN = (21.3, 55.0, 4.2, 80.0, 1013.0, 11.9, 1.0)
+AKTUALISIERT = (21.4, 55.0, 4.2, 80.5, 1013.0, 12.0, 1.0)
+
+
+def miss(steuerung, rahmenpuffer, baudrate):
+    steuerung.RAHMENPUFFER = rahmenpuffer
+    tft = emu.ST7789(emu.SPI(0, baudrate=baudrate), 172, 320)
+    tft.init()
+    tft.zaehler_zuruecksetzen()
+    anzeige = steuerung.baue_dashboard(tft, steuerung.font)
+    ergebnis = []
+    for daten in (DATEN, AKTUALISIERT):
+        steuerung.zeige_dashboard("Lueften empfohlen", steuerung.STATUS_GRUEN, daten, anzeige)
+        ergebnis.append((tft.bytes_gesendet, tft.befehle, tft.spi_zeit() * 1000))
+        tft.zaehler_zuruecksetzen()
+    return ergebnis
+
+
+def main():
+    baudrate = int(sys.argv[1]) if len(sys.argv) > 1 else 30_000_000
+    emu.installiere()
+    steuerung = importlib.import_module("taupunktsteuerung")
+    print("SPI: {:.0f} MHz".format(baudrate / 1e6))
+    print("{:<16}{:<14}{:>9}{:>9}{:>10}".format("Pfad", "Schritt", "Bytes", "Befehle", "SPI ms"))
+    for name, rahmenpuffer in (("direkt", False), ("Palettenpuffer", True)):
+        for schritt, (n, befehle, ms) in zip(("Aufbau", "Aktualisierung"),
+                                             miss(steuerung, rahmenpuffer, baudrate)):
+            print("{:<16}{:<14}{:>9}{:>9}{:>10.2f}".format(name, schritt, n, befehle, ms))
+
+
+if __name__ == "__main__":
+    main()
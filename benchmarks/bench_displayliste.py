@@ -0,0 +1,76 @@
+"""Benchmark: einzelne fill_rect()-Aufrufe gegen die Displayliste (nur auf dem Gerät).
+
+Zeichnet ein Gitter mit Balken und Messpunkten einmal direkt und einmal über
+``displayliste.Displayliste`` und gibt je Variante die an das Panel gesendeten
+Befehle (``command_count()``) und die Zeit aus. Braucht eine Firmware mit dem
+C-Treiber aus ``csrc/``. Pins bei Bedarf unten anpassen, dann:
+
+    mpremote cp src/taupunkt/displayliste.py :
+    mpremote run benchmarks/bench_displayliste.py
+"""
+
+import time
+from machine import Pin, SPI
+
+import st7789
+from displayliste import Displayliste
+
+SPI_ID = 0
+SPI_SCK = 18
+SPI_MOSI = 19
+LCD_CS = 17
+LCD_DC = 16
+LCD_RST = 20
+TFT_WIDTH = 172
+TFT_HEIGHT = 320
+DURCHLAEUFE = 10
+
+
+def szene(ziel):
+    ziel.fill_rect(0, 0, TFT_WIDTH, TFT_HEIGHT, st7789.BLACK)
+    # Gitter
+    for y in range(40, TFT_HEIGHT, 40):
+        ziel.fill_rect(0, y, TFT_WIDTH, 1, st7789.BLUE)
+    for x in range(0, TFT_WIDTH, 43):
+        ziel.fill_rect(x, 40, 1, TFT_HEIGHT - 40, st7789.BLUE)
+    # Balken aus gleichfarbigen Segmenten
+    for i in range(8):
+        ziel.fill_rect(10 + 20 * i, 300 - 10 * i, 16, 10 * i + 10, st7789.GREEN)
+        ziel.fill_rect(10 + 20 * i, 290 - 10 * i, 16, 10, st7789.YELLOW)
+    # Messpunkte
+    for x in range(0, TFT_WIDTH, 2):
+        ziel.fill_rect(x, 100 + (x * 7) % 60, 2, 2, st7789.WHITE)
+
+
+def miss(name, tft, zeichnen):
+    tft.command_count(True)
+    start = time.ticks_us()
+    for _ in range(DURCHLAEUFE):
+        zeichnen()
+    dauer = time.ticks_diff(time.ticks_us(), start)
+    print("%-14s %5d Befehle  %6d us" % (
+        name, tft.command_count(True) // DURCHLAEUFE, dauer // DURCHLAEUFE))
+
+
+def main():
+    spi = SPI(SPI_ID, baudrate=30000000, sck=Pin(SPI_SCK), mosi=Pin(SPI_MOSI))
+    tft = st7789.ST7789(
+        spi, TFT_WIDTH, TFT_HEIGHT,
+        reset=Pin(LCD_RST, Pin.OUT),
+        dc=Pin(LCD_DC, Pin.OUT),
+        cs=Pin(LCD_CS, Pin.OUT),
+        rotation=0,
+    )
+    tft.init()
+    liste = Displayliste(tft, TFT_WIDTH, TFT_HEIGHT)
+
+    def ueber_liste():
+        szene(liste)
+        liste.flush()
+
+    miss("fill_rect()", tft, lambda: szene(tft))
+    miss("Displayliste", tft, ueber_liste)
+
+
+if __name__ == "__main__":
+    main()
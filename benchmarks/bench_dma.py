@@ -0,0 +1,66 @@
+"""Benchmark: blockierende gegen DMA-Übertragung zum Display (nur auf dem Gerät).
+
+Misst für ``fill()`` und ``blit_buffer_async()``, wie lange der Aufruf die CPU
+belegt und wie lange die Übertragung insgesamt dauert (bis ``wait()``
+zurückkehrt). Ohne DMA sind beide Zeiten gleich. Braucht eine Firmware mit dem
+C-Treiber aus ``csrc/``. Pins bei Bedarf unten anpassen, dann:
+
+    mpremote run benchmarks/bench_dma.py
+"""
+
+import time
+from machine import Pin, SPI
+
+import st7789
+
+SPI_ID = 0
+SPI_SCK = 18
+SPI_MOSI = 19
+LCD_CS = 17
+LCD_DC = 16
+LCD_RST = 20
+TFT_WIDTH = 172
+TFT_HEIGHT = 320
+DURCHLAEUFE = 10
+
+
+def miss(name, tft, funktion):
+    aufruf = gesamt = 0
+    for i in range(DURCHLAEUFE):
+        start = time.ticks_us()
+        funktion(i)
+        mitte = time.ticks_us()
+        tft.wait()
+        ende = time.ticks_us()
+        aufruf += time.ticks_diff(mitte, start)
+        gesamt += time.ticks_diff(ende, start)
+    print("%-22s Aufruf %6d us  gesamt %6d us" % (name, aufruf // DURCHLAEUFE, gesamt // DURCHLAEUFE))
+
+
+def display(dma):
+    spi = SPI(SPI_ID, baudrate=30000000, sck=Pin(SPI_SCK), mosi=Pin(SPI_MOSI))
+    tft = st7789.ST7789(
+        spi, TFT_WIDTH, TFT_HEIGHT,
+        reset=Pin(LCD_RST, Pin.OUT),
+        dc=Pin(LCD_DC, Pin.OUT),
+        cs=Pin(LCD_CS, Pin.OUT),
+        rotation=3,
+        **({"spi_id": SPI_ID} if dma else {})
+    )
+    tft.init()
+    return tft
+
+
+def main():
+    farben = (st7789.RED, st7789.BLACK)
+    kachel = bytearray(TFT_WIDTH * 40 * 2)
+    # Ein Display ohne spi_id bleibt auf dem blockierenden Pfad
+    for name, dma in (("blockierend", False), ("DMA", True)):
+        tft = display(dma)
+        miss("fill() " + name, tft, lambda i: tft.fill(farben[i & 1]))
+        miss("blit_buffer_async() " + name, tft,
+             lambda i: tft.blit_buffer_async(kachel, 0, 0, TFT_WIDTH, 40))
+
+
+if __name__ == "__main__":
+    main()
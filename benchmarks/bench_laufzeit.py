@@ -0,0 +1,146 @@
+"""Benchmark: Latenzen der asynchronen Laufzeit mit simulierten Treibern.
+
+Die Sensoren brauchen so lange wie die echten (SHT4x 9 ms, AHT20 80 ms,
+BMP280 sofort), der Touch-Controller meldet in festen Abständen eine
+Berührung, die PMU zieht einmal ihren IRQ-Pin.  Gemessen werden
+Erfassungsdauer, Latenz Touch -> Anzeige und die größte Verzögerung eines
+10-ms-Animationstasks (zeigt, ob irgendetwas die Ereignisschleife blockiert).
+Läuft auf dem Host und per ``mpremote run`` auf dem Pico:
+
+    python benchmarks/bench_laufzeit.py [sekunden]
+"""
+
+import sys
+import time
+
+try:
+    import pathlib
+    sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src" / "taupunkt"))
+except (ImportError, NameError):
+    pass  # MicroPython
+
+if not hasattr(time, "ticks_ms"):
+    # CPython: ticks_* der MicroPython-Zeitbasis nachbilden
+    _t0 = time.monotonic_ns()
+
+    def _ticks_ms():
+        return (time.monotonic_ns() - _t0) // 1000000
+
+    time.ticks_ms = _ticks_ms
+    time.ticks_add = lambda t, delta: t + delta
+    time.ticks_diff = lambda a, b: a - b
+
+import laufzeit
+from laufzeit import asyncio
+from psychrometrie import MAGNUS
+
+
+class FakeSensor:
+    def __init__(self, dauer_ms, wert):
+        self.dauer_ms = dauer_ms
+        self.wert = wert
+
+    def start(self):
+        return time.ticks_add(time.ticks_ms(), self.dauer_ms)
+
+    def collect(self):
+        return self.wert
+
+
+class FakeTouch:
+    """Meldet alle abstand_ms eine Berührung von 100 ms Dauer."""
+
+    def __init__(self, abstand_ms):
+        self.abstand_ms = abstand_ms
+        self.naechste = time.ticks_add(time.ticks_ms(), abstand_ms)
+        self.ende = None
+        self.zeiten = []
+
+    @property
+    def touched(self):
+        jetzt = time.ticks_ms()
+        if self.ende is not None:
+            if time.ticks_diff(jetzt, self.ende) < 0:
+                return 1
+            self.ende = None
+        if time.ticks_diff(jetzt, self.naechste) >= 0:
+            self.zeiten.append(self.naechste)
+            self.ende = time.ticks_add(self.naechste, 100)
+            self.naechste = time.ticks_add(self.naechste, self.abstand_ms)
+            return 1
+        return 0
+
+    @property
+    def touches(self):
+        return [{"x": 80, "y": 160, "id": 0}]
+
+
+class FakePin:
+    def __init__(self):
+        self.pegel = 0  # IRQ steht an
+
+    def value(self):
+        return self.pegel
+
+
+class FakePMU:
+    def __init__(self):
+        self.pin_intr = FakePin()
+        self.irqbuf = bytearray(5)
+
+    def readIRQ(self):
+        self.irqbuf[1] = 0x04  # z. B. VBUS entfernt
+
+    def clearIRQ(self):
+        self.irqbuf[:] = bytes(5)
+        self.pin_intr.pegel = 1
+
+
+def main():
+    sekunden = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    anzeigen = []
+    verzug = [0]
+
+    async def animation():
+        while True:
+            soll = time.ticks_add(time.ticks_ms(), 10)
+            await asyncio.sleep(0.01)
+            verzug[0] = max(verzug[0], time.ticks_diff(time.ticks_ms(), soll))
+
+    async def lauf():
+        touch = FakeTouch(700)
+        app = laufzeit.Laufzeit(
+            (FakeSensor(9, (21.0, 55.0)), FakeSensor(80, (12.0, 70.0)),
+             FakeSensor(0, (12.5, 1013.25))),
+            MAGNUS, 2.0,
+            lambda status: None,
+            lambda status, daten: anzeigen.append(time.ticks_ms()),
+            intervall=2, touch=touch, pmu=FakePMU(),
+        )
+        tasks = app.starte()
+        tasks.append(asyncio.create_task(animation()))
+        await asyncio.sleep(sekunden)
+        for task in tasks:
+            task.cancel()
+        return app, touch
+
+    app, touch = asyncio.run(lauf())
+
+    latenzen = []
+    for t in touch.zeiten:
+        for a in anzeigen:
+            if time.ticks_diff(a, t) >= 0:
+                latenzen.append(time.ticks_diff(a, t))
+                break
+    print("Laufzeit:         %.1f s" % sekunden)
+    print("Zyklen:           %d" % app.statistik["zyklen"])
+    print("Erfassung:        %d ms" % app.statistik["erfassung_ms"])
+    print("Latenz max:       %d ms" % app.statistik["latenz_max_ms"])
+    if latenzen:
+        print("Touch -> Anzeige: %d ms Mittel, %d ms max (%d Berührungen)"
+              % (sum(latenzen) // len(latenzen), max(latenzen), len(latenzen)))
+    print("Animationsverzug: %d ms max" % verzug[0])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark: PMU-Telemetrie byteweise gegen Burst-Lesen (nur auf dem Gerät).
+
+Zählt die I2C-Transaktionen und misst die Zeit für alle ADC-Kanäle und für
+Lesen/Quittieren der IRQ-Register, einmal mit Einzelbyte-Zugriffen wie bisher
+und einmal mit ``snapshot()`` bzw. ``readIRQ()``/``clearIRQ()``.
+Pins bei Bedarf unten anpassen, dann:
+
+    mpremote run benchmarks/bench_pmu.py
+"""
+
+import time
+from machine import I2C, Pin
+
+import axp202c
+
+I2C_ID = 0
+I2C_SDA = 0
+I2C_SCL = 1
+DURCHLAEUFE = 100
+
+# Bisherige Zugriffe: je Kanal H8- und L4-Register einzeln
+_PAARE = (0x56, 0x58, 0x5A, 0x5C, 0x5E, 0x62, 0x64, 0x66, 0x78, 0x7A, 0x7C, 0x7E)
+
+
+class ZaehlBus:
+    """Reicht alle Zugriffe an den echten Bus weiter und zählt sie."""
+
+    def __init__(self, bus):
+        self.bus = bus
+        self.transaktionen = 0
+
+    def readfrom_mem_into(self, addr, reg, buf):
+        self.transaktionen += 1
+        self.bus.readfrom_mem_into(addr, reg, buf)
+
+    def writeto_mem(self, addr, reg, buf):
+        self.transaktionen += 1
+        self.bus.writeto_mem(addr, reg, buf)
+
+    def writeto(self, addr, buf):
+        self.transaktionen += 1
+        self.bus.writeto(addr, buf)
+
+
+def adc_byteweise(pmu):
+    for reg in _PAARE:
+        pmu.read_byte(reg)
+        pmu.read_byte(reg + 1)
+    for reg in (0x70, 0x71, 0x72):
+        pmu.read_byte(reg)
+
+
+def irq_byteweise(pmu):
+    for i in range(5):
+        pmu.irqbuf[i] = pmu.read_byte(axp202c.AXP202_INTSTS1 + i)
+    for i in range(5):
+        pmu.write_byte(axp202c.AXP202_INTSTS1 + i, 0xFF)
+
+
+def irq_burst(pmu):
+    pmu.readIRQ()
+    pmu.clearIRQ()
+
+
+def miss(name, bus, funktion, pmu):
+    bus.transaktionen = 0
+    start = time.ticks_us()
+    for _ in range(DURCHLAEUFE):
+        funktion(pmu)
+    dauer = time.ticks_diff(time.ticks_us(), start) / DURCHLAEUFE
+    print("%-16s %3d Transaktionen  %7.0f us" % (name, bus.transaktionen // DURCHLAEUFE, dauer))
+
+
+def main():
+    bus = ZaehlBus(I2C(I2C_ID, scl=Pin(I2C_SCL), sda=Pin(I2C_SDA), freq=400000))
+    pmu = axp202c.PMU(i2c=bus)
+    miss("ADC byteweise", bus, adc_byteweise, pmu)
+    miss("ADC snapshot()", bus, axp202c.PMU.snapshot, pmu)
+    miss("IRQ byteweise", bus, irq_byteweise, pmu)
+    miss("IRQ Burst", bus, irq_burst, pmu)
+
+
+if __name__ == "__main__":
+    main()
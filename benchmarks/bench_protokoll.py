@@ -0,0 +1,104 @@
+"""Benchmark: Messprotokoll (protokoll.py) – Anhängen, Sichern, Platzbedarf.
+
+Hängt einen Tag Messungen im Minutentakt (1440 Sätze mit Tagesgang und
+Rauschen) an und sichert wie die Laufzeit immer dann einen Block, wenn
+faellig() meldet. Ausgegeben werden die Dauer von neu(), die längste
+Dauer von flush(), die belegten Bytes und auf dem Pico die Heap-Belegung
+durch neu(). Läuft auf dem Host und per ``mpremote run`` auf dem Pico
+(protokoll.py, crc8.py und laufzeit.py müssen auf dem Gerät liegen; die
+Dateien bench_0.bin ... werden danach gelöscht):
+
+    python benchmarks/bench_protokoll.py
+"""
+
+import gc
+import math
+import os
+import sys
+import time
+
+try:
+    import pathlib
+    sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src" / "taupunkt"))
+except (ImportError, NameError):
+    pass  # MicroPython
+
+if not hasattr(time, "ticks_ms"):
+    # CPython: MicroPython-Erweiterungen von time nachrüsten
+    time.ticks_ms = lambda: time.monotonic_ns() // 1000000
+    time.ticks_us = lambda: time.monotonic_ns() // 1000
+    time.ticks_diff = lambda a, b: a - b
+
+import protokoll
+
+ANZAHL = 1440
+
+
+def tagesgang(anzahl):
+    """Vorab berechnete Messwerte, damit die Messung nur neu() erfasst."""
+    zufall = 12345
+    werte = []
+    for i in range(anzahl):
+        phase = 2 * math.pi * i / 1440
+        rauschen = []
+        for _ in range(4):
+            zufall = (zufall * 1103515245 + 12345) & 0x7FFFFFFF
+            rauschen.append(zufall % 13 - 6)
+        werte.append((
+            int((21 + 0.5 * math.sin(phase)) * 100) + rauschen[0],
+            int((50 + 3 * math.sin(phase)) * 100) + 2 * rauschen[1],
+            int((12 + 5 * math.sin(phase - 1)) * 100) + rauschen[2],
+            int((70 - 15 * math.sin(phase - 1)) * 100) + 2 * rauschen[3],
+            10132,
+        ))
+    return werte
+
+
+def aufraeumen(log):
+    for nummer in range(log.dateien):
+        try:
+            os.remove(log.pfad(nummer))
+        except OSError:
+            pass
+
+
+def main():
+    werte = tagesgang(ANZAHL)
+    log = protokoll.Protokoll("bench")
+    aufraeumen(log)
+    log = protokoll.Protokoll("bench")
+
+    neu_us = 0
+    heap = 0
+    mem_alloc = getattr(gc, "mem_alloc", None)
+    for satz in werte:
+        a, b, c, d, e = satz
+        gc.disable()
+        vorher = mem_alloc() if mem_alloc else 0
+        start = time.ticks_us()
+        log.neu(a, b, c, d, e, 0)
+        neu_us += time.ticks_diff(time.ticks_us(), start)
+        if mem_alloc:
+            heap += mem_alloc() - vorher
+        gc.enable()
+        if log.faellig():
+            log.flush()
+    log.flush_alle()
+
+    statistik = log.statistik
+    print("Sätze:            %d" % statistik["saetze"])
+    print("neu():            %.1f us/Satz" % (neu_us / ANZAHL))
+    if mem_alloc:
+        print("Heap durch neu(): %d Bytes" % heap)
+    print("Blöcke:           %d, flush() max. %d ms" % (statistik["bloecke"],
+                                                      statistik["flush_max_ms"]))
+    print("Flash:            %d Bytes (%.1f Bytes/Satz, roh %d)" % (
+        statistik["bytes"], statistik["bytes"] / ANZAHL, ANZAHL * 15))
+    gelesen = protokoll.lies(log.dateien_alt_nach_neu())
+    print("Gelesen:          %d Sätze, %s" % (
+        len(gelesen), "identisch" if [s[1:6] for s in gelesen] == werte else "ABWEICHUNG"))
+    aufraeumen(log)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark: Rechenzeit und Genauigkeit der Taupunktformeln.
+
+Referenz ist Sonntag (1990) mit voll konvergiertem Newton-Verfahren
+(über Wasser bzw. für 'magnus_eis' über Eis).
+
+Host:
+
+    python benchmarks/bench_psychrometrie.py
+
+Pico (psychrometrie.py muss bereits auf dem Gerät liegen):
+
+    mpremote run benchmarks/bench_psychrometrie.py
+"""
+
+import sys
+import time
+
+try:
+    import pathlib
+    sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src" / "taupunkt"))
+except (ImportError, NameError):
+    pass  # MicroPython
+
+import psychrometrie
+
+try:
+    _jetzt_ns = time.perf_counter_ns
+
+    def _dauer_ns(start):
+        return _jetzt_ns() - start
+except AttributeError:
+    def _jetzt_ns():
+        return time.ticks_us()
+
+    def _dauer_ns(start):
+        return time.ticks_diff(time.ticks_us(), start) * 1000
+
+
+def raster(t_min, t_max):
+    werte = []
+    t = t_min
+    while t <= t_max:
+        rh = 5.0
+        while rh <= 100.0:
+            werte.append((t, rh))
+            rh += 5.0
+        t += 2.5
+    return werte
+
+
+def ns_pro_aufruf(funktion, werte, runden):
+    # Leerschleife abziehen, damit nur die Formel gemessen wird
+    start = _jetzt_ns()
+    for _ in range(runden):
+        for t, rh in werte:
+            pass
+    leer = _dauer_ns(start)
+    start = _jetzt_ns()
+    for _ in range(runden):
+        for t, rh in werte:
+            funktion(t, rh)
+    return (_dauer_ns(start) - leer) / (runden * len(werte))
+
+
+def max_fehler(funktion, referenz, werte):
+    fehler = 0.0
+    for t, rh in werte:
+        fehler = max(fehler, abs(funktion(t, rh) - referenz(t, rh)))
+    return fehler
+
+
+def main():
+    runden = 20 if sys.implementation.name == "cpython" else 1
+    wasser = raster(-20.0, 50.0)
+    eis = raster(-40.0, 0.0)
+    ref_wasser = psychrometrie.Sonntag(iterationen=10).taupunkt
+    ref_eis = psychrometrie.Sonntag(eis=True, iterationen=10).taupunkt
+
+    print("Plattform:", sys.implementation.name, sys.platform)
+    print("%-12s %12s %14s" % ("Formel", "ns/Aufruf", "max. Fehler K"))
+    for name in ("magnus", "buck", "sonntag", "magnus_eis"):
+        formel = psychrometrie.FORMELN[name]
+        werte, referenz = (eis, ref_eis) if name == "magnus_eis" else (wasser, ref_wasser)
+        ns = ns_pro_aufruf(formel.taupunkt, werte, runden)
+        print("%-12s %12.0f %14.4f" % (name, ns, max_fehler(formel.taupunkt, referenz, werte)))
+
+
+if __name__ == "__main__":
+    main()
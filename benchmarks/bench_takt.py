@@ -0,0 +1,161 @@
+"""Benchmark: adaptives Messintervall (takt.py) gegen ein festes Intervall.
+
+Spielt einen Taupunktverlauf ab und misst nur zu den Zeitpunkten, die der
+jeweilige Taktgeber wählt. Verglichen werden Anzahl der Messungen,
+LED-Wechsel und die Verzögerung, mit der die LEDs einem Statuswechsel folgen.
+Als Referenz dient die Entscheidung ohne Hysterese über den über 15 Minuten
+gemittelten Verlauf, also ohne Sensorrauschen.
+
+Ohne Datei wird ein synthetischer Verlauf über 7 Tage in 10-s-Schritten
+erzeugt (Tagesgang, Wetterumschwünge, Sensorrauschen). Eine eigene Datei
+enthält je Zeile "sekunde,tp_innen,tp_aussen" in gleichmäßigen Schritten.
+
+Aufruf auf dem Host:
+
+    python benchmarks/bench_takt.py [verlauf.csv]
+"""
+
+import math
+import pathlib
+import random
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src" / "taupunkt"))
+
+# Auf dem Host fehlen die MicroPython-Erweiterungen von time
+time.ticks_ms = lambda: time.monotonic_ns() // 1000000
+time.ticks_diff = lambda a, b: a - b
+
+import laufzeit
+import takt
+
+GRENZE = 2.0
+TAG = 86400
+
+
+def synthetisch(tage=7, schritt=10, seed=0):
+    zufall = random.Random(seed)
+    front = 0.0
+    verlauf = []
+    for i in range(tage * TAG // schritt):
+        t = i * schritt
+        phase = 2 * math.pi * t / TAG
+        # Wetterumschwünge als langsamer Zufallspfad, zur Mitte gezogen
+        front += zufall.gauss(0, 0.02) - front * 0.0005
+        tp_innen = 11.0 + 0.5 * math.sin(phase - 1.0) + zufall.gauss(0, 0.02)
+        tp_aussen = 8.5 + 3.0 * math.sin(phase - 2.0) + front + zufall.gauss(0, 0.05)
+        verlauf.append((t, tp_innen, tp_aussen))
+    return schritt, verlauf
+
+
+def lade(pfad):
+    verlauf = []
+    with open(pfad) as f:
+        for zeile in f:
+            zeile = zeile.strip()
+            if not zeile or zeile.startswith("#"):
+                continue
+            t, tp_innen, tp_aussen = (float(x) for x in zeile.split(",")[:3])
+            verlauf.append((t, tp_innen, tp_aussen))
+    return verlauf[1][0] - verlauf[0][0], verlauf
+
+
+def referenz(verlauf, schritt, fenster_s=900):
+    """Status bei jedem Punkt aus dem zentrierten gleitenden Mittel von d."""
+    halb = max(1, int(fenster_s / schritt) // 2)
+    summen = [0.0]
+    for _, tp_innen, tp_aussen in verlauf:
+        summen.append(summen[-1] + tp_aussen - tp_innen)
+    soll = []
+    for i in range(len(verlauf)):
+        von = max(0, i - halb)
+        bis = min(len(verlauf), i + halb + 1)
+        soll.append(laufzeit.entscheide(0.0, (summen[bis] - summen[von]) / (bis - von), GRENZE))
+    return soll
+
+
+def spiele_ab(verlauf, schritt, naechste):
+    """
+    :param naechste: Funktion(t, tp_innen, tp_aussen) -> (status, intervall_s)
+    :return: Anzahl Messungen und LED-Status bei jedem Punkt des Verlaufs
+    """
+    leds = []
+    status = None
+    faellig = verlauf[0][0]
+    messungen = 0
+    rechenzeit = 0.0
+    for t, tp_innen, tp_aussen in verlauf:
+        if t >= faellig:
+            start = time.perf_counter()
+            status, intervall = naechste(t, tp_innen, tp_aussen)
+            rechenzeit += time.perf_counter() - start
+            messungen += 1
+            faellig = t + intervall
+        leds.append(status)
+    return messungen, leds, rechenzeit
+
+
+def fest(intervall):
+    def naechste(t, tp_innen, tp_aussen):
+        return laufzeit.entscheide(tp_innen, tp_aussen, GRENZE), intervall
+    return naechste
+
+
+def adaptiv(min_s, max_s, **kwargs):
+    takt_geber = takt.Takt(GRENZE, min_s=min_s, max_s=max_s, **kwargs)
+
+    def naechste(t, tp_innen, tp_aussen):
+        status = takt_geber.entscheide(tp_innen, tp_aussen, int(t * 1000))
+        return status, takt_geber.intervall_s
+    return naechste
+
+
+def verzoegerungen(verlauf, soll, ist):
+    """
+    :return: Verzögerung [s] je Statuswechsel der Referenz, bis die LEDs ihn
+             zeigen, und Anzahl der Wechsel, die die LEDs ganz verpasst haben
+    """
+    werte = []
+    verpasst = 0
+    wechsel = [i for i in range(1, len(soll)) if soll[i] != soll[i - 1]] + [len(soll)]
+    for i, ende in zip(wechsel, wechsel[1:]):
+        for j in range(i, ende):
+            if ist[j] == soll[i]:
+                werte.append(verlauf[j][0] - verlauf[i][0])
+                break
+        else:
+            verpasst += 1
+    return werte, verpasst
+
+
+def main():
+    if len(sys.argv) > 1:
+        schritt, verlauf = lade(sys.argv[1])
+    else:
+        schritt, verlauf = synthetisch()
+    tage = (verlauf[-1][0] - verlauf[0][0] + schritt) / TAG
+    soll = referenz(verlauf, schritt)
+
+    print(f"Verlauf: {len(verlauf)} Punkte, {tage:.1f} Tage, Schritt {schritt:.0f} s, "
+          f"{sum(soll[i] != soll[i - 1] for i in range(1, len(soll)))} Statuswechsel")
+    print(f"{'Taktgeber':<20}{'Messungen/Tag':>14}{'LED-Wechsel':>12}"
+          f"{'Mittel':>9}{'95 %':>9}{'Max':>9}{'verpasst':>10}{'µs/Messung':>12}")
+    for name, naechste in (("fest 900 s", fest(900)),
+                           ("fest 60 s", fest(60)),
+                           ("adaptiv 60..900 s", adaptiv(60, 900)),
+                           ("ohne Hysterese", adaptiv(60, 900, hysterese=0))):
+        messungen, ist, rechenzeit = spiele_ab(verlauf, schritt, naechste)
+        leds = sum(ist[i] != ist[i - 1] for i in range(1, len(ist)))
+        werte, verpasst = verzoegerungen(verlauf, soll, ist)
+        werte.sort()
+        mittel = sum(werte) / len(werte) if werte else 0
+        p95 = werte[int(0.95 * (len(werte) - 1))] if werte else 0
+        maximum = werte[-1] if werte else 0
+        print(f"{name:<20}{messungen / tage:>14.0f}{leds:>12}"
+              f"{mittel:>8.0f}s{p95:>8.0f}s{maximum:>8.0f}s{verpasst:>10}"
+              f"{rechenzeit / messungen * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
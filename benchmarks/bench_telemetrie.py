@@ -0,0 +1,79 @@
+"""Benchmark: Konsolenausgabe je Messung – f-String gegen Telemetrierahmen.
+
+Vergleicht die bisherige print()-Zeile (Formatieren und Schreiben) mit
+telemetrie.Sender: Dauer je Messung, Bytes über USB und auf dem Pico die
+Heap-Belegung. Geschrieben wird in einen Nullstrom, damit nur die Kosten auf
+dem Gerät zählen. Läuft auf dem Host und per ``mpremote run`` auf dem Pico
+(telemetrie.py, crc8.py, laufzeit.py, gesten.py und protokoll.py müssen auf
+dem Gerät liegen):
+
+    python benchmarks/bench_telemetrie.py
+"""
+
+import gc
+import sys
+import time
+
+try:
+    import pathlib
+    sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src" / "taupunkt"))
+except (ImportError, NameError):
+    pass  # MicroPython
+
+if not hasattr(time, "ticks_ms"):
+    # CPython: MicroPython-Erweiterungen von time nachrüsten
+    time.ticks_ms = lambda: time.monotonic_ns() // 1000000
+    time.ticks_us = lambda: time.monotonic_ns() // 1000
+    time.ticks_diff = lambda a, b: a - b
+
+import laufzeit
+import telemetrie
+
+ANZAHL = 500
+DATEN = (21.37, 48.5, 9.04, 81.25, 1013.2, 10.12, 6.0)
+
+
+class Nullstrom:
+    def __init__(self):
+        self.bytes = 0
+
+    def write(self, daten):
+        self.bytes += len(daten)
+
+
+def text(strom, daten):
+    innen_t, innen_rh, aussen_t, aussen_rh, _, tp_in, tp_out = daten
+    zeile = (f"Innen: {innen_t:.1f}C/{innen_rh:.1f}% -> {tp_in:.1f}C | "
+             f"Aussen: {aussen_t:.1f}C/{aussen_rh:.1f}% -> {tp_out:.1f}C\n")
+    strom.write(zeile.encode())
+
+
+def miss(name, schreibe, strom):
+    mem_alloc = getattr(gc, "mem_alloc", None)
+    gc.collect()
+    gc.disable()
+    vorher = mem_alloc() if mem_alloc else 0
+    start = time.ticks_us()
+    for _ in range(ANZAHL):
+        schreibe()
+    dauer = time.ticks_diff(time.ticks_us(), start)
+    heap = mem_alloc() - vorher if mem_alloc else None
+    gc.enable()
+    zeile = "%-10s %7.1f us/Messung %5d Bytes/Messung" % (name, dauer / ANZAHL, strom.bytes // ANZAHL)
+    if heap is not None:
+        zeile += " %6d Bytes Heap/Messung" % (heap // ANZAHL)
+    print(zeile)
+
+
+def main():
+    strom = Nullstrom()
+    miss("text", lambda: text(strom, DATEN), strom)
+    sender = telemetrie.Sender(Nullstrom())
+    miss("binaer", lambda: sender.sende(laufzeit.GELB, DATEN, 0), sender.strom)
+    sender.strom = Nullstrom()
+    miss("binaer roh", lambda: sender.sende_roh(2137, 4850, 904, 8125, 10132, 1012, 600, 1, 0),
+         sender.strom)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark: Zeichen pro Sekunde mit text() und text_block() (nur auf dem Gerät).
+
+Zeichnet typische Dashboard-Zeilen einmal Zeichen für Zeichen mit ``text()``
+(ein Fenster und eine SPI-Übertragung je Zeichen) und einmal mit
+``text_block()`` (ein Fenster und eine Übertragung je Zeile). Braucht eine
+Firmware mit dem C-Treiber aus ``csrc/``. Pins bei Bedarf unten anpassen, dann:
+
+    mpremote run benchmarks/bench_text.py
+"""
+
+import time
+from machine import Pin, SPI
+
+import st7789
+import vga1_8x8 as font
+
+SPI_SCK = 18
+SPI_MOSI = 19
+LCD_CS = 17
+LCD_DC = 16
+LCD_RST = 20
+TFT_WIDTH = 172
+TFT_HEIGHT = 320
+DURCHLAEUFE = 50
+
+ZEILEN = ("Taupunkt: 12.3 C", "Feuchte: 55.4 %", "Temp: 21.0 C", "Druck: 1013 hPa")
+
+
+def miss(name, zeichne):
+    zeichen = sum(len(zeile) for zeile in ZEILEN) * DURCHLAEUFE
+    start = time.ticks_us()
+    for _ in range(DURCHLAEUFE):
+        for i, zeile in enumerate(ZEILEN):
+            zeichne(font, zeile, 15, 35 + i * 15, st7789.WHITE, st7789.BLACK)
+    dauer = time.ticks_diff(time.ticks_us(), start)
+    print("%-12s %7.0f Zeichen/s  %6.1f us/Zeichen" % (name, zeichen * 1e6 / dauer, dauer / zeichen))
+
+
+def main():
+    spi = SPI(0, baudrate=30000000, sck=Pin(SPI_SCK), mosi=Pin(SPI_MOSI))
+    tft = st7789.ST7789(
+        spi, TFT_WIDTH, TFT_HEIGHT,
+        reset=Pin(LCD_RST, Pin.OUT),
+        dc=Pin(LCD_DC, Pin.OUT),
+        cs=Pin(LCD_CS, Pin.OUT),
+        rotation=3,
+    )
+    tft.init()
+    tft.fill(st7789.BLACK)
+    miss("text()", tft.text)
+    miss("text_block()", tft.text_block)
+
+
+if __name__ == "__main__":
+    main()
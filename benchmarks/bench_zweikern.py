@@ -0,0 +1,145 @@
+"""Benchmark: Zykluszeit mit einem Kern und mit Anzeige auf dem zweiten Kern.
+
+Wie bench_laufzeit, aber die simulierte Anzeige blockiert für jedes Bild
+``anzeige_ms`` (volles Bild über SPI mit dem Palettenpuffer).  Einmal läuft
+alles auf Kern 0, einmal zeichnet ein zweikern.Anzeigekern auf Kern 1 und
+fragt dort auch den Touch-Controller ab.  Ausgegeben werden die Zeit, die
+Kern 0 je Zyklus braucht (Auslöser bis Zyklus fertig), die Latenz bis zu
+den LEDs, die größte Verzögerung eines 10-ms-Animationstasks auf Kern 0
+und die Latenz Touch -> LEDs.  Läuft auf dem Host und per ``mpremote run``
+auf dem Pico:
+
+    python benchmarks/bench_zweikern.py [sekunden] [anzeige_ms]
+"""
+
+import sys
+import time
+
+try:
+    import pathlib
+    sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src" / "taupunkt"))
+except (ImportError, NameError):
+    pass  # MicroPython
+
+if not hasattr(time, "ticks_ms"):
+    # CPython: ticks_* der MicroPython-Zeitbasis nachbilden
+    _t0 = time.monotonic_ns()
+
+    def _ticks_ms():
+        return (time.monotonic_ns() - _t0) // 1000000
+
+    time.ticks_ms = _ticks_ms
+    time.ticks_add = lambda t, delta: t + delta
+    time.ticks_diff = lambda a, b: a - b
+
+import laufzeit
+import zweikern
+from laufzeit import asyncio
+from psychrometrie import MAGNUS
+
+
+class FakeSensor:
+    def __init__(self, dauer_ms, wert):
+        self.dauer_ms = dauer_ms
+        self.wert = wert
+
+    def start(self):
+        return time.ticks_add(time.ticks_ms(), self.dauer_ms)
+
+    def collect(self):
+        return self.wert
+
+
+class FakeTouch:
+    """Meldet alle abstand_ms eine Berührung von 100 ms Dauer."""
+
+    def __init__(self, abstand_ms):
+        self.abstand_ms = abstand_ms
+        self.naechste = time.ticks_add(time.ticks_ms(), abstand_ms)
+        self.ende = None
+        self.zeiten = []
+
+    @property
+    def touched(self):
+        jetzt = time.ticks_ms()
+        if self.ende is not None:
+            if time.ticks_diff(jetzt, self.ende) < 0:
+                return 1
+            self.ende = None
+        if time.ticks_diff(jetzt, self.naechste) >= 0:
+            self.zeiten.append(self.naechste)
+            self.ende = time.ticks_add(self.naechste, 100)
+            self.naechste = time.ticks_add(self.naechste, self.abstand_ms)
+            return 1
+        return 0
+
+    @property
+    def touches(self):
+        return [{"x": 80, "y": 160, "id": 0}]
+
+
+def miss(sekunden, anzeige_ms, zwei_kerne):
+    leds = []
+    verzug = [0]
+
+    def zeige(status, daten):
+        # Blockiert wie ein SPI-Transfer ohne DMA
+        time.sleep(anzeige_ms / 1000)
+
+    async def animation():
+        while True:
+            soll = time.ticks_add(time.ticks_ms(), 10)
+            await asyncio.sleep(0.01)
+            verzug[0] = max(verzug[0], time.ticks_diff(time.ticks_ms(), soll))
+
+    async def lauf():
+        touch = FakeTouch(700)
+        kern = zweikern.Anzeigekern(zeige, touch=touch) if zwei_kerne else None
+        app = laufzeit.Laufzeit(
+            (FakeSensor(9, (21.0, 55.0)), FakeSensor(80, (12.0, 70.0)),
+             FakeSensor(0, (12.5, 1013.25))),
+            MAGNUS, 2.0,
+            lambda status: leds.append(time.ticks_ms()),
+            zeige,
+            intervall=1, touch=None if zwei_kerne else touch, anzeigekern=kern,
+        )
+        tasks = app.starte()
+        tasks.append(asyncio.create_task(animation()))
+        await asyncio.sleep(sekunden)
+        app.stoppe()
+        tasks[-1].cancel()
+        return app, kern, touch
+
+    app, kern, touch = asyncio.run(lauf())
+
+    latenzen = []
+    for t in touch.zeiten:
+        for a in leds:
+            if time.ticks_diff(a, t) >= 0:
+                latenzen.append(time.ticks_diff(a, t))
+                break
+    statistik = app.statistik
+    print("%s:" % ("Zwei Kerne" if zwei_kerne else "Ein Kern"))
+    print("  Zyklen:            %d" % statistik["zyklen"])
+    print("  Zyklus Kern 0:     %d ms max" % statistik["latenz_max_ms"])
+    print("  Auslöser -> LEDs:  %d ms max" % statistik["leds_max_ms"])
+    if latenzen:
+        print("  Touch -> LEDs:     %d ms Mittel, %d ms max"
+              % (sum(latenzen) // len(latenzen), max(latenzen)))
+    print("  Animationsverzug:  %d ms max" % verzug[0])
+    if kern is not None:
+        k = kern.statistik()
+        print("  Kern 1:            %d Bilder, %d ms zeichnen, Latenz %d ms max, %d verworfen"
+              % (k["bilder"], k["zeichnen_max_ms"], k["latenz_max_ms"], k["verworfen"]))
+
+
+def main():
+    sekunden = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    anzeige_ms = int(sys.argv[2]) if len(sys.argv) > 2 else 120
+    print("Laufzeit %.1f s, Anzeige %d ms je Bild" % (sekunden, anzeige_ms))
+    miss(sekunden, anzeige_ms, False)
+    miss(sekunden, anzeige_ms, True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+//
+// Display list reduction for draw_list() in st7789.c.
+//
+// Python records solid rectangles (fill_rect, hline, vline, pixel) into an
+// array('H') of (x, y, w, h, color) records; draw_list() reduces them and
+// sends each group of touching rectangles through one window:
+//
+//   1. in drawing order, rectangles completely covered by a later one are
+//      dropped, and a rectangle is merged into an earlier one of the same
+//      color when their union is a rectangle and nothing drawn in between
+//      overlaps it
+//   2. if no two remaining rectangles overlap, drawing order does not matter
+//      and they are sorted by (y, x)
+//   3. runs of rectangles stacked in the same columns, or side by side in the
+//      same rows, share one CASET/RASET/RAMWR window
+//
+// The records are modified in place. This header only depends on the C
+// library, so tests/test_draw_list_c.py builds it with the host compiler
+// and checks it against painter's-order rendering.
+//
+
+#ifndef ST7789_DRAW_LIST_H
+#define ST7789_DRAW_LIST_H
+
+#include <stdbool.h>
+#include <stddef.h>
+#include <stdint.h>
+
+typedef struct _dl_rect_t {
+    uint16_t x;
+    uint16_t y;
+    uint16_t w;
+    uint16_t h;
+    uint16_t color;
+} dl_rect_t;
+
+static inline bool dl_intersects(const dl_rect_t *a, const dl_rect_t *b) {
+    return a->x < b->x + b->w && b->x < a->x + a->w && a->y < b->y + b->h && b->y < a->y + a->h;
+}
+
+static inline bool dl_covers(const dl_rect_t *a, const dl_rect_t *b) {
+    return a->x <= b->x && a->y <= b->y && a->x + a->w >= b->x + b->w && a->y + a->h >= b->y + b->h;
+}
+
+// merges b into a if both have the same color and their union is a rectangle
+static inline bool dl_merge(dl_rect_t *a, const dl_rect_t *b) {
+    if (a->color != b->color) {
+        return false;
+    }
+    if (a->y == b->y && a->h == b->h && b->x <= a->x + a->w && a->x <= b->x + b->w) {
+        uint16_t x1 = a->x + a->w > b->x + b->w ? a->x + a->w : b->x + b->w;
+        a->x = a->x < b->x ? a->x : b->x;
+        a->w = x1 - a->x;
+        return true;
+    }
+    if (a->x == b->x && a->w == b->w && b->y <= a->y + a->h && a->y <= b->y + b->h) {
+        uint16_t y1 = a->y + a->h > b->y + b->h ? a->y + a->h : b->y + b->h;
+        a->y = a->y < b->y ? a->y : b->y;
+        a->h = y1 - a->y;
+        return true;
+    }
+    return false;
+}
+
+static size_t dl_reduce(dl_rect_t *list, size_t count) {
+    for (size_t i = 0; i < count; i++) {
+        dl_rect_t *r = &list[i];
+        if (r->w == 0 || r->h == 0) {
+            continue;
+        }
+        for (size_t j = 0; j < i; j++) {
+            if (list[j].w && dl_covers(r, &list[j])) {
+                list[j].w = 0;
+            }
+        }
+        // walk back towards older rectangles until one takes r or blocks it
+        for (size_t k = i; k-- > 0;) {
+            if (list[k].w == 0) {
+                continue;
+            }
+            if (dl_merge(&list[k], r)) {
+                r->w = 0;
+                break;
+            }
+            if (dl_intersects(&list[k], r)) {
+                break;
+            }
+        }
+    }
+
+    size_t n = 0;
+    for (size_t i = 0; i < count; i++) {
+        if (list[i].w && list[i].h) {
+            list[n++] = list[i];
+        }
+    }
+
+    for (size_t i = 0; i < n; i++) {
+        for (size_t j = i + 1; j < n; j++) {
+            if (dl_intersects(&list[i], &list[j])) {
+                return n;
+            }
+        }
+    }
+    for (size_t i = 1; i < n; i++) {
+        dl_rect_t r = list[i];
+        size_t j = i;
+        while (j > 0 && (list[j - 1].y > r.y || (list[j - 1].y == r.y && list[j - 1].x > r.x))) {
+            list[j] = list[j - 1];
+            j--;
+        }
+        list[j] = r;
+    }
+    return n;
+}
+
+// end of the window group starting at list[i]; *rows is set when the group
+// lies side by side and its fills must be interleaved per row
+static size_t dl_group(const dl_rect_t *list, size_t i, size_t n, bool *rows) {
+    const dl_rect_t *a = &list[i];
+    size_t end = i + 1;
+
+    // stacked in the same columns: one window, the fills follow each other
+    while (end < n && list[end].x == a->x && list[end].w == a->w &&
+           list[end].y == list[end - 1].y + list[end - 1].h) {
+        end++;
+    }
+    *rows = false;
+    // side by side in the same rows: one window, fills interleaved per row
+    if (end == i + 1) {
+        while (end < n && list[end].y == a->y && list[end].h == a->h &&
+               list[end].x == list[end - 1].x + list[end - 1].w) {
+            end++;
+        }
+        *rows = end > i + 1;
+    }
+    return end;
+}
+
+#endif // ST7789_DRAW_LIST_H
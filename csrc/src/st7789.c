@@ -48,6 +48,17 @@
 
 #include "mpfile.h"
 #include "st7789.h"
+#include "draw_list.h"
+
+// DMA transfers are available on the rp2 port (pico-sdk). Define ST7789_NO_DMA
+// to always use the blocking spi protocol.
+#if defined(PICO_SDK_VERSION_MAJOR) && !defined(ST7789_NO_DMA)
+#define ST7789_DMA 1
+#include "hardware/dma.h"
+#include "hardware/spi.h"
+#else
+#define ST7789_DMA 0
+#endif
 #include "jpg/tjpgd565.h"
 #include "png/pngle.h"
 
@@ -78,6 +89,7 @@
 
 #define CS_HIGH()                      \
 {                                      \
+    dma_wait();                        \
     if (self->cs != GPIO_NUM_NC) {     \
         mp_hal_pin_write(self->cs, 1); \
     }                                  \
@@ -164,7 +176,107 @@ st7789_rotation_t ORIENTATIONS_128x128[4] = {
     {0xa0, 128, 128, 3, 2}
 };
 
+//
+// DMA state. The display header carries no per-object DMA fields, so the
+// state is kept here for the one display that was created with spi_id.
+// A transfer started with dma_start() keeps CS low; every later bus access
+// goes through dma_wait() first, which finishes the transfer and raises CS.
+//
+
+#if ST7789_DMA
+
+// fills shorter than this are cheaper to send blocking than to set up
+#define DMA_MIN_PIXELS 64
+
+static int dma_channel = -1;
+static spi_inst_t *dma_spi = NULL;
+static mp_obj_base_t *dma_spi_obj = NULL;
+static st7789_ST7789_obj_t *dma_owner = NULL;
+static volatile bool dma_active = false;
+// fill colour, read in ring mode: the DMA repeats these two bytes
+static uint16_t dma_fill_color __attribute__((aligned(4)));
+
+// keeps the buffer of blit_buffer_async() alive while the DMA reads it
+MP_REGISTER_ROOT_POINTER(mp_obj_t st7789_dma_buffer);
+
+static void dma_setup(st7789_ST7789_obj_t *self, mp_int_t spi_id) {
+    if (dma_channel < 0) {
+        dma_channel = dma_claim_unused_channel(false);
+    }
+    if (dma_channel < 0) {
+        return;     // no free channel, stay on the blocking path
+    }
+    dma_spi = spi_id ? spi1 : spi0;
+    dma_spi_obj = self->spi_obj;
+    dma_owner = self;
+}
+
+static bool dma_usable(mp_obj_base_t *spi_obj) {
+    return dma_spi != NULL && spi_obj == dma_spi_obj;
+}
+
+static void dma_finish(void) {
+    // the SPI keeps clocking out the last bytes after the DMA is done
+    while (spi_is_busy(dma_spi)) {
+    }
+    // TX-only transfer: drop the received bytes and the overrun flag
+    while (spi_is_readable(dma_spi)) {
+        (void)spi_get_hw(dma_spi)->dr;
+    }
+    spi_get_hw(dma_spi)->icr = SPI_SSPICR_RORIC_BITS;
+
+    st7789_ST7789_obj_t *self = dma_owner;
+    if (self->cs != GPIO_NUM_NC) {
+        mp_hal_pin_write(self->cs, 1);
+    }
+    MP_STATE_VM(st7789_dma_buffer) = MP_OBJ_NULL;
+    dma_active = false;
+}
+
+static void dma_wait(void) {
+    if (dma_active) {
+        dma_channel_wait_for_finish_blocking(dma_channel);
+        dma_finish();
+    }
+}
+
+static bool dma_busy(void) {
+    if (!dma_active) {
+        return false;
+    }
+    if (dma_channel_is_busy(dma_channel) || spi_is_busy(dma_spi)) {
+        return true;
+    }
+    dma_finish();
+    return false;
+}
+
+static void dma_start(const void *src, uint32_t len, bool ring) {
+    dma_channel_config c = dma_channel_get_default_config(dma_channel);
+    channel_config_set_transfer_data_size(&c, DMA_SIZE_8);
+    channel_config_set_dreq(&c, spi_get_dreq(dma_spi, true));
+    channel_config_set_read_increment(&c, true);
+    channel_config_set_write_increment(&c, false);
+    if (ring) {
+        channel_config_set_ring(&c, false, 1);  // wrap the read address every 2 bytes
+    }
+    dma_active = true;
+    dma_channel_configure(dma_channel, &c, &spi_get_hw(dma_spi)->dr, src, len, true);
+}
+
+#else
+
+static inline void dma_wait(void) {
+}
+
+static inline bool dma_busy(void) {
+    return false;
+}
+
+#endif
+
 static void write_spi(mp_obj_base_t *spi_obj, const uint8_t *buf, int len) {
+    dma_wait();
     #ifdef MP_OBJ_TYPE_GET_SLOT
     mp_machine_spi_p_t *spi_p = (mp_machine_spi_p_t *)MP_OBJ_TYPE_GET_SLOT(spi_obj->type, protocol);
     #else
@@ -179,9 +291,14 @@ static void st7789_ST7789_print(const mp_print_t *print, mp_obj_t self_in, mp_pr
     mp_printf(print, "<ST7789 width=%u, height=%u, spi=%p>", self->width, self->height, self->spi_obj);
 }
 
+// commands sent to the panel since the last command_count(True)
+static uint32_t command_count = 0;
+
 static void write_cmd(st7789_ST7789_obj_t *self, uint8_t cmd, const uint8_t *data, int len) {
+    dma_wait();
     CS_LOW()
     if (cmd) {
+        command_count++;
         DC_LOW();
         write_spi(self->spi_obj, &cmd, 1);
     }
@@ -234,7 +351,29 @@ static mp_obj_t st7789_ST7789_set_window(size_t n_args, const mp_obj_t *args) {
 
 static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(st7789_ST7789_set_window_obj, 5, 5, st7789_ST7789_set_window);
 
+//
+// end of a data phase that may still be running on the DMA: CS is then
+// raised by dma_wait() before the next bus access instead of here
+//
+
+static void release_cs(st7789_ST7789_obj_t *self) {
+    #if ST7789_DMA
+    if (dma_active) {
+        return;
+    }
+    #endif
+    CS_HIGH();
+}
+
 static void fill_color_buffer(mp_obj_base_t *spi_obj, uint16_t color, int length) {
+    #if ST7789_DMA
+    if (length >= DMA_MIN_PIXELS && dma_usable(spi_obj)) {
+        dma_wait();
+        dma_fill_color = _swap_bytes(color);
+        dma_start(&dma_fill_color, length * 2, true);
+        return;
+    }
+    #endif
     const int buffer_pixel_size = 128;
     int chunks = length / buffer_pixel_size;
     int rest = length % buffer_pixel_size;
@@ -411,7 +550,7 @@ static mp_obj_t st7789_ST7789_fill_rect(size_t n_args, const mp_obj_t *args) {
         DC_HIGH();
         CS_LOW();
         fill_color_buffer(self->spi_obj, color, w * h);
-        CS_HIGH();
+        release_cs(self);
     }
     return mp_const_none;
 }
@@ -425,12 +564,71 @@ static mp_obj_t st7789_ST7789_fill(mp_obj_t self_in, mp_obj_t _color) {
     DC_HIGH();
     CS_LOW();
     fill_color_buffer(self->spi_obj, color, self->width * self->height);
-    CS_HIGH();
+    release_cs(self);
 
     return mp_const_none;
 }
 static MP_DEFINE_CONST_FUN_OBJ_2(st7789_ST7789_fill_obj, st7789_ST7789_fill);
 
+//
+// Display list: record format, reduction and window grouping are described
+// in draw_list.h
+//
+
+static mp_obj_t st7789_ST7789_draw_list(mp_obj_t self_in, mp_obj_t list_in, mp_obj_t count_in) {
+    st7789_ST7789_obj_t *self = MP_OBJ_TO_PTR(self_in);
+    mp_buffer_info_t bufinfo;
+    mp_get_buffer_raise(list_in, &bufinfo, MP_BUFFER_RW);
+    size_t count = mp_obj_get_int(count_in);
+    if (count > bufinfo.len / sizeof(dl_rect_t)) {
+        mp_raise_ValueError(MP_ERROR_TEXT("count exceeds list buffer"));
+    }
+
+    dl_rect_t *list = bufinfo.buf;
+    size_t n = dl_reduce(list, count);
+    uint32_t start_count = command_count;
+
+    size_t i = 0;
+    while (i < n) {
+        const dl_rect_t *a = &list[i];
+        bool rows;
+        size_t end = dl_group(list, i, n, &rows);
+
+        const dl_rect_t *last = &list[end - 1];
+        uint16_t x1 = last->x + last->w - 1;
+        uint16_t y1 = last->y + last->h - 1;
+        if (x1 < self->width && y1 < self->height) {
+            set_window(self, a->x, a->y, x1, y1);
+            DC_HIGH();
+            CS_LOW();
+            if (rows) {
+                for (uint16_t line = 0; line < a->h; line++) {
+                    for (size_t k = i; k < end; k++) {
+                        fill_color_buffer(self->spi_obj, list[k].color, list[k].w);
+                    }
+                }
+            } else {
+                for (size_t k = i; k < end; k++) {
+                    fill_color_buffer(self->spi_obj, list[k].color, list[k].w * list[k].h);
+                }
+            }
+            release_cs(self);
+        }
+        i = end;
+    }
+    return mp_obj_new_int(command_count - start_count);
+}
+static MP_DEFINE_CONST_FUN_OBJ_3(st7789_ST7789_draw_list_obj, st7789_ST7789_draw_list);
+
+static mp_obj_t st7789_ST7789_command_count(size_t n_args, const mp_obj_t *args) {
+    mp_obj_t count = mp_obj_new_int_from_uint(command_count);
+    if (n_args > 1 && mp_obj_is_true(args[1])) {
+        command_count = 0;
+    }
+    return count;
+}
+static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(st7789_ST7789_command_count_obj, 1, 2, st7789_ST7789_command_count);
+
 static mp_obj_t st7789_ST7789_pixel(size_t n_args, const mp_obj_t *args) {
     st7789_ST7789_obj_t *self = MP_OBJ_TO_PTR(args[0]);
     mp_int_t x = mp_obj_get_int(args[1]);
@@ -548,6 +746,49 @@ static mp_obj_t st7789_ST7789_blit_buffer(size_t n_args, const mp_obj_t *args) {
 }
 static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(st7789_ST7789_blit_buffer_obj, 6, 6, st7789_ST7789_blit_buffer);
 
+//
+// blit_buffer_async: like blit_buffer, but returns as soon as the DMA has
+// been started. The buffer must not be changed until wait() returns or
+// busy() is False. Without DMA this is the blocking blit_buffer.
+//
+
+static mp_obj_t st7789_ST7789_blit_buffer_async(size_t n_args, const mp_obj_t *args) {
+    #if ST7789_DMA
+    st7789_ST7789_obj_t *self = MP_OBJ_TO_PTR(args[0]);
+    if (dma_usable(self->spi_obj)) {
+        mp_buffer_info_t buf_info;
+        mp_get_buffer_raise(args[1], &buf_info, MP_BUFFER_READ);
+        mp_int_t x = mp_obj_get_int(args[2]);
+        mp_int_t y = mp_obj_get_int(args[3]);
+        mp_int_t w = mp_obj_get_int(args[4]);
+        mp_int_t h = mp_obj_get_int(args[5]);
+        int limit = MIN(buf_info.len, w * h * 2);
+
+        set_window(self, x, y, x + w - 1, y + h - 1);
+        DC_HIGH();
+        CS_LOW();
+        MP_STATE_VM(st7789_dma_buffer) = args[1];
+        dma_start(buf_info.buf, limit, false);
+        return mp_const_none;
+    }
+    #endif
+    return st7789_ST7789_blit_buffer(n_args, args);
+}
+static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(st7789_ST7789_blit_buffer_async_obj, 6, 6, st7789_ST7789_blit_buffer_async);
+
+static mp_obj_t st7789_ST7789_wait(mp_obj_t self_in) {
+    (void)self_in;
+    dma_wait();
+    return mp_const_none;
+}
+static MP_DEFINE_CONST_FUN_OBJ_1(st7789_ST7789_wait_obj, st7789_ST7789_wait);
+
+static mp_obj_t st7789_ST7789_busy(mp_obj_t self_in) {
+    (void)self_in;
+    return mp_obj_new_bool(dma_busy());
+}
+static MP_DEFINE_CONST_FUN_OBJ_1(st7789_ST7789_busy_obj, st7789_ST7789_busy);
+
 static mp_obj_t st7789_ST7789_draw(size_t n_args, const mp_obj_t *args) {
     st7789_ST7789_obj_t *self = MP_OBJ_TO_PTR(args[0]);
     char single_char_s[] = {0, 0};
@@ -763,10 +1004,52 @@ static mp_obj_t st7789_ST7789_write_len(size_t n_args, const mp_obj_t *args) {
 }
 static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(st7789_ST7789_write_len_obj, 3, 3, st7789_ST7789_write_len);
 
+//
+// Run-length coded glyph (fonts with RLE = 1, see micropython/tools/rle_font.py):
+// records of (repeat, runs, run_0 .. run_n-1); each record is decoded once
+// into the buffer and copied for the repeated rows. Runs alternate between
+// background and foreground, starting with background.
+//
+
+static void rle_glyph(const uint8_t *src, const uint8_t *end, uint16_t *buffer, uint16_t buffer_width,
+    uint16_t width, uint16_t height, uint16_t fg_color, uint16_t bg_color) {
+    uint16_t yy = 0;
+    while (yy < height) {
+        uint16_t *row = buffer + yy * buffer_width;
+        uint16_t xx = 0;
+        uint8_t repeat = 1;
+        if (src + 2 <= end) {
+            repeat = src[0];
+            uint8_t runs = src[1];
+            src += 2;
+            for (uint8_t r = 0; r < runs && src < end; r++) {
+                uint16_t color = (r & 1) ? fg_color : bg_color;
+                for (uint8_t len = *src++; len && xx < width; len--) {
+                    row[xx++] = color;
+                }
+            }
+        }
+        while (xx < buffer_width) {
+            row[xx++] = bg_color;
+        }
+        if (repeat == 0) {
+            repeat = 1;
+        }
+        for (uint8_t n = 1; n < repeat && yy + n < height; n++) {
+            memcpy(row + n * buffer_width, row, buffer_width * 2);
+        }
+        yy += repeat;
+    }
+}
+
 //
 //	write(font_module, s, x, y[, fg, bg, background_tuple, fill])
 //		background_tuple (bitmap_buffer, width, height)
 //
+//	Fonts with RLE = 1 are decoded without the background bitmap. The
+//	class attribute ST7789.RLE tells Python that write() can decode them;
+//	drivers without it draw the run-length bytes as a bitmap.
+//
 
 static mp_obj_t st7789_ST7789_write(size_t n_args, const mp_obj_t *args) {
     st7789_ST7789_obj_t *self = MP_OBJ_TO_PTR(args[0]);
@@ -820,6 +1103,8 @@ static mp_obj_t st7789_ST7789_write(size_t n_args, const mp_obj_t *args) {
     mp_buffer_info_t bitmaps_bufinfo;
     mp_get_buffer_raise(bitmaps_data_buff, &bitmaps_bufinfo, MP_BUFFER_READ);
     bitmap_data = bitmaps_bufinfo.buf;
+    const uint8_t *bitmap_end = bitmap_data + bitmaps_bufinfo.len;
+    const bool rle = dict_lookup(MP_OBJ_FROM_PTR(dict), MP_OBJ_NEW_QSTR(MP_QSTR_RLE)) != NULL;
 
     // allocate buffer large enough the the widest character in the font
     // if a buffer was not specified during the driver init.
@@ -878,19 +1163,25 @@ static mp_obj_t st7789_ST7789_write(size_t n_args, const mp_obj_t *args) {
 
                 uint16_t buffer_width = (fill) ? max_width : width;
 
-                uint16_t color = 0;
-                for (uint16_t yy = 0; yy < height; yy++) {
-                    for (uint16_t xx = 0; xx < width; xx++) {
-                        if (background_data && (xx <= background_width && yy <= background_height)) {
-                            if (get_color(bpp) == bg_color) {
-                                color = background_data[(yy * background_width + xx)];
+                if (rle) {
+                    // offsets are byte offsets of the glyph records
+                    rle_glyph(bitmap_data + bs_bit, bitmap_end, self->i2c_buffer, buffer_width,
+                        width, height, fg_color, bg_color);
+                } else {
+                    uint16_t color = 0;
+                    for (uint16_t yy = 0; yy < height; yy++) {
+                        for (uint16_t xx = 0; xx < width; xx++) {
+                            if (background_data && (xx <= background_width && yy <= background_height)) {
+                                if (get_color(bpp) == bg_color) {
+                                    color = background_data[(yy * background_width + xx)];
+                                } else {
+                                    color = fg_color;
+                                }
                             } else {
-                                color = fg_color;
+                                color = get_color(bpp) ? fg_color : bg_color;
                             }
-                        } else {
-                            color = get_color(bpp) ? fg_color : bg_color;
+                            self->i2c_buffer[yy * buffer_width + xx] = color;
                         }
-                        self->i2c_buffer[yy * buffer_width + xx] = color;
                     }
                 }
 
@@ -994,6 +1285,93 @@ static mp_obj_t st7789_ST7789_bitmap(size_t n_args, const mp_obj_t *args) {
 
 static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(st7789_ST7789_bitmap_obj, 4, 5, st7789_ST7789_bitmap);
 
+//
+// Font metrics cache: WIDTH/HEIGHT/FIRST/LAST/FONT are looked up in the font
+// module's globals dict only on the first use of a font object. The cached
+// font and its FONT buffer are held in a root pointer, so the GC cannot free
+// them while `data` points into the buffer, and a new object can never reuse
+// the address of a cached font. make_new() clears the cache, so nothing
+// survives a soft reset.
+//
+
+#define FONT_CACHE_SIZE 4
+
+// font module and FONT buffer of each slot: [2 * i] and [2 * i + 1]
+MP_REGISTER_ROOT_POINTER(mp_obj_t st7789_font_cache[8]);
+
+typedef struct _font_metrics_t {
+    const uint8_t *data;
+    uint8_t width;
+    uint8_t height;
+    uint8_t first;
+    uint8_t last;
+    uint8_t wide;
+} font_metrics_t;
+
+static font_metrics_t font_cache[FONT_CACHE_SIZE];
+static uint8_t font_cache_next = 0;
+
+static void font_cache_clear(void) {
+    MP_STATIC_ASSERT(MP_ARRAY_SIZE(MP_STATE_VM(st7789_font_cache)) == 2 * FONT_CACHE_SIZE);
+    for (int i = 0; i < 2 * FONT_CACHE_SIZE; i++) {
+        MP_STATE_VM(st7789_font_cache)[i] = MP_OBJ_NULL;
+    }
+    memset(font_cache, 0, sizeof(font_cache));
+    font_cache_next = 0;
+}
+
+static const font_metrics_t *get_font_metrics(mp_obj_t font_obj) {
+    mp_obj_t *roots = MP_STATE_VM(st7789_font_cache);
+    for (int i = 0; i < FONT_CACHE_SIZE; i++) {
+        if (roots[2 * i] == font_obj) {
+            return &font_cache[i];
+        }
+    }
+
+    mp_obj_module_t *font = MP_OBJ_TO_PTR(font_obj);
+    mp_obj_dict_t *dict = MP_OBJ_TO_PTR(font->globals);
+    uint8_t slot = font_cache_next;
+    font_metrics_t *metrics = &font_cache[slot];
+
+    // mark the slot unused until all lookups have succeeded
+    roots[2 * slot] = MP_OBJ_NULL;
+    roots[2 * slot + 1] = MP_OBJ_NULL;
+    metrics->width = mp_obj_get_int(mp_obj_dict_get(dict, MP_OBJ_NEW_QSTR(MP_QSTR_WIDTH)));
+    metrics->height = mp_obj_get_int(mp_obj_dict_get(dict, MP_OBJ_NEW_QSTR(MP_QSTR_HEIGHT)));
+    metrics->first = mp_obj_get_int(mp_obj_dict_get(dict, MP_OBJ_NEW_QSTR(MP_QSTR_FIRST)));
+    metrics->last = mp_obj_get_int(mp_obj_dict_get(dict, MP_OBJ_NEW_QSTR(MP_QSTR_LAST)));
+    metrics->wide = metrics->width / 8;
+
+    mp_obj_t data_obj = mp_obj_dict_get(dict, MP_OBJ_NEW_QSTR(MP_QSTR_FONT));
+    mp_buffer_info_t bufinfo;
+    mp_get_buffer_raise(data_obj, &bufinfo, MP_BUFFER_READ);
+    metrics->data = bufinfo.buf;
+    roots[2 * slot + 1] = data_obj;
+    roots[2 * slot] = font_obj;
+
+    font_cache_next = (font_cache_next + 1) % FONT_CACHE_SIZE;
+    return metrics;
+}
+
+static void get_text_source(mp_obj_t text_obj, uint8_t *single_char_s, const uint8_t **source, size_t *source_len) {
+    if (mp_obj_is_int(text_obj)) {
+        mp_int_t c = mp_obj_get_int(text_obj);
+        *single_char_s = (c & 0xff);
+        *source = single_char_s;
+        *source_len = 1;
+    } else if (mp_obj_is_str(text_obj)) {
+        *source = (uint8_t *) mp_obj_str_get_str(text_obj);
+        *source_len = strlen((char *)*source);
+    } else if (mp_obj_is_type(text_obj, &mp_type_bytes)) {
+        mp_buffer_info_t text_bufinfo;
+        mp_get_buffer_raise(text_obj, &text_bufinfo, MP_BUFFER_READ);
+        *source = text_bufinfo.buf;
+        *source_len = text_bufinfo.len;
+    } else {
+        mp_raise_TypeError(MP_ERROR_TEXT("text requires either int, str or bytes."));
+    }
+}
+
 static mp_obj_t st7789_ST7789_text(size_t n_args, const mp_obj_t *args) {
     st7789_ST7789_obj_t *self = MP_OBJ_TO_PTR(args[0]);
     uint8_t single_char_s;
@@ -1001,40 +1379,17 @@ static mp_obj_t st7789_ST7789_text(size_t n_args, const mp_obj_t *args) {
     size_t source_len = 0;
 
     // extract arguments
-    mp_obj_module_t *font = MP_OBJ_TO_PTR(args[1]);
-
-    if (mp_obj_is_int(args[2])) {
-        mp_int_t c = mp_obj_get_int(args[2]);
-        single_char_s = (c & 0xff);
-        source = &single_char_s;
-        source_len = 1;
-    } else if (mp_obj_is_str(args[2])) {
-        source = (uint8_t *) mp_obj_str_get_str(args[2]);
-        source_len = strlen((char *)source);
-    } else if (mp_obj_is_type(args[2], &mp_type_bytes)) {
-        mp_obj_t text_data_buff = args[2];
-        mp_buffer_info_t text_bufinfo;
-        mp_get_buffer_raise(text_data_buff, &text_bufinfo, MP_BUFFER_READ);
-        source = text_bufinfo.buf;
-        source_len = text_bufinfo.len;
-    } else {
-        mp_raise_TypeError(MP_ERROR_TEXT("text requires either int, str or bytes."));
-        return mp_const_none;
-    }
+    const font_metrics_t *font = get_font_metrics(args[1]);
+    get_text_source(args[2], &single_char_s, &source, &source_len);
 
     mp_int_t x0 = mp_obj_get_int(args[3]);
     mp_int_t y0 = mp_obj_get_int(args[4]);
 
-    mp_obj_dict_t *dict = MP_OBJ_TO_PTR(font->globals);
-    const uint8_t width = mp_obj_get_int(mp_obj_dict_get(dict, MP_OBJ_NEW_QSTR(MP_QSTR_WIDTH)));
-    const uint8_t height = mp_obj_get_int(mp_obj_dict_get(dict, MP_OBJ_NEW_QSTR(MP_QSTR_HEIGHT)));
-    const uint8_t first = mp_obj_get_int(mp_obj_dict_get(dict, MP_OBJ_NEW_QSTR(MP_QSTR_FIRST)));
-    const uint8_t last = mp_obj_get_int(mp_obj_dict_get(dict, MP_OBJ_NEW_QSTR(MP_QSTR_LAST)));
-
-    mp_obj_t font_data_buff = mp_obj_dict_get(dict, MP_OBJ_NEW_QSTR(MP_QSTR_FONT));
-    mp_buffer_info_t bufinfo;
-    mp_get_buffer_raise(font_data_buff, &bufinfo, MP_BUFFER_READ);
-    const uint8_t *font_data = bufinfo.buf;
+    const uint8_t width = font->width;
+    const uint8_t height = font->height;
+    const uint8_t first = font->first;
+    const uint8_t last = font->last;
+    const uint8_t *font_data = font->data;
 
     mp_int_t fg_color;
     mp_int_t bg_color;
@@ -1051,7 +1406,7 @@ static mp_obj_t st7789_ST7789_text(size_t n_args, const mp_obj_t *args) {
         bg_color = _swap_bytes(BLACK);
     }
 
-    uint8_t wide = width / 8;
+    uint8_t wide = font->wide;
     size_t buf_size = width * height * 2;
 
     if (self->buffer_size == 0) {
@@ -1099,6 +1454,104 @@ static mp_obj_t st7789_ST7789_text(size_t n_args, const mp_obj_t *args) {
 
 static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(st7789_ST7789_text_obj, 5, 7, st7789_ST7789_text);
 
+//
+// text_block: renders the whole string with its background into one buffer
+// and sends it through a single window, instead of one window and one
+// transfer per glyph as text() does. Glyphs that would not fit completely
+// on the display are dropped. If a preallocated buffer (buffer_size) is
+// too small for the whole string, the block is sent in strips of rows, still
+// within the same window.
+//
+
+static mp_obj_t st7789_ST7789_text_block(size_t n_args, const mp_obj_t *args) {
+    st7789_ST7789_obj_t *self = MP_OBJ_TO_PTR(args[0]);
+    uint8_t single_char_s;
+    const uint8_t *source = NULL;
+    size_t source_len = 0;
+
+    const font_metrics_t *font = get_font_metrics(args[1]);
+    get_text_source(args[2], &single_char_s, &source, &source_len);
+
+    mp_int_t x0 = mp_obj_get_int(args[3]);
+    mp_int_t y0 = mp_obj_get_int(args[4]);
+    uint16_t fg_color = _swap_bytes((n_args > 5) ? mp_obj_get_int(args[5]) : WHITE);
+    uint16_t bg_color = _swap_bytes((n_args > 6) ? mp_obj_get_int(args[6]) : BLACK);
+
+    if (x0 < 0 || y0 < 0 || x0 >= self->width || y0 + font->height > self->height) {
+        return mp_const_none;
+    }
+
+    // count the glyphs that exist in the font and fit on the display
+    size_t max_chars = (self->width - x0) / font->width;
+    size_t count = 0;
+    for (size_t i = 0; i < source_len; i++) {
+        if (source[i] >= font->first && source[i] <= font->last) {
+            count++;
+        }
+    }
+    if (count > max_chars) {
+        count = max_chars;
+    }
+    if (count == 0) {
+        return mp_const_none;
+    }
+
+    size_t row_pixels = count * font->width;
+    size_t row_bytes = row_pixels * 2;
+    uint16_t *buffer;
+    uint16_t strip_rows;
+    bool allocated = false;
+
+    if (self->buffer_size >= row_bytes) {
+        buffer = self->i2c_buffer;
+        strip_rows = self->buffer_size / row_bytes;
+        if (strip_rows > font->height) {
+            strip_rows = font->height;
+        }
+    } else {
+        buffer = m_malloc(row_bytes * font->height);
+        strip_rows = font->height;
+        allocated = true;
+    }
+
+    set_window(self, x0, y0, x0 + row_pixels - 1, y0 + font->height - 1);
+    DC_HIGH();
+    CS_LOW();
+    for (uint16_t strip = 0; strip < font->height; strip += strip_rows) {
+        uint16_t rows = font->height - strip;
+        if (rows > strip_rows) {
+            rows = strip_rows;
+        }
+        size_t buf_idx = 0;
+        for (uint16_t line = strip; line < strip + rows; line++) {
+            size_t drawn = 0;
+            for (size_t i = 0; i < source_len && drawn < count; i++) {
+                uint8_t chr = source[i];
+                if (chr < font->first || chr > font->last) {
+                    continue;
+                }
+                const uint8_t *glyph_row = font->data + ((chr - font->first) * font->height + line) * font->wide;
+                for (uint8_t line_byte = 0; line_byte < font->wide; line_byte++) {
+                    uint8_t chr_data = glyph_row[line_byte];
+                    for (uint8_t bit = 8; bit; bit--) {
+                        buffer[buf_idx++] = (chr_data >> (bit - 1) & 1) ? fg_color : bg_color;
+                    }
+                }
+                drawn++;
+            }
+        }
+        write_spi(self->spi_obj, (uint8_t *)buffer, buf_idx * 2);
+    }
+    CS_HIGH();
+
+    if (allocated) {
+        m_free(buffer);
+    }
+    return mp_const_none;
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(st7789_ST7789_text_block_obj, 5, 7, st7789_ST7789_text_block);
+
 // 0=Portrait, 1=Landscape, 2=Reverse Portrait (180), 3=Reverse Landscape (180)
 
 static void set_rotation(st7789_ST7789_obj_t *self) {
@@ -2356,6 +2809,7 @@ static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(st7789_ST7789_bounding_obj, 1, 3, st7
 static const mp_rom_map_elem_t st7789_ST7789_locals_dict_table[] = {
     {MP_ROM_QSTR(MP_QSTR_write), MP_ROM_PTR(&st7789_ST7789_write_obj)},
     {MP_ROM_QSTR(MP_QSTR_write_len), MP_ROM_PTR(&st7789_ST7789_write_len_obj)},
+    {MP_ROM_QSTR(MP_QSTR_RLE), MP_ROM_INT(1)},
     {MP_ROM_QSTR(MP_QSTR_hard_reset), MP_ROM_PTR(&st7789_ST7789_hard_reset_obj)},
     {MP_ROM_QSTR(MP_QSTR_soft_reset), MP_ROM_PTR(&st7789_ST7789_soft_reset_obj)},
     {MP_ROM_QSTR(MP_QSTR_sleep_mode), MP_ROM_PTR(&st7789_ST7789_sleep_mode_obj)},
@@ -2367,18 +2821,24 @@ static const mp_rom_map_elem_t st7789_ST7789_locals_dict_table[] = {
     {MP_ROM_QSTR(MP_QSTR_pixel), MP_ROM_PTR(&st7789_ST7789_pixel_obj)},
     {MP_ROM_QSTR(MP_QSTR_line), MP_ROM_PTR(&st7789_ST7789_line_obj)},
     {MP_ROM_QSTR(MP_QSTR_blit_buffer), MP_ROM_PTR(&st7789_ST7789_blit_buffer_obj)},
+    {MP_ROM_QSTR(MP_QSTR_blit_buffer_async), MP_ROM_PTR(&st7789_ST7789_blit_buffer_async_obj)},
+    {MP_ROM_QSTR(MP_QSTR_wait), MP_ROM_PTR(&st7789_ST7789_wait_obj)},
+    {MP_ROM_QSTR(MP_QSTR_busy), MP_ROM_PTR(&st7789_ST7789_busy_obj)},
     {MP_ROM_QSTR(MP_QSTR_draw), MP_ROM_PTR(&st7789_ST7789_draw_obj)},
     {MP_ROM_QSTR(MP_QSTR_draw_len), MP_ROM_PTR(&st7789_ST7789_draw_len_obj)},
     {MP_ROM_QSTR(MP_QSTR_bitmap), MP_ROM_PTR(&st7789_ST7789_bitmap_obj)},
     {MP_ROM_QSTR(MP_QSTR_set_window), MP_ROM_PTR(&st7789_ST7789_set_window_obj)},
     {MP_ROM_QSTR(MP_QSTR_fill_rect), MP_ROM_PTR(&st7789_ST7789_fill_rect_obj)},
     {MP_ROM_QSTR(MP_QSTR_fill), MP_ROM_PTR(&st7789_ST7789_fill_obj)},
+    {MP_ROM_QSTR(MP_QSTR_draw_list), MP_ROM_PTR(&st7789_ST7789_draw_list_obj)},
+    {MP_ROM_QSTR(MP_QSTR_command_count), MP_ROM_PTR(&st7789_ST7789_command_count_obj)},
     {MP_ROM_QSTR(MP_QSTR_hline), MP_ROM_PTR(&st7789_ST7789_hline_obj)},
     {MP_ROM_QSTR(MP_QSTR_vline), MP_ROM_PTR(&st7789_ST7789_vline_obj)},
     {MP_ROM_QSTR(MP_QSTR_fill_circle), MP_ROM_PTR(&st7789_ST7789_fill_circle_obj)},
     {MP_ROM_QSTR(MP_QSTR_circle), MP_ROM_PTR(&st7789_ST7789_circle_obj)},
     {MP_ROM_QSTR(MP_QSTR_rect), MP_ROM_PTR(&st7789_ST7789_rect_obj)},
     {MP_ROM_QSTR(MP_QSTR_text), MP_ROM_PTR(&st7789_ST7789_text_obj)},
+    {MP_ROM_QSTR(MP_QSTR_text_block), MP_ROM_PTR(&st7789_ST7789_text_block_obj)},
     {MP_ROM_QSTR(MP_QSTR_rotation), MP_ROM_PTR(&st7789_ST7789_rotation_obj)},
     {MP_ROM_QSTR(MP_QSTR_width), MP_ROM_PTR(&st7789_ST7789_width_obj)},
     {MP_ROM_QSTR(MP_QSTR_height), MP_ROM_PTR(&st7789_ST7789_height_obj)},
@@ -2437,7 +2897,8 @@ mp_obj_t st7789_ST7789_make_new(const mp_obj_type_t *type,
         ARG_color_order,
         ARG_inversion,
         ARG_options,
-        ARG_buffer_size
+        ARG_buffer_size,
+        ARG_spi_id
     };
     static const mp_arg_t allowed_args[] = {
         {MP_QSTR_spi, MP_ARG_OBJ | MP_ARG_REQUIRED, {.u_obj = MP_OBJ_NULL}},
@@ -2454,6 +2915,7 @@ mp_obj_t st7789_ST7789_make_new(const mp_obj_type_t *type,
         {MP_QSTR_inversion, MP_ARG_KW_ONLY | MP_ARG_BOOL, {.u_bool = true}},
         {MP_QSTR_options, MP_ARG_KW_ONLY | MP_ARG_INT, {.u_int = 0}},
         {MP_QSTR_buffer_size, MP_ARG_KW_ONLY | MP_ARG_INT, {.u_int = 0}},
+        {MP_QSTR_spi_id, MP_ARG_KW_ONLY | MP_ARG_INT, {.u_int = -1}},
     };
     mp_arg_val_t args[MP_ARRAY_SIZE(allowed_args)];
     mp_arg_parse_all_kw_array(n_args, n_kw, all_args, MP_ARRAY_SIZE(allowed_args), allowed_args, args);
@@ -2462,6 +2924,9 @@ mp_obj_t st7789_ST7789_make_new(const mp_obj_type_t *type,
     st7789_ST7789_obj_t *self = m_new_obj(st7789_ST7789_obj_t);
     self->base.type = &st7789_ST7789_type;
 
+    // root pointers are not cleared on soft reset: drop fonts of the last run
+    font_cache_clear();
+
     // set parameters
     mp_obj_base_t *spi_obj = (mp_obj_base_t *)MP_OBJ_TO_PTR(args[ARG_spi].u_obj);
     self->spi_obj = spi_obj;
@@ -2539,6 +3004,14 @@ mp_obj_t st7789_ST7789_make_new(const mp_obj_type_t *type,
     self->max_x = 0;
     self->max_y = 0;
 
+    // spi_id: hardware SPI behind the spi object, enables the DMA path
+    #if ST7789_DMA
+    if (args[ARG_spi_id].u_int >= 0) {
+        dma_wait();
+        dma_setup(self, args[ARG_spi_id].u_int);
+    }
+    #endif
+
     return MP_OBJ_FROM_PTR(self);
 }
 
@@ -10,6 +10,11 @@ AHT20_ADDR = 0x38
 BMP280_ADDR = 0x76
 SHT41_ADDR = 0x44
 
+# BMP280: forced mode measures only on request and idles in between;
+# oversampling/IIR profile, see bmp280.PROFILES
+BMP280_FORCED = True
+BMP280_PROFILE = "ultra_low_power"
+
 # LED pins
 LED_ROT = 13
 LED_GELB = 14
@@ -23,6 +28,13 @@ LCD_BL = 21
 SPI_SCK = 18
 SPI_MOSI = 19
 
+# Hardware SPI of the display. With DISPLAY_DMA the C driver gets the SPI id
+# and sends fills and blit_buffer_async() by DMA. Only enable it on firmware
+# built from csrc/: examples/firmware.* has no spi_id keyword and the display
+# constructor would raise TypeError.
+SPI_ID = 0
+DISPLAY_DMA = False
+
 # Display geometry
 TFT_WIDTH = 172
 TFT_HEIGHT = 320
@@ -30,6 +42,50 @@ ROTATION = 3
 
 # Measurement interval in seconds
 INTERVAL = 900
+# Adaptive interval (takt.py): down to INTERVAL_MIN seconds near a traffic
+# light boundary, INTERVAL far from it; None = fixed interval
+INTERVAL_MIN = None
+# Margin [K] beyond a boundary before the LEDs switch (only with INTERVAL_MIN)
+HYSTERESIS = 0.1
 
 # Allowed difference between indoor and outdoor dew point
 DEWPOINT_DELTA = 2.0
+
+# Dew point formula: 'magnus', 'magnus_eis', 'buck' or 'sonntag'
+DEWPOINT_FORMULA = "magnus"
+
+# Per-sensor sampling policies (erfassung.Erfassungsplan); None = read every
+# sensor every cycle at full precision. PRESSURE_PERIOD reads the BMP280 only
+# every Nth cycle. A sensor whose values change by less than STABLE_TOLERANCE
+# counts as stable: the SHT41 then uses low precision and the AHT20 skips
+# OUTDOOR_SKIP cycles. Within 1 K of a traffic light boundary both always
+# measure at full precision.
+SAMPLING_POLICY = True
+PRESSURE_PERIOD = 10
+STABLE_TOLERANCE = 0.2
+OUTDOOR_SKIP = 1
+
+# Measurement log in flash (protokoll.py): LOG_FILES files of at most
+# LOG_FILE_BYTES each, the oldest is overwritten; None = off
+LOG_NAME = "messungen"
+LOG_FILES = 4
+LOG_FILE_BYTES = 32768
+# Seconds after which a buffered sample is written to flash at the latest;
+# samples still in RAM are lost on a reset or brown-out
+LOG_MAX_AGE_S = 1800
+
+# Console output per measurement: "text" = readable print() line, "binaer" =
+# 24-byte frames with CRC (telemetrie.py, read them on the host with
+# tools/read_telemetry.py), None = off
+TELEMETRY = "text"
+
+# Low-power mode (sparbetrieb.py) instead of the asyncio runtime: None = off,
+# "wach" (time.sleep), "leicht" (lightsleep) or "tief" (deepsleep, reboots
+# every cycle). Touch and PMU interrupts are not served in this mode.
+POWER_MODE = None
+# Seconds the display stays on after each measurement, 0 = LEDs only
+DISPLAY_ON_S = 10
+# Last measurement and decision, restored after deepsleep
+STATE_FILE = "zustand.bin"
+# AXP202 on the I2C bus: average current per cycle from its coulomb counter
+PMU_PRESENT = False
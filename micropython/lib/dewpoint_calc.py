@@ -1,9 +1,13 @@
 """Utility to calculate the dew point."""
 
-import math
+import psychrometrie
+from config import DEWPOINT_FORMULA
 
-def dewpoint(temp_c, humidity):
-    """Return dew point in Celsius for given temperature and relative humidity."""
-    a, b = 17.27, 237.7
-    alpha = ((a * temp_c) / (b + temp_c)) + math.log(humidity / 100.0)
-    return (b * alpha) / (a - alpha)
+
+def dewpoint(temp_c, humidity, formula=DEWPOINT_FORMULA):
+    """Return dew point in Celsius for given temperature and relative humidity.
+
+    ``formula`` selects a backend from ``psychrometrie.FORMELN``
+    ('magnus', 'magnus_eis', 'buck', 'sonntag').
+    """
+    return psychrometrie.FORMELN[formula].taupunkt(temp_c, humidity)
@@ -2,17 +2,20 @@
 
 from machine import Pin, SPI
 import st7789
-from config import SPI_SCK, SPI_MOSI, LCD_DC, LCD_CS, LCD_RST, LCD_BL, TFT_WIDTH, TFT_HEIGHT, ROTATION
+from config import (SPI_ID, SPI_SCK, SPI_MOSI, LCD_DC, LCD_CS, LCD_RST, LCD_BL,
+                    TFT_WIDTH, TFT_HEIGHT, ROTATION, DISPLAY_DMA)
 
 
 def init_display():
-    spi = SPI(0, baudrate=30_000_000, sck=Pin(SPI_SCK), mosi=Pin(SPI_MOSI))
+    spi = SPI(SPI_ID, baudrate=30_000_000, sck=Pin(SPI_SCK), mosi=Pin(SPI_MOSI))
+    dma = {"spi_id": SPI_ID} if DISPLAY_DMA else {}
     tft = st7789.ST7789(
         spi, TFT_WIDTH, TFT_HEIGHT,
         reset=Pin(LCD_RST, Pin.OUT),
         dc=Pin(LCD_DC, Pin.OUT),
         cs=Pin(LCD_CS, Pin.OUT),
         rotation=ROTATION,
+        **dma,
     )
     tft.init()
     Pin(LCD_BL, Pin.OUT).on()
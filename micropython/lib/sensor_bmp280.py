@@ -1,8 +1,8 @@
 """BMP280 sensor helper."""
 
 import bmp280
+from config import BMP280_FORCED, BMP280_PROFILE
 
 class BMP280(bmp280.BMP280):
-    def __init__(self, i2c, addr=0x76):
-        super().__init__(i2c, addr=addr)
-
+    def __init__(self, i2c, addr=0x76, forced=BMP280_FORCED, profile=BMP280_PROFILE):
+        super().__init__(i2c, addr=addr, forced=forced, profile=profile)
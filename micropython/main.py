@@ -4,38 +4,66 @@ Initialises sensors and display and shows dew point information.
 
 import st7789
 from machine import I2C, Pin
-import time
+import asyncio
 
+import erfassung
+import laufzeit
+import protokoll
+import psychrometrie
+import sparbetrieb
+import takt
+import telemetrie
 from config import (
     I2C_SCL,
     I2C_SDA,
     LED_ROT,
     LED_GELB,
     LED_GRUEN,
+    LCD_BL,
     INTERVAL,
+    INTERVAL_MIN,
+    HYSTERESIS,
     DEWPOINT_DELTA,
+    DEWPOINT_FORMULA,
+    POWER_MODE,
+    DISPLAY_ON_S,
+    STATE_FILE,
+    PMU_PRESENT,
+    SAMPLING_POLICY,
+    LOG_NAME,
+    LOG_FILES,
+    LOG_FILE_BYTES,
+    LOG_MAX_AGE_S,
+    TELEMETRY,
+    PRESSURE_PERIOD,
+    STABLE_TOLERANCE,
+    OUTDOOR_SKIP,
 )
 from lib.display_st7789 import init_display
 from lib.sensor_aht20 import AHT20
 from lib.sensor_bmp280 import BMP280
 from lib.sensor_sht41 import SHT41
-from lib.dewpoint_calc import dewpoint
 
 
-def setup():
+def setup_leds():
+    return {
+        "rot": Pin(LED_ROT, Pin.OUT),
+        "gelb": Pin(LED_GELB, Pin.OUT),
+        "gruen": Pin(LED_GRUEN, Pin.OUT),
+    }
+
+
+def setup(leds=None, display=True):
     i2c = I2C(0, scl=Pin(I2C_SCL), sda=Pin(I2C_SDA), freq=100000)
     sensors = {
         "innen": SHT41(i2c),
         "aussen": AHT20(i2c),
         "druck": BMP280(i2c),
     }
-    leds = {
-        "rot": Pin(LED_ROT, Pin.OUT),
-        "gelb": Pin(LED_GELB, Pin.OUT),
-        "gruen": Pin(LED_GRUEN, Pin.OUT),
-    }
-    display = init_display()
-    return sensors, leds, display
+    if leds is None:
+        leds = setup_leds()
+    tft = init_display() if display else None
+    return sensors, leds, tft
 
 
 def show_status(tft, text, color):
@@ -44,30 +72,105 @@ def show_status(tft, text, color):
     tft.text(font, text, 10, 10, st7789.WHITE)
 
 
+def switch_leds(leds, status):
+    for pin in leds.values():
+        pin.off()
+    if status in leds:
+        leds[status].on()
+
+
+sender = telemetrie.Sender() if TELEMETRY == "binaer" else None
+
+
+def report(tft, status, data):
+    if sender is not None:
+        sender.sende(status, data)
+    if status == laufzeit.FEHLER:
+        show_status(tft, "Sensorfehler!", st7789.RED)
+        return
+    if TELEMETRY != "text":
+        return
+    innen_t, innen_rh, aussen_t, aussen_rh, _, tp_in, tp_out = data
+    print(
+        f"Innen: {innen_t:.1f}C/{innen_rh:.1f}% -> {tp_in:.1f}C | "
+        f"Aussen: {aussen_t:.1f}C/{aussen_rh:.1f}% -> {tp_out:.1f}C"
+    )
+
+
+def make_plan(sensors):
+    if not SAMPLING_POLICY:
+        return None
+    return erfassung.Erfassungsplan(
+        (sensors["innen"], sensors["aussen"], sensors["druck"]),
+        (
+            erfassung.Richtlinie(toleranz=STABLE_TOLERANCE, praezision=erfassung.AUTO),
+            erfassung.Richtlinie(toleranz=STABLE_TOLERANCE, auslassen=OUTDOOR_SKIP),
+            erfassung.Richtlinie(periode=PRESSURE_PERIOD),
+        ),
+        namen=("innen", "aussen", "druck"),
+    )
+
+
+def make_log():
+    if not LOG_NAME:
+        return None
+    return protokoll.Protokoll(LOG_NAME, dateien=LOG_FILES, datei_bytes=LOG_FILE_BYTES,
+                               max_alter_s=LOG_MAX_AGE_S)
+
+
+def make_takt():
+    if not INTERVAL_MIN:
+        return None
+    return takt.Takt(DEWPOINT_DELTA, min_s=INTERVAL_MIN, max_s=INTERVAL, hysterese=HYSTERESIS)
+
+
+def run_low_power():
+    # Restore the LEDs from the saved state before anything else is set up
+    leds = setup_leds()
+    state = sparbetrieb.Zustand(STATE_FILE)
+    if state.lade() and state.status is not None:
+        switch_leds(leds, state.status)
+    sensors, leds, tft = setup(leds, display=DISPLAY_ON_S > 0)
+    pmu = None
+    if PMU_PRESENT:
+        import axp202c
+        pmu = axp202c.PMU(i2c=sensors["innen"].i2c)
+    sparbetrieb.Sparbetrieb(
+        (sensors["innen"], sensors["aussen"], sensors["druck"]),
+        psychrometrie.FORMELN[DEWPOINT_FORMULA],
+        DEWPOINT_DELTA,
+        lambda status: switch_leds(leds, status),
+        lambda status, data: report(tft, status, data),
+        intervall=INTERVAL,
+        modus=POWER_MODE,
+        tft=tft,
+        backlight=Pin(LCD_BL, Pin.OUT),
+        anzeige_s=DISPLAY_ON_S,
+        pmu=pmu,
+        zustand=state,
+        takt=make_takt(),
+        plan=make_plan(sensors),
+        protokoll=make_log(),
+    ).run()
+
+
 def main():
+    if POWER_MODE:
+        run_low_power()
+        return
     sensors, leds, tft = setup()
-    while True:
-        innen_t, innen_rh = sensors["innen"].measurements
-        aussen_t = sensors["aussen"].temperature
-        aussen_rh = sensors["aussen"].relative_humidity
-        tp_in = dewpoint(innen_t, innen_rh)
-        tp_out = dewpoint(aussen_t, aussen_rh)
-
-        for pin in leds.values():
-            pin.off()
-
-        if tp_out < tp_in - DEWPOINT_DELTA:
-            leds["gruen"].on()
-        elif tp_out >= tp_in:
-            leds["rot"].on()
-        else:
-            leds["gelb"].on()
-
-        print(
-            f"Innen: {innen_t:.1f}C/{innen_rh:.1f}% -> {tp_in:.1f}C | "
-            f"Aussen: {aussen_t:.1f}C/{aussen_rh:.1f}% -> {tp_out:.1f}C"
-        )
-        time.sleep(INTERVAL)
+    app = laufzeit.Laufzeit(
+        (sensors["innen"], sensors["aussen"], sensors["druck"]),
+        psychrometrie.FORMELN[DEWPOINT_FORMULA],
+        DEWPOINT_DELTA,
+        lambda status: switch_leds(leds, status),
+        lambda status, data: report(tft, status, data),
+        intervall=INTERVAL,
+        takt=make_takt(),
+        plan=make_plan(sensors),
+        protokoll=make_log(),
+    )
+    asyncio.run(app.run())
 
 
 if __name__ == "__main__":
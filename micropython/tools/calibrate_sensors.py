@@ -15,9 +15,8 @@ def main():
     sht = SHT41(i2c, address=SHT41_ADDR)
 
     while True:
-        t_i, rh_i = sht.measurements
-        t_o = aht.temperature
-        rh_o = aht.relative_humidity
+        t_i, rh_i = sht.measurements()
+        t_o, rh_o = aht.measurement()
         p = bmp.pressure
         print(f"Innen: {t_i:.1f}C {rh_i:.1f}% | Aussen: {t_o:.1f}C {rh_o:.1f}% | Druck: {p:.0f} hPa")
         time.sleep(1)
@@ -0,0 +1,60 @@
+"""Decode binary telemetry frames (TELEMETRY = "binaer") on the host.
+
+Reads from a serial port (needs pyserial), a capture file or stdin and prints
+one line per frame. Ordinary print() output from the Pico is passed through
+unchanged; CRC errors and lost frames are reported at the end.
+
+    python micropython/tools/read_telemetry.py /dev/ttyACM0
+    python micropython/tools/read_telemetry.py capture.bin
+"""
+
+import argparse
+import pathlib
+import sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2] / "src" / "taupunkt"))
+
+import telemetrie  # noqa: E402
+
+
+def open_source(name, baud):
+    if name == "-":
+        return sys.stdin.buffer
+    if name.startswith(("/dev/", "COM")):
+        import serial
+        return serial.Serial(name, baud, timeout=1)
+    return open(name, "rb")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", help="serial port, capture file or - for stdin")
+    parser.add_argument("--baud", type=int, default=115200)
+    args = parser.parse_args()
+
+    receiver = telemetrie.Empfaenger()
+    source = open_source(args.source, args.baud)
+    try:
+        while True:
+            chunk = source.read(256)
+            if not chunk:
+                if hasattr(source, "in_waiting"):
+                    continue  # serial timeout, keep listening
+                break
+            frames, lines = receiver.futter(chunk)
+            for line in lines:
+                print(line)
+            for frame in frames:
+                print(telemetrie.als_text(frame))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        source.close()
+
+    stats = receiver.statistik
+    print(f"{stats['rahmen']} frames, {stats['verloren']} lost, "
+          f"{stats['crc_fehler']} CRC errors, {stats['text_bytes']} text bytes", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""Convert bitmap fonts to the run-length font format of the ST7789 driver.
+
+The format is a proportional font module like the ones ``write()`` already
+takes (``MAP``, ``WIDTHS``, ``OFFSETS``, ``BITMAPS``, ...) with ``RLE = 1``.
+Each glyph in ``BITMAPS`` is a list of row records::
+
+    repeat, runs, run_0, run_1, ..., run_(runs-1)
+
+``repeat`` identical rows, each made of runs alternating between background
+and foreground, starting with background. Pixels after the last run are
+background. ``OFFSETS`` holds the byte offset of each glyph (2 bytes, big
+endian). Glyph widths are limited to 255 pixels.
+
+Usage on the host::
+
+    # pre-rendered seven-segment digits 0-9 . - ° %
+    python tools/rle_font.py digits --width 24 --height 40 -o ../src/taupunkt/ziffern_24x40.py
+
+    # compress a fixed-width font module (WIDTH, HEIGHT, FIRST, LAST, FONT)
+    python tools/rle_font.py convert vga1_16x32.py --chars "0123456789.-" -o klein.py
+"""
+
+import argparse
+import pathlib
+import runpy
+
+DIGIT_CHARS = "0123456789.-°%"
+
+# segments lit per character: a top, b top right, c bottom right, d bottom,
+# e bottom left, f top left, g middle
+SEGMENTS = {
+    "0": "abcdef", "1": "bc", "2": "abdeg", "3": "abcdg", "4": "bcfg",
+    "5": "acdfg", "6": "acdefg", "7": "abc", "8": "abcdefg", "9": "abcdfg",
+    "-": "g",
+}
+
+
+def encode_glyph(rows):
+    """Encode a glyph given as rows of 0/1 pixels."""
+    data = bytearray()
+    records = []
+    for row in rows:
+        runs = []
+        color, length = 0, 0
+        for pixel in row:
+            if pixel == color:
+                length += 1
+            else:
+                runs.append(length)
+                color, length = pixel, 1
+        if color:
+            runs.append(length)
+        if records and records[-1][1] == runs and records[-1][0] < 255:
+            records[-1][0] += 1
+        else:
+            records.append([1, runs])
+    for repeat, runs in records:
+        data += bytes((repeat, len(runs))) + bytes(runs)
+    return bytes(data)
+
+
+def decode_glyph(data, width, height):
+    """Inverse of encode_glyph, for checks on the host."""
+    rows = []
+    i = 0
+    while len(rows) < height:
+        repeat, count = data[i], data[i + 1]
+        row = []
+        for n, run in enumerate(data[i + 2:i + 2 + count]):
+            row += [n & 1] * run
+        row += [0] * (width - len(row))
+        rows += [row] * repeat
+        i += 2 + count
+    return rows
+
+
+def blank(width, height):
+    return [[0] * width for _ in range(height)]
+
+
+def fill(rows, x, y, w, h):
+    for yy in range(y, y + h):
+        for xx in range(x, x + w):
+            rows[yy][xx] = 1
+
+
+def fill_clear(rows, x, y, w, h):
+    for yy in range(y, y + h):
+        for xx in range(x, x + w):
+            rows[yy][xx] = 0
+
+
+def render_digits(width, height):
+    """
+    Seven-segment glyphs for the chars in DIGIT_CHARS. Digits are ``width``
+    wide including a right margin of width // 6; '.' and '°' are narrower.
+    """
+    stroke = max(2, width // 6)
+    margin = width // 6
+    inner = width - margin
+    half = height // 2
+    # rectangles (x, y, w, h) per segment, with one pixel gap at the joints
+    seg = {
+        "a": (stroke, 0, inner - 2 * stroke, stroke),
+        "b": (inner - stroke, stroke + 1, stroke, half - stroke - 1 - stroke // 2),
+        "c": (inner - stroke, half + stroke // 2 + 1, stroke, half - stroke - 1 - stroke // 2),
+        "d": (stroke, height - stroke, inner - 2 * stroke, stroke),
+        "e": (0, half + stroke // 2 + 1, stroke, half - stroke - 1 - stroke // 2),
+        "f": (0, stroke + 1, stroke, half - stroke - 1 - stroke // 2),
+        "g": (stroke, half - stroke // 2, inner - 2 * stroke, stroke),
+    }
+    glyphs = {}
+    for ch, lit in SEGMENTS.items():
+        rows = blank(width, height)
+        for s in lit:
+            fill(rows, *seg[s])
+        glyphs[ch] = rows
+
+    dot = blank(stroke + margin, height)
+    fill(dot, 0, height - stroke, stroke, stroke)
+    glyphs["."] = dot
+
+    ring = 3 * stroke
+    degree = blank(ring + margin, height)
+    fill(degree, 0, 0, ring, ring)
+    fill_clear(degree, stroke, stroke, stroke, stroke)
+    glyphs["°"] = degree
+
+    percent = blank(width, height)
+    box = 2 * stroke
+    fill(percent, 0, 0, box, box)
+    fill(percent, inner - box, height - box, box, box)
+    # slash from bottom left to top right, stroke pixels wide
+    for yy in range(height):
+        xx = (inner - stroke) * (height - 1 - yy) // (height - 1)
+        for dx in range(stroke):
+            percent[yy][xx + dx] = 1
+    glyphs["%"] = percent
+    return {ch: glyphs[ch] for ch in DIGIT_CHARS}
+
+
+def load_fixed_font(path, chars):
+    """Glyph rows of a fixed-width font module (vga1_*.py style)."""
+    font = runpy.run_path(str(path))
+    width, height = font["WIDTH"], font["HEIGHT"]
+    first, last, data = font["FIRST"], font["LAST"], font["FONT"]
+    wide = (width + 7) // 8
+    glyphs = {}
+    for ch in chars:
+        code = ord(ch)
+        if not first <= code <= last:
+            raise SystemExit("character %r not in font" % ch)
+        base = (code - first) * height * wide
+        glyphs[ch] = [
+            [data[base + y * wide + x // 8] >> (7 - x % 8) & 1 for x in range(width)]
+            for y in range(height)
+        ]
+    return glyphs
+
+
+def font_module(glyphs, source):
+    """Source of the font module for the glyphs (dict char -> rows)."""
+    chars = "".join(glyphs)
+    height = len(next(iter(glyphs.values())))
+    widths = bytes(len(rows[0]) for rows in glyphs.values())
+    bitmaps = bytearray()
+    offsets = bytearray()
+    for rows in glyphs.values():
+        if len(rows[0]) > 255:
+            raise SystemExit("glyphs must not be wider than 255 pixels")
+        offsets += len(bitmaps).to_bytes(2, "big")
+        bitmaps += encode_glyph(rows)
+    if len(bitmaps) > 0xFFFF:
+        raise SystemExit("font too large for 2 byte offsets")
+
+    def literal(name, data):
+        lines = [name + " = \\"]
+        for i in range(0, len(data), 16):
+            lines.append("    b'" + "".join("\\x%02x" % b for b in data[i:i + 16]) + "'\\")
+        lines[-1] = lines[-1][:-1]
+        return "\n".join(lines)
+
+    raw = sum((len(rows[0]) * height + 7) // 8 for rows in glyphs.values())
+    return "\n".join((
+        "# Generated by tools/rle_font.py from %s" % source,
+        "# %d glyphs, %d bytes run-length coded (%d bytes as 1 bpp bitmap)" % (
+            len(glyphs), len(bitmaps), raw),
+        "",
+        "RLE = 1",
+        "BPP = 1",
+        "MAP = %r" % chars,
+        "HEIGHT = %d" % height,
+        "MAX_WIDTH = %d" % max(widths),
+        "OFFSET_WIDTH = 2",
+        literal("WIDTHS", widths),
+        literal("OFFSETS", bytes(offsets)),
+        literal("BITMAPS", bytes(bitmaps)),
+        "",
+    ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    digits = sub.add_parser("digits", help="render seven-segment digits")
+    digits.add_argument("--width", type=int, default=24)
+    digits.add_argument("--height", type=int, default=40)
+    convert = sub.add_parser("convert", help="compress a fixed-width font module")
+    convert.add_argument("font", type=pathlib.Path)
+    convert.add_argument("--chars", default="".join(chr(c) for c in range(0x20, 0x7F)))
+    for p in (digits, convert):
+        p.add_argument("-o", "--output", type=pathlib.Path, required=True)
+    args = parser.parse_args()
+
+    if args.command == "digits":
+        glyphs = render_digits(args.width, args.height)
+        source = "digits --width %d --height %d" % (args.width, args.height)
+    else:
+        glyphs = load_fixed_font(args.font, args.chars)
+        source = args.font.name
+    args.output.write_text(font_module(glyphs, source), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
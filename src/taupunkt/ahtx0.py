@@ -1,5 +1,9 @@
 # AHT20 Treiber für MicroPython (vollständig)
 import time
+from crc8 import crc8
+
+# Messdauer laut Datenblatt [ms]
+_DAUER_MS = 80
 
 class AHT20:
     def __init__(self, i2c, address=0x38):
@@ -8,6 +12,10 @@ class AHT20:
         """
         self.i2c = i2c
         self.addr = address
+        # Status + 5 Datenbytes + CRC
+        self._buf = bytearray(7)
+        self.temp_raw = 0
+        self.hum_raw = 0
         self._init_sensor()
 
     def _init_sensor(self):
@@ -39,35 +47,74 @@ class AHT20:
         time.sleep(0.08)
 
     def _read(self):
+        """
+        Liest den 7-Byte-Rahmen (Status, 5 Datenbytes, CRC) in den Lesepuffer.
+        """
+        data = self._buf
         for _ in range(3):
             try:
-                data = self.i2c.readfrom(self.addr, 6)
-                if not (data[0] & 0x80):  # Busy-Bit prüfen
+                self.i2c.readfrom_into(self.addr, data)
+                # Busy-Bit und CRC über Status + Daten prüfen
+                if not (data[0] & 0x80) and crc8(data, 0, 6) == data[6]:
                     return data
                 time.sleep(0.01)
             except Exception:
                 time.sleep(0.01)
-        raise RuntimeError('AHT20 Antwortfehler oder Sensor busy')
+        raise RuntimeError('AHT20 Antwortfehler, CRC-Fehler oder Sensor busy')
+
+    def _collect_raw(self):
+        data = self._read()
+        self.hum_raw = ((data[1] << 16) | (data[2] << 8) | data[3]) >> 4
+        self.temp_raw = ((data[3] & 0x0F) << 16) | (data[4] << 8) | data[5]
+
+    def measure_raw(self):
+        """
+        Eine Wandlung für Temperatur und Feuchte. Die Rohwerte (20 Bit) stehen
+        danach in temp_raw und hum_raw (z. B. für taupunkt_fix.taupunkt_aht20).
+        """
+        self._trigger()
+        self._collect_raw()
+
+    def measurement(self):
+        """
+        Temperatur und Feuchte aus demselben Messrahmen (eine Wandlung, 80 ms).
+        :return: (Temperatur [°C], rel. Feuchte [%])
+        """
+        self.measure_raw()
+        return self.temp_raw * 200 / 1048576 - 50, self.hum_raw * 100 / 1048576
+
+    def start(self):
+        """
+        Startet eine Wandlung, ohne die 80 ms abzuwarten.
+        :return: time.ticks_ms()-Zeitpunkt, ab dem collect() das Ergebnis liefert
+        """
+        self.i2c.writeto(self.addr, b'\xAC\x33\x00')
+        return time.ticks_add(time.ticks_ms(), _DAUER_MS)
+
+    def collect(self):
+        """
+        Liest das Ergebnis der mit start() begonnenen Wandlung.
+        :return: (Temperatur [°C], rel. Feuchte [%])
+        :raises RuntimeError: bei CRC-Fehler oder wenn der Sensor noch busy ist
+        """
+        self._collect_raw()
+        return self.temp_raw * 200 / 1048576 - 50, self.hum_raw * 100 / 1048576
 
     @property
     def temperature(self):
         """
         Gibt die Temperatur in Grad Celsius zurück.
+        Für Temperatur und Feuchte zusammen measurement() verwenden.
         """
-        self._trigger()
-        data = self._read()
-        temp_raw = ((data[3] & 0x0F) << 16) | (data[4] << 8) | data[5]
-        return temp_raw * 200 / 1048576 - 50
+        return self.measurement()[0]
 
     @property
     def relative_humidity(self):
         """
         Gibt die relative Luftfeuchtigkeit in Prozent zurück.
+        Für Temperatur und Feuchte zusammen measurement() verwenden.
         """
-        self._trigger()
-        data = self._read()
-        hum_raw = ((data[1] << 16) | (data[2] << 8) | data[3]) >> 4
-        return hum_raw * 100 / 1048576
+        return self.measurement()[1]
 
     def reset(self):
         """
@@ -375,10 +375,46 @@ AXP20X_LED_BLINK_1HZ = 1
 AXP20X_LED_BLINK_4HZ = 2
 AXP20X_LED_LOW_LEVEL = 3
 
+# Multi-byte writes use X-Powers' register/value pair format, so one
+# transaction can clear all IRQ status registers (write 1 to clear)
+_AXP202_IRQ_CLEAR = bytes((AXP202_INTSTS1, 0xFF, AXP202_INTSTS2, 0xFF,
+                           AXP202_INTSTS3, 0xFF, AXP202_INTSTS4, 0xFF,
+                           AXP202_INTSTS5, 0xFF))
+_AXP192_IRQ_CLEAR = bytes((AXP192_INTSTS1, 0xFF, AXP192_INTSTS2, 0xFF,
+                           AXP192_INTSTS3, 0xFF, AXP192_INTSTS4, 0xFF,
+                           AXP192_INTSTS5, 0xFF))
+
+
+# Configuration registers kept in the optional shadow cache, as contiguous
+# (start, length) blocks so sync() needs one burst read per block:
+# power output control, DC-DC/LDO voltages, off/charge/PEK control,
+# IRQ enable 1-4 and ADC enable 1/2
+_SHADOW_BLOCKS = (
+    (AXP202_LDO234_DC23_CTL, 1),
+    (AXP202_DC2OUT_VOL, 7),
+    (AXP202_OFF_CTL, 5),
+    (AXP202_INTEN1, 4),
+    (AXP202_ADC_EN1, 2),
+)
+
+
+def _h8_l4(buf, i):
+    return (buf[i] << 4) | (buf[i + 1] & 0xF)
+
+
+def _h8_l5(buf, i):
+    return (buf[i] << 5) | (buf[i + 1] & 0x1F)
+
 
 class PMU(object):
     def __init__(self, i2c=None, scl=None, sda=None,
-                 intr=None, address=None):
+                 intr=None, address=None, shadow=False, verify=False):
+        """
+        :param shadow: cache the configuration registers (_SHADOW_BLOCKS) so
+                       setters write without reading the register back first
+        :param verify: debug mode, compare every cached value with the
+                       hardware before it is used and raise on a mismatch
+        """
         self.device = None
         self.bus = i2c
         if self.bus is None:
@@ -393,6 +429,18 @@ class PMU(object):
         self.bytebuf = memoryview(self.buffer[0:1])
         self.wordbuf = memoryview(self.buffer[0:2])
         self.irqbuf = memoryview(self.buffer[0:5])
+        # Views into self.buffer for the burst reads of snapshot()
+        bufview = memoryview(self.buffer)
+        self.adcbuf_acin = bufview[0:10]  # 0x56-0x5F
+        self.adcbuf_ts = bufview[0:6]     # 0x62-0x67
+        self.adcbuf_batt = bufview        # 0x70-0x7F
+        self.adcbuf_power = bufview[0:3]  # 0x70-0x72
+        self.coulombbuf = bufview[0:8]    # 0xB0-0xB7
+        self.irqbuf4 = self.irqbuf[0:4]
+
+        # register -> last value written or read; None = cache disabled
+        self.shadow = {} if shadow else None
+        self.verify = verify
 
         self.init_pins()
         if self.bus is None:
@@ -415,6 +463,73 @@ class PMU(object):
     def write_byte(self, reg, val):
         self.bytebuf[0] = val
         self.bus.writeto_mem(self.address, reg, self.bytebuf)
+        if self.shadow is not None and reg in self.shadow:
+            self.shadow[reg] = val & 0xFF
+
+    def read_config(self, reg):
+        """
+        Read a configuration register for read-modify-write. With the shadow
+        cache enabled this costs no bus transaction once the register is cached.
+        """
+        shadow = self.shadow
+        if shadow is None:
+            return self.read_byte(reg)
+        val = shadow.get(reg)
+        if val is None:
+            val = self.read_byte(reg)
+            if self._is_shadowed(reg):
+                shadow[reg] = val
+        elif self.verify:
+            hw = self.read_byte(reg)
+            if hw != val:
+                raise RuntimeError('PMU shadow mismatch at 0x%02X: cached 0x%02X, '
+                                   'hardware 0x%02X' % (reg, val, hw))
+        return val
+
+    def _is_shadowed(self, reg):
+        for start, length in _SHADOW_BLOCKS:
+            if start <= reg < start + length:
+                return True
+        return False
+
+    def sync(self):
+        """
+        (Re)load the shadow cache from the hardware, one burst read per block.
+        Needed after anything else changed the PMU registers, e.g. a reset.
+        """
+        if self.shadow is None:
+            return
+        buf = memoryview(self.buffer)
+        for start, length in _SHADOW_BLOCKS:
+            self.bus.readfrom_mem_into(self.address, start, buf[0:length])
+            for i in range(length):
+                self.shadow[start + i] = buf[i]
+
+    def invalidate(self, reg=None):
+        """
+        Drop one register (or all) from the shadow cache; the next access
+        reads it from the hardware again.
+        """
+        if self.shadow is None:
+            return
+        if reg is None:
+            self.shadow.clear()
+        else:
+            self.shadow.pop(reg, None)
+
+    def verify_shadow(self):
+        """
+        Compare the whole shadow cache with the hardware.
+        :return: dict register -> (cached, hardware) of all mismatches
+        """
+        mismatches = {}
+        if self.shadow is None:
+            return mismatches
+        for reg, val in self.shadow.items():
+            hw = self.read_byte(reg)
+            if hw != val:
+                mismatches[reg] = (val, hw)
+        return mismatches
 
     def read_byte(self, reg):
         self.bus.readfrom_mem_into(self.address, reg, self.bytebuf)
@@ -439,29 +554,29 @@ class PMU(object):
             self.chip = AXP192_CHIP_ID
         else:
             raise Exception("Invalid Chip ID!")
+        self.sync()
 
     def enablePower(self, ch):
-        data = self.read_byte(AXP202_LDO234_DC23_CTL)
+        data = self.read_config(AXP202_LDO234_DC23_CTL)
         data = data | (1 << ch)
         self.write_byte(AXP202_LDO234_DC23_CTL, data)
 
     def disablePower(self, ch):
-        data = self.read_byte(AXP202_LDO234_DC23_CTL)
+        data = self.read_config(AXP202_LDO234_DC23_CTL)
         data = data & (~(1 << ch))
         self.write_byte(AXP202_LDO234_DC23_CTL, data)
 
     def __BIT_MASK(self, mask):
         return 1 << mask
 
+    # H8/L4 register pairs are adjacent: one 2-byte read instead of two
     def __get_h8_l5(self, regh8, regl5):
-        hv = self.read_byte(regh8)
-        lv = self.read_byte(regl5)
-        return (hv << 5) | (lv & 0x1F)
+        self.bus.readfrom_mem_into(self.address, regh8, self.wordbuf)
+        return _h8_l5(self.wordbuf, 0)
 
     def __get_h8_l4(self, regh8, regl5):
-        hv = self.read_byte(regh8)
-        lv = self.read_byte(regl5)
-        return (hv << 4) | (lv & 0xF)
+        self.bus.readfrom_mem_into(self.address, regh8, self.wordbuf)
+        return _h8_l4(self.wordbuf, 0)
 
     def isChargeing(self):
         data = self.read_byte(AXP202_MODE_CHGSTATUS)
@@ -488,9 +603,8 @@ class PMU(object):
         return data * AXP202_VBUS_CUR_STEP
 
     def getTemp(self):
-        hv = self.read_byte(AXP202_INTERNAL_TEMP_H8)
-        lv = self.read_byte(AXP202_INTERNAL_TEMP_L4)
-        data = (hv << 8) | (lv & 0xF)
+        self.bus.readfrom_mem_into(self.address, AXP202_INTERNAL_TEMP_H8, self.wordbuf)
+        data = (self.wordbuf[0] << 8) | (self.wordbuf[1] & 0xF)
         return data / 1000
 
     def getTSTemp(self):
@@ -508,10 +622,9 @@ class PMU(object):
         return data * AXP202_GPIO1_STEP
 
     def getBattInpower(self):
-        h8 = self.read_byte(AXP202_BAT_POWERH8)
-        m8 = self.read_byte(AXP202_BAT_POWERM8)
-        l8 = self.read_byte(AXP202_BAT_POWERL8)
-        data = (h8 << 16) | (m8 << 8) | l8
+        buf = self.adcbuf_power
+        self.bus.readfrom_mem_into(self.address, AXP202_BAT_POWERH8, buf)
+        data = (buf[0] << 16) | (buf[1] << 8) | buf[2]
         return 2 * data * 1.1 * 0.5 / 1000
 
     def getBattVoltage(self):
@@ -534,97 +647,145 @@ class PMU(object):
         return data
 
     def getSysIPSOUTVoltage(self):
-        hv = self.read_byte(AXP202_APS_AVERVOL_H8)
-        lv = self.read_byte(AXP202_APS_AVERVOL_L4)
-        data = (hv << 4) | (lv & 0xF)
+        data = self.__get_h8_l4(AXP202_APS_AVERVOL_H8, AXP202_APS_AVERVOL_L4)
         return data
 
+    def snapshot(self):
+        """
+        Read all ADC channels with three burst reads of the contiguous
+        register blocks 0x56-0x5F, 0x62-0x67 and 0x70-0x7F into self.buffer.
+        Calling the 13 getters one by one used to take 27 single-byte
+        transactions; with one read per getter it is still 13.
+        Values are decoded exactly like the matching get*() methods.
+        :return: dict of channel values
+        """
+        bus = self.bus
+        addr = self.address
+        buf = self.buffer
+
+        bus.readfrom_mem_into(addr, AXP202_ACIN_VOL_H8, self.adcbuf_acin)
+        acin_voltage = _h8_l4(buf, 0) * AXP202_ACIN_VOLTAGE_STEP
+        acin_current = _h8_l4(buf, 2) * AXP202_ACIN_CUR_STEP
+        vbus_voltage = _h8_l4(buf, 4) * AXP202_VBUS_VOLTAGE_STEP
+        vbus_current = _h8_l4(buf, 6) * AXP202_VBUS_CUR_STEP
+        temp = ((buf[8] << 8) | (buf[9] & 0xF)) / 1000
+
+        bus.readfrom_mem_into(addr, AXP202_TS_IN_H8, self.adcbuf_ts)
+        ts_temp = _h8_l4(buf, 0) * AXP202_TS_PIN_OUT_STEP
+        gpio0_voltage = _h8_l4(buf, 2) * AXP202_GPIO0_STEP
+        gpio1_voltage = _h8_l4(buf, 4) * AXP202_GPIO1_STEP
+
+        bus.readfrom_mem_into(addr, AXP202_BAT_POWERH8, self.adcbuf_batt)
+        batt_inpower = 2 * ((buf[0] << 16) | (buf[1] << 8) | buf[2]) * 1.1 * 0.5 / 1000
+        batt_voltage = _h8_l4(buf, 8) * AXP202_BATT_VOLTAGE_STEP
+        if self.chip == AXP202_CHIP_ID:
+            batt_charge_current = _h8_l4(buf, 10) * AXP202_BATT_CHARGE_CUR_STEP
+        elif self.chip == AXP192_CHIP_ID:
+            batt_charge_current = _h8_l5(buf, 10) * AXP202_BATT_CHARGE_CUR_STEP
+        else:
+            batt_charge_current = 0
+        batt_discharge_current = _h8_l4(buf, 12) * AXP202_BATT_DISCHARGE_CUR_STEP
+        ips_out_voltage = _h8_l4(buf, 14)
+
+        return {
+            'acin_voltage': acin_voltage,
+            'acin_current': acin_current,
+            'vbus_voltage': vbus_voltage,
+            'vbus_current': vbus_current,
+            'temp': temp,
+            'ts_temp': ts_temp,
+            'gpio0_voltage': gpio0_voltage,
+            'gpio1_voltage': gpio1_voltage,
+            'batt_inpower': batt_inpower,
+            'batt_voltage': batt_voltage,
+            'batt_charge_current': batt_charge_current,
+            'batt_discharge_current': batt_discharge_current,
+            'ips_out_voltage': ips_out_voltage,
+        }
+
     def enableADC(self, ch, val):
         if(ch == 1):
-            data = self.read_byte(AXP202_ADC_EN1)
+            data = self.read_config(AXP202_ADC_EN1)
             data = data | (1 << val)
             self.write_byte(AXP202_ADC_EN1, data)
         elif(ch == 2):
-            data = self.read_byte(AXP202_ADC_EN2)
+            data = self.read_config(AXP202_ADC_EN2)
             data = data | (1 << val)
-            self.write_byte(AXP202_ADC_EN1, data)
+            self.write_byte(AXP202_ADC_EN2, data)
         else:
             return
 
     def disableADC(self, ch, val):
         if(ch == 1):
-            data = self.read_byte(AXP202_ADC_EN1)
+            data = self.read_config(AXP202_ADC_EN1)
             data = data & (~(1 << val))
             self.write_byte(AXP202_ADC_EN1, data)
         elif(ch == 2):
-            data = self.read_byte(AXP202_ADC_EN2)
+            data = self.read_config(AXP202_ADC_EN2)
             data = data & (~(1 << val))
-            self.write_byte(AXP202_ADC_EN1, data)
+            self.write_byte(AXP202_ADC_EN2, data)
         else:
             return
 
     def enableIRQ(self, val):
         if(val & 0xFF):
-            data = self.read_byte(AXP202_INTEN1)
+            data = self.read_config(AXP202_INTEN1)
             data = data | (val & 0xFF)
             self.write_byte(AXP202_INTEN1, data)
 
         if(val & 0xFF00):
-            data = self.read_byte(AXP202_INTEN2)
+            data = self.read_config(AXP202_INTEN2)
             data = data | (val >> 8)
             self.write_byte(AXP202_INTEN2, data)
 
         if(val & 0xFF0000):
-            data = self.read_byte(AXP202_INTEN3)
+            data = self.read_config(AXP202_INTEN3)
             data = data | (val >> 16)
             self.write_byte(AXP202_INTEN3, data)
 
         if(val & 0xFF000000):
-            data = self.read_byte(AXP202_INTEN4)
+            data = self.read_config(AXP202_INTEN4)
             data = data | (val >> 24)
             self.write_byte(AXP202_INTEN4, data)
 
     def disableIRQ(self, val):
         if(val & 0xFF):
-            data = self.read_byte(AXP202_INTEN1)
+            data = self.read_config(AXP202_INTEN1)
             data = data & (~(val & 0xFF))
             self.write_byte(AXP202_INTEN1, data)
 
         if(val & 0xFF00):
-            data = self.read_byte(AXP202_INTEN2)
+            data = self.read_config(AXP202_INTEN2)
             data = data & (~(val >> 8))
             self.write_byte(AXP202_INTEN2, data)
 
         if(val & 0xFF0000):
-            data = self.read_byte(AXP202_INTEN3)
+            data = self.read_config(AXP202_INTEN3)
             data = data & (~(val >> 16))
             self.write_byte(AXP202_INTEN3, data)
 
         if(val & 0xFF000000):
-            data = self.read_byte(AXP202_INTEN4)
+            data = self.read_config(AXP202_INTEN4)
             data = data & (~(val >> 24))
             self.write_byte(AXP202_INTEN4, data)
         pass
 
     def readIRQ(self):
+        # AXP202: 1 burst read instead of 5, AXP192: 2 instead of 5
         if(self.chip == AXP202_CHIP_ID):
-            for i in range(5):
-                self.irqbuf[i] = self.read_byte(AXP202_INTSTS1 + i)
+            self.bus.readfrom_mem_into(self.address, AXP202_INTSTS1, self.irqbuf)
         elif(self.chip == AXP192_CHIP_ID):
-            for i in range(4):
-                self.irqbuf[i] = self.read_byte(AXP192_INTSTS1 + i)
-
+            self.bus.readfrom_mem_into(self.address, AXP192_INTSTS1, self.irqbuf4)
             self.irqbuf[4] = self.read_byte(AXP192_INTSTS5)
 
     def clearIRQ(self):
+        # 1 write transaction instead of 5
         if(self.chip == AXP202_CHIP_ID):
-            for i in range(5):
-                self.write_byte(AXP202_INTSTS1 + i, 0xFF)
-                self.irqbuf[i] = 0
+            self.bus.writeto(self.address, _AXP202_IRQ_CLEAR)
         elif(self.chip == AXP192_CHIP_ID):
-            for i in range(4):
-                self.write_byte(AXP192_INTSTS1 + i, 0xFF)
-            self.write_byte(AXP192_INTSTS5, 0xFF)
+            self.bus.writeto(self.address, _AXP192_IRQ_CLEAR)
+        for i in range(5):
+            self.irqbuf[i] = 0
 
     def isVBUSPlug(self):
         data = self.read_byte(AXP202_STATUS)
@@ -663,7 +824,7 @@ class PMU(object):
         elif(mv > 3300):
             mv = 3300
         val = (mv - 1800) / 100
-        prev = self.read_byte(AXP202_LDO24OUT_VOL)
+        prev = self.read_config(AXP202_LDO24OUT_VOL)
         prev &= 0x0F
         prev = prev | (int(val) << 4)
         self.write_byte(AXP202_LDO24OUT_VOL, int(prev))
@@ -681,20 +842,20 @@ class PMU(object):
 
         if self.chip == AXP202_CHIP_ID:
             val = (mv - 700) / 25
-            prev = self.read_byte(AXP202_LDO3OUT_VOL)
+            prev = self.read_config(AXP202_LDO3OUT_VOL)
             prev &= 0x80
             prev = prev | int(val)
             self.write_byte(AXP202_LDO3OUT_VOL, int(prev))
             # self.write_byte(AXP202_LDO3OUT_VOL, int(val))
         elif self.chip == AXP192_CHIP_ID:
             val = (mv - 1800) / 100
-            prev = self.read_byte(AXP192_LDO23OUT_VOL)
+            prev = self.read_config(AXP192_LDO23OUT_VOL)
             prev &= 0xF0
             prev = prev | int(val)
             self.write_byte(AXP192_LDO23OUT_VOL, int(prev))
 
     def setLDO4Voltage(self, arg):
-        data = self.read_byte(AXP202_LDO24OUT_VOL)
+        data = self.read_config(AXP202_LDO24OUT_VOL)
         data = data & 0xF0
         data = data | arg
         self.write_byte(AXP202_LDO24OUT_VOL, data)
@@ -702,7 +863,7 @@ class PMU(object):
     def setLDO3Mode(self, mode):
         if(mode > AXP202_LDO3_DCIN_MODE):
             return
-        data = self.read_byte(AXP202_LDO3OUT_VOL)
+        data = self.read_config(AXP202_LDO3OUT_VOL)
         if(mode):
             data = data | self.__BIT_MASK(7)
         else:
@@ -717,7 +878,7 @@ class PMU(object):
             0b11000000)
         if(val > AXP202_STARTUP_TIME_2S):
             return
-        data = self.read_byte(AXP202_POK_SET)
+        data = self.read_config(AXP202_POK_SET)
         data = data & (~startupParams[3])
         data = data | startupParams[val]
         self.write_byte(AXP202_POK_SET, data)
@@ -730,7 +891,7 @@ class PMU(object):
             0b00110000)
         if(val > AXP202_LONGPRESS_TIME_2S5):
             return
-        data = self.read_byte(AXP202_POK_SET)
+        data = self.read_config(AXP202_POK_SET)
         data = data & (~longPressParams[3])
         data = data | longPressParams[val]
         self.write_byte(AXP202_POK_SET, data)
@@ -743,13 +904,13 @@ class PMU(object):
             0b00000011)
         if(val > AXP202_SHUTDOWN_TIME_10S):
             return
-        data = self.read_byte(AXP202_POK_SET)
+        data = self.read_config(AXP202_POK_SET)
         data = data & (~shutdownParams[3])
         data = data | shutdownParams[val]
         self.write_byte(AXP202_POK_SET, data)
 
     def setTimeOutShutdown(self, en):
-        data = self.read_byte(AXP202_POK_SET)
+        data = self.read_config(AXP202_POK_SET)
         if(en):
             data = data | self.__BIT_MASK(3)
         else:
@@ -757,24 +918,24 @@ class PMU(object):
         self.write_byte(AXP202_POK_SET, data)
 
     def shutdown(self):
-        data = self.read_byte(AXP202_OFF_CTL)
+        data = self.read_config(AXP202_OFF_CTL)
         data = data | self.__BIT_MASK(7)
         self.write_byte(AXP202_OFF_CTL, data)
 
     def getSettingChargeCurrent(self):
-        data = self.read_byte(AXP202_CHARGE1)
+        data = self.read_config(AXP202_CHARGE1)
         data = data & 0b00000111
         curr = 300 + data * 100
         return curr
 
     def isChargeingEnable(self):
-        data = self.read_byte(AXP202_CHARGE1)
+        data = self.read_config(AXP202_CHARGE1)
         if(data & self.__BIT_MASK(7)):
             return True
         return False
 
     def enableChargeing(self):
-        data = self.read_byte(AXP202_CHARGE1)
+        data = self.read_config(AXP202_CHARGE1)
         data = data | self.__BIT_MASK(7)
         self.write_byte(AXP202_CHARGE1, data)
 
@@ -786,11 +947,44 @@ class PMU(object):
             0b01100000)
         if(val > AXP202_TARGET_VOL_4_36V):
             return
-        data = self.read_byte(AXP202_CHARGE1)
+        data = self.read_config(AXP202_CHARGE1)
         data = data & (~targetVolParams[3])
         data = data | targetVolParams[val]
         self.write_byte(AXP202_CHARGE1, data)
 
+    def enableCoulombcounter(self):
+        self.write_byte(AXP202_COULOMB_CTL, 0x80)
+
+    def disableCoulombcounter(self):
+        self.write_byte(AXP202_COULOMB_CTL, 0x00)
+
+    def stopCoulombcounter(self):
+        self.write_byte(AXP202_COULOMB_CTL, 0xC0)
+
+    def clearCoulombcounter(self):
+        self.write_byte(AXP202_COULOMB_CTL, 0xA0)
+
+    def getAdcSamplingRate(self):
+        # 25, 50, 100 or 200 Hz
+        data = self.read_config(AXP202_ADC_SPEED)
+        return 25 * (1 << ((data & 0xC0) >> 6))
+
+    def getCoulombCounters(self):
+        """
+        Read the charge and discharge counters (0xB0-0xB7) in one burst.
+        :return: (charge, discharge) raw counts
+        """
+        self.bus.readfrom_mem_into(self.address, AXP202_BAT_CHGCOULOMB3, self.coulombbuf)
+        return unpack('>II', self.coulombbuf)
+
+    def getCoulombData(self):
+        """
+        Net charge since the counter was cleared, positive while charging.
+        :return: mAh
+        """
+        charge, discharge = self.getCoulombCounters()
+        return 65536 * 0.5 * (charge - discharge) / 3600 / self.getAdcSamplingRate()
+
     def getBattPercentage(self):
         data = self.read_byte(AXP202_BATT_PERCENTAGE)
         mask = data & self.__BIT_MASK(7)
@@ -799,12 +993,12 @@ class PMU(object):
         return data & (~self.__BIT_MASK(7))
 
     def setChgLEDChgControl(self):
-        data = self.read_byte(AXP202_OFF_CTL)
+        data = self.read_config(AXP202_OFF_CTL)
         data = data & 0b111110111
         self.write_byte(AXP202_OFF_CTL, data)
 
     def setChgLEDMode(self, mode):
-        data = self.read_byte(AXP202_OFF_CTL)
+        data = self.read_config(AXP202_OFF_CTL)
         data |= self.__BIT_MASK(3)
         if(mode == AXP20X_LED_OFF):
             data = data & 0b11001111
@@ -0,0 +1,76 @@
+# Vektorisierte Taupunktberechnung für die Auswertung auf dem Host
+# Gleiche Magnus-Formel und Ampel-Logik wie berechne_taupunkt/entscheide_lueften,
+# aber für ganze Messreihen (NumPy-Arrays oder beliebige Puffer) in einem Durchlauf.
+# Nur für CPython gedacht – auf dem Pico gibt es kein NumPy.
+
+import numpy as np
+
+from psychrometrie import MAGNUS
+
+# Magnus-Formel Konstanten (identisch zu berechne_taupunkt)
+MAGNUS_A = MAGNUS.a
+MAGNUS_B = MAGNUS.b
+
+# Taupunktgrenze (identisch zu TAUPUNKT_GRENZE in main.py)
+TAUPUNKT_GRENZE = 2.0
+
+# Statuscodes der Ampel
+UNGUELTIG = -1
+GRUEN = 0
+GELB = 1
+ROT = 2
+
+STATUS_NAMEN = {
+    UNGUELTIG: "ungueltig",
+    GRUEN: "gruen",
+    GELB: "gelb",
+    ROT: "rot",
+}
+
+
+def berechne_taupunkt(temp, rh):
+    """
+    Berechnet den Taupunkt für ganze Messreihen.
+    Liefert dieselben Zahlen wie die skalare Funktion berechne_taupunkt.
+    Für RH <= 0 oder NaN-Eingaben wird NaN zurückgegeben statt eine Ausnahme zu werfen.
+    :param temp: Temperaturen [°C] (Array, Liste oder Puffer)
+    :param rh: rel. Feuchten [%] (Array, Liste oder Puffer)
+    :return: Taupunkte [°C] als float64-Array
+    """
+    temp = np.asarray(temp, dtype=np.float64)
+    rh = np.asarray(rh, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        alpha = ((MAGNUS_A * temp) / (MAGNUS_B + temp)) + np.log(rh / 100.0)
+        tp = (MAGNUS_B * alpha) / (MAGNUS_A - alpha)
+    return np.where(rh > 0, tp, np.nan)
+
+
+def entscheide(tp_innen, tp_aussen, grenze=TAUPUNKT_GRENZE):
+    """
+    Trifft die Lüftungsentscheidung für ganze Messreihen.
+    Gleiche Reihenfolge der Bedingungen wie entscheide_lueften.
+    :param tp_innen: Taupunkte innen [°C]
+    :param tp_aussen: Taupunkte außen [°C]
+    :param grenze: Taupunktgrenze [K]
+    :return: int8-Array mit GRUEN, GELB, ROT oder UNGUELTIG (NaN-Eingaben)
+    """
+    tp_innen = np.asarray(tp_innen, dtype=np.float64)
+    tp_aussen = np.asarray(tp_aussen, dtype=np.float64)
+    ungueltig = np.isnan(tp_innen) | np.isnan(tp_aussen)
+    status = np.select(
+        [ungueltig, tp_aussen < (tp_innen - grenze), tp_aussen >= tp_innen],
+        [UNGUELTIG, GRUEN, ROT],
+        default=GELB,
+    )
+    return status.astype(np.int8)
+
+
+def werte_aus(innen_t, innen_rh, aussen_t, aussen_rh, grenze=TAUPUNKT_GRENZE):
+    """
+    Berechnet beide Taupunkte und die Ampel in einem vektorisierten Durchlauf.
+    Die Eingaben werden nach den NumPy-Regeln gebroadcastet, z. B. (Geräte, Messungen).
+    :return: (tp_innen, tp_aussen, status)
+    """
+    tp_innen = berechne_taupunkt(innen_t, innen_rh)
+    tp_aussen = berechne_taupunkt(aussen_t, aussen_rh)
+    return tp_innen, tp_aussen, entscheide(tp_innen, tp_aussen, grenze)
@@ -2,30 +2,111 @@
 import time
 import struct
 
+# Registeradressen
+_REG_CALIB = 0x88
+_REG_CTRL_MEAS = 0xF4
+_REG_CONFIG = 0xF5
+_REG_DATA = 0xF7
+
+_MODE_FORCED = 0x01
+_MODE_NORMAL = 0x03
+
+# Standby 1000 ms zwischen zwei Messungen im Normal-Modus
+_T_SB_1000MS = 0x05
+
+# Registercodes für Oversampling (x0..x16) und IIR-Filterkoeffizient
+_OSRS = {0: 0, 1: 1, 2: 2, 4: 3, 8: 4, 16: 5}
+_IIR = {0: 0, 2: 1, 4: 2, 8: 3, 16: 4}
+
+# Profile nach Datenblatt Tab. 4/7: (Oversampling T, Oversampling p, IIR-Filter)
+PROFILES = {
+    'ultra_low_power': (1, 1, 0),       # Wetterstation, bisherige Einstellung
+    'low_power': (1, 2, 0),
+    'standard': (1, 4, 4),
+    'high_resolution': (1, 8, 4),
+    'ultra_high_resolution': (2, 16, 16),
+}
+
+# Konstante Summanden der 64-Bit-Druckkompensation (einmalig angelegt)
+_P_OFFSET = 1 << 47
+
+
+def measurement_time_ms(osrs_t, osrs_p):
+    """
+    Maximale Messdauer laut Datenblatt Kap. 9.1, aufgerundet.
+    :param osrs_t: Oversampling Temperatur (0, 1, 2, 4, 8, 16)
+    :param osrs_p: Oversampling Druck (0, 1, 2, 4, 8, 16)
+    :return: Messdauer [ms]
+    """
+    us = 1250 + 2300 * osrs_t
+    if osrs_p:
+        us += 2300 * osrs_p + 575
+    return (us + 999) // 1000
+
+
 class BMP280:
-    def __init__(self, i2c, addr=0x76):
+    def __init__(self, i2c, addr=0x76, forced=False, profile='ultra_low_power',
+                 use_float=False):
+        """
+        Initialisiert den BMP280 und liest die Kalibrierdaten.
+        :param i2c: I2C-Objekt
+        :param addr: I2C-Adresse (Standard: 0x76)
+        :param forced: True = Forced-Modus, der Sensor misst nur nach start()
+                       und ruht dazwischen; False = fortlaufender Normal-Modus
+        :param profile: Schlüssel aus PROFILES
+        :param use_float: Gleitkomma-Kompensation des Datenblatts statt der
+                          64-Bit-Ganzzahlrechnung
+        """
         self.i2c = i2c
         self.addr = addr
-        self.i2c.writeto_mem(self.addr, 0xF4, b'\x27')  # Normal mode, temp and pressure
-        self.i2c.writeto_mem(self.addr, 0xF5, b'\xA0')  # Config
+        self.forced = forced
+        self.use_float = use_float
+        osrs_t, osrs_p, iir = PROFILES[profile]
+        self.duration_ms = measurement_time_ms(osrs_t, osrs_p)
+        self._ctrl = (_OSRS[osrs_t] << 5) | (_OSRS[osrs_p] << 2)
+        # Vorab angelegte Puffer: Register schreiben und Messwerte lesen
+        # erzeugen keine Heap-Objekte
+        self._reg = bytearray(1)
+        self._buf = bytearray(6)
+        self._write_reg(_REG_CTRL_MEAS, self._ctrl | (0 if forced else _MODE_NORMAL))
+        self._write_reg(_REG_CONFIG, (_T_SB_1000MS << 5) | (_IIR[iir] << 2))
         # Kalibrierdaten auslesen
-        calib = self.i2c.readfrom_mem(self.addr, 0x88, 24)
-        self.dig_T1 = struct.unpack('<H', calib[0:2])[0]
-        self.dig_T2 = struct.unpack('<h', calib[2:4])[0]
-        self.dig_T3 = struct.unpack('<h', calib[4:6])[0]
-        self.dig_P1 = struct.unpack('<H', calib[6:8])[0]
-        self.dig_P2 = struct.unpack('<h', calib[8:10])[0]
-        self.dig_P3 = struct.unpack('<h', calib[10:12])[0]
-        self.dig_P4 = struct.unpack('<h', calib[12:14])[0]
-        self.dig_P5 = struct.unpack('<h', calib[14:16])[0]
-        self.dig_P6 = struct.unpack('<h', calib[16:18])[0]
-        self.dig_P7 = struct.unpack('<h', calib[18:20])[0]
-        self.dig_P8 = struct.unpack('<h', calib[20:22])[0]
-        self.dig_P9 = struct.unpack('<h', calib[22:24])[0]
+        calib = self.i2c.readfrom_mem(self.addr, _REG_CALIB, 24)
+        (self.dig_T1, self.dig_T2, self.dig_T3,
+         self.dig_P1, self.dig_P2, self.dig_P3, self.dig_P4, self.dig_P5,
+         self.dig_P6, self.dig_P7, self.dig_P8, self.dig_P9) = struct.unpack(
+            '<HhhHhhhhhhhh', calib)
+        # Konstante Teilterme der Druckkompensation vorberechnen
+        self._p4_35 = self.dig_P4 << 35
+        self._p7_4 = self.dig_P7 << 4
+        self._init_float()
         self.t_fine = 0
+        self._t_fine_float = 0.0
+
+    def _init_float(self):
+        """
+        Skalierte Koeffizienten für die Gleitkomma-Kompensation.
+        """
+        self._ft1a = self.dig_T1 / 1024.0
+        self._ft1b = self.dig_T1 / 8192.0
+        self._fp6 = self.dig_P6 / 32768.0
+        self._fp5 = self.dig_P5 * 2.0
+        self._fp4 = self.dig_P4 * 65536.0
+        self._fp3 = self.dig_P3 / 524288.0
+        self._fp9 = self.dig_P9 / 2147483648.0
+        self._fp8 = self.dig_P8 / 32768.0
+
+    def _write_reg(self, reg, val):
+        self._reg[0] = val
+        self.i2c.writeto_mem(self.addr, reg, self._reg)
 
     def _read_raw_data(self):
-        data = self.i2c.readfrom_mem(self.addr, 0xF7, 6)
+        """
+        Liest Druck und Temperatur in einem 6-Byte-Burst.
+        :return: (adc_t, adc_p)
+        """
+        data = self._buf
+        self.i2c.readfrom_mem_into(self.addr, _REG_DATA, data)
         adc_p = (data[0] << 12) | (data[1] << 4) | (data[2] >> 4)
         adc_t = (data[3] << 12) | (data[4] << 4) | (data[5] >> 4)
         return adc_t, adc_p
@@ -38,28 +119,115 @@ class BMP280:
         return T / 100.0
 
     def _compensate_pressure(self, adc_P):
+        """
+        64-Bit-Ganzzahlkompensation des Datenblatts (Ergebnis in Pa/256).
+        Die Zwischenwerte brauchen bis zu 64 Bit und sind auf MicroPython
+        lange Ganzzahlen; var1² und die konstanten Terme werden daher nur
+        einmal gebildet.
+        """
         var1 = self.t_fine - 128000
-        var2 = var1 * var1 * self.dig_P6
-        var2 = var2 + ((var1 * self.dig_P5) << 17)
-        var2 = var2 + (self.dig_P4 << 35)
-        var1 = ((var1 * var1 * self.dig_P3) >> 8) + ((var1 * self.dig_P2) << 12)
-        var1 = (((1 << 47) + var1) * self.dig_P1) >> 33
+        var1_2 = var1 * var1
+        var2 = var1_2 * self.dig_P6 + ((var1 * self.dig_P5) << 17) + self._p4_35
+        var1 = ((var1_2 * self.dig_P3) >> 8) + ((var1 * self.dig_P2) << 12)
+        var1 = ((_P_OFFSET + var1) * self.dig_P1) >> 33
         if var1 == 0:
             return 0  # Vermeide Division durch 0
         p = 1048576 - adc_P
         p = ((p << 31) - var2) * 3125 // var1
-        var1 = (self.dig_P9 * (p >> 13) * (p >> 13)) >> 25
+        p13 = p >> 13
+        var1 = (self.dig_P9 * p13 * p13) >> 25
         var2 = (self.dig_P8 * p) >> 19
-        p = ((p + var1 + var2) >> 8) + (self.dig_P7 << 4)
+        p = ((p + var1 + var2) >> 8) + self._p7_4
         return p / 25600.0  # hPa
 
+    def _compensate_temperature_float(self, adc_T):
+        """
+        Gleitkomma-Variante des Datenblatts (Kap. 8.1).
+        """
+        var1 = (adc_T / 16384.0 - self._ft1a) * self.dig_T2
+        var2 = adc_T / 131072.0 - self._ft1b
+        var2 = var2 * var2 * self.dig_T3
+        t_fine = var1 + var2
+        self.t_fine = int(t_fine)
+        self._t_fine_float = t_fine
+        return t_fine / 5120.0
+
+    def _compensate_pressure_float(self, adc_P):
+        """
+        Gleitkomma-Variante des Datenblatts (Kap. 8.1), Ergebnis in hPa.
+        """
+        var1 = self._t_fine_float / 2.0 - 64000.0
+        var2 = var1 * var1 * self._fp6 + var1 * self._fp5
+        var2 = var2 / 4.0 + self._fp4
+        var1 = (self._fp3 * var1 * var1 + self.dig_P2 * var1) / 524288.0
+        var1 = (1.0 + var1 / 32768.0) * self.dig_P1
+        if var1 == 0.0:
+            return 0  # Vermeide Division durch 0
+        p = 1048576.0 - adc_P
+        p = (p - var2 / 4096.0) * 6250.0 / var1
+        var1 = self._fp9 * p * p
+        var2 = p * self._fp8
+        p = p + (var1 + var2 + self.dig_P7) / 16.0
+        return p / 100.0
+
+    def start(self):
+        """
+        Startet im Forced-Modus eine Messung. Im Normal-Modus misst der Sensor
+        fortlaufend, das letzte Ergebnis steht sofort bereit.
+        :return: time.ticks_ms()-Zeitpunkt, ab dem collect() das Ergebnis liefert
+        """
+        if not self.forced:
+            return time.ticks_ms()
+        self._write_reg(_REG_CTRL_MEAS, self._ctrl | _MODE_FORCED)
+        return time.ticks_add(time.ticks_ms(), self.duration_ms)
+
+    def collect(self):
+        """
+        Liest Temperatur und Druck aus demselben Datenrahmen.
+        :return: (Temperatur [°C], Luftdruck [hPa])
+        """
+        adc_t, adc_p = self._read_raw_data()
+        if self.use_float:
+            temp = self._compensate_temperature_float(adc_t)
+            return temp, self._compensate_pressure_float(adc_p)
+        temp = self._compensate_temperature(adc_t)
+        return temp, self._compensate_pressure(adc_p)
+
+    def sleep(self):
+        """
+        Schaltet den Sensor in den Sleep-Modus (ca. 0,1 µA). Im Forced-Modus
+        ruht er nach jeder Messung ohnehin; der Normal-Modus misst erst nach
+        wake() wieder.
+        """
+        self._write_reg(_REG_CTRL_MEAS, self._ctrl)
+
+    def wake(self):
+        """
+        Nimmt nach sleep() den fortlaufenden Normal-Modus wieder auf.
+        """
+        if not self.forced:
+            self._write_reg(_REG_CTRL_MEAS, self._ctrl | _MODE_NORMAL)
+
+    def measurement(self):
+        """
+        Temperatur und Druck aus einer Messung (im Forced-Modus wird gewartet).
+        :return: (Temperatur [°C], Luftdruck [hPa])
+        """
+        if self.forced:
+            self.start()
+            time.sleep_ms(self.duration_ms)
+        return self.collect()
+
     @property
     def temperature(self):
-        adc_t, _ = self._read_raw_data()
-        return self._compensate_temperature(adc_t)
+        """
+        Für Temperatur und Druck zusammen measurement() verwenden.
+        """
+        return self.measurement()[0]
 
     @property
     def pressure(self):
-        adc_t, adc_p = self._read_raw_data()
-        self._compensate_temperature(adc_t)  # t_fine aktualisieren
-        return self._compensate_pressure(adc_p)
\ No newline at end of file
+        """
+        Für Temperatur und Druck zusammen measurement() verwenden.
+        """
+        return self.measurement()[1]
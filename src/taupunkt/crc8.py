@@ -0,0 +1,52 @@
+# CRC-8 für Sensirion (SHT4x) und Aosong (AHT20)
+# Polynom 0x31 (x^8 + x^5 + x^4 + 1), Startwert 0xFF, keine Endinvertierung.
+# Tabellengesteuert: ein Tabellenzugriff pro Byte statt 8 Schiebeschritten.
+
+
+def crc8_bitweise(data):
+    """
+    Referenzimplementierung, bitweise.
+    :param data: Bytes
+    :return: CRC8-Wert
+    """
+    crc = 0xFF
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            if crc & 0x80:
+                crc = (crc << 1) ^ 0x31
+            else:
+                crc <<= 1
+            crc &= 0xFF
+    return crc
+
+
+def _erzeuge_tabelle():
+    tabelle = bytearray(256)
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            if crc & 0x80:
+                crc = ((crc << 1) ^ 0x31) & 0xFF
+            else:
+                crc = (crc << 1) & 0xFF
+        tabelle[i] = crc
+    return bytes(tabelle)
+
+
+TABELLE = _erzeuge_tabelle()
+
+
+def crc8(buf, start=0, laenge=2):
+    """
+    CRC8 über buf[start:start+laenge], ohne Slice und ohne Allokation.
+    :param buf: bytes, bytearray oder memoryview
+    :param start: Index des ersten Bytes
+    :param laenge: Anzahl Bytes
+    :return: CRC8-Wert
+    """
+    tabelle = TABELLE
+    crc = 0xFF
+    for i in range(start, start + laenge):
+        crc = tabelle[crc ^ buf[i]]
+    return crc
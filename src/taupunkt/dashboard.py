@@ -0,0 +1,268 @@
+# Retained-Mode-Dashboard für das ST7789
+# Die Widgets merken sich, was sie zuletzt gezeichnet haben, und zeichnen nur
+# neu, wenn sich formatierter Text oder Farbe geändert haben – jeweils
+# begrenzt auf ihr eigenes Rechteck. Statt eines vollen Bildes (110 KB) gehen
+# im Dauerbetrieb nur die geänderten Zeichen über den SPI-Bus.
+# Braucht nur ein tft-Objekt mit fill/fill_rect/text und ein Bitmap-Font-Modul
+# (WIDTH, HEIGHT), läuft also auch mit Attrappen auf dem Host. Statt des
+# Displays kann auch ein rahmenpuffer.Palettenpuffer übergeben werden.
+
+import rlefont
+
+# Fensterbefehle je Zeichenaufruf: CASET, RASET, RAMWR + 2x4 Parameterbytes
+_FENSTER_BYTES = 11
+
+
+def _text(tft, font, text, x, y, farbe, hintergrund):
+    """
+    Zeichnet Text und liefert die gesendeten Bytes. text_block() des
+    C-Treibers schickt den ganzen Text durch ein Fenster, text() setzt für
+    jedes Zeichen ein eigenes.
+    """
+    pixel = len(text) * font.WIDTH * font.HEIGHT * 2
+    if hasattr(tft, 'text_block'):
+        tft.text_block(font, text, x, y, farbe, hintergrund)
+        return pixel + _FENSTER_BYTES
+    tft.text(font, text, x, y, farbe, hintergrund)
+    return pixel + len(text) * _FENSTER_BYTES
+
+
+def _fill_rect(tft, x, y, breite, hoehe, farbe):
+    """
+    Füllt ein Rechteck und liefert die gesendeten Bytes.
+    """
+    tft.fill_rect(x, y, breite, hoehe, farbe)
+    return breite * hoehe * 2 + _FENSTER_BYTES
+
+
+class Wertfeld:
+    """
+    Textfeld fester Breite (in Zeichen). Bei gleicher Farbe werden nur die
+    Zeichen neu gezeichnet, die sich gegenüber dem letzten Stand geändert
+    haben; zu lange Texte werden am Feldrand abgeschnitten.
+    """
+
+    def __init__(self, x, y, zeichen, format='{}', farbe=0xFFFF, hintergrund=0):
+        self.x = x
+        self.y = y
+        self.zeichen = zeichen
+        self.format = format
+        self.farbe = farbe
+        self.hintergrund = hintergrund
+        self._text = ''
+        self._gezeichnet = None  # (text, farbe) auf dem Panel, None = unbekannt
+
+    def setze(self, wert, farbe=None):
+        """
+        :param wert: wird mit format formatiert
+        :param farbe: neue Vordergrundfarbe oder None für unverändert
+        """
+        self._text = self.format.format(wert)[:self.zeichen]
+        if farbe is not None:
+            self.farbe = farbe
+
+    def invalidiere(self):
+        self._gezeichnet = None
+
+    def geloescht(self):
+        """
+        Das Feld ist leer (Panel mit Hintergrundfarbe gefüllt).
+        """
+        self._gezeichnet = ('', None)
+
+    def zeichne(self, tft, font):
+        """
+        :return: an das Panel gesendete Bytes (0, wenn nichts geändert)
+        """
+        text = self._text
+        if self._gezeichnet == (text, self.farbe):
+            return 0
+        w = font.WIDTH
+        gesendet = 0
+        # Vorher belegte Zeichen; unbekannt = ganzes Feld
+        alt_laenge = self.zeichen if self._gezeichnet is None else len(self._gezeichnet[0])
+        if self._gezeichnet is None or self._gezeichnet[1] != self.farbe:
+            gesendet += _text(tft, font, text, self.x, self.y, self.farbe, self.hintergrund)
+        else:
+            alt = self._gezeichnet[0]
+            # Zusammenhängende Abschnitte geänderter Zeichen neu zeichnen
+            i = 0
+            n = len(text)
+            while i < n:
+                if i < len(alt) and alt[i] == text[i]:
+                    i += 1
+                    continue
+                j = i + 1
+                while j < n and not (j < len(alt) and alt[j] == text[j]):
+                    j += 1
+                gesendet += _text(tft, font, text[i:j], self.x + i * w, self.y,
+                                  self.farbe, self.hintergrund)
+                i = j
+        # Rest des Felds löschen, soweit dort vorher etwas stand
+        rest = alt_laenge - len(text)
+        if rest > 0:
+            gesendet += _fill_rect(tft, self.x + len(text) * w, self.y,
+                                   rest * w, font.HEIGHT, self.hintergrund)
+        self._gezeichnet = (text, self.farbe)
+        return gesendet
+
+
+class Label(Wertfeld):
+    """
+    Feststehender Text; wird nur nach einer Änderung von Text oder Farbe
+    neu gezeichnet.
+    """
+
+    def __init__(self, x, y, text, farbe=0xFFFF, hintergrund=0):
+        super().__init__(x, y, len(text), '{}', farbe, hintergrund)
+        self._text = text
+
+
+class Grosswert:
+    """
+    Zahlenwert in einem lauflängenkodierten Font (z. B. ziffern_24x40).
+    Die Glyphen sind proportional; neu gezeichnet werden nur die, die sich an
+    ihrer Position geändert haben. Platz ist für zeichen * font.MAX_WIDTH Pixel.
+    """
+
+    def __init__(self, x, y, font, zeichen, format='{}', farbe=0xFFFF, hintergrund=0):
+        self.x = x
+        self.y = y
+        self.font = font
+        self.breite = zeichen * font.MAX_WIDTH
+        self.format = format
+        self.farbe = farbe
+        self.hintergrund = hintergrund
+        self._text = ''
+        self._gezeichnet = None  # (Glyphen als (x, Zeichen), farbe), None = unbekannt
+
+    def setze(self, wert, farbe=None):
+        text = self.format.format(wert)
+        # Nur so viele Zeichen, wie in die Feldbreite passen
+        while rlefont.breite(self.font, text) > self.breite:
+            text = text[:-1]
+        self._text = text
+        if farbe is not None:
+            self.farbe = farbe
+
+    def invalidiere(self):
+        self._gezeichnet = None
+
+    def geloescht(self):
+        self._gezeichnet = ((), None)
+
+    def zeichne(self, tft, font):
+        """
+        Der Dashboard-Font wird nicht gebraucht.
+        :return: an das Panel gesendete Bytes
+        """
+        glyphen = []
+        x = self.x
+        for zeichen in self._text:
+            glyphen.append((x, zeichen))
+            x += rlefont.breite(self.font, zeichen)
+        glyphen = tuple(glyphen)
+        if self._gezeichnet == (glyphen, self.farbe):
+            return 0
+        if self._gezeichnet is None:
+            alt, alt_ende = (), self.x + self.breite
+        else:
+            alt = self._gezeichnet[0] if self._gezeichnet[1] == self.farbe else ()
+            alt_ende = self.x + rlefont.breite(self.font, ''.join(z for _, z in self._gezeichnet[0]))
+        gesendet = 0
+        for glyphe in glyphen:
+            if glyphe not in alt:
+                gesendet += rlefont.zeichne(tft, self.font, glyphe[1], glyphe[0], self.y,
+                                            self.farbe, self.hintergrund)[1]
+        if alt_ende > x:
+            gesendet += _fill_rect(tft, x, self.y, alt_ende - x, self.font.HEIGHT, self.hintergrund)
+        self._gezeichnet = (glyphen, self.farbe)
+        return gesendet
+
+
+class Statusleiste:
+    """
+    Farbiger Balken über die volle Breite mit zentriertem Text.
+    """
+
+    def __init__(self, y, breite, hoehe, text_y=15, textfarbe=0xFFFF):
+        self.y = y
+        self.breite = breite
+        self.hoehe = hoehe
+        self.text_y = text_y
+        self.textfarbe = textfarbe
+        self.text = ''
+        self.farbe = 0
+        self._gezeichnet = None
+
+    def setze(self, text, farbe):
+        self.text = text
+        self.farbe = farbe
+
+    def invalidiere(self):
+        self._gezeichnet = None
+
+    geloescht = invalidiere
+
+    def zeichne(self, tft, font):
+        if self._gezeichnet == (self.text, self.farbe):
+            return 0
+        gesendet = _fill_rect(tft, 0, self.y, self.breite, self.hoehe, self.farbe)
+        text = self.text[:self.breite // font.WIDTH]
+        x = (self.breite - len(text) * font.WIDTH) // 2
+        gesendet += _text(tft, font, text, x, self.y + self.text_y, self.textfarbe, self.farbe)
+        self._gezeichnet = (self.text, self.farbe)
+        return gesendet
+
+
+class Dashboard:
+    def __init__(self, tft, font, breite, hoehe, hintergrund=0):
+        """
+        :param breite: Panelbreite [px]
+        :param hoehe: Panelhöhe [px]
+        """
+        self.tft = tft
+        self.font = font
+        self.breite = breite
+        self.hoehe = hoehe
+        self.hintergrund = hintergrund
+        self.widgets = []
+        # Bytes der letzten Aktualisierung und seit dem Start
+        self.bytes_gesendet = 0
+        self.bytes_gesamt = 0
+        self._leer = False
+
+    def hinzu(self, widget):
+        self.widgets.append(widget)
+        return widget
+
+    def invalidiere(self):
+        """
+        Das Panel wurde von außen überschrieben (z. B. Fehlerbildschirm):
+        beim nächsten zeichne() alles neu aufbauen.
+        """
+        self._leer = False
+        for widget in self.widgets:
+            widget.invalidiere()
+
+    def zeichne(self):
+        """
+        Zeichnet alle geänderten Widgets.
+        :return: dabei an das Panel gesendete Bytes
+        """
+        gesendet = 0
+        if not self._leer:
+            self.tft.fill(self.hintergrund)
+            gesendet += self.breite * self.hoehe * 2 + _FENSTER_BYTES
+            self._leer = True
+            for widget in self.widgets:
+                widget.geloescht()
+        for widget in self.widgets:
+            gesendet += widget.zeichne(self.tft, self.font)
+        # In einen Rahmenpuffer gezeichnet: erst flush() schreibt auf das Panel
+        flush = getattr(self.tft, 'flush', None)
+        if flush is not None:
+            gesendet = flush()
+        self.bytes_gesendet = gesendet
+        self.bytes_gesamt += gesendet
+        return gesendet
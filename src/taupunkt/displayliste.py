@@ -0,0 +1,95 @@
+# Displayliste für das ST7789
+# Jeder Zeichenbefehl des Treibers setzt ein eigenes Fenster (CASET, RASET,
+# RAMWR). Bei vielen kleinen Elementen (Gitter, Balken, Punkte) sind das die
+# meisten Bytes auf dem Bus. Die Displayliste nimmt gefüllte Rechtecke in einen
+# vorab angelegten Puffer auf; flush() übergibt sie an draw_list() des
+# C-Treibers, der überdeckte Rechtecke verwirft, gleichfarbige zusammenlegt und
+# aneinandergrenzende in ein gemeinsames Fenster schreibt.
+# Text wird weiterhin direkt mit tft.text() gezeichnet.
+
+from array import array
+
+# Ein Eintrag: x, y, Breite, Höhe, RGB565-Farbe
+_FELDER = 5
+
+# Befehle je Fenster: CASET, RASET, RAMWR
+_BEFEHLE_JE_FENSTER = 3
+
+
+class Displayliste:
+    def __init__(self, tft, breite, hoehe, groesse=256):
+        """
+        :param tft: Display; ohne draw_list() werden die Rechtecke einzeln
+                    mit fill_rect() gezeichnet
+        :param breite: Panelbreite [px]
+        :param hoehe: Panelhöhe [px]
+        :param groesse: Anzahl Einträge; eine volle Liste wird sofort gezeichnet
+        """
+        self.tft = tft
+        self.breite = breite
+        self.hoehe = hoehe
+        self.groesse = groesse
+        self.puffer = array('H', (0 for _ in range(groesse * _FELDER)))
+        self.anzahl = 0
+        # Befehle des letzten flush()
+        self.befehle = 0
+
+    def fill_rect(self, x, y, breite, hoehe, farbe):
+        # Auf das Panel beschneiden, der Puffer hält nur vorzeichenlose Werte
+        if x < 0:
+            breite += x
+            x = 0
+        if y < 0:
+            hoehe += y
+            y = 0
+        breite = min(breite, self.breite - x)
+        hoehe = min(hoehe, self.hoehe - y)
+        if breite <= 0 or hoehe <= 0:
+            return
+        if self.anzahl == self.groesse:
+            self.flush()
+        i = self.anzahl * _FELDER
+        puffer = self.puffer
+        puffer[i] = x
+        puffer[i + 1] = y
+        puffer[i + 2] = breite
+        puffer[i + 3] = hoehe
+        puffer[i + 4] = farbe
+        self.anzahl += 1
+
+    def fill(self, farbe):
+        self.fill_rect(0, 0, self.breite, self.hoehe, farbe)
+
+    def hline(self, x, y, breite, farbe):
+        self.fill_rect(x, y, breite, 1, farbe)
+
+    def vline(self, x, y, hoehe, farbe):
+        self.fill_rect(x, y, 1, hoehe, farbe)
+
+    def pixel(self, x, y, farbe):
+        self.fill_rect(x, y, 1, 1, farbe)
+
+    def rect(self, x, y, breite, hoehe, farbe):
+        self.hline(x, y, breite, farbe)
+        self.hline(x, y + hoehe - 1, breite, farbe)
+        self.vline(x, y, hoehe, farbe)
+        self.vline(x + breite - 1, y, hoehe, farbe)
+
+    def flush(self):
+        """
+        Zeichnet alle aufgenommenen Rechtecke und leert die Liste.
+        :return: an das Panel gesendete Befehle
+        """
+        if self.anzahl == 0:
+            self.befehle = 0
+            return 0
+        if hasattr(self.tft, 'draw_list'):
+            befehle = self.tft.draw_list(self.puffer, self.anzahl)
+        else:
+            puffer = self.puffer
+            for i in range(0, self.anzahl * _FELDER, _FELDER):
+                self.tft.fill_rect(puffer[i], puffer[i + 1], puffer[i + 2], puffer[i + 3], puffer[i + 4])
+            befehle = self.anzahl * _BEFEHLE_JE_FENSTER
+        self.anzahl = 0
+        self.befehle = befehle
+        return befehle
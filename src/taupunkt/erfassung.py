@@ -0,0 +1,215 @@
+# Gleichzeitige Messwerterfassung für SHT4x, AHT20 und BMP280
+# Alle Wandlungen werden zuerst gestartet und dann in der Reihenfolge ihrer
+# Fertigstellung abgeholt. Die Erfassung dauert so nur noch so lange wie die
+# langsamste Einzelwandlung (AHT20, 80 ms) statt der Summe aller Wartezeiten.
+# Erfassungsplan liest zusätzlich jeden Sensor nach seiner eigenen
+# Richtlinie: den Luftdruck z. B. nur jeden zehnten Zyklus, den SHT4x mit
+# geringerer Genauigkeit, solange die Werte stabil und weit von der
+# Ampelgrenze entfernt sind.
+
+import time
+
+
+def erfasse(sensoren):
+    """
+    Startet alle Sensoren und sammelt ihre Ergebnisse ein.
+    Jeder Sensor braucht start() (liefert den time.ticks_ms()-Zeitpunkt, ab dem
+    das Ergebnis bereitsteht) und collect() (liest und wandelt das Ergebnis).
+    Fehler aus start() oder collect() werden an den Aufrufer weitergereicht.
+    :param sensoren: Folge von Sensorobjekten
+    :return: Liste der collect()-Ergebnisse in der Reihenfolge von sensoren
+    """
+    bezug = time.ticks_ms()
+    bereit = [sensor.start() for sensor in sensoren]
+    # ticks_diff relativ zu einem gemeinsamen Bezug bleibt über den
+    # Zählerüberlauf hinweg sortierbar
+    reihenfolge = sorted(range(len(bereit)),
+                         key=lambda i: time.ticks_diff(bereit[i], bezug))
+    ergebnisse = [None] * len(bereit)
+    for i in reihenfolge:
+        warten = time.ticks_diff(bereit[i], time.ticks_ms())
+        if warten > 0:
+            time.sleep_ms(warten)
+        ergebnisse[i] = sensoren[i].collect()
+    return ergebnisse
+
+
+# Genauigkeit des SHT4x je nach Lage (siehe Erfassungsplan)
+GENAU = 'high'
+MITTEL = 'medium'
+GROB = 'low'
+AUTO = 'auto'
+
+
+class Richtlinie:
+    def __init__(self, periode=1, toleranz=None, auslassen=0, praezision=None):
+        """
+        Wie oft und wie genau ein Sensor im Erfassungsplan gelesen wird.
+        :param periode: nur jeden periode-ten Zyklus lesen (z. B. Luftdruck),
+                        dazwischen gilt das letzte Ergebnis
+        :param toleranz: ändert sich kein Wert des Ergebnisses um mehr als
+                         toleranz, gilt der Sensor als stabil
+        :param auslassen: so viele Zyklen wird ein stabiler Sensor zusätzlich
+                          ausgelassen, nicht aber nahe der Entscheidungsgrenze
+        :param praezision: None = start() ohne Argument, 'high'/'medium'/'low'
+                           fest oder AUTO: GENAU nahe der Grenze, sonst GROB,
+                           solange der Sensor stabil ist, und MITTEL
+        """
+        if periode < 1:
+            raise ValueError('Periode muss mindestens 1 sein')
+        self.periode = periode
+        self.toleranz = toleranz
+        self.auslassen = auslassen
+        self.praezision = praezision
+
+
+class Erfassungsplan:
+    """
+    Erfassung mit einer Richtlinie je Sensor. Ausgelassene Sensoren liefern
+    ihr letztes Ergebnis; die Busdauer von start() und collect() wird je
+    Sensor mitgezählt (ohne die Wartezeit der Wandlung).
+    """
+
+    def __init__(self, sensoren, richtlinien=None, namen=None, genau_abstand=1.0):
+        """
+        :param sensoren: Folge von Sensorobjekten wie bei erfasse()
+        :param richtlinien: je Sensor eine Richtlinie, Standard: jeden Zyklus
+        :param namen: Namen für die Statistik, Standard: '0', '1', ...
+        :param genau_abstand: unterhalb dieses Abstands [K] zur nächsten
+                              Ampelgrenze gilt melde_abstand() als nahe
+        """
+        self.sensoren = sensoren
+        anzahl = len(sensoren)
+        self.richtlinien = richtlinien or [Richtlinie() for _ in range(anzahl)]
+        self.namen = namen or [str(i) for i in range(anzahl)]
+        self.genau_abstand = genau_abstand
+        self.nahe = True  # bis zur ersten Entscheidung genau messen
+        self.ergebnisse = [None] * anzahl
+        self._stabil = [False] * anzahl
+        self._rest = [0] * anzahl  # ausgelassene Zyklen wegen der Periode
+        self._aus = [0] * anzahl   # ... und weil der Sensor stabil ist
+        self._gelesen = [False] * anzahl  # im letzten Zyklus gelesen
+        self.statistik = {name: {
+            'messungen': 0,
+            'ausgelassen': 0,
+            'fehler': 0,
+            'praezision': None,
+            'bus_us': 0,
+            'bus_max_us': 0,
+            'bus_summe_us': 0,
+        } for name in self.namen}
+
+    def melde_abstand(self, abstand):
+        """
+        :param abstand: Abstand [K] des Taupunktabstands zur nächsten
+                        Ampelgrenze, z. B. aus laufzeit.grenzabstand
+        """
+        self.nahe = abstand < self.genau_abstand
+
+    def _praezision(self, i):
+        praezision = self.richtlinien[i].praezision
+        if praezision != AUTO:
+            return praezision
+        if self.nahe:
+            return GENAU
+        return GROB if self._stabil[i] else MITTEL
+
+    def _bus(self, i, start_us):
+        statistik = self.statistik[self.namen[i]]
+        dauer = time.ticks_diff(time.ticks_us(), start_us)
+        statistik['bus_us'] += dauer
+        statistik['bus_summe_us'] += dauer
+
+    def starte(self):
+        """
+        Startet die in diesem Zyklus fälligen Sensoren.
+        :return: Liste (index, bereit) in der Reihenfolge der Fertigstellung
+        """
+        bezug = time.ticks_ms()
+        gestartet = []
+        for i, sensor in enumerate(self.sensoren):
+            statistik = self.statistik[self.namen[i]]
+            self._gelesen[i] = False
+            if self.ergebnisse[i] is not None:
+                if self._rest[i] > 0:
+                    self._rest[i] -= 1
+                    statistik['ausgelassen'] += 1
+                    continue
+                if self._aus[i] > 0 and not self.nahe:
+                    self._aus[i] -= 1
+                    statistik['ausgelassen'] += 1
+                    continue
+            praezision = self._praezision(i)
+            statistik['praezision'] = praezision
+            statistik['bus_us'] = 0
+            start_us = time.ticks_us()
+            try:
+                bereit = sensor.start() if praezision is None else sensor.start(praezision)
+            except Exception:
+                statistik['fehler'] += 1
+                raise
+            self._bus(i, start_us)
+            self._gelesen[i] = True
+            gestartet.append((i, bereit))
+        gestartet.sort(key=lambda eintrag: time.ticks_diff(eintrag[1], bezug))
+        return gestartet
+
+    def hole(self, i):
+        """
+        Liest das Ergebnis von Sensor i und plant seine nächste Messung.
+        """
+        statistik = self.statistik[self.namen[i]]
+        start_us = time.ticks_us()
+        try:
+            ergebnis = self.sensoren[i].collect()
+        except Exception:
+            statistik['fehler'] += 1
+            # Beim nächsten Zyklus auf jeden Fall neu messen
+            self.ergebnisse[i] = None
+            raise
+        self._bus(i, start_us)
+        if statistik['bus_us'] > statistik['bus_max_us']:
+            statistik['bus_max_us'] = statistik['bus_us']
+        statistik['messungen'] += 1
+
+        richtlinie = self.richtlinien[i]
+        alt = self.ergebnisse[i]
+        stabil = False
+        if richtlinie.toleranz is not None and alt is not None:
+            stabil = True
+            for a, b in zip(alt, ergebnis):
+                if abs(b - a) > richtlinie.toleranz:
+                    stabil = False
+                    break
+        self._stabil[i] = stabil
+        self.ergebnisse[i] = ergebnis
+        self._rest[i] = richtlinie.periode - 1
+        self._aus[i] = richtlinie.auslassen if stabil else 0
+
+    def bericht(self):
+        """
+        :return: Busdauer je Sensor im letzten Zyklus, z. B.
+                 'innen 310 us (low), aussen -, druck -' (- = ausgelassen)
+        """
+        teile = []
+        for i, name in enumerate(self.namen):
+            statistik = self.statistik[name]
+            if not self._gelesen[i]:
+                teile.append('%s -' % name)
+            elif statistik['praezision'] is None:
+                teile.append('%s %d us' % (name, statistik['bus_us']))
+            else:
+                teile.append('%s %d us (%s)' % (name, statistik['bus_us'], statistik['praezision']))
+        return ', '.join(teile)
+
+    def erfasse(self):
+        """
+        Wie erfasse(), aber nach den Richtlinien.
+        :return: Liste der Ergebnisse in der Reihenfolge der Sensoren
+        """
+        for i, bereit in self.starte():
+            warten = time.ticks_diff(bereit, time.ticks_ms())
+            if warten > 0:
+                time.sleep_ms(warten)
+            self.hole(i)
+        return list(self.ergebnisse)
@@ -56,23 +56,44 @@ try:
 except ImportError:
     import ustruct as struct
 
-from machine import SoftI2C
-from micropython import const
+try:
+    from micropython import const
+except ImportError:
+    def const(value):
+        return value
+
+from array import array
 
 
 _FT6206_DEFAULT_I2C_ADDR = 0x38
 
 _FT6XXX_REG_DATA = const(0x00)
+_FT6XXX_REG_GESTURE = const(0x01)
 _FT6XXX_REG_NUMTOUCHES = const(0x02)
 _FT6XXX_REG_THRESHHOLD = const(0x80)
 _FT6XXX_REG_POINTRATE = const(0x88)
 _FT6XXX_REG_LIBH = const(0xA1)
 _FT6XXX_REG_LIBL = const(0xA2)
 _FT6XXX_REG_CHIPID = const(0xA3)
+_FT6XXX_REG_GMODE = const(0xA4)
 _FT6XXX_REG_FIRMVERS = const(0xA6)
 _FT6XXX_REG_VENDID = const(0xA8)
 _FT6XXX_REG_RELEASE = const(0xAF)
 
+# G_MODE: 0 = INT stays low while touched, 1 = INT pulses once per new report
+_FT6XXX_GMODE_TRIGGER = const(0x01)
+
+# Event flag in the top two bits of P1_XH / P2_XH
+EVENT_DOWN = const(0)
+EVENT_UP = const(1)
+EVENT_CONTACT = const(2)
+EVENT_NONE = const(3)
+
+# GEST_ID, TD_STATUS and both 6-byte point records (registers 0x01-0x0E)
+_REPORT_LEN = const(14)
+# Fields per ring buffer record: x, y, id, event
+_RECORD = const(4)
+
 
 class FocalTouch:
     """
@@ -86,6 +107,9 @@ class FocalTouch:
         self.bus = i2c
         self.address = address
         self._debug = debug
+        self._count_buf = bytearray(1)
+        self._report = bytearray(_REPORT_LEN)
+        self.irq_enabled = False
 
         chip_data = self._read(_FT6XXX_REG_LIBH, 8)
         lib_ver, chip_id, _, _, firm_id, _, vend_id = struct.unpack(
@@ -113,9 +137,9 @@ class FocalTouch:
     @property
     def touched(self):
         """ Returns the number of touches currently detected """
-        return self._read(_FT6XXX_REG_NUMTOUCHES, 1)[0]
+        self.bus.readfrom_mem_into(self.address, _FT6XXX_REG_NUMTOUCHES, self._count_buf)
+        return self._count_buf[0]
 
-    # pylint: disable=unused-variable
     @property
     def touches(self):
         """
@@ -123,22 +147,103 @@ class FocalTouch:
         touch coordinates, and 'id' as the touch # for multitouch tracking
         """
         touchpoints = []
-        data = self._read(_FT6XXX_REG_DATA, 32)
-
-        for i in range(2):
-            point_data = data[i * 6 + 3 : i * 6 + 9]
-            if all([i == 0xFF for i in point_data]):
+        data = self._report
+        self.bus.readfrom_mem_into(self.address, _FT6XXX_REG_GESTURE, data)
+        for offset in (2, 8):
+            if data[offset] == 0xFF and data[offset + 2] == 0xFF:
                 continue
-            # print([hex(i) for i in point_data])
-            x, y, weight, misc = struct.unpack(">HHBB", point_data)
-            # print(x, y, weight, misc)
-            touch_id = y >> 12
-            x &= 0xFFF
-            y &= 0xFFF
-            point = {"x": x, "y": y, "id": touch_id}
-            touchpoints.append(point)
+            touchpoints.append({
+                "x": (data[offset] & 0x0F) << 8 | data[offset + 1],
+                "y": (data[offset + 2] & 0x0F) << 8 | data[offset + 3],
+                "id": data[offset + 2] >> 4,
+            })
         return touchpoints
 
+    def enable_irq(self, pin, size=16):
+        """
+        Switches the controller to trigger mode and reads each report from the
+        INT pin interrupt into a ring buffer of (x, y, id, event) records.
+        Nothing is read while the panel is not touched, and the interrupt
+        handler does not allocate. Fetch the records with read_event().
+
+        :param pin: machine.Pin connected to INT (active low)
+        :param size: number of records; when full, new records are dropped
+                     and counted in ``dropped``
+        """
+        # One slot stays free to tell a full buffer from an empty one
+        self._size = size + 1
+        self.events = array("H", bytes(2 * _RECORD * self._size))
+        self._head = 0
+        self._tail = 0
+        self.dropped = 0
+        self.errors = 0
+        # Bound method created once: the handler must not allocate
+        self._handler = self._on_irq
+        self._write(_FT6XXX_REG_GMODE, [_FT6XXX_GMODE_TRIGGER])
+        self._pin = pin
+        pin.irq(trigger=pin.IRQ_FALLING, handler=self._handler)
+        self.irq_enabled = True
+
+    def disable_irq(self):
+        """Stops the interrupt; buffered records can still be read."""
+        if self.irq_enabled:
+            self._pin.irq(handler=None)
+            self.irq_enabled = False
+
+    @property
+    def pending(self):
+        """Number of records waiting in the ring buffer."""
+        return (self._head - self._tail) % self._size
+
+    def read_event(self, record):
+        """
+        Copies the oldest record into ``record`` (any mutable sequence of
+        at least four ints, e.g. a preallocated array) without allocating.
+
+        :return: False if the ring buffer is empty
+        """
+        tail = self._tail
+        if tail == self._head:
+            return False
+        events = self.events
+        i = tail * _RECORD
+        record[0] = events[i]
+        record[1] = events[i + 1]
+        record[2] = events[i + 2]
+        record[3] = events[i + 3]
+        self._tail = (tail + 1) % self._size
+        return True
+
+    def _on_irq(self, pin):
+        data = self._report
+        try:
+            self.bus.readfrom_mem_into(self.address, _FT6XXX_REG_GESTURE, data)
+        except OSError:
+            self.errors += 1
+            return
+        count = data[1] & 0x0F
+        self._store(data, 2, count > 0)
+        self._store(data, 8, count > 1)
+
+    def _store(self, data, offset, active):
+        event = data[offset] >> 6
+        # Inactive slots only carry the lift-up of the last finger
+        if event == EVENT_NONE or not (active or event == EVENT_UP):
+            return
+        head = self._head
+        following = (head + 1) % self._size
+        if following == self._tail:
+            self.dropped += 1
+            return
+        events = self.events
+        i = head * _RECORD
+        events[i] = (data[offset] & 0x0F) << 8 | data[offset + 1]
+        events[i + 1] = (data[offset + 2] & 0x0F) << 8 | data[offset + 3]
+        events[i + 2] = data[offset + 2] >> 4
+        events[i + 3] = event
+        # Publish only after the record is complete
+        self._head = following
+
     def _read(self, reg, length):
         """Returns an array of 'length' bytes from the 'register'"""
         result = bytearray(length)
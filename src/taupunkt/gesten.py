@@ -0,0 +1,77 @@
+# Tipp- und Wischgesten aus den Touch-Ereignissen des FocalTouch
+# Wertet die (x, y, id, ereignis)-Sätze aus dem Ringpuffer von
+# FocalTouch.enable_irq() aus: Aufsetzen merkt sich den Startpunkt, beim
+# Abheben entscheidet der zurückgelegte Weg über Tippen oder Wischen.
+# Gesten sind kleine Ganzzahlen, die Auswertung legt nichts auf dem Heap an.
+# Richtungen gelten in Koordinaten des Touch-Controllers.
+
+from array import array
+
+from focaltouch import EVENT_DOWN, EVENT_UP
+
+KEINE = 0
+TIPPEN = 1
+WISCHEN_LINKS = 2
+WISCHEN_RECHTS = 3
+WISCHEN_OBEN = 4
+WISCHEN_UNTEN = 5
+
+NAMEN = ('keine', 'tippen', 'links', 'rechts', 'oben', 'unten')
+
+
+class Gesten:
+    def __init__(self, tipp_radius=10, wisch_weg=40):
+        """
+        :param tipp_radius: größter Weg [px] zwischen Aufsetzen und Abheben,
+                            der noch als Tippen zählt
+        :param wisch_weg: kleinster Weg [px] entlang einer Achse für Wischen;
+                          dazwischen wird keine Geste erkannt
+        """
+        self.tipp_radius = tipp_radius
+        self.wisch_weg = wisch_weg
+        self._satz = array('H', (0, 0, 0, 0))
+        self._id = -1  # verfolgter Finger, -1 = keiner
+        self._x = 0
+        self._y = 0
+
+    def ereignis(self, x, y, finger, art):
+        """
+        Verarbeitet einen Touch-Satz.
+        :param art: focaltouch.EVENT_*
+        :return: erkannte Geste oder KEINE
+        """
+        if art == EVENT_DOWN:
+            # Nur der erste Finger zählt
+            if self._id < 0:
+                self._id = finger
+                self._x = x
+                self._y = y
+            return KEINE
+        if art != EVENT_UP or finger != self._id:
+            return KEINE
+        self._id = -1
+        dx = x - self._x
+        dy = y - self._y
+        weg_x = dx if dx >= 0 else -dx
+        weg_y = dy if dy >= 0 else -dy
+        if weg_x <= self.tipp_radius and weg_y <= self.tipp_radius:
+            return TIPPEN
+        if weg_x >= weg_y:
+            if weg_x >= self.wisch_weg:
+                return WISCHEN_RECHTS if dx > 0 else WISCHEN_LINKS
+        elif weg_y >= self.wisch_weg:
+            return WISCHEN_UNTEN if dy > 0 else WISCHEN_OBEN
+        return KEINE
+
+    def lies(self, touch):
+        """
+        Leert den Ringpuffer eines FocalTouch im IRQ-Modus.
+        :return: zuletzt erkannte Geste oder KEINE
+        """
+        satz = self._satz
+        geste = KEINE
+        while touch.read_event(satz):
+            neu = self.ereignis(satz[0], satz[1], satz[2], satz[3])
+            if neu:
+                geste = neu
+        return geste
@@ -0,0 +1,385 @@
+# Asynchrone Laufzeit der Taupunktsteuerung
+# Ersetzt die blockierende while-True-Schleife durch einzelne Tasks für
+# Erfassung, Entscheidung/LEDs, Anzeige, Touch und PMU. Die Tasks tauschen
+# Daten nur über begrenzte Warteschlangen aus, so dass Touch und PMU auch
+# während der 900 s Messpause bedient werden.
+# Mit einem zweikern.Anzeigekern zeichnet Kern 1 das Dashboard, die Anzeige-
+# Task übergibt ihm nur noch den Schnappschuss.
+# Läuft mit uasyncio auf dem Pico und mit asyncio unter CPython (dort müssen
+# time.ticks_ms/ticks_add/ticks_diff nachgerüstet werden, siehe
+# benchmarks/bench_laufzeit.py).
+
+import time
+
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+
+from gesten import Gesten
+
+# Ampelzustände (gleiche Namen wie in schalte_leds)
+GRUEN = 'gruen'
+GELB = 'gelb'
+ROT = 'rot'
+FEHLER = 'fehler'
+# Reihenfolge für Statusbytes (protokoll.py, telemetrie.py)
+STATUS = (GRUEN, GELB, ROT, FEHLER)
+
+
+class Warteschlange:
+    """
+    Begrenzte FIFO für Tasks (uasyncio hat keine asyncio.Queue).
+    Ist sie voll, verdrängt put() den ältesten Eintrag: ein langsamer
+    Verbraucher sieht immer die neuesten Daten und der Erzeuger blockiert nie.
+    """
+
+    def __init__(self, groesse=2):
+        self._daten = [None] * groesse
+        self._kopf = 0
+        self._anzahl = 0
+        self._ereignis = asyncio.Event()
+        self.verworfen = 0
+
+    def __len__(self):
+        return self._anzahl
+
+    def put(self, wert):
+        """
+        Hängt einen Eintrag an, ohne zu warten.
+        :return: False, wenn dafür der älteste Eintrag verworfen wurde
+        """
+        groesse = len(self._daten)
+        frei = self._anzahl < groesse
+        if frei:
+            self._anzahl += 1
+        else:
+            self._kopf = (self._kopf + 1) % groesse
+            self.verworfen += 1
+        self._daten[(self._kopf + self._anzahl - 1) % groesse] = wert
+        self._ereignis.set()
+        return frei
+
+    def get_nowait(self):
+        """
+        :return: ältester Eintrag
+        :raises IndexError: wenn die Warteschlange leer ist
+        """
+        if not self._anzahl:
+            raise IndexError('Warteschlange leer')
+        wert = self._daten[self._kopf]
+        self._daten[self._kopf] = None
+        self._kopf = (self._kopf + 1) % len(self._daten)
+        self._anzahl -= 1
+        return wert
+
+    async def get(self):
+        """
+        Wartet auf den nächsten Eintrag.
+        """
+        while not self._anzahl:
+            self._ereignis.clear()
+            await self._ereignis.wait()
+        return self.get_nowait()
+
+
+def entscheide(tp_innen, tp_aussen, grenze):
+    """
+    Lüftungsentscheidung wie in entscheide_lueften.
+    :return: GRUEN, GELB oder ROT
+    """
+    if tp_aussen < (tp_innen - grenze):
+        return GRUEN
+    if tp_aussen >= tp_innen:
+        return ROT
+    return GELB
+
+
+def grenzabstand(tp_innen, tp_aussen, grenze):
+    """
+    :return: Abstand [K] von tp_aussen zur nächsten Ampelgrenze
+             (tp_innen - grenze bzw. tp_innen)
+    """
+    d = tp_aussen - tp_innen
+    return min(abs(d + grenze), abs(d))
+
+
+async def _erfasse(sensoren):
+    """
+    Wie erfassung.erfasse, gibt aber während der Wandlungen die CPU an die
+    anderen Tasks ab.
+    """
+    bezug = time.ticks_ms()
+    bereit = [sensor.start() for sensor in sensoren]
+    reihenfolge = sorted(range(len(bereit)),
+                         key=lambda i: time.ticks_diff(bereit[i], bezug))
+    ergebnisse = [None] * len(bereit)
+    for i in reihenfolge:
+        warten = time.ticks_diff(bereit[i], time.ticks_ms())
+        if warten > 0:
+            await asyncio.sleep(warten / 1000)
+        ergebnisse[i] = sensoren[i].collect()
+    return ergebnisse
+
+
+async def _erfasse_plan(plan):
+    """
+    Wie Erfassungsplan.erfasse, aber mit await statt sleep_ms.
+    """
+    for i, bereit in plan.starte():
+        warten = time.ticks_diff(bereit, time.ticks_ms())
+        if warten > 0:
+            await asyncio.sleep(warten / 1000)
+        plan.hole(i)
+    return list(plan.ergebnisse)
+
+
+class Laufzeit:
+    def __init__(self, sensoren, formel, grenze, schalte_leds, zeige,
+                 intervall=900, touch=None, pmu=None,
+                 touch_intervall_ms=50, pmu_intervall_ms=500, anzeigekern=None,
+                 takt=None, plan=None, protokoll=None):
+        """
+        :param sensoren: (innen, aussen, druck) mit start()/collect()
+        :param formel: Taupunktformel aus psychrometrie.FORMELN
+        :param grenze: Taupunktgrenze [K]
+        :param schalte_leds: Funktion(status)
+        :param zeige: Funktion(status, daten); daten ist das 7-Tupel von
+                      zeige_dashboard bzw. bei FEHLER die Ausnahme
+        :param intervall: Messintervall [s]
+        :param touch: optionaler FocalTouch, eine Berührung löst sofort eine Messung aus
+        :param pmu: optionaler axp202c.PMU, ein IRQ löst sofort eine Messung aus
+        :param anzeigekern: optionaler zweikern.Anzeigekern; dann ruft Kern 1
+                            zeige auf und meldet dessen Touch-Ereignisse hierher
+        :param takt: optionaler takt.Takt; entscheidet dann mit Hysterese und
+                     ersetzt intervall durch ein adaptives Intervall
+        :param plan: optionaler erfassung.Erfassungsplan über dieselben
+                     Sensoren; liest sie dann nach dessen Richtlinien
+        :param protokoll: optionales protokoll.Protokoll; jeder Zyklus wird
+                          angehängt und nach dem Zeichnen blockweise gesichert
+        """
+        self.sensoren = sensoren
+        self.formel = formel
+        self.grenze = grenze
+        self.schalte_leds = schalte_leds
+        self.zeige = zeige
+        self.intervall = intervall
+        self.touch = touch
+        self.pmu = pmu
+        self.touch_intervall_ms = touch_intervall_ms
+        self.pmu_intervall_ms = pmu_intervall_ms
+        self.anzeigekern = anzeigekern
+        self.takt = takt
+        self.plan = plan
+        self.protokoll = protokoll
+
+        # Erfassung -> Entscheidung -> Anzeige, Touch/PMU -> Erfassung
+        # Ereignisse sind Tupel (art, ticks_ms, daten)
+        self.messungen = Warteschlange()
+        self.anzeige = Warteschlange()
+        self.ereignisse = Warteschlange(4)
+
+        # latenz_ms: Auslöser bis Kern 0 mit dem Zyklus fertig ist (Bild
+        # gezeichnet bzw. an Kern 1 übergeben), leds_ms: Auslöser bis LEDs,
+        # anzeige_ms: davon für zeige() bzw. die Übergabe
+        self.statistik = {
+            'zyklen': 0,
+            'erfassung_ms': 0,
+            'leds_ms': 0,
+            'leds_max_ms': 0,
+            'anzeige_ms': 0,
+            'latenz_ms': 0,
+            'latenz_max_ms': 0,
+        }
+        self._tasks = []
+
+    async def erfassung(self):
+        """
+        Misst alle intervall Sekunden (mit takt adaptiv) oder sofort nach
+        einem Touch-/PMU-Ereignis.
+        """
+        # Die Latenz zählt ab dem Auslöser (Timer, Touch oder PMU-IRQ)
+        ausloeser = time.ticks_ms()
+        while True:
+            try:
+                if self.plan is None:
+                    ergebnisse = await _erfasse(self.sensoren)
+                else:
+                    ergebnisse = await _erfasse_plan(self.plan)
+                (innen_t, innen_rh), (aussen_t, aussen_rh), (_, druck) = ergebnisse
+                # Plausibilitätsprüfung wie in hole_daten
+                if not (-40 < innen_t < 80 and 0 <= innen_rh <= 100):
+                    raise ValueError("Innen-Sensor liefert ungültige Werte")
+                werte = (innen_t, innen_rh, aussen_t, aussen_rh, druck)
+            except Exception as e:
+                print("Fehler:", e)
+                werte = e
+            self.statistik['erfassung_ms'] = time.ticks_diff(time.ticks_ms(), ausloeser)
+            self.messungen.put((ausloeser, werte))
+
+            ereignis = await self._warte()
+            if ereignis is None:
+                ausloeser = time.ticks_ms()
+            else:
+                art, ausloeser, _ = ereignis
+                print("Ereignis:", art)
+            # Gehäufte Ereignisse lösen nur eine Messung aus
+            while len(self.ereignisse):
+                self.ereignisse.get_nowait()
+
+    async def _warte(self):
+        """
+        Wartet auf ein Ereignis oder bis das Intervall abgelaufen ist.
+        Das adaptive Intervall legt die Entscheidung erst nach dieser Messung
+        fest; es wird darum spätestens alle takt.min_s Sekunden neu gelesen.
+        :return: Ereignis oder None nach Ablauf des Intervalls
+        """
+        takt = self.takt
+        if takt is None:
+            try:
+                return await asyncio.wait_for(self.ereignisse.get(), self.intervall)
+            except asyncio.TimeoutError:
+                return None
+        start = time.ticks_ms()
+        while True:
+            rest = takt.intervall_s - time.ticks_diff(time.ticks_ms(), start) / 1000
+            if rest <= 0:
+                return None
+            try:
+                return await asyncio.wait_for(self.ereignisse.get(), min(rest, takt.min_s))
+            except asyncio.TimeoutError:
+                pass
+
+    async def entscheidung(self):
+        while True:
+            ausloeser, werte = await self.messungen.get()
+            if isinstance(werte, Exception):
+                # LEDs behalten wie bisher den letzten gültigen Zustand
+                self.anzeige.put((ausloeser, FEHLER, werte))
+                continue
+            innen_t, innen_rh, aussen_t, aussen_rh, druck = werte
+            tp_innen = self.formel.taupunkt(innen_t, innen_rh)
+            tp_aussen = self.formel.taupunkt(aussen_t, aussen_rh)
+            if self.takt is None:
+                status = entscheide(tp_innen, tp_aussen, self.grenze)
+            else:
+                status = self.takt.entscheide(tp_innen, tp_aussen, ausloeser)
+            if self.plan is not None:
+                self.plan.melde_abstand(grenzabstand(tp_innen, tp_aussen, self.grenze))
+            self.schalte_leds(status)
+            leds = time.ticks_diff(time.ticks_ms(), ausloeser)
+            self.statistik['leds_ms'] = leds
+            if leds > self.statistik['leds_max_ms']:
+                self.statistik['leds_max_ms'] = leds
+            self.anzeige.put((ausloeser, status, werte + (tp_innen, tp_aussen)))
+
+    async def darstellung(self):
+        statistik = self.statistik
+        kern = self.anzeigekern
+        while True:
+            ausloeser, status, daten = await self.anzeige.get()
+            start = time.ticks_ms()
+            if kern is None:
+                self.zeige(status, daten)
+            else:
+                # Gezeichnet wird auf Kern 1, ein noch nicht gezeichneter
+                # älterer Schnappschuss wird dabei verworfen
+                kern.put((ausloeser, status, daten))
+            ende = time.ticks_ms()
+            latenz = time.ticks_diff(ende, ausloeser)
+            statistik['anzeige_ms'] = time.ticks_diff(ende, start)
+            statistik['zyklen'] += 1
+            statistik['latenz_ms'] = latenz
+            if latenz > statistik['latenz_max_ms']:
+                statistik['latenz_max_ms'] = latenz
+            protokoll = self.protokoll
+            if protokoll is not None:
+                # neu() legt nichts an, die Umrechnung der float-Messwerte in
+                # Centi-Einheiten davor schon
+                if status == FEHLER:
+                    protokoll.fehler()
+                else:
+                    protokoll.neu(round(daten[0] * 100), round(daten[1] * 100),
+                                  round(daten[2] * 100), round(daten[3] * 100),
+                                  round(daten[4] * 10), STATUS.index(status))
+                # Höchstens ein Block, erst nach der Latenzmessung
+                if protokoll.faellig():
+                    protokoll.flush()
+
+    async def beruehrung(self):
+        """
+        Fragt den Touch-Controller ab und meldet jede neue Berührung. Im
+        IRQ-Modus (FocalTouch.enable_irq) wird nur der Ringpuffer gelesen und
+        jede erkannte Geste gemeldet, der I2C-Bus bleibt in Ruhe.
+        """
+        if getattr(self.touch, 'irq_enabled', False):
+            gesten = Gesten()
+            while True:
+                geste = gesten.lies(self.touch)
+                if geste:
+                    self.ereignisse.put(('touch', time.ticks_ms(), geste))
+                await asyncio.sleep(self.touch_intervall_ms / 1000)
+        beruehrt = False
+        while True:
+            try:
+                jetzt = self.touch.touched > 0
+            except OSError:
+                jetzt = False
+            if jetzt and not beruehrt:
+                self.ereignisse.put(('touch', time.ticks_ms(), self.touch.touches))
+            beruehrt = jetzt
+            await asyncio.sleep(self.touch_intervall_ms / 1000)
+
+    async def kernereignisse(self):
+        """
+        Holt die Touch-Ereignisse von Kern 1 ab.
+        """
+        ereignisse = self.anzeigekern.ereignisse
+        while True:
+            if len(ereignisse):
+                self.ereignisse.put(ereignisse.get_nowait())
+            await asyncio.sleep(self.touch_intervall_ms / 1000)
+
+    async def energie(self):
+        """
+        Wertet den (low-aktiven) IRQ-Pin der PMU aus und quittiert die IRQs.
+        """
+        pmu = self.pmu
+        while True:
+            if not pmu.pin_intr.value():
+                pmu.readIRQ()
+                irq = bytes(pmu.irqbuf)
+                pmu.clearIRQ()
+                self.ereignisse.put(('pmu', time.ticks_ms(), irq))
+            await asyncio.sleep(self.pmu_intervall_ms / 1000)
+
+    def starte(self):
+        """
+        Legt alle Tasks an und startet den Anzeigekern; muss innerhalb der
+        Ereignisschleife aufgerufen werden.
+        :return: Liste der Tasks
+        """
+        koroutinen = [self.erfassung(), self.entscheidung(), self.darstellung()]
+        if self.touch is not None:
+            koroutinen.append(self.beruehrung())
+        if self.anzeigekern is not None:
+            self.anzeigekern.starte()
+            if self.anzeigekern.touch is not None:
+                koroutinen.append(self.kernereignisse())
+        if self.pmu is not None:
+            koroutinen.append(self.energie())
+        self._tasks = [asyncio.create_task(k) for k in koroutinen]
+        return self._tasks
+
+    def stoppe(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        if self.anzeigekern is not None:
+            self.anzeigekern.stoppe()
+
+    async def run(self):
+        """
+        Startet alle Tasks und läuft, bis einer davon abbricht.
+        """
+        await asyncio.gather(*self.starte())
@@ -4,16 +4,25 @@
 # Signalisierung: Ampel-LEDs (Rot, Gelb, Grün)
 
 
-import time
-import math
+import asyncio
 from machine import Pin, I2C, SPI
 import sht4x
 import ahtx0
 import bmp280
+import erfassung
+import laufzeit
+import protokoll
+from dashboard import Dashboard, Grosswert, Label, Statusleiste, Wertfeld
+from rahmenpuffer import Palettenpuffer
 import st7789
+import psychrometrie
+import sparbetrieb
+import takt
+import telemetrie
+import zweikern
 import vga1_8x8 as font
-# Optional: Für größere Schrift eine andere Font-Datei importieren, falls vorhanden
-# import vga1_16x32 as font_large
+# Große Ziffern, lauflängenkodiert (340 Bytes, erzeugt mit tools/rle_font.py)
+import ziffern_24x40 as font_gross
 
 
 # ========== KONFIGURATION ==========
@@ -42,6 +51,46 @@ LCD_RST = 20
 LCD_BL = 21
 SPI_SCK = 18
 SPI_MOSI = 19
+SPI_ID = 0
+
+# Füllen und blit_buffer_async() per DMA. Nur mit einer Firmware aus csrc/:
+# examples/firmware.* kennt spi_id nicht und bricht beim Start mit TypeError ab
+DISPLAY_DMA = False
+
+# Dashboard in einen 4-Bit-Palettenpuffer (27 KB) zeichnen und nur geänderte
+# Kacheln übertragen; False = direkt auf das Panel
+RAHMENPUFFER = True
+
+# Dashboard auf dem zweiten Kern zeichnen (_thread); Kern 0 misst und
+# schaltet die LEDs, ohne auf das Display zu warten
+ZWEI_KERNE = False
+
+# Stromsparbetrieb (sparbetrieb.py) statt der asyncio-Laufzeit: None = aus,
+# 'wach', 'leicht' (lightsleep) oder 'tief' (deepsleep, Neustart je Zyklus).
+# Touch und PMU-IRQs werden dann nicht bedient.
+STROMSPAREN = None
+# So lange bleibt das Display nach jeder Messung an [s], 0 = nur LEDs
+ANZEIGE_DAUER = 10
+# Letzte Messung und Entscheidung für den Neustart nach deepsleep
+ZUSTAND_DATEI = 'zustand.bin'
+# AXP202 am I2C-Bus: mittleren Strom je Zyklus mit dem Coulombzähler messen
+PMU_VORHANDEN = False
+
+
+# Messprotokoll im Flash (protokoll.py): Dateien messungen_0.bin bis _3.bin
+# mit je höchstens 32 KB, die älteste wird überschrieben; False = aus
+PROTOKOLL = True
+PROTOKOLL_DATEIEN = 4
+PROTOKOLL_DATEI_BYTES = 32768
+# Spätestens nach so vielen Sekunden landet eine Messung im Flash; was noch im
+# RAM liegt, geht bei Reset oder Spannungseinbruch verloren
+PROTOKOLL_MAX_ALTER = 1800
+
+
+# Konsolenausgabe je Messung: 'text' = lesbare Zeile per print(), 'binaer' =
+# 24-Byte-Rahmen mit CRC (telemetrie.py, lesen mit
+# micropython/tools/read_telemetry.py), None = keine
+TELEMETRIE = 'text'
 
 
 # LCD Maße
@@ -51,12 +100,35 @@ TFT_HEIGHT = 320
 
 # Prüfintervall (Sekunden)
 INTERVALL = 900
+# Adaptives Intervall (takt.py): nahe an einer Ampelgrenze bis hinunter auf
+# INTERVALL_MIN, weit davon entfernt INTERVALL; None = festes Intervall
+INTERVALL_MIN = None
+# Um so viel [K] muss der Abstand eine Grenze überschreiten, bevor die LEDs
+# wechseln (nur mit INTERVALL_MIN)
+HYSTERESE = 0.1
 
 
 # Taupunktgrenze
 TAUPUNKT_GRENZE = 2.0
 
 
+# Richtlinien je Sensor (erfassung.Erfassungsplan), False = alle Sensoren in
+# jedem Zyklus mit voller Genauigkeit
+ERFASSUNGSPLAN = True
+# Luftdruck nur jeden n-ten Zyklus lesen (geht nicht in die Entscheidung ein)
+DRUCK_PERIODE = 10
+# Ändern sich die Werte um weniger als so viel (°C bzw. %), gilt ein Sensor
+# als stabil: der SHT4x misst dann grob, der AHT20 setzt so viele Zyklen aus.
+# Nahe der Ampelgrenze (< 1 K) messen beide immer mit voller Genauigkeit.
+STABIL_TOLERANZ = 0.2
+AUSSEN_AUSLASSEN = 1
+
+
+# Taupunktformel: 'magnus', 'magnus_eis', 'buck' oder 'sonntag'
+TAUPUNKT_FORMEL = 'magnus'
+formel = psychrometrie.FORMELN[TAUPUNKT_FORMEL]
+
+
 
 
 # ========== FARB- & LAYOUT-DEFINITIONEN ==========
@@ -65,13 +137,13 @@ FARBE_HINTERGRUND = st7789.BLACK
 FARBE_TEXT = st7789.WHITE
 FARBE_WERT = st7789.WHITE
 FARBE_INFO = st7789.CYAN
-FARBE_DRUCK = st7789.ORANGE
+FARBE_DRUCK = st7789.color565(255, 165, 0)
 
 
 # Farben für den Status
-STATUS_GRUEN = st7789.color(0, 100, 0) # Dunkles Grün
-STATUS_GELB = st7789.color(255, 215, 0) # Gold
-STATUS_ROT = st7789.color(139, 0, 0) # Dunkles Rot
+STATUS_GRUEN = st7789.color565(0, 100, 0) # Dunkles Grün
+STATUS_GELB = st7789.color565(255, 215, 0) # Gold
+STATUS_ROT = st7789.color565(139, 0, 0) # Dunkles Rot
 
 
 
@@ -86,7 +158,17 @@ i2c = I2C(0, scl=Pin(I2C_SCL), sda=Pin(I2C_SDA), freq=100000)
 # Sensoren
 sensor_innen = sht4x.SHT4x(i2c, address=SHT41_ADDR)
 sensor_aussen = ahtx0.AHT20(i2c, address=AHT20_ADDR)
-sensor_druck = bmp280.BMP280(i2c, addr=BMP280_ADDR)
+sensor_druck = bmp280.BMP280(i2c, addr=BMP280_ADDR, forced=True)
+
+plan = None
+if ERFASSUNGSPLAN:
+    plan = erfassung.Erfassungsplan(
+        (sensor_innen, sensor_aussen, sensor_druck),
+        (erfassung.Richtlinie(toleranz=STABIL_TOLERANZ, praezision=erfassung.AUTO),
+         erfassung.Richtlinie(toleranz=STABIL_TOLERANZ, auslassen=AUSSEN_AUSLASSEN),
+         erfassung.Richtlinie(periode=DRUCK_PERIODE)),
+        namen=('innen', 'aussen', 'druck'),
+    )
 
 
 # LEDs
@@ -94,18 +176,36 @@ led_rot = Pin(LED_ROT, Pin.OUT)
 led_gelb = Pin(LED_GELB, Pin.OUT)
 led_gruen = Pin(LED_GRUEN, Pin.OUT)
 
+# Nach deepsleep zeigen die LEDs sofort wieder den letzten Zustand, noch
+# bevor das Display initialisiert ist
+zustand = sparbetrieb.Zustand(ZUSTAND_DATEI)
+if STROMSPAREN and zustand.lade() and zustand.status is not None:
+    {laufzeit.ROT: led_rot, laufzeit.GELB: led_gelb, laufzeit.GRUEN: led_gruen}[zustand.status].on()
+
 
 # Display
-spi = SPI(0, baudrate=30000000, sck=Pin(SPI_SCK), mosi=Pin(SPI_MOSI))
+spi = SPI(SPI_ID, baudrate=30000000, sck=Pin(SPI_SCK), mosi=Pin(SPI_MOSI))
 tft = st7789.ST7789(
     spi, TFT_WIDTH, TFT_HEIGHT,
     reset=Pin(LCD_RST, Pin.OUT),
     dc=Pin(LCD_DC, Pin.OUT),
     cs=Pin(LCD_CS, Pin.OUT),
-    rotation=3  # 270° Rotation für Waveshare 1.47" Display
+    rotation=3,  # 270° Rotation für Waveshare 1.47" Display
+    **({'spi_id': SPI_ID} if DISPLAY_DMA else {})
 )
-tft.init()
-Pin(LCD_BL, Pin.OUT).on()
+backlight = Pin(LCD_BL, Pin.OUT)
+# Im Tiefschlaf ohne Anzeige bleibt das Panel im Sleep-Modus, der Neustart
+# spart sich die Initialisierung
+if not (STROMSPAREN == sparbetrieb.TIEF and not ANZEIGE_DAUER):
+    tft.init()
+backlight.value(not STROMSPAREN)
+
+
+# PMU (nur für die Strommessung im Stromsparbetrieb)
+pmu = None
+if PMU_VORHANDEN:
+    import axp202c
+    pmu = axp202c.PMU(i2c=i2c)
 
 
 
@@ -113,48 +213,62 @@ Pin(LCD_BL, Pin.OUT).on()
 # ========== FUNKTIONEN ==========
 
 
-def zeige_dashboard(status, status_farbe, daten):
-    """Zeigt ein strukturiertes Dashboard mit Farben an."""
-    tft.fill(FARBE_HINTERGRUND)
-    
-    innen_t, innen_rh, aussen_t, aussen_rh, druck, tp_innen, tp_aussen = daten
+# --- DASHBOARD (retained: nur geänderte Felder werden neu gezeichnet) ---
+ziel = Palettenpuffer(tft, TFT_WIDTH, TFT_HEIGHT, FARBE_HINTERGRUND) if RAHMENPUFFER else tft
+dashboard = Dashboard(ziel, font, TFT_WIDTH, TFT_HEIGHT, FARBE_HINTERGRUND)
 
 
-    # --- INNENRAUM ---
-    tft.text(font, "INNEN", 15, 15, FARBE_INFO)
-    tft.text(font, f"Temp: {innen_t:.1f} C", 15, 35, FARBE_WERT)
-    tft.text(font, f"Feuchte: {innen_rh:.1f} %", 15, 50, FARBE_WERT)
-    tft.text(font, f"Taupunkt: {tp_innen:.1f} C", 15, 65, FARBE_WERT)
+def _wertzeile(beschriftung, y, format, zeichen, farbe=FARBE_WERT):
+    dashboard.hinzu(Label(15, y, beschriftung, farbe, FARBE_HINTERGRUND))
+    x = 15 + len(beschriftung) * font.WIDTH
+    return dashboard.hinzu(Wertfeld(x, y, zeichen, format, farbe, FARBE_HINTERGRUND))
 
 
-    # --- AUSSENBEREICH ---
-    tft.text(font, "AUSSEN", 15, 100, FARBE_INFO)
-    tft.text(font, f"Temp: {aussen_t:.1f} C", 15, 120, FARBE_WERT)
-    tft.text(font, f"Feuchte: {aussen_rh:.1f} %", 15, 135, FARBE_WERT)
-    tft.text(font, f"Taupunkt: {tp_aussen:.1f} C", 15, 150, FARBE_WERT)
-    
-    # --- DRUCK ---
-    tft.text(font, f"Druck: {druck:.0f} hPa", 15, 175, FARBE_DRUCK)
+# --- INNENRAUM ---
+dashboard.hinzu(Label(15, 15, "INNEN", FARBE_INFO, FARBE_HINTERGRUND))
+feld_innen_t = _wertzeile("Temp: ", 35, "{:.1f} C", 7)
+feld_innen_rh = _wertzeile("Feuchte: ", 50, "{:.1f} %", 7)
+feld_tp_innen = _wertzeile("Taupunkt: ", 65, "{:.1f} C", 7)
 
+# --- AUSSENBEREICH ---
+dashboard.hinzu(Label(15, 100, "AUSSEN", FARBE_INFO, FARBE_HINTERGRUND))
+feld_aussen_t = _wertzeile("Temp: ", 120, "{:.1f} C", 7)
+feld_aussen_rh = _wertzeile("Feuchte: ", 135, "{:.1f} %", 7)
+feld_tp_aussen = _wertzeile("Taupunkt: ", 150, "{:.1f} C", 7)
 
-    # --- STATUSLEISTE ---
-    status_y_pos = 200
-    tft.fill_rect(0, status_y_pos, TFT_WIDTH, TFT_HEIGHT - status_y_pos, status_farbe)
-    
-    # Text zentrieren für eine saubere Optik
-    text_breite = len(status) * 8 # Breite des Fonts ist 8px
-    text_x = (TFT_WIDTH - text_breite) // 2
-    text_y = status_y_pos + 15
-    tft.text(font, status, text_x, text_y, FARBE_TEXT)
+# --- DRUCK ---
+feld_druck = _wertzeile("Druck: ", 175, "{:.0f} hPa", 8, FARBE_DRUCK)
 
+# --- GROSSANZEIGE INNEN (nur geänderte Ziffern werden neu gezeichnet) ---
+gross_innen_t = dashboard.hinzu(Grosswert(15, 200, font_gross, 5, "{:.1f}°", FARBE_WERT, FARBE_HINTERGRUND))
+dashboard.hinzu(Label(140, 216, "T", FARBE_INFO, FARBE_HINTERGRUND))
+gross_tp_innen = dashboard.hinzu(Grosswert(15, 245, font_gross, 5, "{:.1f}°", FARBE_WERT, FARBE_HINTERGRUND))
+dashboard.hinzu(Label(140, 261, "TP", FARBE_INFO, FARBE_HINTERGRUND))
 
+# --- STATUSLEISTE ---
+status_y_pos = 290
+statusleiste = dashboard.hinzu(Statusleiste(
+    status_y_pos, TFT_WIDTH, TFT_HEIGHT - status_y_pos, text_y=11, textfarbe=FARBE_TEXT))
+
+
+def zeige_dashboard(status, status_farbe, daten):
+    """Zeigt ein strukturiertes Dashboard mit Farben an."""
+    innen_t, innen_rh, aussen_t, aussen_rh, druck, tp_innen, tp_aussen = daten
+    feld_innen_t.setze(innen_t)
+    feld_innen_rh.setze(innen_rh)
+    feld_tp_innen.setze(tp_innen)
+    feld_aussen_t.setze(aussen_t)
+    feld_aussen_rh.setze(aussen_rh)
+    feld_tp_aussen.setze(tp_aussen)
+    feld_druck.setze(druck)
+    gross_innen_t.setze(innen_t)
+    gross_tp_innen.setze(tp_innen)
+    statusleiste.setze(status, status_farbe)
+    return dashboard.zeichne()
 
 
 def berechne_taupunkt(temp, rh):
-    # Magnus-Formel Konstanten
-    a, b = 17.27, 237.7
-    alpha = ((a * temp) / (b + temp)) + math.log(rh / 100.0)
-    return (b * alpha) / (a - alpha)
+    return formel.taupunkt(temp, rh)
 
 
 def schalte_leds(status):
@@ -169,66 +283,38 @@ def schalte_leds(status):
         led_gruen.on()
 
 
-def hole_daten():
-    try:
-        innen_t, innen_rh = sensor_innen.measurements
-        aussen_t = sensor_aussen.temperature
-        aussen_rh = sensor_aussen.relative_humidity
-        druck = sensor_druck.pressure
-        
-        # Plausibilitätsprüfung (optional, aber empfohlen)
-        if not (-40 < innen_t < 80 and 0 <= innen_rh <= 100):
-            raise ValueError("Innen-Sensor liefert ungültige Werte")
-        
-        return innen_t, innen_rh, aussen_t, aussen_rh, druck
-    except Exception as e:
+def zeige_ergebnis(status, daten):
+    """Zeigt das Ergebnis eines Messzyklus der Laufzeit an."""
+    if sender is not None:
+        sender.sende(status, daten)
+    if status == laufzeit.FEHLER:
         tft.fill(STATUS_ROT)
         tft.text(font, "Sensorfehler!", 10, 10, FARBE_TEXT)
-        tft.text(font, str(e), 10, 30, FARBE_TEXT)
-        print("Fehler:", e)
-        return None
-
-
-def entscheide_lueften():
-    raw_daten = hole_daten()
-    if not raw_daten:
+        tft.text(font, str(daten), 10, 30, FARBE_TEXT)
+        # Fehlerbild überschreibt das Dashboard: nächstes Mal komplett aufbauen
+        dashboard.invalidiere()
         return
 
-
-    innen_t, innen_rh, aussen_t, aussen_rh, druck = raw_daten
-    tp_innen = berechne_taupunkt(innen_t, innen_rh)
-    tp_aussen = berechne_taupunkt(aussen_t, aussen_rh)
-
-
-    status = ""
-    status_farbe = FARBE_HINTERGRUND
-
-
-    if tp_aussen < (tp_innen - TAUPUNKT_GRENZE):
-        status = "Lueften empfohlen"
-        status_farbe = STATUS_GRUEN
-        schalte_leds("gruen")
-    elif tp_aussen >= tp_innen:
-        status = "Nicht lueften"
-        status_farbe = STATUS_ROT
-        schalte_leds("rot")
+    if status == laufzeit.GRUEN:
+        text, status_farbe = "Lueften empfohlen", STATUS_GRUEN
+    elif status == laufzeit.ROT:
+        text, status_farbe = "Nicht lueften", STATUS_ROT
     else:
-        status = "Bedingt lueften"
-        status_farbe = STATUS_GELB
-        schalte_leds("gelb")
+        text, status_farbe = "Bedingt lueften", STATUS_GELB
+    zeige_dashboard(text, status_farbe, daten)
 
+    if TELEMETRIE != 'text':
+        return
+    innen_t, innen_rh, aussen_t, aussen_rh, druck, tp_innen, tp_aussen = daten
+    x_innen = psychrometrie.mischungsverhaeltnis(innen_t, innen_rh, druck, formel)
+    x_aussen = psychrometrie.mischungsverhaeltnis(aussen_t, aussen_rh, druck, formel)
 
-    # Alle Daten in einem Tupel zusammenfassen für die Übergabe
-    display_daten = (innen_t, innen_rh, aussen_t, aussen_rh, druck, tp_innen, tp_aussen)
-    
-    # Die neue Dashboard-Funktion aufrufen
-    zeige_dashboard(status, status_farbe, display_daten)
-    
     # Konsolenausgabe für Debugging beibehalten
     print(
-        f"Innen: {innen_t:.1f}C, {innen_rh:.1f}%, TP: {tp_innen:.1f}C | "
-        f"Aussen: {aussen_t:.1f}C, {aussen_rh:.1f}%, TP: {tp_aussen:.1f}C | "
-        f"Status: {status}"
+        f"Innen: {innen_t:.1f}C, {innen_rh:.1f}%, TP: {tp_innen:.1f}C, x: {x_innen:.1f}g/kg | "
+        f"Aussen: {aussen_t:.1f}C, {aussen_rh:.1f}%, TP: {tp_aussen:.1f}C, x: {x_aussen:.1f}g/kg | "
+        f"Status: {text} | Display: {dashboard.bytes_gesendet} B"
+        + (f" | Bus: {plan.bericht()}" if plan is not None else "")
     )
 
 
@@ -237,6 +323,39 @@ def entscheide_lueften():
 # ========== HAUPTSCHLEIFE ==========
 
 
-while True:
-    entscheide_lueften()
-    time.sleep(INTERVALL)
\ No newline at end of file
+sender = telemetrie.Sender() if TELEMETRIE == 'binaer' else None
+
+messprotokoll = None
+if PROTOKOLL:
+    messprotokoll = protokoll.Protokoll('messungen', dateien=PROTOKOLL_DATEIEN,
+                                        datei_bytes=PROTOKOLL_DATEI_BYTES,
+                                        max_alter_s=PROTOKOLL_MAX_ALTER)
+
+takt_geber = None
+if INTERVALL_MIN:
+    takt_geber = takt.Takt(TAUPUNKT_GRENZE, min_s=INTERVALL_MIN, max_s=INTERVALL,
+                           hysterese=HYSTERESE)
+
+if STROMSPAREN:
+    # Messen, anzeigen, alles schlafen legen (siehe sparbetrieb.py)
+    sparbetrieb.Sparbetrieb(
+        (sensor_innen, sensor_aussen, sensor_druck),
+        formel, TAUPUNKT_GRENZE, schalte_leds, zeige_ergebnis,
+        intervall=INTERVALL, modus=STROMSPAREN,
+        tft=tft, backlight=backlight, anzeige_s=ANZEIGE_DAUER,
+        pmu=pmu, zustand=zustand, takt=takt_geber, plan=plan,
+        protokoll=messprotokoll,
+    ).run()
+else:
+    # Erfassung, Entscheidung und Anzeige laufen als eigene Tasks (siehe
+    # laufzeit.py), mit ZWEI_KERNE zeichnet Kern 1 (siehe zweikern.py)
+    app = laufzeit.Laufzeit(
+        (sensor_innen, sensor_aussen, sensor_druck),
+        formel, TAUPUNKT_GRENZE, schalte_leds, zeige_ergebnis,
+        intervall=INTERVALL,
+        anzeigekern=zweikern.Anzeigekern(zeige_ergebnis) if ZWEI_KERNE else None,
+        takt=takt_geber,
+        plan=plan,
+        protokoll=messprotokoll,
+    )
+    asyncio.run(app.run())
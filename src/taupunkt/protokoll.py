@@ -0,0 +1,364 @@
+# Messprotokoll im Flash
+# Bisher wurden Messwerte nur mit print() ausgegeben. Protokoll hält die
+# letzten Messungen in einem Ringpuffer aus array-Feldern (Centi-Einheiten,
+# 15 Bytes je Satz) und schreibt sie blockweise an Dateien im Flash an.
+#
+# Nur neu() und fehler() legen nichts auf dem Heap an: Werte kommen als ganze
+# Zahlen, die Zeit als Sekunden seit der letzten Synchronisation mit der RTC
+# (ticks_ms). Wer float-Messwerte hat, rechnet sie vorher um; das legt Objekte
+# an (so auch erfasse()). flush() kodiert höchstens einen Block (block_bytes)
+# und schreibt ihn mit einem einzigen write() an; die Dauer ist dadurch
+# begrenzt. faellig() meldet auch, wenn der älteste Satz im RAM älter als
+# max_alter_s ist: bei einem Reset gehen so höchstens diese Sätze verloren.
+#
+# Block: Kennung b'TL', Länge der Nutzdaten (uint16), Anzahl Sätze (uint8),
+# RTC-Zeit des ersten Satzes (uint32), Nutzdaten, CRC-8 über alles davor.
+# Nutzdaten: erster Satz absolut (5x int16, Status), jeder weitere Satz als
+# Steuerbyte und Zigzag-Varints der Differenzen zum Vorgänger:
+#   Bit 0..4  Feld i hat sich geändert, die Differenz folgt
+#   Bit 5     Zeitabstand ändert sich, der neue Abstand [s] folgt
+#   Bit 6     Status ändert sich, das Statusbyte folgt
+# Ein Tag mit Messungen im Minutentakt belegt so etwa 7 KB statt 21 KB.
+#
+# Geschrieben wird nur angehängt, immer ganze Blöcke, reihum in eine feste
+# Anzahl von Dateien (name_0.bin ...): ist eine voll, wird die älteste
+# überschrieben. Der Platz im Flash bleibt damit begrenzt und littlefs
+# verteilt die Schreibzugriffe.
+
+import os
+import struct
+import time
+from array import array
+
+from crc8 import crc8
+from laufzeit import FEHLER, STATUS
+
+# innen_t, innen_rh, aussen_t, aussen_rh [0,01 °C bzw. 0,01 %], druck [0,1 hPa]
+FELDER = 5
+UNGUELTIG = -32768
+
+KENNUNG = b'TL'
+_KOPF = '<2sHBI'
+_KOPF_BYTES = 9
+# Steuerbyte, 5 Felder und Zeit als Varint, Status
+_SATZ_MAX = 1 + FELDER * 3 + 5 + 1
+
+
+def _zeit_rtc():
+    """
+    :return: Sekunden laut RTC (time.time() ist unter CPython ein float)
+    """
+    return int(time.time())
+
+
+def _varint(puffer, pos, wert):
+    # Zigzag: kleine negative Werte bleiben kurz
+    wert = (wert << 1) ^ (wert >> 31)
+    while wert >= 0x80:
+        puffer[pos] = (wert & 0x7F) | 0x80
+        wert >>= 7
+        pos += 1
+    puffer[pos] = wert
+    return pos + 1
+
+
+def _lies_varint(daten, pos):
+    wert = 0
+    schieben = 0
+    while True:
+        b = daten[pos]
+        pos += 1
+        wert |= (b & 0x7F) << schieben
+        if b < 0x80:
+            return (wert >> 1) ^ -(wert & 1), pos
+        schieben += 7
+
+
+class Protokoll:
+    def __init__(self, name='messungen', dateien=4, datei_bytes=32768,
+                 groesse=128, block_bytes=512, max_alter_s=1800):
+        """
+        :param name: Dateien heißen name_0.bin bis name_<dateien-1>.bin
+        :param dateien: Anzahl der Dateien im Wechsel
+        :param datei_bytes: ab dieser Größe geht es mit der nächsten Datei weiter
+        :param groesse: Plätze im Ringpuffer; ist er voll, wird der älteste
+                        Satz überschrieben
+        :param block_bytes: größter Block, den flush() auf einmal schreibt
+        :param max_alter_s: spätestens dann ist ein Satz fällig [s], None = nur
+                            nach Füllstand
+        """
+        self.name = name
+        self.dateien = dateien
+        self.datei_bytes = datei_bytes
+        self.groesse = groesse
+        self.max_alter_s = max_alter_s
+        self._zeit = array('i', (0 for _ in range(groesse)))
+        self._werte = array('h', (0 for _ in range(groesse * FELDER)))
+        self._status = bytearray(groesse)
+        self._kopf = 0
+        self._anzahl = 0
+        self.verworfen = 0
+        self._block = bytearray(block_bytes)
+        self.synchronisiere()
+        self.statistik = {
+            'saetze': 0,
+            'bloecke': 0,
+            'bytes': 0,
+            'flush_ms': 0,
+            'flush_max_ms': 0,
+        }
+        self._datei, self._datei_groesse = self._finde_aktuelle()
+
+    def __len__(self):
+        return self._anzahl
+
+    def pfad(self, nummer):
+        return '%s_%d.bin' % (self.name, nummer)
+
+    def synchronisiere(self):
+        """
+        Liest die RTC neu; nur bei leerem Ringpuffer, sonst stimmen die
+        gespeicherten Zeiten nicht mehr.
+        """
+        if self._anzahl:
+            return False
+        self._basis_s = _zeit_rtc()
+        self._basis_ticks = time.ticks_ms()
+        return True
+
+    def _finde_aktuelle(self):
+        """
+        :return: (Nummer, Größe) der Datei mit dem neuesten ersten Block
+        """
+        beste, beste_zeit, beste_groesse = 0, -1, 0
+        kopf = bytearray(_KOPF_BYTES)
+        for nummer in range(self.dateien):
+            try:
+                with open(self.pfad(nummer), 'rb') as f:
+                    if f.readinto(kopf) != _KOPF_BYTES:
+                        continue
+                    groesse = f.seek(0, 2)
+            except OSError:
+                continue
+            kennung, _, _, zeit = struct.unpack(_KOPF, kopf)
+            if kennung == KENNUNG and zeit > beste_zeit:
+                beste, beste_zeit, beste_groesse = nummer, zeit, groesse
+        return beste, beste_groesse
+
+    def neu(self, innen_t, innen_rh, aussen_t, aussen_rh, druck, status=0):
+        """
+        Hängt einen Satz an, ohne Heap-Allokation.
+        :param innen_t: usw. ganze Zahlen in 0,01 °C / 0,01 % / 0,1 hPa,
+                        UNGUELTIG für fehlende Werte
+        :param status: Index in STATUS
+        :return: False, wenn dafür der älteste Satz verworfen wurde
+        """
+        groesse = self.groesse
+        frei = self._anzahl < groesse
+        if frei:
+            self._anzahl += 1
+        else:
+            self._kopf += 1
+            if self._kopf == groesse:
+                self._kopf = 0
+            self.verworfen += 1
+        i = self._kopf + self._anzahl - 1
+        if i >= groesse:
+            i -= groesse
+        self._zeit[i] = time.ticks_diff(time.ticks_ms(), self._basis_ticks) // 1000
+        j = i * FELDER
+        werte = self._werte
+        werte[j] = innen_t
+        werte[j + 1] = innen_rh
+        werte[j + 2] = aussen_t
+        werte[j + 3] = aussen_rh
+        werte[j + 4] = druck
+        self._status[i] = status
+        self.statistik['saetze'] += 1
+        return frei
+
+    def fehler(self):
+        """
+        Hängt einen Satz ohne Messwerte an (Sensorfehler), ohne Heap-Allokation.
+        """
+        return self.neu(UNGUELTIG, UNGUELTIG, UNGUELTIG, UNGUELTIG, UNGUELTIG, 3)
+
+    def erfasse(self, status, daten):
+        """
+        Bequemere Form von neu() für (status, daten) wie bei zeige();
+        rechnet mit float und legt darum Objekte an. Laufzeit und
+        Sparbetrieb rufen neu() und fehler() direkt auf.
+        """
+        if status == FEHLER:
+            self.fehler()
+            return
+        innen_t, innen_rh, aussen_t, aussen_rh, druck = daten[:5]
+        self.neu(round(innen_t * 100), round(innen_rh * 100), round(aussen_t * 100),
+                 round(aussen_rh * 100), round(druck * 10), STATUS.index(status))
+
+    def faellig(self):
+        """
+        :return: True, wenn die Sätze im Ringpuffer etwa einen Block füllen,
+                 der Puffer zu drei Vierteln voll ist oder der älteste Satz
+                 älter als max_alter_s ist
+        """
+        anzahl = self._anzahl
+        if not anzahl:
+            return False
+        if anzahl * 6 >= len(self._block) - _KOPF_BYTES or anzahl * 4 >= self.groesse * 3:
+            return True
+        if self.max_alter_s is None:
+            return False
+        jetzt = time.ticks_diff(time.ticks_ms(), self._basis_ticks) // 1000
+        return jetzt - self._zeit[self._kopf] >= self.max_alter_s
+
+    def _kodiere(self):
+        """
+        Kodiert Sätze ab dem Kopf des Ringpuffers in den Blockpuffer.
+        :return: (Länge des Blocks, Anzahl Sätze)
+        """
+        block = self._block
+        ende = len(block) - 1  # Platz für die CRC
+        groesse = self.groesse
+        zeit, werte, status = self._zeit, self._werte, self._status
+        i = self._kopf
+        j = i * FELDER
+        pos = _KOPF_BYTES
+        for k in range(FELDER):
+            struct.pack_into('<h', block, pos, werte[j + k])
+            pos += 2
+        block[pos] = status[i]
+        pos += 1
+        anzahl = 1
+        abstand = 0
+        while anzahl < self._anzahl and anzahl < 255 and pos + _SATZ_MAX <= ende:
+            vorher = i
+            i += 1
+            if i == groesse:
+                i = 0
+            steuer_pos = pos
+            pos += 1
+            steuer = 0
+            jv = vorher * FELDER
+            j = i * FELDER
+            for k in range(FELDER):
+                diff = werte[j + k] - werte[jv + k]
+                if diff:
+                    steuer |= 1 << k
+                    pos = _varint(block, pos, diff)
+            diff = zeit[i] - zeit[vorher]
+            if diff != abstand:
+                steuer |= 0x20
+                pos = _varint(block, pos, diff)
+                abstand = diff
+            if status[i] != status[vorher]:
+                steuer |= 0x40
+                block[pos] = status[i]
+                pos += 1
+            block[steuer_pos] = steuer
+            anzahl += 1
+        struct.pack_into(_KOPF, block, 0, KENNUNG, pos - _KOPF_BYTES, anzahl,
+                         self._basis_s + zeit[self._kopf])
+        block[pos] = crc8(block, 0, pos)
+        return pos + 1, anzahl
+
+    def flush(self):
+        """
+        Schreibt höchstens einen Block aus dem Ringpuffer in den Flash.
+        :return: Anzahl geschriebener Sätze
+        """
+        if not self._anzahl:
+            return 0
+        start = time.ticks_ms()
+        laenge, anzahl = self._kodiere()
+        if self._datei_groesse + laenge > self.datei_bytes:
+            self._datei = (self._datei + 1) % self.dateien
+            self._datei_groesse = 0
+        # Neue Datei: die älteste wird dabei überschrieben
+        with open(self.pfad(self._datei), 'ab' if self._datei_groesse else 'wb') as f:
+            f.write(memoryview(self._block)[:laenge])
+        self._datei_groesse += laenge
+        self._kopf = (self._kopf + anzahl) % self.groesse
+        self._anzahl -= anzahl
+        self.synchronisiere()
+        statistik = self.statistik
+        statistik['bloecke'] += 1
+        statistik['bytes'] += laenge
+        dauer = time.ticks_diff(time.ticks_ms(), start)
+        statistik['flush_ms'] = dauer
+        if dauer > statistik['flush_max_ms']:
+            statistik['flush_max_ms'] = dauer
+        return anzahl
+
+    def flush_alle(self):
+        """
+        Schreibt den ganzen Ringpuffer, z. B. vor deepsleep.
+        """
+        while self._anzahl:
+            self.flush()
+
+    def dateien_alt_nach_neu(self):
+        """
+        :return: vorhandene Dateipfade, älteste zuerst
+        """
+        pfade = []
+        for k in range(1, self.dateien + 1):
+            pfad = self.pfad((self._datei + k) % self.dateien)
+            try:
+                os.stat(pfad)
+            except OSError:
+                continue
+            pfade.append(pfad)
+        return pfade
+
+
+def dekodiere(daten):
+    """
+    Liest Blöcke aus einem Datei-Abbild. Beschädigte Blöcke (CRC, Länge)
+    werden übersprungen, bis die nächste Kennung passt.
+    :return: Generator über (zeit, innen_t, innen_rh, aussen_t, aussen_rh,
+             druck, status) in RTC-Sekunden und Centi-Einheiten wie bei neu()
+    """
+    pos = 0
+    while pos + _KOPF_BYTES < len(daten):
+        if daten[pos:pos + 2] != KENNUNG:
+            pos += 1
+            continue
+        _, laenge, anzahl, zeit = struct.unpack_from(_KOPF, daten, pos)
+        ende = pos + _KOPF_BYTES + laenge
+        if ende >= len(daten) or crc8(daten, pos, ende - pos) != daten[ende]:
+            pos += 1
+            continue
+        p = pos + _KOPF_BYTES
+        werte = list(struct.unpack_from('<5h', daten, p))
+        status = daten[p + 10]
+        p += 11
+        yield (zeit,) + tuple(werte) + (status,)
+        abstand = 0
+        for _ in range(anzahl - 1):
+            steuer = daten[p]
+            p += 1
+            for k in range(FELDER):
+                if steuer & (1 << k):
+                    diff, p = _lies_varint(daten, p)
+                    werte[k] += diff
+            if steuer & 0x20:
+                abstand, p = _lies_varint(daten, p)
+            zeit += abstand
+            if steuer & 0x40:
+                status = daten[p]
+                p += 1
+            yield (zeit,) + tuple(werte) + (status,)
+        pos = ende + 1
+
+
+def lies(pfade):
+    """
+    :param pfade: Dateien, älteste zuerst (z. B. dateien_alt_nach_neu())
+    :return: Liste aller Sätze wie bei dekodiere()
+    """
+    saetze = []
+    for pfad in pfade:
+        with open(pfad, 'rb') as f:
+            saetze.extend(dekodiere(f.read()))
+    return saetze
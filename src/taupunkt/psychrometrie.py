@@ -0,0 +1,144 @@
+# Psychrometrische Formeln für Pico und Host
+# Austauschbare Sättigungsdampfdruck-Formeln (Magnus, Magnus-Tetens über Eis,
+# Arden Buck, Sonntag) und daraus abgeleitete Größen mit dem BMP280-Luftdruck.
+# Temperaturen in °C, rel. Feuchte in %, Drücke in hPa.
+
+import math
+
+# Gaskonstanten-Verhältnis Wasserdampf/trockene Luft * 1000 [g/kg]
+_EPSILON_G_KG = 621.98
+# 100 / R_w * 1000 [g*K/(m³*hPa)], R_w = 461.5 J/(kg*K)
+_ABS_FEUCHTE_FAKTOR = 216.68
+
+
+class Magnus:
+    """
+    Magnus-Formel es = c * exp(a*T / (b+T)).
+    Standard (a=17.27, b=237.7) entspricht der bisherigen berechne_taupunkt.
+    """
+
+    def __init__(self, a=17.27, b=237.7, c=6.1078):
+        self.a = a
+        self.b = b
+        self.c = c
+
+    def saettigungsdampfdruck(self, temp):
+        """
+        :param temp: Temperatur [°C]
+        :return: Sättigungsdampfdruck [hPa]
+        """
+        return self.c * math.exp((self.a * temp) / (self.b + temp))
+
+    def taupunkt(self, temp, rh):
+        """
+        Geschlossene Umkehrung der Magnus-Formel.
+        :param temp: Temperatur [°C]
+        :param rh: rel. Feuchte [%]
+        :return: Taupunkt [°C] (über Eis: Reifpunkt)
+        """
+        a, b = self.a, self.b
+        alpha = ((a * temp) / (b + temp)) + math.log(rh / 100.0)
+        return (b * alpha) / (a - alpha)
+
+
+class Buck:
+    """
+    Arden Buck (1981): es = 6.1121 * exp((18.678 - T/234.5) * T/(257.14+T)).
+    Der Exponent ist in T quadratisch, der Taupunkt daher geschlossen lösbar.
+    """
+
+    a = 18.678
+    b = 257.14
+    d = 234.5
+    c = 6.1121
+
+    def saettigungsdampfdruck(self, temp):
+        return self.c * math.exp((self.a - temp / self.d) * (temp / (self.b + temp)))
+
+    def taupunkt(self, temp, rh):
+        a, b, d = self.a, self.b, self.d
+        gamma = math.log(rh / 100.0) + (a - temp / d) * (temp / (b + temp))
+        # (a - x/d) * x = gamma * (b + x)  ->  x²/d - (a - gamma)*x + gamma*b = 0
+        p = a - gamma
+        return 0.5 * d * (p - math.sqrt(p * p - 4.0 * gamma * b / d))
+
+
+class Sonntag:
+    """
+    Sonntag (1990), Referenzformel der WMO über Wasser bzw. Eis.
+    Der Taupunkt hat keine geschlossene Form und wird per Newton-Verfahren
+    ausgehend vom Magnus-Wert bestimmt; mehr Iterationen = genauer, aber teurer.
+    """
+
+    _WASSER = (-6096.9385, 16.635794, -2.711193e-2, 1.673952e-5, 2.433502)
+    _EIS = (-6024.5282, 24.7219, 1.0613868e-2, -1.3198825e-5, -0.49382577)
+
+    def __init__(self, eis=False, iterationen=2):
+        self.k = self._EIS if eis else self._WASSER
+        self.iterationen = iterationen
+        self._start = MAGNUS_EIS if eis else MAGNUS
+
+    def _ln_es(self, tk):
+        k0, k1, k2, k3, k4 = self.k
+        return k0 / tk + k1 + k2 * tk + k3 * tk * tk + k4 * math.log(tk)
+
+    def saettigungsdampfdruck(self, temp):
+        return math.exp(self._ln_es(temp + 273.15))
+
+    def taupunkt(self, temp, rh):
+        k0, _, k2, k3, k4 = self.k
+        ziel = math.log(rh / 100.0) + self._ln_es(temp + 273.15)
+        tk = self._start.taupunkt(temp, rh) + 273.15
+        for _ in range(self.iterationen):
+            ableitung = -k0 / (tk * tk) + k2 + 2 * k3 * tk + k4 / tk
+            tk -= (self._ln_es(tk) - ziel) / ableitung
+        return tk - 273.15
+
+
+MAGNUS = Magnus()
+MAGNUS_EIS = Magnus(a=21.875, b=265.5, c=6.1078)  # Magnus-Tetens über Eis
+BUCK = Buck()
+SONNTAG = Sonntag()
+
+FORMELN = {
+    'magnus': MAGNUS,
+    'magnus_eis': MAGNUS_EIS,
+    'buck': BUCK,
+    'sonntag': SONNTAG,
+}
+
+
+def dampfdruck(temp, rh, formel=MAGNUS):
+    """
+    Wasserdampfpartialdruck.
+    :return: e [hPa]
+    """
+    return rh / 100.0 * formel.saettigungsdampfdruck(temp)
+
+
+def absolute_feuchte(temp, rh, formel=MAGNUS):
+    """
+    Absolute Feuchte (Wasserdampfdichte).
+    :return: [g/m³]
+    """
+    return _ABS_FEUCHTE_FAKTOR * dampfdruck(temp, rh, formel) / (temp + 273.15)
+
+
+def mischungsverhaeltnis(temp, rh, druck, formel=MAGNUS):
+    """
+    Masse Wasserdampf je Masse trockener Luft.
+    :param druck: Luftdruck [hPa], z. B. vom BMP280
+    :return: [g/kg]
+    """
+    e = dampfdruck(temp, rh, formel)
+    return _EPSILON_G_KG * e / (druck - e)
+
+
+def enthalpie(temp, rh, druck, formel=MAGNUS):
+    """
+    Spezifische Enthalpie feuchter Luft bezogen auf trockene Luft.
+    :param druck: Luftdruck [hPa]
+    :return: [kJ/kg]
+    """
+    x = mischungsverhaeltnis(temp, rh, druck, formel) / 1000.0
+    return 1.006 * temp + x * (2501.0 + 1.86 * temp)
@@ -0,0 +1,228 @@
+# Palettenpuffer für das ST7789
+# Ein RGB565-Bild des 172x320-Panels bräuchte 110 KB. Die Dashboards kommen
+# mit weniger als 16 Farben aus, daher hält der Puffer 4 Bit je Pixel (27 KB)
+# und bietet dieselben Zeichenbefehle wie das tft-Objekt (fill, fill_rect,
+# pixel, text). Geänderte Kacheln werden vermerkt; flush() wandelt nur diese
+# zeilenweise zusammenhängend in RGB565 um und schickt sie per blit_buffer()
+# – das Panel sieht so nur fertige Bilder, kein Flackern beim Neuzeichnen.
+
+KACHEL = 16
+
+# Fensterbefehle je blit_buffer: CASET, RASET, RAMWR + 2x4 Parameterbytes
+_FENSTER_BYTES = 11
+
+
+class Palettenpuffer:
+    def __init__(self, tft, breite, hoehe, hintergrund=0, kachel=KACHEL):
+        """
+        :param tft: Display mit blit_buffer() (optional blit_buffer_async())
+        :param breite: Panelbreite [px], gerade
+        :param hoehe: Panelhöhe [px]
+        :param hintergrund: RGB565-Farbe, mit der der Puffer beginnt (Index 0)
+        :param kachel: Kantenlänge der Kacheln [px], gerade
+        """
+        if breite % 2 or kachel % 2:
+            raise ValueError("Breite und Kachel müssen gerade sein")
+        self.tft = tft
+        self.breite = breite
+        self.hoehe = hoehe
+        self.kachel = kachel
+        self._zeilenbytes = breite // 2
+        self.puffer = bytearray(self._zeilenbytes * hoehe)
+        self.palette = []
+        self._index = {}
+        self._lut = None
+        self.kacheln_x = (breite + kachel - 1) // kachel
+        self.kacheln_y = (hoehe + kachel - 1) // kachel
+        self.schmutzig = bytearray(self.kacheln_x * self.kacheln_y)
+        # Mit DMA wird ein Band übertragen, während das nächste entsteht
+        self._async = hasattr(tft, 'blit_buffer_async')
+        self._baender = [bytearray(breite * kachel * 2) for _ in range(2 if self._async else 1)]
+        self._naechstes = 0
+        self.bytes_gesendet = 0
+        self.farbindex(hintergrund)
+
+    def farbindex(self, farbe):
+        """
+        :param farbe: RGB565-Farbe
+        :return: Paletteneintrag, neue Farben werden angehängt
+        """
+        i = self._index.get(farbe)
+        if i is None:
+            if len(self.palette) == 16:
+                raise ValueError("Palette voll: höchstens 16 Farben")
+            i = len(self.palette)
+            self.palette.append(farbe)
+            self._index[farbe] = i
+            self._lut = None
+        return i
+
+    def _markiere(self, x, y, breite, hoehe):
+        k = self.kachel
+        schmutzig = self.schmutzig
+        for ky in range(y // k, (y + hoehe - 1) // k + 1):
+            zeile = ky * self.kacheln_x
+            for kx in range(x // k, (x + breite - 1) // k + 1):
+                schmutzig[zeile + kx] = 1
+
+    def fill(self, farbe):
+        i = self.farbindex(farbe)
+        zeile = bytes((i << 4 | i,)) * self._zeilenbytes
+        puffer = self.puffer
+        for o in range(0, len(puffer), self._zeilenbytes):
+            puffer[o:o + self._zeilenbytes] = zeile
+        for n in range(len(self.schmutzig)):
+            self.schmutzig[n] = 1
+
+    def fill_rect(self, x, y, breite, hoehe, farbe):
+        # Auf das Panel beschneiden
+        if x < 0:
+            breite += x
+            x = 0
+        if y < 0:
+            hoehe += y
+            y = 0
+        breite = min(breite, self.breite - x)
+        hoehe = min(hoehe, self.hoehe - y)
+        if breite <= 0 or hoehe <= 0:
+            return
+        i = self.farbindex(farbe)
+        puffer = self.puffer
+        xa = x
+        xe = x + breite
+        links = xa & 1
+        rechts = xe & 1
+        if links:
+            xa += 1
+        if rechts and xe > xa:
+            xe -= 1
+        n = max(0, (xe - xa) // 2)
+        muster = bytes((i << 4 | i,)) * n
+        for zeile in range(y, y + hoehe):
+            o = zeile * self._zeilenbytes
+            if links:
+                puffer[o + x // 2] = (puffer[o + x // 2] & 0xF0) | i
+            if n:
+                puffer[o + xa // 2:o + xa // 2 + n] = muster
+            if rechts and x + breite > xa:
+                puffer[o + xe // 2] = (puffer[o + xe // 2] & 0x0F) | (i << 4)
+        self._markiere(x, y, breite, hoehe)
+
+    def pixel(self, x, y, farbe):
+        if 0 <= x < self.breite and 0 <= y < self.hoehe:
+            i = self.farbindex(farbe)
+            o = y * self._zeilenbytes + x // 2
+            if x & 1:
+                self.puffer[o] = (self.puffer[o] & 0xF0) | i
+            else:
+                self.puffer[o] = (self.puffer[o] & 0x0F) | (i << 4)
+            self._markiere(x, y, 1, 1)
+
+    def text(self, font, text, x, y, farbe=0xFFFF, hintergrund=0):
+        """
+        Wie ST7789.text(): Bitmap-Font mit WIDTH, HEIGHT, FIRST, LAST und FONT;
+        Zeichen, die nicht ganz auf das Panel passen, entfallen.
+        """
+        w = font.WIDTH
+        h = font.HEIGHT
+        if y < 0 or y + h > self.hoehe or x < 0:
+            return
+        if isinstance(text, int):
+            text = bytes((text & 0xFF,))
+        elif isinstance(text, str):
+            text = text.encode()
+        vg = self.farbindex(farbe)
+        hg = self.farbindex(hintergrund)
+        # Zwei Pixel (Bitpaar des Glyphen) ergeben ein Pufferbyte
+        paar = (hg << 4 | hg, hg << 4 | vg, vg << 4 | hg, vg << 4 | vg)
+        nibble = (hg, vg)
+        first = font.FIRST
+        last = font.LAST
+        daten = font.FONT
+        wide = w // 8
+        puffer = self.puffer
+        zb = self._zeilenbytes
+        x0 = x
+        for c in text:
+            if c < first or c > last:
+                continue
+            if x0 + w > self.breite:
+                break
+            idx = (c - first) * h * wide
+            o = y * zb + x0 // 2
+            for _ in range(h):
+                v = 0
+                for _ in range(wide):
+                    v = v << 8 | daten[idx]
+                    idx += 1
+                if x0 & 1:
+                    puffer[o] = (puffer[o] & 0xF0) | nibble[(v >> (w - 1)) & 1]
+                    for n in range(1, w // 2):
+                        puffer[o + n] = paar[(v >> (w - 1 - 2 * n)) & 3]
+                    e = o + w // 2
+                    puffer[e] = (puffer[e] & 0x0F) | (nibble[v & 1] << 4)
+                else:
+                    for n in range(w // 2):
+                        puffer[o + n] = paar[(v >> (w - 2 - 2 * n)) & 3]
+                o += zb
+            x0 += w
+        if x0 > x:
+            self._markiere(x, y, x0 - x, h)
+
+    def _baue_lut(self):
+        """
+        Je Pufferbyte die 4 RGB565-Bytes (big endian) seiner zwei Pixel.
+        """
+        farben = self.palette + [0] * (16 - len(self.palette))
+        lut = []
+        for b in range(256):
+            hi = farben[b >> 4]
+            lo = farben[b & 0x0F]
+            lut.append(bytes((hi >> 8, hi & 0xFF, lo >> 8, lo & 0xFF)))
+        self._lut = lut
+
+    def flush(self):
+        """
+        Schickt alle geänderten Kacheln an das Panel; nebeneinanderliegende
+        Kacheln einer Kachelzeile gehen gemeinsam in einem Fenster.
+        :return: an das Panel gesendete Bytes
+        """
+        if self._lut is None:
+            self._baue_lut()
+        lut = self._lut
+        puffer = self.puffer
+        zb = self._zeilenbytes
+        k = self.kachel
+        schmutzig = self.schmutzig
+        gesendet = 0
+        for ky in range(self.kacheln_y):
+            zeile = ky * self.kacheln_x
+            kx = 0
+            while kx < self.kacheln_x:
+                if not schmutzig[zeile + kx]:
+                    kx += 1
+                    continue
+                start = kx
+                while kx < self.kacheln_x and schmutzig[zeile + kx]:
+                    schmutzig[zeile + kx] = 0
+                    kx += 1
+                xa = start * k
+                xe = min(kx * k, self.breite)
+                ya = ky * k
+                ye = min(ya + k, self.hoehe)
+                band = self._baender[self._naechstes]
+                j = 0
+                for y in range(ya, ye):
+                    o = y * zb + xa // 2
+                    for n in range(o, o + (xe - xa) // 2):
+                        band[j:j + 4] = lut[puffer[n]]
+                        j += 4
+                # blit_buffer sendet nur breite*hoehe*2 Bytes des Bands
+                if self._async:
+                    self.tft.blit_buffer_async(band, xa, ya, xe - xa, ye - ya)
+                    self._naechstes ^= 1
+                else:
+                    self.tft.blit_buffer(band, xa, ya, xe - xa, ye - ya)
+                gesendet += j + _FENSTER_BYTES
+        self.bytes_gesendet = gesendet
+        return gesendet
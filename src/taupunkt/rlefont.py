@@ -0,0 +1,76 @@
+# Lauflängenkodierte Fonts (micropython/tools/rle_font.py)
+# Das Format ist zeilenweise: je Datensatz eine Zeile aus Läufen, abwechselnd
+# Hintergrund und Vordergrund, mit Wiederholungszähler für gleiche Zeilen.
+# write() des C-Treibers dekodiert es direkt in seinen Zeilenpuffer, wenn
+# der Treiber das mit ST7789.RLE meldet. Für alle anderen Ziele
+# (Palettenpuffer, ältere Firmware, deren write() die Läufe als Bitmap
+# zeichnen würde) werden aus den Datensätzen Rechtecke: ein Vordergrundlauf
+# über n gleiche Zeilen ist ein fill_rect().
+
+# Fensterbefehle je Zeichenaufruf, wie in dashboard
+_FENSTER_BYTES = 11
+
+
+def glyphe(font, zeichen):
+    """
+    :return: (Byte-Offset in BITMAPS, Breite) oder None, wenn das Zeichen
+             nicht im Font ist
+    """
+    i = font.MAP.find(zeichen)
+    if i < 0:
+        return None
+    o = font.OFFSETS
+    return o[2 * i] << 8 | o[2 * i + 1], font.WIDTHS[i]
+
+
+def breite(font, text):
+    """
+    :return: Breite des Texts [px]; Zeichen außerhalb des Fonts zählen nicht
+    """
+    summe = 0
+    for zeichen in text:
+        g = glyphe(font, zeichen)
+        if g is not None:
+            summe += g[1]
+    return summe
+
+
+def rechtecke(font, offset):
+    """
+    Vordergrund einer Glyphe als Rechtecke (x, y, breite, hoehe) relativ zu
+    ihrer linken oberen Ecke.
+    """
+    daten = font.BITMAPS
+    y = 0
+    while y < font.HEIGHT:
+        wiederholung = daten[offset]
+        laeufe = daten[offset + 1]
+        x = 0
+        for n in range(laeufe):
+            lauf = daten[offset + 2 + n]
+            if n & 1 and lauf:
+                yield x, y, lauf, wiederholung
+            x += lauf
+        offset += 2 + laeufe
+        y += wiederholung
+
+
+def zeichne(tft, font, zeichen, x, y, farbe, hintergrund):
+    """
+    Zeichnet eine Glyphe, mit write() eines Treibers mit RLE oder als Rechtecke.
+    :return: (Breite, gesendete Bytes); (0, 0) für Zeichen außerhalb des Fonts
+    """
+    g = glyphe(font, zeichen)
+    if g is None:
+        return 0, 0
+    offset, w = g
+    h = font.HEIGHT
+    if getattr(tft, 'RLE', 0):
+        tft.write(font, zeichen, x, y, farbe, hintergrund)
+        return w, w * h * 2 + _FENSTER_BYTES
+    tft.fill_rect(x, y, w, h, hintergrund)
+    gesendet = w * h * 2 + _FENSTER_BYTES
+    for rx, ry, rw, rh in rechtecke(font, offset):
+        tft.fill_rect(x + rx, y + ry, rw, rh, farbe)
+        gesendet += rw * rh * 2 + _FENSTER_BYTES
+    return w, gesendet
@@ -3,6 +3,21 @@
 # Vervollständigt und erweitert um Fehlerbehandlung, CRC-Prüfung und Dokumentation
 
 import time
+from crc8 import crc8, TABELLE as _CRC8_TABELLE
+
+_COMMANDS = {
+    'high': b'\xFD',    # Single shot high precision
+    'medium': b'\xF6',  # Single shot medium precision
+    'low': b'\xE0',     # Single shot low precision
+}
+
+# Maximale Messdauer laut Datenblatt (8.3 / 4.5 / 1.6 ms), aufgerundet [ms]
+_DAUER_MS = {
+    'high': 9,
+    'medium': 5,
+    'low': 2,
+}
+
 
 class SHT4x:
     def __init__(self, i2c, address=0x44):
@@ -13,23 +28,88 @@ class SHT4x:
         """
         self.i2c = i2c
         self.addr = address
+        # Vorab angelegter Lesepuffer: eine Messung erzeugt keine Heap-Objekte
+        self._buf = memoryview(bytearray(6))
+        self.temp_raw = 0
+        self.hum_raw = 0
 
     def _crc8(self, data):
         """
-        Berechnet den CRC8 nach Sensirion-Standard für 2 Bytes.
-        :param data: Bytes (2 Byte)
+        Berechnet den CRC8 nach Sensirion-Standard (Tabelle, Polynom 0x31).
+        :param data: Bytes
         :return: CRC8-Wert
         """
-        crc = 0xFF
-        for byte in data:
-            crc ^= byte
-            for _ in range(8):
-                if crc & 0x80:
-                    crc = (crc << 1) ^ 0x31
-                else:
-                    crc <<= 1
-                crc &= 0xFF
-        return crc
+        return crc8(data, 0, len(data))
+
+    def _check_crc(self):
+        """
+        Prüft beide CRC-Bytes im Lesepuffer ohne Slices.
+        """
+        buf = self._buf
+        return (_CRC8_TABELLE[_CRC8_TABELLE[0xFF ^ buf[0]] ^ buf[1]] == buf[2]
+                and _CRC8_TABELLE[_CRC8_TABELLE[0xFF ^ buf[3]] ^ buf[4]] == buf[5])
+
+    def _read_into(self, command, delay=0.01):
+        """
+        Sendet ein Kommando und liest 6 Bytes in den Lesepuffer.
+        :raises ValueError: bei CRC-Fehler
+        """
+        self.i2c.writeto(self.addr, command)
+        time.sleep(delay)
+        self._collect_into()
+
+    def _collect_into(self):
+        """
+        Liest 6 Bytes einer laufenden Messung in den Lesepuffer.
+        :raises ValueError: bei CRC-Fehler
+        """
+        self.i2c.readfrom_into(self.addr, self._buf)
+        if not self._check_crc():
+            raise ValueError('CRC-Fehler bei Sensordaten')
+        buf = self._buf
+        self.temp_raw = buf[0] << 8 | buf[1]
+        self.hum_raw = buf[3] << 8 | buf[4]
+
+    def _umrechnen(self):
+        """
+        Rechnet temp_raw und hum_raw in physikalische Werte um.
+        :return: (Temperatur [°C], rel. Feuchte [%])
+        """
+        temp = -45 + (175 * (self.temp_raw / 65535.0))
+        hum = 100 * (self.hum_raw / 65535.0)
+        return temp, hum
+
+    def measure_raw(self, precision='high'):
+        """
+        Einzelmessung ohne Heap-Allokation. Die Rohwerte stehen danach in
+        temp_raw und hum_raw (z. B. für taupunkt_fix.taupunkt_sht4x).
+        :param precision: 'high', 'medium', 'low'
+        :return: True bei Erfolg, sonst False
+        """
+        try:
+            self._read_into(_COMMANDS.get(precision, b'\xFD'))
+        except Exception as e:
+            print('Fehler beim Lesen vom SHT4x:', e)
+            return False
+        return True
+
+    def start(self, precision='high'):
+        """
+        Startet eine Einzelmessung, ohne auf das Ergebnis zu warten.
+        :param precision: 'high', 'medium', 'low'
+        :return: time.ticks_ms()-Zeitpunkt, ab dem collect() das Ergebnis liefert
+        """
+        self.i2c.writeto(self.addr, _COMMANDS.get(precision, b'\xFD'))
+        return time.ticks_add(time.ticks_ms(), _DAUER_MS.get(precision, 9))
+
+    def collect(self):
+        """
+        Liest das Ergebnis der mit start() begonnenen Messung.
+        :return: (Temperatur [°C], rel. Feuchte [%])
+        :raises ValueError: bei CRC-Fehler
+        """
+        self._collect_into()
+        return self._umrechnen()
 
     def _read_data(self, command, delay=0.01):
         """
@@ -39,13 +119,10 @@ class SHT4x:
         :return: (temp_raw, hum_raw) oder None bei Fehler
         """
         try:
-            self.i2c.writeto(self.addr, command)
-            time.sleep(delay)
-            data = self.i2c.readfrom(self.addr, 6)
-            if self._crc8(data[0:2]) != data[2] or self._crc8(data[3:5]) != data[5]:
-                raise ValueError('CRC-Fehler bei Sensordaten')
-            temp_raw = data[0] << 8 | data[1]
-            hum_raw = data[3] << 8 | data[4]
+            self._read_into(command, delay)
+            buf = self._buf
+            temp_raw = buf[0] << 8 | buf[1]
+            hum_raw = buf[3] << 8 | buf[4]
             return temp_raw, hum_raw
         except Exception as e:
             print('Fehler beim Lesen vom SHT4x:', e)
@@ -57,18 +134,9 @@ class SHT4x:
         :param precision: 'high', 'medium', 'low'
         :return: (Temperatur [°C], rel. Feuchte [%])
         """
-        commands = {
-            'high': b'\xFD',    # Single shot high precision
-            'medium': b'\xF6',  # Single shot medium precision
-            'low': b'\xE0',     # Single shot low precision
-        }
-        cmd = commands.get(precision, b'\xFD')
-        temp_raw, hum_raw = self._read_data(cmd)
-        if temp_raw is None:
+        if not self.measure_raw(precision):
             return None, None
-        temp = -45 + (175 * (temp_raw / 65535.0))
-        hum = 100 * (hum_raw / 65535.0)
-        return temp, hum
+        return self._umrechnen()
 
     def temperature(self, precision='high'):
         """
@@ -122,11 +190,11 @@ class SHT4x:
         try:
             self.i2c.writeto(self.addr, b'\x89')
             time.sleep(0.01)
-            serial_data = self.i2c.readfrom(self.addr, 6)
+            self.i2c.readfrom_into(self.addr, self._buf)
             # CRC-Prüfung für beide 2-Byte-Blöcke
-            if self._crc8(serial_data[0:2]) != serial_data[2] or self._crc8(serial_data[3:5]) != serial_data[5]:
+            if not self._check_crc():
                 raise ValueError('CRC-Fehler bei Seriennummer')
-            return ''.join(f'{byte:02X}' for byte in serial_data)
+            return ''.join(f'{byte:02X}' for byte in self._buf)
         except Exception as e:
             print('Fehler beim Auslesen der Seriennummer:', e)
             return None
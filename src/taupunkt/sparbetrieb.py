@@ -0,0 +1,365 @@
+# Stromsparbetrieb für Geräte am Akku (AXP202)
+# Statt 900 s mit laufender CPU, wachem Display und Hintergrundbeleuchtung zu
+# warten, misst Sparbetrieb einmal, schaltet die LEDs, zeigt das Ergebnis
+# optional einige Sekunden an und legt dann Display (SLPIN), Beleuchtung und
+# Sensoren schlafen. Bis zur nächsten Messung schläft der Pico:
+#   WACH    time.sleep (Vergleichswert, Display bleibt an)
+#   LEICHT  machine.lightsleep, RAM und GPIO-Zustände bleiben erhalten
+#   TIEF    machine.deepsleep, danach startet main.py neu
+# Letzte Messung und Entscheidung liegen in Zustand (Flash-Datei oder
+# RTC-Speicher), damit die LEDs nach dem Aufwachen sofort wieder stimmen.
+# Mit einer PMU misst der Coulombzähler den mittleren Strom je Zyklus,
+# getrennt nach Modus.
+
+import os
+import struct
+import time
+
+try:
+    import machine
+except ImportError:
+    machine = None  # Host: Tests setzen eine Attrappe ein
+
+import erfassung
+from laufzeit import FEHLER, GELB, GRUEN, ROT, STATUS, entscheide, grenzabstand
+
+WACH = 'wach'
+LEICHT = 'leicht'
+TIEF = 'tief'
+MODI = (WACH, LEICHT, TIEF)
+
+_STATUS = (GRUEN, GELB, ROT)
+_KEIN = 255
+_NAN = float('nan')
+
+# Kennung, Zyklus, Status, Modus, 7 Anzeigewerte, Coulombzähler [mAh],
+# geplante Schlafdauer [ms], je Modus (Zyklen, Summe mittlerer Strom [mA])
+_FORMAT = '<4sIBB7ffI' + 'If' * len(MODI)
+_KENNUNG = b'TPZ1'
+
+
+def _index(folge, wert):
+    return folge.index(wert) if wert in folge else _KEIN
+
+
+def nach_tiefschlaf():
+    """
+    :return: True, wenn dieser Start das Aufwachen aus machine.deepsleep ist.
+             ESP32 meldet DEEPSLEEP_RESET; rp2 beendet deepsleep mit einem
+             Watchdog-Reset, Einschalten und RUN-Taste melden PWRON_RESET.
+    """
+    reset_cause = getattr(machine, 'reset_cause', None)
+    if reset_cause is None:
+        return False
+    erwartet = getattr(machine, 'DEEPSLEEP_RESET', None)
+    if erwartet is None:
+        erwartet = getattr(machine, 'WDT_RESET', None)
+    return erwartet is not None and reset_cause() == erwartet
+
+
+class Zustand:
+    """
+    Zustand, der einen Neustart aus deepsleep überlebt (70 Bytes).
+    Mit rtc (machine.RTC mit memory(), z. B. ESP32) im RTC-Speicher, sonst in
+    einer Datei im Flash.
+    """
+
+    def __init__(self, pfad='zustand.bin', rtc=None):
+        self.pfad = pfad
+        self.rtc = rtc if rtc is not None and hasattr(rtc, 'memory') else None
+        self.geladen = False
+        self.zyklus = 0
+        self.status = None   # letzte gültige Entscheidung
+        self.modus = None    # Modus, in dem zuletzt geschlafen wurde
+        self.daten = None    # 7-Tupel der letzten gültigen Messung
+        self.coulomb_mah = None
+        self.schlaf_ms = 0
+        self.strom = {modus: [0, 0.0] for modus in MODI}
+
+    def lade(self):
+        """
+        :return: False, wenn kein gültiger Zustand gespeichert ist
+        """
+        try:
+            if self.rtc is not None:
+                roh = self.rtc.memory()
+            else:
+                with open(self.pfad, 'rb') as f:
+                    roh = f.read()
+        except OSError:
+            return False
+        groesse = struct.calcsize(_FORMAT)
+        if len(roh) < groesse:
+            return False
+        werte = struct.unpack(_FORMAT, roh[:groesse])
+        if werte[0] != _KENNUNG:
+            return False
+        self.zyklus = werte[1]
+        self.status = _STATUS[werte[2]] if werte[2] < len(_STATUS) else None
+        self.modus = MODI[werte[3]] if werte[3] < len(MODI) else None
+        daten = werte[4:11]
+        self.daten = None if daten[0] != daten[0] else daten
+        self.coulomb_mah = None if werte[11] != werte[11] else werte[11]
+        self.schlaf_ms = werte[12]
+        for i, modus in enumerate(MODI):
+            self.strom[modus] = [werte[13 + 2 * i], werte[14 + 2 * i]]
+        self.geladen = True
+        return True
+
+    def speichere(self):
+        werte = [_KENNUNG, self.zyklus, _index(_STATUS, self.status), _index(MODI, self.modus)]
+        werte.extend(self.daten or (_NAN,) * 7)
+        werte.append(_NAN if self.coulomb_mah is None else self.coulomb_mah)
+        werte.append(self.schlaf_ms)
+        for modus in MODI:
+            werte.extend(self.strom[modus])
+        roh = struct.pack(_FORMAT, *werte)
+        if self.rtc is not None:
+            self.rtc.memory(roh)
+            return
+        # Erst vollständig schreiben, dann umbenennen: ein Stromausfall
+        # hinterlässt den alten oder den neuen Zustand
+        neu = self.pfad + '.neu'
+        with open(neu, 'wb') as f:
+            f.write(roh)
+        os.rename(neu, self.pfad)
+
+    def mittlerer_strom(self, modus):
+        """
+        :return: mittlerer Strom je Zyklus im Modus [mA] oder None
+        """
+        anzahl, summe = self.strom[modus]
+        return summe / anzahl if anzahl else None
+
+
+class Sparbetrieb:
+    def __init__(self, sensoren, formel, grenze, schalte_leds, zeige,
+                 intervall=900, modus=LEICHT, tft=None, backlight=None,
+                 anzeige_s=10, pmu=None, zustand=None, takt=None, plan=None,
+                 protokoll=None):
+        """
+        :param sensoren: (innen, aussen, druck) mit start()/collect(); sleep()
+                         bzw. wake() werden aufgerufen, wenn vorhanden
+        :param formel: Taupunktformel aus psychrometrie.FORMELN
+        :param grenze: Taupunktgrenze [K]
+        :param schalte_leds: Funktion(status)
+        :param zeige: Funktion(status, daten) wie bei laufzeit.Laufzeit
+        :param intervall: Messintervall [s]
+        :param modus: WACH, LEICHT oder TIEF
+        :param tft: ST7789, wird zwischen den Anzeigen mit sleep_mode() schlafen gelegt
+        :param backlight: Pin der Hintergrundbeleuchtung
+        :param anzeige_s: so lange bleibt das Display nach jeder Messung an,
+                          0 = nur LEDs (zeige wird dann nicht aufgerufen)
+        :param pmu: optionaler axp202c.PMU für die Strommessung
+        :param zustand: Zustand, Standard: Datei zustand.bin
+        :param takt: optionaler takt.Takt; entscheidet dann mit Hysterese und
+                     ersetzt intervall durch ein adaptives Intervall
+        :param plan: optionaler erfassung.Erfassungsplan über dieselben
+                     Sensoren; nach deepsleep beginnt er jedes Mal neu
+        :param protokoll: optionales protokoll.Protokoll; vor deepsleep wird
+                          der ganze Ringpuffer gesichert, sonst blockweise
+        """
+        if modus not in MODI:
+            raise ValueError('Unbekannter Modus: %s' % modus)
+        self.sensoren = sensoren
+        self.formel = formel
+        self.grenze = grenze
+        self.schalte_leds = schalte_leds
+        self.zeige = zeige
+        self.intervall = intervall
+        self.modus = modus
+        self.tft = tft
+        self.backlight = backlight
+        self.anzeige_s = anzeige_s
+        self.pmu = pmu
+        self.zustand = zustand if zustand is not None else Zustand()
+        self.takt = takt
+        self.plan = plan
+        self.protokoll = protokoll
+        # Strom des letzten Zyklus [mA], None = noch nicht messbar
+        self.strom_ma = None
+        # Beginn der Wachphase; nach deepsleep zählt die Zeit seit dem Neustart
+        self._wach_seit = 0 if modus == TIEF else time.ticks_ms()
+        self._erster = True
+        # Nur dann schließt der erste Zyklus an den gespeicherten an
+        self._geweckt = modus == TIEF and nach_tiefschlaf()
+
+    def wecken(self):
+        """
+        Stellt die LEDs aus dem gespeicherten Zustand wieder her, ohne zu messen.
+        :return: True, wenn ein Zustand vorlag
+        """
+        if not (self.zustand.geladen or self.zustand.lade()):
+            return False
+        zustand = self.zustand
+        if zustand.status is not None:
+            self.schalte_leds(zustand.status)
+        if self.takt is not None and self.takt.status is None:
+            if self.modus == TIEF and zustand.modus == TIEF and zustand.daten is not None:
+                # Die letzte Messung lag etwa eine Schlafdauer vor dem Neustart
+                self.takt.vorgabe(zustand.status, zustand.daten[5], zustand.daten[6],
+                                  time.ticks_add(self._wach_seit, -zustand.schlaf_ms))
+            else:
+                self.takt.vorgabe(zustand.status)
+        return True
+
+    def _messe(self):
+        for sensor in self.sensoren:
+            wake = getattr(sensor, 'wake', None)
+            if wake is not None:
+                wake()
+        try:
+            if self.plan is None:
+                ergebnisse = erfassung.erfasse(self.sensoren)
+            else:
+                ergebnisse = self.plan.erfasse()
+            (innen_t, innen_rh), (aussen_t, aussen_rh), (_, druck) = ergebnisse
+            # Plausibilitätsprüfung wie in hole_daten
+            if not (-40 < innen_t < 80 and 0 <= innen_rh <= 100):
+                raise ValueError("Innen-Sensor liefert ungültige Werte")
+        except Exception as e:
+            print("Fehler:", e)
+            return e
+        return innen_t, innen_rh, aussen_t, aussen_rh, druck
+
+    def ruhe(self):
+        """
+        Display, Hintergrundbeleuchtung und Sensoren schlafen legen.
+        SHT4x und AHT20 ruhen nach jeder Messung von selbst.
+        """
+        if self.tft is not None:
+            self.tft.sleep_mode(True)
+        if self.backlight is not None:
+            self.backlight.off()
+        for sensor in self.sensoren:
+            sleep = getattr(sensor, 'sleep', None)
+            if sleep is not None:
+                sleep()
+
+    def _anzeige_an(self):
+        if self.tft is not None:
+            self.tft.sleep_mode(False)
+            # Nach SLPOUT 5 ms bis zum nächsten Befehl (Datenblatt 9.1.12)
+            time.sleep_ms(5)
+        if self.backlight is not None:
+            self.backlight.on()
+
+    def _miss_strom(self, zustand):
+        """
+        Mittlerer Strom seit dem Ende der letzten Wachphase aus dem
+        Coulombzähler: Schlafdauer plus diese Wachphase.
+        """
+        jetzt = self.pmu.getCoulombData()
+        # Nach einem Neustart ist die Lücke nur beim Aufwachen aus deepsleep
+        # bekannt; nach Einschalten, Reset oder Flashen wird nur neu
+        # aufgesetzt
+        vergleichbar = (zustand.coulomb_mah is not None and zustand.modus == self.modus
+                        and (self._geweckt or not self._erster))
+        if vergleichbar:
+            dauer_ms = zustand.schlaf_ms + time.ticks_diff(time.ticks_ms(), self._wach_seit)
+            if dauer_ms > 0:
+                # Entladung positiv
+                self.strom_ma = (zustand.coulomb_mah - jetzt) * 3600000 / dauer_ms
+                eintrag = zustand.strom[self.modus]
+                eintrag[0] += 1
+                eintrag[1] += self.strom_ma
+        zustand.coulomb_mah = jetzt
+
+    def zyklus(self):
+        """
+        Misst, schaltet die LEDs, zeigt an und legt alles schlafen.
+        :return: Schlafdauer bis zur nächsten Messung [ms]
+        """
+        zustand = self.zustand
+        werte = self._messe()
+        if isinstance(werte, Exception):
+            # LEDs und gespeicherter Zustand behalten die letzte gültige Entscheidung
+            status, daten = FEHLER, werte
+        else:
+            innen_t, innen_rh, aussen_t, aussen_rh, druck = werte
+            tp_innen = self.formel.taupunkt(innen_t, innen_rh)
+            tp_aussen = self.formel.taupunkt(aussen_t, aussen_rh)
+            if self.takt is None:
+                status = entscheide(tp_innen, tp_aussen, self.grenze)
+            else:
+                status = self.takt.entscheide(tp_innen, tp_aussen)
+            if self.plan is not None:
+                self.plan.melde_abstand(grenzabstand(tp_innen, tp_aussen, self.grenze))
+            self.schalte_leds(status)
+            daten = werte + (tp_innen, tp_aussen)
+            zustand.status = status
+            zustand.daten = daten
+
+        if self.anzeige_s:
+            self._anzeige_an()
+            self.zeige(status, daten)
+        if self.modus != WACH:
+            # Ergebnis stehen lassen, danach schläft alles (in WACH bleibt
+            # das Display wie bisher an)
+            if self.anzeige_s:
+                time.sleep(self.anzeige_s)
+            self.ruhe()
+
+        protokoll = self.protokoll
+        if protokoll is not None:
+            if status == FEHLER:
+                protokoll.fehler()
+            else:
+                protokoll.neu(round(daten[0] * 100), round(daten[1] * 100),
+                              round(daten[2] * 100), round(daten[3] * 100),
+                              round(daten[4] * 10), STATUS.index(status))
+            # Der Ringpuffer überlebt deepsleep nicht
+            if self.modus == TIEF:
+                protokoll.flush_alle()
+            elif protokoll.faellig():
+                protokoll.flush()
+        if self.pmu is not None:
+            self._miss_strom(zustand)
+        wach_ms = time.ticks_diff(time.ticks_ms(), self._wach_seit)
+        intervall = self.intervall if self.takt is None else self.takt.intervall_s
+        schlaf_ms = max(0, int(intervall * 1000) - wach_ms)
+        zustand.zyklus += 1
+        zustand.modus = self.modus
+        zustand.schlaf_ms = schlaf_ms
+        zustand.speichere()
+        return schlaf_ms
+
+    def schlafe(self, ms):
+        if self.modus == WACH:
+            time.sleep(ms / 1000)
+        elif self.modus == LEICHT:
+            machine.lightsleep(ms)
+        else:
+            # Kehrt auf dem Pico nicht zurück, main.py startet neu
+            machine.deepsleep(ms)
+        self._wach_seit = time.ticks_ms()
+        self._erster = False
+
+    def bericht(self):
+        """
+        Gibt den Strom des letzten Zyklus und die Mittelwerte je Modus aus.
+        """
+        teile = []
+        for modus in MODI:
+            mittel = self.zustand.mittlerer_strom(modus)
+            if mittel is not None:
+                teile.append("%s %.2f mA (%d)" % (modus, mittel, self.zustand.strom[modus][0]))
+        letzter = "-" if self.strom_ma is None else "%.2f mA" % self.strom_ma
+        print("Zyklus %d (%s): %s | Mittel: %s" % (
+            self.zustand.zyklus, self.modus, letzter, ", ".join(teile) or "-"))
+
+    def run(self, zyklen=None):
+        """
+        :param zyklen: Anzahl Zyklen, None = endlos
+        """
+        self.wecken()
+        if self.pmu is not None:
+            # Zählt weiter, wenn er schon läuft; gelöscht wird er nie
+            self.pmu.enableCoulombcounter()
+        n = 0
+        while zyklen is None or n < zyklen:
+            schlaf_ms = self.zyklus()
+            if self.pmu is not None:
+                self.bericht()
+            n += 1
+            self.schlafe(schlaf_ms)
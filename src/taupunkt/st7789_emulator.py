@@ -0,0 +1,806 @@
+# ST7789-Emulator für den Host
+# Bildet die Schnittstelle des C-Treibers aus csrc/ (Modul st7789) nach, aber
+# statt über SPI landen die Befehle bei einem nachgebildeten Panel: 240x320
+# RGB565-Bildspeicher, Adressfenster (CASET/RASET/RAMWR), MADCTL-Abbildung und
+# vertikales Scrollen (VSCRDEF/VSCSAD). Jede Zeichenfunktion schickt dieselben
+# Befehle und Datenbytes wie der Treiber, einschließlich seiner Eigenheiten
+# (Fenster außerhalb des Panels werden verworfen, die Daten landen dann im
+# vorigen Fenster). Gezählt werden Befehle und Bytes auf dem Bus.
+#
+# installiere() hängt den Emulator als st7789 und eine machine-Attrappe in
+# sys.modules ein, damit Anzeigecode wie lib/display_st7789.py unverändert
+# auf dem Host läuft. Nur für CPython gedacht – braucht NumPy.
+
+import struct
+import sys
+import types
+import zlib
+
+import numpy as np
+
+# Farben wie im C-Modul
+BLACK = 0x0000
+BLUE = 0x001F
+RED = 0xF800
+GREEN = 0x07E0
+CYAN = 0x07FF
+MAGENTA = 0xF81F
+YELLOW = 0xFFE0
+WHITE = 0xFFFF
+
+FAST = 0
+SLOW = 1
+
+MADCTL_MY = 0x80
+MADCTL_MX = 0x40
+MADCTL_MV = 0x20
+MADCTL_ML = 0x10
+MADCTL_MH = 0x04
+RGB = 0x00
+BGR = 0x08
+
+WRAP = 0x01
+WRAP_H = 0x02
+WRAP_V = 0x04
+
+# Befehle des Panels
+_SWRESET = 0x01
+_SLPIN = 0x10
+_SLPOUT = 0x11
+_NORON = 0x13
+_INVOFF = 0x20
+_INVON = 0x21
+_DISPON = 0x29
+_CASET = 0x2A
+_RASET = 0x2B
+_RAMWR = 0x2C
+_VSCRDEF = 0x33
+_MADCTL = 0x36
+_VSCSAD = 0x37
+_COLMOD = 0x3A
+
+# Bildspeicher des ST7789
+SPALTEN = 240
+ZEILEN = 320
+
+# Rotationstabellen des Treibers: (madctl, breite, hoehe, colstart, rowstart)
+ROTATIONEN = {
+    (240, 320): ((0x00, 240, 320, 0, 0), (0x60, 320, 240, 0, 0),
+                 (0xC0, 240, 320, 0, 0), (0xA0, 320, 240, 0, 0)),
+    (170, 320): ((0x00, 170, 320, 35, 0), (0x60, 320, 170, 0, 35),
+                 (0xC0, 170, 320, 35, 0), (0xA0, 320, 170, 0, 35)),
+    (172, 320): ((0x00, 172, 320, 34, 0), (0x60, 320, 172, 0, 34),
+                 (0xC0, 172, 320, 34, 0), (0xA0, 320, 172, 0, 34)),
+    (240, 240): ((0x00, 240, 240, 0, 0), (0x60, 240, 240, 0, 0),
+                 (0xC0, 240, 240, 0, 80), (0xA0, 240, 240, 80, 0)),
+    (135, 240): ((0x00, 135, 240, 52, 40), (0x60, 240, 135, 40, 53),
+                 (0xC0, 135, 240, 53, 40), (0xA0, 240, 135, 40, 52)),
+    (128, 160): ((0x00, 128, 160, 0, 0), (0x60, 160, 128, 0, 0),
+                 (0xC0, 128, 160, 0, 0), (0xA0, 160, 128, 0, 0)),
+    (80, 160): ((0x00, 80, 160, 26, 1), (0x60, 160, 80, 1, 26),
+                (0xC0, 80, 160, 26, 1), (0xA0, 160, 80, 1, 26)),
+    (128, 128): ((0x00, 128, 128, 2, 1), (0x60, 128, 128, 1, 2),
+                 (0xC0, 128, 128, 2, 3), (0xA0, 128, 128, 3, 2)),
+}
+
+
+def color565(red, green, blue):
+    return (red & 0xF8) << 8 | (green & 0xFC) << 3 | blue >> 3
+
+
+def _u16(wert):
+    return wert & 0xFFFF
+
+
+def _i16(wert):
+    wert &= 0xFFFF
+    return wert - 0x10000 if wert & 0x8000 else wert
+
+
+def _text_bytes(text):
+    if isinstance(text, int):
+        return bytes((text & 0xFF,))
+    if isinstance(text, str):
+        return text.encode()
+    return bytes(text)
+
+
+class ST7789:
+    # write() dekodiert lauflängenkodierte Fonts, wie ST7789.RLE im C-Treiber
+    RLE = 1
+
+    def __init__(self, spi, width, height, reset=None, dc=None, cs=None, backlight=None,
+                 rotations=None, rotation=0, custom_init=None, color_order=RGB,
+                 inversion=True, options=0, buffer_size=0, spi_id=-1):
+        """
+        Parameter wie beim C-Treiber; die Pins werden nur für on()/off()
+        benutzt.
+        """
+        self.spi = spi
+        self.display_width = width
+        self.display_height = height
+        self.backlight = backlight
+        self.rotations = rotations or ROTATIONEN.get((width, height))
+        self._rotation = rotation % (len(self.rotations) if self.rotations else 4)
+        self.custom_init = custom_init
+        self.color_order = color_order
+        self.inversion = inversion
+        self.options = options
+        self.buffer_size = buffer_size
+        self._width, self._height = width, height
+        self.colstart = self.rowstart = 0
+        self._madctl = color_order
+
+        # Zustand des Panels
+        self.speicher = np.zeros((ZEILEN, SPALTEN), np.uint16)
+        self.madctl_register = 0
+        self.schlafend = True
+        self.invertiert = False
+        self._fenster = (0, SPALTEN - 1, 0, ZEILEN - 1)
+        self._position = 0
+        self._ramwr = False
+        self.tfa, self.vsa, self.vssa = 0, ZEILEN, 0
+
+        # Zähler für den Bus
+        self.befehle = 0
+        self.bytes_gesendet = 0
+        self._befehle_treiber = 0
+        self.protokoll = None
+        self._geometrie()
+
+    # --- Bus ---
+
+    def _befehl(self, befehl, daten=b''):
+        self.befehle += 1
+        self._befehle_treiber += 1
+        self.bytes_gesendet += 1 + len(daten)
+        if self.protokoll is not None:
+            self.protokoll.append(befehl)
+        self._ramwr = befehl == _RAMWR
+        if befehl == _CASET:
+            self._fenster = (daten[0] << 8 | daten[1], daten[2] << 8 | daten[3]) + self._fenster[2:]
+        elif befehl == _RASET:
+            self._fenster = self._fenster[:2] + (daten[0] << 8 | daten[1], daten[2] << 8 | daten[3])
+        elif befehl == _RAMWR:
+            self._position = 0
+        elif befehl == _MADCTL:
+            self.madctl_register = daten[0]
+        elif befehl == _VSCRDEF:
+            self.tfa, self.vsa = daten[0] << 8 | daten[1], daten[2] << 8 | daten[3]
+        elif befehl == _VSCSAD:
+            self.vssa = daten[0] << 8 | daten[1]
+        elif befehl == _SWRESET:
+            self.madctl_register = 0
+            self.tfa, self.vsa, self.vssa = 0, ZEILEN, 0
+            self.schlafend = True
+        elif befehl in (_SLPIN, _SLPOUT):
+            self.schlafend = befehl == _SLPIN
+        elif befehl in (_INVON, _INVOFF):
+            self.invertiert = befehl == _INVON
+
+    def _adressen(self, spalte, zeile):
+        """
+        Fensteradressen -> Bildspeicher nach MADCTL (MV tauscht, MY/MX spiegeln).
+        """
+        madctl = self.madctl_register
+        if madctl & MADCTL_MV:
+            spalte, zeile = zeile, spalte
+        if madctl & MADCTL_MY:
+            zeile = ZEILEN - 1 - zeile
+        if madctl & MADCTL_MX:
+            spalte = SPALTEN - 1 - spalte
+        return spalte, zeile
+
+    def _pixel(self, farben):
+        """
+        Pixeldaten in das aktuelle Fenster schreiben; am Fensterende geht es
+        oben links weiter.
+        """
+        farben = np.asarray(farben, np.uint16).ravel()
+        n = len(farben)
+        self.bytes_gesendet += 2 * n
+        if not self._ramwr or n == 0:
+            return
+        x0, x1, y0, y1 = self._fenster
+        breite, hoehe = x1 - x0 + 1, y1 - y0 + 1
+        if breite <= 0 or hoehe <= 0:
+            return
+        groesse = breite * hoehe
+        start = self._position
+        if n > groesse:
+            # Nur der letzte Umlauf bleibt stehen
+            start = (start + n - groesse) % groesse
+            farben = farben[-groesse:]
+        pos = (start + np.arange(len(farben))) % groesse
+        spalte, zeile = self._adressen(x0 + pos % breite, y0 + pos // breite)
+        gueltig = (spalte >= 0) & (spalte < SPALTEN) & (zeile >= 0) & (zeile < ZEILEN)
+        self.speicher[zeile[gueltig], spalte[gueltig]] = farben[gueltig]
+        self._position = (self._position + n) % groesse
+
+    def _fuellen(self, farbe, anzahl):
+        if anzahl > 0:
+            self._pixel(np.full(anzahl, farbe & 0xFFFF, np.uint16))
+
+    def _set_window(self, x0, y0, x1, y1):
+        x0, y0, x1, y1 = _u16(x0), _u16(y0), _u16(x1), _u16(y1)
+        if x0 > x1 or x1 >= self._width or y0 > y1 or y1 >= self._height:
+            return
+        x0 += self.colstart
+        x1 += self.colstart
+        y0 += self.rowstart
+        y1 += self.rowstart
+        self._befehl(_CASET, bytes((x0 >> 8 & 0xFF, x0 & 0xFF, x1 >> 8 & 0xFF, x1 & 0xFF)))
+        self._befehl(_RASET, bytes((y0 >> 8 & 0xFF, y0 & 0xFF, y1 >> 8 & 0xFF, y1 & 0xFF)))
+        self._befehl(_RAMWR)
+
+    # --- Auswertung ---
+
+    def bild(self):
+        """
+        :return: sichtbares Bild in Bildschirmkoordinaten (hoehe x breite,
+                 RGB565), mit Scrollbereich
+        """
+        y, x = np.mgrid[0:self._height, 0:self._width]
+        spalte, zeile = self._adressen(x + self.colstart, y + self.rowstart)
+        tfa, vsa = self.tfa, self.vsa
+        im_bereich = (zeile >= tfa) & (zeile < tfa + vsa)
+        zeile = np.where(im_bereich, tfa + (self.vssa - tfa + zeile - tfa) % max(vsa, 1), zeile)
+        gueltig = (spalte >= 0) & (spalte < SPALTEN) & (zeile >= 0) & (zeile < ZEILEN)
+        bild = np.zeros((self._height, self._width), np.uint16)
+        bild[gueltig] = self.speicher[zeile[gueltig], spalte[gueltig]]
+        return bild
+
+    def zaehler_zuruecksetzen(self):
+        self.befehle = 0
+        self.bytes_gesendet = 0
+
+    def spi_zeit(self, baudrate=None):
+        """
+        :return: Übertragungszeit der gezählten Bytes [s], ohne Pausen
+                 zwischen den Befehlen
+        """
+        if baudrate is None:
+            baudrate = getattr(self.spi, 'baudrate', 30_000_000)
+        return self.bytes_gesendet * 8 / baudrate
+
+    # --- Schnittstelle des C-Treibers ---
+
+    def _geometrie(self):
+        self._madctl = self.color_order
+        if self.rotations:
+            madctl, self._width, self._height, self.colstart, self.rowstart = \
+                self.rotations[self._rotation]
+            self._madctl |= madctl
+        self._madctl &= 0xFF
+
+    def _set_rotation(self):
+        self._geometrie()
+        self._befehl(_MADCTL, bytes((self._madctl,)))
+
+    def hard_reset(self):
+        self.speicher[:] = 0
+        self.madctl_register = 0
+        self.tfa, self.vsa, self.vssa = 0, ZEILEN, 0
+        self.schlafend = True
+
+    def soft_reset(self):
+        self._befehl(_SWRESET)
+
+    def init(self):
+        self.hard_reset()
+        if self.custom_init is None:
+            self.soft_reset()
+            self._befehl(_SLPOUT)
+            self._befehl(_COLMOD, b'\x55')
+            self._befehl(_INVON if self.inversion else _INVOFF)
+            self._befehl(_NORON)
+            self._befehl(_DISPON)
+        else:
+            for eintrag in self.custom_init:
+                daten = bytes(eintrag[0])
+                self._befehl(daten[0], daten[1:])
+        self._set_rotation()
+        self.fill_rect(0, 0, self._width, self._height, BLACK)
+        self.on()
+
+    def on(self):
+        if self.backlight is not None:
+            self.backlight.value(1)
+
+    def off(self):
+        if self.backlight is not None:
+            self.backlight.value(0)
+
+    def sleep_mode(self, wert):
+        self._befehl(_SLPIN if wert else _SLPOUT)
+
+    def inversion_mode(self, wert):
+        self.inversion = bool(wert)
+        self._befehl(_INVON if wert else _INVOFF)
+
+    def rotation(self, rotation):
+        self._rotation = rotation % 4
+        self._set_rotation()
+
+    def width(self):
+        return self._width
+
+    def height(self):
+        return self._height
+
+    def madctl(self, wert=None):
+        if wert is not None:
+            self._befehl(_MADCTL, bytes((wert & 0xFF,)))
+            self._madctl = wert & 0xFF
+        return self._madctl
+
+    def offset(self, colstart, rowstart):
+        self.colstart = colstart
+        self.rowstart = rowstart
+
+    def vscrdef(self, tfa, vsa, bfa):
+        self._befehl(_VSCRDEF, struct.pack('>HHH', tfa & 0xFFFF, vsa & 0xFFFF, bfa & 0xFFFF))
+
+    def vscsad(self, vssa):
+        self._befehl(_VSCSAD, struct.pack('>H', vssa & 0xFFFF))
+
+    def set_window(self, x0, y0, x1, y1):
+        self._set_window(x0, y0, x1, y1)
+
+    def fill(self, farbe):
+        self._set_window(0, 0, self._width - 1, self._height - 1)
+        self._fuellen(farbe, self._width * self._height)
+
+    def fill_rect(self, x, y, breite, hoehe, farbe):
+        rechts = _u16(x + breite - 1)
+        unten = _u16(y + hoehe - 1)
+        if x < self._width and y < self._height:
+            rechts = min(rechts, self._width)
+            unten = min(unten, self._height)
+            self._set_window(x, y, rechts, unten)
+            self._fuellen(farbe, breite * hoehe)
+
+    def pixel(self, x, y, farbe):
+        if self.options & WRAP:
+            if self.options & WRAP_H:
+                x %= self._width
+            if self.options & WRAP_V:
+                y %= self._height
+        if 0 <= x < self._width and 0 <= y < self._height:
+            self._set_window(x, y, x, y)
+            self._pixel((farbe & 0xFFFF,))
+
+    def hline(self, x, y, breite, farbe):
+        x, y, breite = _i16(x), _i16(y), _i16(breite)
+        if y >= 0 and x < self._width and y < self._height:
+            if x < 0:
+                breite += x
+                x = 0
+            breite = min(breite, self._width - x)
+            if breite > 0:
+                self._set_window(x, y, x + breite - 1, y)
+                self._fuellen(farbe, breite)
+
+    def vline(self, x, y, hoehe, farbe):
+        x, y, hoehe = _i16(x), _i16(y), _i16(hoehe)
+        if x >= 0 and x < self._width and y < self._height:
+            if y < 0:
+                hoehe += y
+                y = 0
+            hoehe = min(hoehe, self._height - y)
+            if hoehe > 0:
+                self._set_window(x, y, x, y + hoehe - 1)
+                self._fuellen(farbe, hoehe)
+
+    def rect(self, x, y, breite, hoehe, farbe):
+        self.hline(x, y, breite, farbe)
+        self.vline(x, y, hoehe, farbe)
+        self.hline(x, y + hoehe - 1, breite, farbe)
+        self.vline(x + breite - 1, y, hoehe, farbe)
+
+    def line(self, x0, y0, x1, y1, farbe):
+        steil = abs(y1 - y0) > abs(x1 - x0)
+        if steil:
+            x0, y0, x1, y1 = y0, x0, y1, x1
+        if x0 > x1:
+            x0, x1, y0, y1 = x1, x0, y1, y0
+        dx, dy = x1 - x0, abs(y1 - y0)
+        fehler, schritt, xs, laenge = dx >> 1, 1 if y0 < y1 else -1, x0, 0
+        strich = self.vline if steil else self.hline
+
+        def punkt(a, b):
+            if steil:
+                self.pixel(b, a, farbe)
+            else:
+                self.pixel(a, b, farbe)
+
+        while x0 <= x1:
+            laenge += 1
+            fehler -= dy
+            if fehler < 0:
+                fehler += dx
+                if laenge == 1:
+                    punkt(xs, y0)
+                else:
+                    strich(*((y0, xs) if steil else (xs, y0)), laenge, farbe)
+                laenge = 0
+                y0 += schritt
+                xs = x0 + 1
+            x0 += 1
+        if laenge:
+            strich(*((y0, xs) if steil else (xs, y0)), laenge, farbe)
+
+    def blit_buffer(self, puffer, x, y, breite, hoehe):
+        daten = bytes(memoryview(puffer).cast('B'))[:max(breite * hoehe * 2, 0)]
+        self._set_window(x, y, x + breite - 1, y + hoehe - 1)
+        self._pixel(np.frombuffer(daten[:len(daten) & ~1], '>u2'))
+
+    def blit_buffer_async(self, puffer, x, y, breite, hoehe):
+        self.blit_buffer(puffer, x, y, breite, hoehe)
+
+    def wait(self):
+        pass
+
+    def busy(self):
+        return False
+
+    @staticmethod
+    def _glyphe(font, code, fg, bg):
+        breite, hoehe = font.WIDTH, font.HEIGHT
+        wide = breite // 8
+        start = (code - font.FIRST) * hoehe * wide
+        daten = np.frombuffer(bytes(font.FONT[start:start + hoehe * wide]), np.uint8)
+        bits = np.unpackbits(daten).reshape(hoehe, wide * 8)
+        return np.where(bits, fg, bg).astype(np.uint16)
+
+    def text(self, font, text, x0, y0, fg=WHITE, bg=BLACK):
+        for code in _text_bytes(text):
+            if font.FIRST <= code <= font.LAST:
+                glyphe = self._glyphe(font, code, fg, bg)
+                x1 = _u16(x0 + font.WIDTH - 1)
+                if x1 < self._width:
+                    self._set_window(x0, y0, x1, y0 + font.HEIGHT - 1)
+                    self._pixel(glyphe)
+                x0 += font.WIDTH
+
+    def text_block(self, font, text, x0, y0, fg=WHITE, bg=BLACK):
+        if x0 < 0 or y0 < 0 or x0 >= self._width or y0 + font.HEIGHT > self._height:
+            return
+        codes = [c for c in _text_bytes(text) if font.FIRST <= c <= font.LAST]
+        codes = codes[:(self._width - x0) // font.WIDTH]
+        if not codes:
+            return
+        block = np.hstack([self._glyphe(font, c, fg, bg) for c in codes])
+        self._set_window(x0, y0, x0 + block.shape[1] - 1, y0 + font.HEIGHT - 1)
+        self._pixel(block)
+
+    def _proportional(self, font, zeichen):
+        """
+        :return: (Index im Font, Breite) oder None
+        """
+        i = font.MAP.find(zeichen)
+        if i < 0:
+            return None
+        return i, font.WIDTHS[i]
+
+    def write_len(self, font, text):
+        summe = 0
+        for zeichen in text:
+            g = self._proportional(font, zeichen)
+            if g is not None:
+                summe += g[1]
+        return summe
+
+    def write(self, font, text, x, y, fg=WHITE, bg=BLACK, background=None, fill=False):
+        """
+        Proportionale Fonts und lauflängenkodierte Fonts (RLE = 1); ein
+        Hintergrundbild (background) wird nicht nachgebildet.
+        """
+        hoehe = font.HEIGHT
+        breite_ow = font.OFFSET_WIDTH
+        rle = getattr(font, 'RLE', 0)
+        gezeichnet = 0
+        for zeichen in text:
+            g = self._proportional(font, zeichen)
+            if g is None:
+                continue
+            i, breite = g
+            offset = int.from_bytes(bytes(font.OFFSETS[i * breite_ow:(i + 1) * breite_ow]), 'big')
+            puffer_breite = font.MAX_WIDTH if fill else breite
+            glyphe = np.full((hoehe, puffer_breite), bg, np.uint16)
+            if rle:
+                bitmap = _rle_zeilen(font.BITMAPS, offset, breite, hoehe)
+            else:
+                bits = np.unpackbits(np.frombuffer(bytes(font.BITMAPS), np.uint8))
+                bitmap = bits[offset:offset + breite * hoehe * font.BPP:font.BPP].reshape(hoehe, breite)
+            glyphe[:, :breite] = np.where(bitmap, fg, bg)
+            x2 = _u16(x + puffer_breite - 1)
+            if x2 < self._width:
+                self._set_window(x, y, x2, y + hoehe - 1)
+                self._pixel(glyphe)
+                gezeichnet += breite
+            x += breite
+        return gezeichnet
+
+    def draw_list(self, puffer, anzahl):
+        """
+        Wie draw_list() des Treibers: Liste reduzieren, dann aneinander
+        grenzende Rechtecke durch ein gemeinsames Fenster schicken.
+        """
+        if anzahl > len(puffer) // 5:
+            raise ValueError("count exceeds list buffer")
+        liste = _dl_reduziere([list(puffer[5 * i:5 * i + 5]) for i in range(anzahl)])
+        start = self._befehle_treiber
+        n = len(liste)
+        i = 0
+        while i < n:
+            a = liste[i]
+            ende, zeilen = _dl_gruppe(liste, i)
+            letzte = liste[ende - 1]
+            x1 = _u16(letzte[0] + letzte[2] - 1)
+            y1 = _u16(letzte[1] + letzte[3] - 1)
+            if x1 < self._width and y1 < self._height:
+                self._set_window(a[0], a[1], x1, y1)
+                if zeilen:
+                    zeile = np.concatenate([np.full(r[2], r[4], np.uint16) for r in liste[i:ende]])
+                    self._pixel(np.tile(zeile, a[3]))
+                else:
+                    for r in liste[i:ende]:
+                        self._fuellen(r[4], r[2] * r[3])
+            i = ende
+        return self._befehle_treiber - start
+
+    def command_count(self, zuruecksetzen=False):
+        anzahl = self._befehle_treiber
+        if zuruecksetzen:
+            self._befehle_treiber = 0
+        return anzahl
+
+
+def _rle_zeilen(daten, offset, breite, hoehe):
+    """
+    Glyphe eines lauflängenkodierten Fonts als 0/1-Array (hoehe x breite).
+    """
+    bitmap = np.zeros((hoehe, breite), np.uint8)
+    y = 0
+    while y < hoehe and offset + 2 <= len(daten):
+        wiederholung, laeufe = max(daten[offset], 1), daten[offset + 1]
+        x = 0
+        for n in range(laeufe):
+            lauf = daten[offset + 2 + n]
+            if n & 1:
+                bitmap[y:y + wiederholung, x:x + lauf] = 1
+            x += lauf
+        offset += 2 + laeufe
+        y += wiederholung
+    return bitmap
+
+
+def _dl_schneidet(a, b):
+    return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+
+def _dl_deckt(a, b):
+    return a[0] <= b[0] and a[1] <= b[1] and a[0] + a[2] >= b[0] + b[2] and a[1] + a[3] >= b[1] + b[3]
+
+
+def _dl_vereinige(a, b):
+    if a[4] != b[4]:
+        return False
+    if a[1] == b[1] and a[3] == b[3] and b[0] <= a[0] + a[2] and a[0] <= b[0] + b[2]:
+        x1 = max(a[0] + a[2], b[0] + b[2])
+        a[0] = min(a[0], b[0])
+        a[2] = x1 - a[0]
+        return True
+    if a[0] == b[0] and a[2] == b[2] and b[1] <= a[1] + a[3] and a[1] <= b[1] + b[3]:
+        y1 = max(a[1] + a[3], b[1] + b[3])
+        a[1] = min(a[1], b[1])
+        a[3] = y1 - a[1]
+        return True
+    return False
+
+
+def _dl_reduziere(liste):
+    """dl_reduce() aus csrc/src/draw_list.h (tests/test_draw_list_c.py vergleicht beide)"""
+    for i, r in enumerate(liste):
+        if r[2] == 0 or r[3] == 0:
+            continue
+        for j in range(i):
+            if liste[j][2] and _dl_deckt(r, liste[j]):
+                liste[j][2] = 0
+        for k in range(i - 1, -1, -1):
+            if liste[k][2] == 0:
+                continue
+            if _dl_vereinige(liste[k], r):
+                r[2] = 0
+                break
+            if _dl_schneidet(liste[k], r):
+                break
+    liste = [r for r in liste if r[2] and r[3]]
+    for i in range(len(liste)):
+        for j in range(i + 1, len(liste)):
+            if _dl_schneidet(liste[i], liste[j]):
+                return liste
+    return sorted(liste, key=lambda r: (r[1], r[0]))
+
+
+def _dl_gruppe(liste, i):
+    """
+    dl_group() aus csrc/src/draw_list.h
+    :return: (Ende der Fenstergruppe ab liste[i], Füllungen zeilenweise verschränkt)
+    """
+    n = len(liste)
+    a = liste[i]
+    ende = i + 1
+    while (ende < n and liste[ende][0] == a[0] and liste[ende][2] == a[2]
+           and liste[ende][1] == liste[ende - 1][1] + liste[ende - 1][3]):
+        ende += 1
+    if ende > i + 1:
+        return ende, False
+    while (ende < n and liste[ende][1] == a[1] and liste[ende][3] == a[3]
+           and liste[ende][0] == liste[ende - 1][0] + liste[ende - 1][2]):
+        ende += 1
+    return ende, ende > i + 1
+
+
+# --- PNG ---
+
+def rgb888(bild):
+    """
+    RGB565-Bild -> uint8-Array (hoehe x breite x 3)
+    """
+    bild = np.asarray(bild, np.uint32)
+    r = (bild >> 11 & 0x1F) * 255 // 31
+    g = (bild >> 5 & 0x3F) * 255 // 63
+    b = (bild & 0x1F) * 255 // 31
+    return np.stack((r, g, b), axis=-1).astype(np.uint8)
+
+
+def _png_block(art, daten):
+    return (struct.pack('>I', len(daten)) + art + daten
+            + struct.pack('>I', zlib.crc32(art + daten) & 0xFFFFFFFF))
+
+
+def speichere_png(pfad, bild):
+    """
+    Schreibt ein RGB565-Bild als 8-Bit-RGB-PNG (ohne Zeilenfilter).
+    """
+    rgb = rgb888(bild)
+    hoehe, breite = rgb.shape[:2]
+    roh = b''.join(b'\x00' + rgb[y].tobytes() for y in range(hoehe))
+    with open(pfad, 'wb') as datei:
+        datei.write(b'\x89PNG\r\n\x1a\n')
+        datei.write(_png_block(b'IHDR', struct.pack('>IIBBBBB', breite, hoehe, 8, 2, 0, 0, 0)))
+        datei.write(_png_block(b'IDAT', zlib.compress(roh, 9)))
+        datei.write(_png_block(b'IEND', b''))
+
+
+def lies_png(pfad):
+    """
+    Liest ein von speichere_png() geschriebenes PNG.
+    :return: uint8-Array (hoehe x breite x 3)
+    """
+    with open(pfad, 'rb') as datei:
+        daten = datei.read()
+    if daten[:8] != b'\x89PNG\r\n\x1a\n':
+        raise ValueError("kein PNG")
+    i = 8
+    idat = b''
+    while i < len(daten):
+        laenge, = struct.unpack_from('>I', daten, i)
+        art = daten[i + 4:i + 8]
+        inhalt = daten[i + 8:i + 8 + laenge]
+        if art == b'IHDR':
+            breite, hoehe, tiefe, farbtyp = struct.unpack_from('>IIBB', inhalt)
+            if (tiefe, farbtyp) != (8, 2):
+                raise ValueError("nur 8-Bit-RGB")
+        elif art == b'IDAT':
+            idat += inhalt
+        i += 12 + laenge
+    roh = np.frombuffer(zlib.decompress(idat), np.uint8).reshape(hoehe, 1 + 3 * breite)
+    if roh[:, 0].any():
+        raise ValueError("Zeilenfilter werden nicht unterstützt")
+    return roh[:, 1:].reshape(hoehe, breite, 3)
+
+
+# --- Host-Umgebung ---
+
+def platzhalterfont(breite=8, hoehe=8, erstes=0x20, letztes=0x7F):
+    """
+    Font-Modul im Format von vga1_8x8 (der echte liegt in der Firmware):
+    jedes Zeichen ist ein Rahmen mit seinem Code als Bitmuster. Reicht für
+    Layout, Byte-Zählung und Vergleichsbilder.
+    """
+    wide = breite // 8
+    daten = bytearray()
+    for code in range(erstes, letztes + 1):
+        glyphe = np.zeros((hoehe, wide * 8), np.uint8)
+        if code != 0x20:
+            glyphe[0, :breite - 1] = glyphe[hoehe - 2, :breite - 1] = 1
+            glyphe[:hoehe - 1, 0] = glyphe[:hoehe - 1, breite - 2] = 1
+            for bit in range(7):
+                if code >> bit & 1:
+                    y = 1 + bit * (hoehe - 3) // 7
+                    glyphe[y, 2:breite - 3] = 1
+        daten += np.packbits(glyphe, axis=1).tobytes()
+    modul = types.ModuleType('vga1_%dx%d' % (breite, hoehe))
+    modul.WIDTH, modul.HEIGHT = breite, hoehe
+    modul.FIRST, modul.LAST = erstes, letztes
+    modul.FONT = bytes(daten)
+    return modul
+
+
+class Pin:
+    IN = 0
+    OUT = 1
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_FALLING = 4
+    IRQ_RISING = 8
+
+    def __init__(self, nummer, modus=-1, pull=None, value=None):
+        self.nummer = nummer
+        self._wert = value or 0
+
+    def value(self, wert=None):
+        if wert is None:
+            return self._wert
+        self._wert = 1 if wert else 0
+
+    def on(self):
+        self._wert = 1
+
+    def off(self):
+        self._wert = 0
+
+    def irq(self, handler=None, trigger=None):
+        pass
+
+    __call__ = value
+
+
+class SPI:
+    def __init__(self, bus, baudrate=1_000_000, **kwargs):
+        self.bus = bus
+        self.baudrate = baudrate
+
+    def write(self, daten):
+        pass
+
+
+class I2C:
+    """Bus ohne Geräte: jeder Zugriff scheitert wie auf dem Pico mit ENODEV."""
+
+    def __init__(self, bus, scl=None, sda=None, freq=400_000):
+        self.bus = bus
+
+    def scan(self):
+        return []
+
+    def _fehlt(self, *args, **kwargs):
+        raise OSError(19)
+
+    writeto = readfrom = readfrom_into = writeto_mem = readfrom_mem = readfrom_mem_into = _fehlt
+
+
+def installiere(fonts=True):
+    """
+    Hängt den Emulator als st7789 und eine machine-Attrappe (Pin, SPI, I2C)
+    in sys.modules ein; mit fonts auch Platzhalter für vga1_8x8 und
+    vga1_16x32, falls die echten Module nicht importierbar sind.
+    :return: das st7789-Modul
+    """
+    modul = sys.modules[__name__]
+    sys.modules['st7789'] = modul
+    if 'machine' not in sys.modules:
+        machine = types.ModuleType('machine')
+        machine.Pin, machine.SPI, machine.I2C = Pin, SPI, I2C
+        sys.modules['machine'] = machine
+    if fonts:
+        for name, (breite, hoehe) in (('vga1_8x8', (8, 8)), ('vga1_16x32', (16, 32))):
+            if name not in sys.modules:
+                try:
+                    __import__(name)
+                except ImportError:
+                    sys.modules[name] = platzhalterfont(breite, hoehe)
+    return modul
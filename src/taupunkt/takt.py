@@ -0,0 +1,115 @@
+# Adaptives Messintervall
+# Die Ampel hängt nur vom Abstand d = tp_aussen - tp_innen ab und springt an
+# zwei Grenzen: d = -grenze (GRUEN/GELB) und d = 0 (GELB/ROT). Liegt d weit
+# von beiden entfernt, ändert eine Messung nichts; liegt d nahe an einer
+# Grenze, kommt eine Änderung mit festem Intervall bis zu 15 Minuten zu spät.
+# Takt legt das nächste Intervall aus dem Abstand zur nächsten Grenze und
+# der geglätteten Änderungsrate von d fest und entscheidet mit Hysterese, damit
+# die LEDs an einer Grenze nicht flattern.
+
+import time
+
+from laufzeit import GELB, GRUEN, ROT, entscheide
+
+_RANG = {GRUEN: 0, GELB: 1, ROT: 2}
+
+
+class Takt:
+    def __init__(self, grenze, min_s=60, max_s=900, hysterese=0.1,
+                 abstand_voll=3.0, reserve=0.5, glaettung=0.5):
+        """
+        :param grenze: Taupunktgrenze [K] wie bei entscheide
+        :param min_s: kürzestes Intervall [s]
+        :param max_s: längstes Intervall [s]
+        :param hysterese: so weit [K] muss d eine Grenze überschreiten, bevor
+                          der Status wechselt; etwa das doppelte Rauschen des
+                          Taupunktabstands
+        :param abstand_voll: ab diesem Abstand [K] zur nächsten Grenze gilt max_s
+        :param reserve: Anteil der geschätzten Zeit bis zum Erreichen einer
+                        Grenze, der höchstens gewartet wird
+        :param glaettung: Gewicht der neuesten Rate im gleitenden Mittel (0..1]
+        """
+        if not 0 < min_s <= max_s:
+            raise ValueError('Ungültige Grenzen: %s..%s s' % (min_s, max_s))
+        self.grenze = grenze
+        self.min_s = min_s
+        self.max_s = max_s
+        self.hysterese = hysterese
+        self.abstand_voll = abstand_voll
+        self.reserve = reserve
+        self.glaettung = glaettung
+        self.status = None      # letzte Entscheidung (mit Hysterese)
+        self.intervall_s = max_s
+        self.rate = None        # geglättete Änderung von d [K/s]
+        self._d = None
+        self._zeit = None
+
+    def vorgabe(self, status, tp_innen=None, tp_aussen=None, zeit_ms=None):
+        """
+        Übernimmt eine frühere Entscheidung, z. B. aus sparbetrieb.Zustand
+        nach einem Neustart aus deepsleep.
+        :param zeit_ms: Zeitpunkt jener Messung in ticks_ms; mit den Taupunkten
+                        zählt sie für die Änderungsrate der nächsten Messung
+        """
+        self.status = status
+        if tp_innen is not None and zeit_ms is not None:
+            self._d = tp_aussen - tp_innen
+            self._zeit = zeit_ms
+
+    def _mit_hysterese(self, tp_innen, tp_aussen):
+        neu = entscheide(tp_innen, tp_aussen, self.grenze)
+        alt = self.status
+        if alt is None or neu == alt:
+            return neu
+        # Gleiche Entscheidung, nur um die Hysterese zugunsten des alten
+        # Status verschoben; bleibt der Wechsel aus, gilt weiter der alte
+        if _RANG[neu] > _RANG[alt]:
+            neu = entscheide(tp_innen, tp_aussen - self.hysterese, self.grenze)
+            return neu if _RANG[neu] > _RANG[alt] else alt
+        neu = entscheide(tp_innen, tp_aussen + self.hysterese, self.grenze)
+        return neu if _RANG[neu] < _RANG[alt] else alt
+
+    def _naechstes(self, d):
+        abstand = min(abs(d + self.grenze), abs(d))
+        anteil = abstand / self.abstand_voll
+        intervall = self.min_s + (self.max_s - self.min_s) * (anteil if anteil < 1 else 1)
+        rate = self.rate
+        if rate:
+            # Zeit, bis d bei gleicher Rate die nächste Grenze in
+            # Bewegungsrichtung erreicht
+            for b in (-self.grenze, 0.0):
+                weg = b - d
+                if weg * rate > 0:
+                    bis = self.reserve * weg / rate
+                    if bis < intervall:
+                        intervall = bis
+        if intervall < self.min_s:
+            return self.min_s
+        return intervall
+
+    def entscheide(self, tp_innen, tp_aussen, zeit_ms=None):
+        """
+        Entscheidet mit Hysterese und legt intervall_s fest.
+        :param zeit_ms: Zeitpunkt der Messung in ticks_ms, Standard: jetzt
+        :return: GRUEN, GELB oder ROT
+        """
+        if zeit_ms is None:
+            zeit_ms = time.ticks_ms()
+        d = tp_aussen - tp_innen
+        if self._d is not None:
+            dt_s = time.ticks_diff(zeit_ms, self._zeit) / 1000
+            # Sehr kurze Abstände (z. B. Touch) liefern nur Rauschen
+            if dt_s >= 1:
+                rate = (d - self._d) / dt_s
+                if self.rate is None:
+                    self.rate = rate
+                else:
+                    self.rate += self.glaettung * (rate - self.rate)
+                self._d = d
+                self._zeit = zeit_ms
+        else:
+            self._d = d
+            self._zeit = zeit_ms
+        self.status = self._mit_hysterese(tp_innen, tp_aussen)
+        self.intervall_s = self._naechstes(d)
+        return self.status
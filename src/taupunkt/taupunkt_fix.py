@@ -0,0 +1,137 @@
+# Ganzzahliger Taupunkt (Festkomma) für den Pico
+# Rechnet direkt aus den Rohwerten von SHT4x (16 Bit) und AHT20 (20 Bit),
+# ohne math.log und ohne float-Objekte. Ergebnis in Centi-Grad (1234 = 12,34 °C).
+#
+# Verfahren: Magnus-Formel mit a = 17.27, b = 237.7 wie berechne_taupunkt.
+#   gamma = a*T/(b+T) + ln(RH/100)      Td = b*gamma / (a - gamma)
+# a*T/(b+T) kommt aus _MAGNUS (Stützstellen alle 2 °C von -50 bis 150 °C),
+# ln(RH) aus _LN (ln(1 + i/64) für die normierte Mantisse) plus k*ln(2),
+# jeweils linear interpoliert. Alle Werte in Q15 (32768 = 1.0).
+# Alle Zwischenergebnisse bleiben unter 2**30 und damit Small-Ints.
+#
+# Maximaler Fehler gegen die float-Referenz (Treiberumrechnung + berechne_taupunkt),
+# gemessen im Rohwert-Raster über den ganzen Messbereich und RH 1..100 %:
+#   SHT4x: 0.021 °C      AHT20: 0.022 °C      zugesichert: < 0.025 °C
+# (tests/test_taupunkt_fix.py prüft diese Grenze)
+# Feuchten unter 1 % werden auf 1 % begrenzt, Temperaturen auf -50..150 °C.
+
+from array import array
+
+# ln(1 + i/64) in Q15, i = 0..64
+_LN = array('h', (
+    0, 508, 1008, 1501, 1987, 2465, 2936, 3401, 3860, 4311, 4757, 5197, 5631,
+    6060, 6482, 6900, 7312, 7719, 8121, 8518, 8911, 9299, 9682, 10061, 10435, 10805,
+    11171, 11534, 11892, 12246, 12596, 12943, 13286, 13626, 13962, 14295, 14624, 14950, 15273,
+    15593, 15909, 16223, 16533, 16841, 17146, 17448, 17747, 18044, 18337, 18629, 18917, 19204,
+    19487, 19769, 20048, 20324, 20598, 20870, 21140, 21407, 21673, 21936, 22197, 22456, 22713,
+))
+
+# a*T/(b+T) in Q15 für T = -50 °C + 2 °C * i, i = 0..100
+_MAGNUS = array('i', (
+    -150747, -143191, -135793, -128548, -121451, -114497, -107683, -101004, -94456, -88036,
+    -81739, -75562, -69502, -63555, -57718, -51989, -46364, -40841, -35416, -30088,
+    -24853, -19709, -14654, -9686, -4802, 0, 4722, 9365, 13933, 18426,
+    22846, 27196, 31477, 35690, 39837, 43920, 47939, 51898, 55796, 59636,
+    63418, 67145, 70816, 74434, 77999, 81513, 84977, 88391, 91757, 95077,
+    98350, 101577, 104761, 107901, 110999, 114055, 117070, 120046, 122982, 125880,
+    128740, 131563, 134350, 137101, 139818, 142500, 145149, 147765, 150348, 152900,
+    155421, 157911, 160371, 162801, 165203, 167576, 169921, 172239, 174529, 176794,
+    179032, 181244, 183432, 185595, 187733, 189847, 191938, 194006, 196051, 198074,
+    200075, 202054, 204011, 205948, 207864, 209760, 211636, 213492, 215329, 217147,
+    218946,
+))
+
+_Q15_LN2 = 22713           # ln(2)
+_Q15_LN_SHT4X = 363408     # ln(65535), Vollausschlag SHT4x
+_Q15_LN_AHT20 = 454261     # ln(2**20), Vollausschlag AHT20
+_Q15_LN_1PROZENT = -150902 # ln(0.01), Untergrenze für RH
+_Q15_A = 565903            # a = 17.27
+_B_CENTI = 23770           # b = 237.7 °C
+
+_T_MIN = -5000
+_T_MAX = 15000
+_T_SCHRITT = 200
+
+
+def _ln_q15(x):
+    """
+    Natürlicher Logarithmus einer positiven Ganzzahl in Q15.
+    :param x: Ganzzahl >= 1
+    :return: ln(x) * 32768
+    """
+    e = 15
+    while x >= 0x10000:
+        x >>= 1
+        e += 1
+    while x < 0x8000:
+        x <<= 1
+        e -= 1
+    m = x - 0x8000
+    i = m >> 9
+    lo = _LN[i]
+    return e * _Q15_LN2 + lo + (((_LN[i + 1] - lo) * (m & 0x1FF) + 256) >> 9)
+
+
+def _magnus_q15(t_centi):
+    """
+    Magnus-Term a*T/(b+T) in Q15.
+    :param t_centi: Temperatur [0,01 °C]
+    """
+    if t_centi <= _T_MIN:
+        return _MAGNUS[0]
+    if t_centi >= _T_MAX:
+        return _MAGNUS[-1]
+    d = t_centi - _T_MIN
+    i = d // _T_SCHRITT
+    lo = _MAGNUS[i]
+    return lo + ((_MAGNUS[i + 1] - lo) * (d - i * _T_SCHRITT) + 100) // _T_SCHRITT
+
+
+def taupunkt_centi(t_centi, ln_rh):
+    """
+    Taupunkt aus Temperatur und ln(RH/100).
+    :param t_centi: Temperatur [0,01 °C]
+    :param ln_rh: ln(RH/100) in Q15 (<= 0)
+    :return: Taupunkt [0,01 °C]
+    """
+    if ln_rh < _Q15_LN_1PROZENT:
+        ln_rh = _Q15_LN_1PROZENT
+    g = _magnus_q15(t_centi) + ln_rh
+    r = (g << 11) // ((_Q15_A - g + 16) >> 5)  # g/(a-g) in Q16
+    return (r * _B_CENTI + 32768) >> 16
+
+
+def sht4x_temperatur_centi(t_raw):
+    """
+    Rohwert SHT4x -> Temperatur [0,01 °C], wie -45 + 175 * t_raw / 65535.
+    """
+    return (t_raw * 3500 + 6553) // 13107 - 4500
+
+
+def aht20_temperatur_centi(t_raw):
+    """
+    Rohwert AHT20 -> Temperatur [0,01 °C], wie t_raw * 200 / 2**20 - 50.
+    """
+    return ((t_raw * 625 + 16384) >> 15) - 5000
+
+
+def taupunkt_sht4x(t_raw, rh_raw):
+    """
+    Taupunkt aus den 16-Bit-Rohwerten des SHT4x.
+    :param t_raw: Temperatur-Rohwert (0..65535)
+    :param rh_raw: Feuchte-Rohwert (0..65535)
+    :return: Taupunkt [0,01 °C]
+    """
+    ln_rh = _ln_q15(rh_raw if rh_raw > 0 else 1) - _Q15_LN_SHT4X
+    return taupunkt_centi(sht4x_temperatur_centi(t_raw), ln_rh)
+
+
+def taupunkt_aht20(t_raw, rh_raw):
+    """
+    Taupunkt aus den 20-Bit-Rohwerten des AHT20.
+    :param t_raw: Temperatur-Rohwert (0..2**20-1)
+    :param rh_raw: Feuchte-Rohwert (0..2**20-1)
+    :return: Taupunkt [0,01 °C]
+    """
+    ln_rh = _ln_q15(rh_raw if rh_raw > 0 else 1) - _Q15_LN_AHT20
+    return taupunkt_centi(aht20_temperatur_centi(t_raw), ln_rh)
@@ -5,12 +5,16 @@
 
 
 import time
-import math
 from machine import Pin, I2C, SPI
 import sht4x
 import ahtx0
 import bmp280
+import erfassung
+from dashboard import Dashboard, Label, Statusleiste, Wertfeld
+from rahmenpuffer import Palettenpuffer
 import st7789
+import psychrometrie
+import telemetrie
 import vga1_8x8 as font
 # Optional: Für größere Schrift eine andere Font-Datei importieren, falls vorhanden
 # import vga1_16x32 as font_large
@@ -42,6 +46,15 @@ LCD_RST = 20
 LCD_BL = 21
 SPI_SCK = 18
 SPI_MOSI = 19
+SPI_ID = 0
+
+# Füllen und blit_buffer_async() per DMA. Nur mit einer Firmware aus csrc/:
+# examples/firmware.* kennt spi_id nicht und bricht beim Start mit TypeError ab
+DISPLAY_DMA = False
+
+# Dashboard in einen 4-Bit-Palettenpuffer (27 KB) zeichnen und nur geänderte
+# Kacheln übertragen; False = direkt auf das Panel
+RAHMENPUFFER = True
 
 
 # LCD Maße
@@ -57,6 +70,16 @@ INTERVALL = 900
 TAUPUNKT_GRENZE = 2.0
 
 
+# Taupunktformel: 'magnus', 'magnus_eis', 'buck' oder 'sonntag'
+TAUPUNKT_FORMEL = 'magnus'
+formel = psychrometrie.FORMELN[TAUPUNKT_FORMEL]
+
+
+# Konsolenausgabe je Messung: 'text' = lesbare Zeile per print(), 'binaer' =
+# 24-Byte-Rahmen mit CRC (telemetrie.py), None = keine
+TELEMETRIE = 'text'
+
+
 
 
 # ========== FARB- & LAYOUT-DEFINITIONEN ==========
@@ -65,13 +88,13 @@ FARBE_HINTERGRUND = st7789.BLACK
 FARBE_TEXT = st7789.WHITE
 FARBE_WERT = st7789.WHITE
 FARBE_INFO = st7789.CYAN
-FARBE_DRUCK = st7789.ORANGE
+FARBE_DRUCK = st7789.color565(255, 165, 0)
 
 
 # Farben für den Status
-STATUS_GRUEN = st7789.color(0, 100, 0) # Dunkles Grün
-STATUS_GELB = st7789.color(255, 215, 0) # Gold
-STATUS_ROT = st7789.color(139, 0, 0) # Dunkles Rot
+STATUS_GRUEN = st7789.color565(0, 100, 0) # Dunkles Grün
+STATUS_GELB = st7789.color565(255, 215, 0) # Gold
+STATUS_ROT = st7789.color565(139, 0, 0) # Dunkles Rot
 
 
 
@@ -86,7 +109,7 @@ def initialisiere_hardware():
     # Sensoren
     sensor_innen = sht4x.SHT4x(i2c, address=SHT41_ADDR)
     sensor_aussen = ahtx0.AHT20(i2c, address=AHT20_ADDR)
-    sensor_druck = bmp280.BMP280(i2c, addr=BMP280_ADDR)
+    sensor_druck = bmp280.BMP280(i2c, addr=BMP280_ADDR, forced=True)
 
 
     # LEDs
@@ -96,13 +119,14 @@ def initialisiere_hardware():
 
 
     # Display
-    spi = SPI(0, baudrate=30000000, sck=Pin(SPI_SCK), mosi=Pin(SPI_MOSI))
+    spi = SPI(SPI_ID, baudrate=30000000, sck=Pin(SPI_SCK), mosi=Pin(SPI_MOSI))
     tft = st7789.ST7789(
         spi, TFT_WIDTH, TFT_HEIGHT,
         reset=Pin(LCD_RST, Pin.OUT),
         dc=Pin(LCD_DC, Pin.OUT),
         cs=Pin(LCD_CS, Pin.OUT),
-        rotation=3  # 270° Rotation für Waveshare 1.47" Display
+        rotation=3,  # 270° Rotation für Waveshare 1.47" Display
+        **({'spi_id': SPI_ID} if DISPLAY_DMA else {})
     )
     tft.init()
     Pin(LCD_BL, Pin.OUT).on()
@@ -118,6 +142,8 @@ def initialisiere_hardware():
         'spi': spi,
         'tft': tft,
         'font': font,
+        'dashboard': baue_dashboard(tft, font),
+        'sender': telemetrie.Sender() if TELEMETRIE == 'binaer' else None,
         'INTERVALL': INTERVALL
     }
 
@@ -127,47 +153,55 @@ def initialisiere_hardware():
 # ========== FUNKTIONEN ===========
 
 
-def zeige_dashboard(status, status_farbe, daten, tft, font):
-    """Zeigt ein strukturiertes Dashboard mit Farben an."""
-    tft.fill(FARBE_HINTERGRUND)
-    
-    innen_t, innen_rh, aussen_t, aussen_rh, druck, tp_innen, tp_aussen = daten
+def baue_dashboard(tft, font):
+    """
+    Legt die Widgets des Dashboards an. Danach zeichnet zeige_dashboard()
+    nur noch die Felder neu, deren Text oder Farbe sich geändert hat.
+    :return: (Dashboard, Wertfelder in der Reihenfolge der Anzeigedaten, Statusleiste)
+    """
+    ziel = Palettenpuffer(tft, TFT_WIDTH, TFT_HEIGHT, FARBE_HINTERGRUND) if RAHMENPUFFER else tft
+    dashboard = Dashboard(ziel, font, TFT_WIDTH, TFT_HEIGHT, FARBE_HINTERGRUND)
 
+    def zeile(beschriftung, y, format, zeichen, farbe=FARBE_WERT):
+        dashboard.hinzu(Label(15, y, beschriftung, farbe, FARBE_HINTERGRUND))
+        x = 15 + len(beschriftung) * font.WIDTH
+        return dashboard.hinzu(Wertfeld(x, y, zeichen, format, farbe, FARBE_HINTERGRUND))
 
     # --- INNENRAUM ---
-    tft.text(font, "INNEN", 15, 15, FARBE_INFO)
-    tft.text(font, f"Temp: {innen_t:.1f} C", 15, 35, FARBE_WERT)
-    tft.text(font, f"Feuchte: {innen_rh:.1f} %", 15, 50, FARBE_WERT)
-    tft.text(font, f"Taupunkt: {tp_innen:.1f} C", 15, 65, FARBE_WERT)
-
+    dashboard.hinzu(Label(15, 15, "INNEN", FARBE_INFO, FARBE_HINTERGRUND))
+    innen_t = zeile("Temp: ", 35, "{:.1f} C", 7)
+    innen_rh = zeile("Feuchte: ", 50, "{:.1f} %", 7)
+    tp_innen = zeile("Taupunkt: ", 65, "{:.1f} C", 7)
 
     # --- AUSSENBEREICH ---
-    tft.text(font, "AUSSEN", 15, 100, FARBE_INFO)
-    tft.text(font, f"Temp: {aussen_t:.1f} C", 15, 120, FARBE_WERT)
-    tft.text(font, f"Feuchte: {aussen_rh:.1f} %", 15, 135, FARBE_WERT)
-    tft.text(font, f"Taupunkt: {tp_aussen:.1f} C", 15, 150, FARBE_WERT)
-    
-    # --- DRUCK ---
-    tft.text(font, f"Druck: {druck:.0f} hPa", 15, 175, FARBE_DRUCK)
+    dashboard.hinzu(Label(15, 100, "AUSSEN", FARBE_INFO, FARBE_HINTERGRUND))
+    aussen_t = zeile("Temp: ", 120, "{:.1f} C", 7)
+    aussen_rh = zeile("Feuchte: ", 135, "{:.1f} %", 7)
+    tp_aussen = zeile("Taupunkt: ", 150, "{:.1f} C", 7)
 
+    # --- DRUCK ---
+    druck = zeile("Druck: ", 175, "{:.0f} hPa", 8, FARBE_DRUCK)
 
     # --- STATUSLEISTE ---
     status_y_pos = 200
-    tft.fill_rect(0, status_y_pos, TFT_WIDTH, TFT_HEIGHT - status_y_pos, status_farbe)
-    
-    # Text zentrieren für eine saubere Optik
-    text_breite = len(status) * 8 # Breite des Fonts ist 8px
-    text_x = (TFT_WIDTH - text_breite) // 2
-    text_y = status_y_pos + 15
-    tft.text(font, status, text_x, text_y, FARBE_TEXT)
+    statusleiste = dashboard.hinzu(Statusleiste(
+        status_y_pos, TFT_WIDTH, TFT_HEIGHT - status_y_pos, text_y=15, textfarbe=FARBE_TEXT))
+
+    felder = (innen_t, innen_rh, aussen_t, aussen_rh, druck, tp_innen, tp_aussen)
+    return dashboard, felder, statusleiste
+
 
+def zeige_dashboard(status, status_farbe, daten, anzeige):
+    """Zeigt ein strukturiertes Dashboard mit Farben an."""
+    dashboard, felder, statusleiste = anzeige
+    for feld, wert in zip(felder, daten):
+        feld.setze(wert)
+    statusleiste.setze(status, status_farbe)
+    return dashboard.zeichne()
 
 
 def berechne_taupunkt(temp, rh):
-    # Magnus-Formel Konstanten
-    a, b = 17.27, 237.7
-    alpha = ((a * temp) / (b + temp)) + math.log(rh / 100.0)
-    return (b * alpha) / (a - alpha)
+    return formel.taupunkt(temp, rh)
 
 
 def schalte_leds(status, led_rot, led_gelb, led_gruen):
@@ -184,10 +218,9 @@ def schalte_leds(status, led_rot, led_gelb, led_gruen):
 
 def hole_daten(sensor_innen, sensor_aussen, sensor_druck, tft, font):
     try:
-        innen_t, innen_rh = sensor_innen.measurements
-        aussen_t = sensor_aussen.temperature
-        aussen_rh = sensor_aussen.relative_humidity
-        druck = sensor_druck.pressure
+        # Alle drei Wandlungen laufen gleichzeitig
+        (innen_t, innen_rh), (aussen_t, aussen_rh), (_, druck) = erfassung.erfasse(
+            (sensor_innen, sensor_aussen, sensor_druck))
         
         # Plausibilitätsprüfung (optional, aber empfohlen)
         if not (-40 < innen_t < 80 and 0 <= innen_rh <= 100):
@@ -204,7 +237,12 @@ def hole_daten(sensor_innen, sensor_aussen, sensor_druck, tft, font):
 
 def entscheide_lueften(hw):
     raw_daten = hole_daten(hw['sensor_innen'], hw['sensor_aussen'], hw['sensor_druck'], hw['tft'], hw['font'])
+    sender = hw.get('sender')
     if not raw_daten:
+        if sender is not None:
+            sender.sende('fehler', None)
+        # Fehlerbild überschreibt das Dashboard: nächstes Mal komplett aufbauen
+        hw['dashboard'][0].invalidiere()
         return
 
 
@@ -220,26 +258,36 @@ def entscheide_lueften(hw):
     if tp_aussen < (tp_innen - TAUPUNKT_GRENZE):
         status = "Lueften empfohlen"
         status_farbe = STATUS_GRUEN
-        schalte_leds("gruen", hw['led_rot'], hw['led_gelb'], hw['led_gruen'])
+        ampel = "gruen"
+        schalte_leds(ampel, hw['led_rot'], hw['led_gelb'], hw['led_gruen'])
     elif tp_aussen >= tp_innen:
         status = "Nicht lueften"
         status_farbe = STATUS_ROT
-        schalte_leds("rot", hw['led_rot'], hw['led_gelb'], hw['led_gruen'])
+        ampel = "rot"
+        schalte_leds(ampel, hw['led_rot'], hw['led_gelb'], hw['led_gruen'])
     else:
         status = "Bedingt lueften"
         status_farbe = STATUS_GELB
-        schalte_leds("gelb", hw['led_rot'], hw['led_gelb'], hw['led_gruen'])
+        ampel = "gelb"
+        schalte_leds(ampel, hw['led_rot'], hw['led_gelb'], hw['led_gruen'])
 
 
     # Alle Daten in einem Tupel zusammenfassen für die Übergabe
     display_daten = (innen_t, innen_rh, aussen_t, aussen_rh, druck, tp_innen, tp_aussen)
     
     # Die neue Dashboard-Funktion aufrufen
-    zeige_dashboard(status, status_farbe, display_daten, hw['tft'], hw['font'])
-    
+    gesendet = zeige_dashboard(status, status_farbe, display_daten, hw['dashboard'])
+
+    if sender is not None:
+        sender.sende(ampel, display_daten)
+    if TELEMETRIE != 'text':
+        return
+    x_innen = psychrometrie.mischungsverhaeltnis(innen_t, innen_rh, druck, formel)
+    x_aussen = psychrometrie.mischungsverhaeltnis(aussen_t, aussen_rh, druck, formel)
+
     # Konsolenausgabe für Debugging beibehalten
     print(
-        f"Innen: {innen_t:.1f}C, {innen_rh:.1f}%, TP: {tp_innen:.1f}C | "
-        f"Aussen: {aussen_t:.1f}C, {aussen_rh:.1f}%, TP: {tp_aussen:.1f}C | "
-        f"Status: {status}"
+        f"Innen: {innen_t:.1f}C, {innen_rh:.1f}%, TP: {tp_innen:.1f}C, x: {x_innen:.1f}g/kg | "
+        f"Aussen: {aussen_t:.1f}C, {aussen_rh:.1f}%, TP: {tp_aussen:.1f}C, x: {x_aussen:.1f}g/kg | "
+        f"Status: {status} | Display: {gesendet} B"
     )
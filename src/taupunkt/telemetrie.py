@@ -0,0 +1,149 @@
+# Binäre Telemetrie über die USB-Konsole
+# Statt jeder Messung eine f-String-Zeile mit sechs float-Formatierungen zu
+# drucken, schreibt Sender einen festen Rahmen von 24 Bytes aus einem vorab
+# angelegten Puffer. Der Host liest ihn mit Empfaenger zurück; print()-Zeilen
+# (Fehlermeldungen, REPL) im selben Datenstrom werden dabei als Text
+# weitergereicht. Die Textausgabe bleibt als Rückfall erhalten (TELEMETRIE in
+# main.py).
+#
+# Rahmen (Little Endian):
+#   A5 5A        Synchronisation
+#   uint16       laufende Nummer (Lücken = verlorene Rahmen)
+#   uint32       time.ticks_ms() der Messung
+#   7x int16     innen_t, innen_rh, aussen_t, aussen_rh [0,01 °C bzw. %],
+#                druck [0,1 hPa], tp_innen, tp_aussen [0,01 °C]
+#   uint8        Status (Index in protokoll.STATUS)
+#   uint8        CRC-8 über alles nach der Synchronisation
+
+import struct
+import sys
+import time
+
+from crc8 import crc8
+from laufzeit import FEHLER
+from protokoll import STATUS, UNGUELTIG
+
+SYNC = b'\xA5\x5A'
+_FORMAT = '<2sHI7hB'
+RAHMEN_BYTES = 24
+
+
+class Sender:
+    def __init__(self, strom=None):
+        """
+        :param strom: Ziel mit write(), Standard: sys.stdout.buffer (USB)
+        """
+        self.strom = strom if strom is not None else sys.stdout.buffer
+        self._puffer = bytearray(RAHMEN_BYTES)
+        self.nummer = 0
+
+    def sende_roh(self, innen_t, innen_rh, aussen_t, aussen_rh, druck,
+                  tp_innen, tp_aussen, status, zeit=None):
+        """
+        Schreibt einen Rahmen aus ganzen Zahlen, ohne Heap-Allokation.
+        :param innen_t: usw. in Centi-Einheiten wie bei protokoll.neu()
+        :param status: Index in protokoll.STATUS
+        :param zeit: ticks_ms der Messung, Standard: jetzt
+        """
+        if zeit is None:
+            zeit = time.ticks_ms()
+        puffer = self._puffer
+        struct.pack_into(_FORMAT, puffer, 0, SYNC, self.nummer, zeit, innen_t, innen_rh,
+                         aussen_t, aussen_rh, druck, tp_innen, tp_aussen, status)
+        puffer[RAHMEN_BYTES - 1] = crc8(puffer, 2, RAHMEN_BYTES - 3)
+        self.strom.write(puffer)
+        self.nummer = (self.nummer + 1) & 0xFFFF
+
+    def sende(self, status, daten, zeit=None):
+        """
+        Rahmen für (status, daten) wie bei zeige(); bei FEHLER ohne Werte.
+        """
+        if status == FEHLER:
+            self.sende_roh(UNGUELTIG, UNGUELTIG, UNGUELTIG, UNGUELTIG, UNGUELTIG,
+                           UNGUELTIG, UNGUELTIG, 3, zeit)
+            return
+        innen_t, innen_rh, aussen_t, aussen_rh, druck, tp_innen, tp_aussen = daten
+        self.sende_roh(round(innen_t * 100), round(innen_rh * 100), round(aussen_t * 100),
+                       round(aussen_rh * 100), round(druck * 10), round(tp_innen * 100),
+                       round(tp_aussen * 100), STATUS.index(status), zeit)
+
+
+class Empfaenger:
+    """
+    Zerlegt einen Datenstrom in Rahmen und Textzeilen. Nach einem
+    beschädigten Rahmen sucht er die nächste Synchronisation.
+    """
+
+    def __init__(self):
+        self._puffer = bytearray()
+        self._text = bytearray()
+        self._nummer = None
+        self.statistik = {
+            'rahmen': 0,
+            'crc_fehler': 0,
+            'verloren': 0,
+            'text_bytes': 0,
+        }
+
+    def _text_an(self, daten, zeilen):
+        self.statistik['text_bytes'] += len(daten)
+        self._text.extend(daten)
+        while True:
+            ende = self._text.find(b'\n')
+            if ende < 0:
+                return
+            zeilen.append(bytes(self._text[:ende]).decode('utf-8', 'replace').rstrip('\r'))
+            del self._text[:ende + 1]
+
+    def futter(self, daten):
+        """
+        :param daten: empfangene Bytes in beliebigen Stücken
+        :return: (rahmen, zeilen): Liste von Tupeln (nummer, zeit, innen_t,
+                 innen_rh, aussen_t, aussen_rh, druck, tp_innen, tp_aussen,
+                 status) und Liste vollständiger Textzeilen
+        """
+        puffer = self._puffer
+        puffer.extend(daten)
+        rahmen, zeilen = [], []
+        pos = 0
+        while True:
+            sync = puffer.find(SYNC, pos)
+            if sync < 0:
+                # Ein einzelnes A5 am Ende kann der Anfang eines Rahmens sein
+                rest = len(puffer) - 1 if puffer[-1:] == SYNC[:1] else len(puffer)
+                self._text_an(puffer[pos:rest], zeilen)
+                pos = rest
+                break
+            if sync > pos:
+                self._text_an(puffer[pos:sync], zeilen)
+            if len(puffer) - sync < RAHMEN_BYTES:
+                pos = sync
+                break
+            if crc8(puffer, sync + 2, RAHMEN_BYTES - 3) != puffer[sync + RAHMEN_BYTES - 1]:
+                # Kein Rahmen: das erste Byte ist Text oder Störung
+                self.statistik['crc_fehler'] += 1
+                self._text_an(puffer[sync:sync + 1], zeilen)
+                pos = sync + 1
+                continue
+            satz = struct.unpack_from(_FORMAT, puffer, sync)[1:]
+            if self._nummer is not None:
+                self.statistik['verloren'] += (satz[0] - self._nummer - 1) & 0xFFFF
+            self._nummer = satz[0]
+            self.statistik['rahmen'] += 1
+            rahmen.append(satz)
+            pos = sync + RAHMEN_BYTES
+        del puffer[:pos]
+        return rahmen, zeilen
+
+
+def als_text(satz):
+    """
+    :return: Textzeile ähnlich der print()-Ausgabe für einen Rahmen
+    """
+    nummer, zeit, innen_t, innen_rh, aussen_t, aussen_rh, druck, tp_innen, tp_aussen, status = satz
+    if status == 3:
+        return '#%d %d ms | Sensorfehler' % (nummer, zeit)
+    return ('#%d %d ms | Innen: %.2fC, %.2f%%, TP: %.2fC | Aussen: %.2fC, %.2f%%, TP: %.2fC | '
+            'Druck: %.1f hPa | Status: %s' % (
+                nummer, zeit, innen_t / 100, innen_rh / 100, tp_innen / 100, aussen_t / 100,
+                aussen_rh / 100, tp_aussen / 100, druck / 10, STATUS[status]))
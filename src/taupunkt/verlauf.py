@@ -0,0 +1,167 @@
+# Verlaufsdiagramm mit dem Hardware-Scrolling des ST7789
+# Das Panel kann einen Streifen seiner 320 Speicherzeilen (VSCRDEF) ab einer
+# wählbaren Startzeile (VSCSAD) ringförmig anzeigen. Das Diagramm legt seine
+# Zeitachse auf diese Scrollachse: ein neuer Messwert verschiebt das Bild um
+# eine Zeile und zeichnet nur diese eine Spalte neu – unabhängig davon, wie
+# breit das Diagramm ist.
+# Die Scrollachse ist die native Zeilenrichtung des Panels. Quer (MADCTL MV)
+# läuft die Zeit daher von links nach rechts, hochkant von oben nach unten.
+# Der Scrollbereich reicht immer über die ganze andere Achse: alles, was dort
+# sonst steht, scrollt mit.
+
+from array import array
+
+# MADCTL-Bits, wie st7789.MADCTL_MY / MADCTL_MV
+_MADCTL_MY = 0x80
+_MADCTL_MV = 0x20
+
+# Zeilen im Bildspeicher des ST7789
+ZEILEN = 320
+
+
+class Verlaufsdiagramm:
+    def __init__(self, tft, x, y, breite, hoehe, minimum, maximum,
+                 farben=(0xFFFF,), hintergrund=0, offset=0, zeilen=ZEILEN):
+        """
+        :param tft: Display mit madctl(), vscrdef(), vscsad(), fill_rect() und
+                    blit_buffer()
+        :param x, y, breite, hoehe: Diagrammfläche in Bildschirmkoordinaten
+        :param minimum, maximum: Wertebereich der Werteachse
+        :param farben: RGB565-Farbe je Datenreihe
+        :param offset: rowstart bzw. colstart der Rotation auf der Scrollachse
+                       (0 für das 172x320-Panel)
+        :param zeilen: Zeilen im Bildspeicher
+        """
+        self.tft = tft
+        self.minimum = minimum
+        self.maximum = maximum
+        self.farben = farben
+        self.hintergrund = hintergrund
+        self.offset = offset
+        self.zeilen = zeilen
+        self._bereich(x, y, breite, hoehe)
+
+    def _bereich(self, x, y, breite, hoehe):
+        self.x = x
+        self.y = y
+        self.breite = breite
+        self.hoehe = hoehe
+        madctl = self.tft.madctl()
+        # Quer liegt die Zeitachse auf x, hochkant auf y
+        self._quer = bool(madctl & _MADCTL_MV)
+        self._gespiegelt = bool(madctl & _MADCTL_MY)
+        if self._quer:
+            self.laenge, start, werte = breite, x, hoehe
+        else:
+            self.laenge, start, werte = hoehe, y, breite
+        erste = self.offset + start
+        if self._gespiegelt:
+            erste = self.zeilen - erste - self.laenge
+        self._tfa = erste
+        self._vssa = erste
+        self._werte = werte
+        self._spalte = bytearray(werte * 2)
+        self._leer = bytes((self.hintergrund >> 8, self.hintergrund & 0xFF)) * werte
+        self._punkte = [bytes((f >> 8, f & 0xFF)) for f in self.farben]
+        # Ringpuffer der Messwerte für das Neuzeichnen (z. B. nach Rotation)
+        self._verlauf = [array('f', [0.0] * self.laenge) for _ in self.farben]
+        self._anzahl = 0
+        self._pos = 0
+        self._letzte = [None] * len(self.farben)
+
+    def _einrichten(self):
+        self.tft.vscrdef(self._tfa, self.laenge, self.zeilen - self._tfa - self.laenge)
+        self._vssa = self._tfa
+        self.tft.vscsad(self._vssa)
+        self.tft.fill_rect(self.x, self.y, self.breite, self.hoehe, self.hintergrund)
+        self._letzte = [None] * len(self.farben)
+
+    def _position(self, wert):
+        """
+        :return: Index auf der Werteachse, 0 = oben bzw. links
+        """
+        n = self._werte - 1
+        p = int((wert - self.minimum) * n / (self.maximum - self.minimum) + 0.5)
+        p = min(max(p, 0), n)
+        # Quer wachsen die Werte nach oben, hochkant nach rechts
+        return n - p if self._quer else p
+
+    def _spalte_zeichnen(self, werte):
+        spalte = self._spalte
+        spalte[:] = self._leer
+        for reihe, wert in enumerate(werte):
+            if wert is None:
+                self._letzte[reihe] = None
+                continue
+            p = self._position(wert)
+            vorher = self._letzte[reihe]
+            von, bis = (p, p) if vorher is None else (min(p, vorher), max(p, vorher))
+            punkt = self._punkte[reihe]
+            # Linie zum vorigen Wert, damit steile Verläufe nicht abreißen
+            for i in range(von, bis + 1):
+                spalte[2 * i:2 * i + 2] = punkt
+            self._letzte[reihe] = p
+
+        # Eine Speicherzeile weiterscrollen, dann genau diese neu beschreiben
+        tfa, vsa = self._tfa, self.laenge
+        if self._gespiegelt:
+            # Neuester Wert oben in der Speicherzeilenfolge
+            self._vssa = tfa + (self._vssa - tfa - 1) % vsa
+            zeile = self._vssa
+            s = self.zeilen - 1 - zeile - self.offset
+        else:
+            zeile = self._vssa
+            self._vssa = tfa + (self._vssa - tfa + 1) % vsa
+            s = zeile - self.offset
+        self.tft.vscsad(self._vssa)
+        if self._quer:
+            self.tft.blit_buffer(spalte, s, self.y, 1, self._werte)
+        else:
+            self.tft.blit_buffer(spalte, self.x, s, self._werte, 1)
+
+    def neu(self, *werte):
+        """
+        Hängt einen Messwert je Datenreihe an (None = Lücke).
+        Kostet ein VSCSAD und eine Spalte, egal wie breit das Diagramm ist.
+        """
+        if self._anzahl == 0:
+            self._einrichten()
+        for reihe, wert in enumerate(werte):
+            self._verlauf[reihe][self._pos] = float('nan') if wert is None else wert
+        self._pos = (self._pos + 1) % self.laenge
+        self._anzahl = min(self._anzahl + 1, self.laenge)
+        self._spalte_zeichnen(werte)
+
+    def werte(self):
+        """
+        :return: gespeicherte Messwerte, ältester zuerst, je Zeitpunkt ein Tupel
+        """
+        start = (self._pos - self._anzahl) % self.laenge
+        ergebnis = []
+        for n in range(self._anzahl):
+            i = (start + n) % self.laenge
+            ergebnis.append(tuple(None if v != v else v for v in (r[i] for r in self._verlauf)))
+        return ergebnis
+
+    def neu_zeichnen(self):
+        """
+        Baut Scrollbereich und Diagramm aus dem gespeicherten Verlauf neu auf,
+        z. B. nachdem das Panel gelöscht wurde.
+        """
+        verlauf = self.werte()
+        self._einrichten()
+        for werte in verlauf:
+            self._spalte_zeichnen(werte)
+
+    def rotation(self, rotation, x=None, y=None, breite=None, hoehe=None):
+        """
+        Dreht das Display (ST7789.rotation) und legt das Diagramm neu an.
+        Ohne neue Fläche bleibt die bisherige, der Verlauf bleibt erhalten.
+        """
+        verlauf = self.werte()
+        self.tft.rotation(rotation)
+        self._bereich(self.x if x is None else x, self.y if y is None else y,
+                      self.breite if breite is None else breite,
+                      self.hoehe if hoehe is None else hoehe)
+        for werte in verlauf[-self.laenge:]:
+            self.neu(*werte)
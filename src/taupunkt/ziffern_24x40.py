@@ -0,0 +1,37 @@
+# Generated by tools/rle_font.py from digits --width 24 --height 40
+# 14 glyphs, 340 bytes run-length coded (1560 bytes as 1 bpp bitmap)
+
+RLE = 1
+BPP = 1
+MAP = '0123456789.-°%'
+HEIGHT = 40
+MAX_WIDTH = 24
+OFFSET_WIDTH = 2
+WIDTHS = \
+    b'\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x08\x18\x10\x18'
+OFFSETS = \
+    b'\x00\x00\x00\x18\x00\x26\x00\x3e\x00\x56\x00\x6a\x00\x82\x00\x9c'\
+    b'\x00\xae\x00\xca\x00\xe4\x00\xea\x00\xf2\x01\x02'
+BITMAPS = \
+    b'\x04\x02\x04\x0c\x01\x00\x0d\x04\x00\x04\x0c\x04\x05\x00\x0d\x04'\
+    b'\x00\x04\x0c\x04\x04\x02\x04\x0c\x05\x00\x0d\x02\x10\x04\x05\x00'\
+    b'\x0d\x02\x10\x04\x04\x00\x04\x02\x04\x0c\x01\x00\x0d\x02\x10\x04'\
+    b'\x04\x02\x04\x0c\x01\x00\x0d\x02\x00\x04\x04\x02\x04\x0c\x04\x02'\
+    b'\x04\x0c\x01\x00\x0d\x02\x10\x04\x04\x02\x04\x0c\x01\x00\x0d\x02'\
+    b'\x10\x04\x04\x02\x04\x0c\x05\x00\x0d\x04\x00\x04\x0c\x04\x04\x02'\
+    b'\x04\x0c\x01\x00\x0d\x02\x10\x04\x04\x00\x04\x02\x04\x0c\x01\x00'\
+    b'\x0d\x02\x00\x04\x04\x02\x04\x0c\x01\x00\x0d\x02\x10\x04\x04\x02'\
+    b'\x04\x0c\x04\x02\x04\x0c\x01\x00\x0d\x02\x00\x04\x04\x02\x04\x0c'\
+    b'\x01\x00\x0d\x04\x00\x04\x0c\x04\x04\x02\x04\x0c\x04\x02\x04\x0c'\
+    b'\x01\x00\x0d\x02\x10\x04\x05\x00\x0d\x02\x10\x04\x04\x00\x04\x02'\
+    b'\x04\x0c\x01\x00\x0d\x04\x00\x04\x0c\x04\x04\x02\x04\x0c\x01\x00'\
+    b'\x0d\x04\x00\x04\x0c\x04\x04\x02\x04\x0c\x04\x02\x04\x0c\x01\x00'\
+    b'\x0d\x04\x00\x04\x0c\x04\x04\x02\x04\x0c\x01\x00\x0d\x02\x10\x04'\
+    b'\x04\x02\x04\x0c\x24\x00\x04\x02\x00\x04\x12\x00\x04\x02\x04\x0c'\
+    b'\x12\x00\x04\x02\x00\x0c\x04\x04\x00\x04\x04\x04\x04\x02\x00\x0c'\
+    b'\x1c\x00\x01\x04\x00\x08\x08\x04\x02\x04\x00\x08\x07\x04\x02\x04'\
+    b'\x00\x08\x06\x04\x03\x04\x00\x08\x05\x04\x02\x02\x0c\x04\x03\x02'\
+    b'\x0b\x04\x02\x02\x0a\x04\x03\x02\x09\x04\x02\x02\x08\x04\x02\x02'\
+    b'\x07\x04\x03\x02\x06\x04\x02\x02\x05\x04\x03\x02\x04\x04\x02\x02'\
+    b'\x03\x04\x03\x04\x02\x04\x06\x08\x02\x04\x01\x04\x07\x08\x03\x04'\
+    b'\x00\x04\x08\x08'
@@ -0,0 +1,183 @@
+# Anzeige auf dem zweiten Kern
+# Der RP2350 hat zwei Kerne. Auf Kern 0 laufen Erfassung, Entscheidung und
+# LEDs (laufzeit.Laufzeit), das Zeichnen des Dashboards – und optional das
+# Abfragen des Touch-Controllers – übernimmt ein _thread auf Kern 1. Eine
+# langsame Bildaktualisierung verzögert so weder die Messung noch die LEDs.
+# Die Kerne tauschen nur unveränderliche Schnappschüsse (Tupel) über je einen
+# Briefkasten mit einem Platz aus; alles, was das Display anfasst, läuft
+# ausschließlich auf Kern 1.
+# Auf dem Pico hat MicroPython kein GIL: geteilte Objekte werden nur unter
+# dem Lock des Briefkastens bzw. der Statistik verändert.
+
+import time
+import _thread
+
+from gesten import Gesten
+
+
+class Briefkasten:
+    """
+    Ein Platz zwischen zwei Threads, geschützt durch einen Lock.
+    put() überschreibt einen noch nicht abgeholten Eintrag: der Empfänger sieht
+    immer den neuesten Stand und der Sender wartet nie auf ihn.
+    Gleiche Schnittstelle wie laufzeit.Warteschlange (ohne await).
+    """
+
+    def __init__(self):
+        self._lock = _thread.allocate_lock()
+        self._wert = None
+        self._voll = False
+        self.verworfen = 0
+
+    def __len__(self):
+        return 1 if self._voll else 0
+
+    def put(self, wert):
+        """
+        :param wert: Schnappschuss; darf danach nicht mehr verändert werden
+        :return: False, wenn dafür ein nicht abgeholter Eintrag verworfen wurde
+        """
+        with self._lock:
+            frei = not self._voll
+            if not frei:
+                self.verworfen += 1
+            self._wert = wert
+            self._voll = True
+        return frei
+
+    def get_nowait(self):
+        """
+        :return: den Eintrag, der Platz ist danach leer
+        :raises IndexError: wenn der Briefkasten leer ist
+        """
+        with self._lock:
+            if not self._voll:
+                raise IndexError('Briefkasten leer')
+            wert = self._wert
+            self._wert = None
+            self._voll = False
+        return wert
+
+
+class Anzeigekern:
+    def __init__(self, zeige, touch=None, intervall_ms=20):
+        """
+        :param zeige: Funktion(status, daten) wie bei laufzeit.Laufzeit; läuft
+                      auf Kern 1 und ist dann der einzige Zugriff auf das Display
+        :param touch: optionaler FocalTouch, wird auf Kern 1 abgefragt
+                      (im IRQ-Modus nur dessen Ringpuffer)
+        :param intervall_ms: Abfrageabstand für Briefkasten und Touch [ms]
+        """
+        self.zeige = zeige
+        self.touch = touch
+        self.intervall_ms = intervall_ms
+        # Kern 0 -> Kern 1: (ausloeser, status, daten)
+        self.schnappschuesse = Briefkasten()
+        # Kern 1 -> Kern 0: Ereignisse (art, ticks_ms, daten) wie in Laufzeit
+        self.ereignisse = Briefkasten()
+        self._lock = _thread.allocate_lock()
+        self._statistik = {
+            'bilder': 0,
+            'fehler': 0,
+            'zeichnen_ms': 0,
+            'zeichnen_max_ms': 0,
+            'latenz_ms': 0,
+            'latenz_max_ms': 0,
+        }
+        self._laeuft = False
+        self._beendet = _thread.allocate_lock()
+        # Im IRQ-Modus des FocalTouch nur dessen Ringpuffer auswerten
+        self._gesten = Gesten() if getattr(touch, 'irq_enabled', False) else None
+
+    @property
+    def laeuft(self):
+        return self._laeuft
+
+    def put(self, schnappschuss):
+        """
+        Übergibt einen Schnappschuss an Kern 1 (aufgerufen auf Kern 0).
+        :param schnappschuss: (ausloeser, status, daten), ausloeser in ticks_ms
+        """
+        return self.schnappschuesse.put(schnappschuss)
+
+    def statistik(self):
+        """
+        :return: Kopie der Zählerstände; latenz_ms zählt vom Auslöser der
+                 Messung bis zum fertig gezeichneten Bild, 'verworfen' sind
+                 Schnappschüsse, die Kern 1 nicht rechtzeitig abgeholt hat
+        """
+        with self._lock:
+            kopie = dict(self._statistik)
+        kopie['verworfen'] = self.schnappschuesse.verworfen
+        return kopie
+
+    def starte(self):
+        """
+        Startet die Schleife auf Kern 1 (auf dem Pico gibt es nur diesen einen
+        zusätzlichen Thread).
+        """
+        if self._laeuft:
+            return
+        self._laeuft = True
+        self._beendet.acquire()
+        _thread.start_new_thread(self._schleife, ())
+
+    def stoppe(self):
+        """
+        Beendet die Schleife und wartet, bis das letzte Bild fertig ist.
+        """
+        if not self._laeuft:
+            return
+        self._laeuft = False
+        self._beendet.acquire()
+        self._beendet.release()
+
+    def _zeichne(self, schnappschuss):
+        ausloeser, status, daten = schnappschuss
+        start = time.ticks_ms()
+        try:
+            self.zeige(status, daten)
+        except Exception as e:
+            # Ein Fehler beim Zeichnen darf Kern 1 nicht beenden
+            print("Anzeigefehler:", e)
+            with self._lock:
+                self._statistik['fehler'] += 1
+            return
+        ende = time.ticks_ms()
+        dauer = time.ticks_diff(ende, start)
+        latenz = time.ticks_diff(ende, ausloeser)
+        with self._lock:
+            statistik = self._statistik
+            statistik['bilder'] += 1
+            statistik['zeichnen_ms'] = dauer
+            statistik['latenz_ms'] = latenz
+            if dauer > statistik['zeichnen_max_ms']:
+                statistik['zeichnen_max_ms'] = dauer
+            if latenz > statistik['latenz_max_ms']:
+                statistik['latenz_max_ms'] = latenz
+
+    def _frage_touch_ab(self, beruehrt):
+        if self._gesten is not None:
+            geste = self._gesten.lies(self.touch)
+            if geste:
+                self.ereignisse.put(('touch', time.ticks_ms(), geste))
+            return False
+        try:
+            jetzt = self.touch.touched > 0
+        except OSError:
+            jetzt = False
+        if jetzt and not beruehrt:
+            self.ereignisse.put(('touch', time.ticks_ms(), self.touch.touches))
+        return jetzt
+
+    def _schleife(self):
+        beruehrt = False
+        try:
+            while self._laeuft:
+                if len(self.schnappschuesse):
+                    self._zeichne(self.schnappschuesse.get_nowait())
+                if self.touch is not None:
+                    beruehrt = self._frage_touch_ab(beruehrt)
+                time.sleep(self.intervall_ms / 1000)
+        finally:
+            self._beendet.release()
@@ -0,0 +1,15 @@
+"""Gemeinsame pytest-Konfiguration.
+
+Die Module unter ``src/taupunkt`` werden auf dem Pico flach ins Wurzelverzeichnis
+kopiert (``import sht4x``), die Helfer unter ``micropython/`` als ``lib.*``.
+Für die Host-Tests werden beide Verzeichnisse genauso in ``sys.path`` eingehängt.
+"""
+
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+for pfad in (ROOT / "src" / "taupunkt", ROOT / "micropython"):
+    if str(pfad) not in sys.path:
+        sys.path.insert(0, str(pfad))
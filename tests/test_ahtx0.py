@@ -0,0 +1,61 @@
+import pytest
+
+import ahtx0
+from crc8 import crc8
+
+
+class FakeI2C:
+    """AHT20 mit festem Messrahmen; zählt die Messkommandos."""
+
+    def __init__(self, hum_raw, temp_raw, crc_fehler=0):
+        rahmen = bytearray(7)
+        rahmen[0] = 0x18  # kalibriert, nicht busy
+        rahmen[1] = hum_raw >> 12
+        rahmen[2] = (hum_raw >> 4) & 0xFF
+        rahmen[3] = ((hum_raw & 0x0F) << 4) | (temp_raw >> 16)
+        rahmen[4] = (temp_raw >> 8) & 0xFF
+        rahmen[5] = temp_raw & 0xFF
+        rahmen[6] = crc8(rahmen, 0, 6)
+        self.rahmen = rahmen
+        self.crc_fehler = crc_fehler
+        self.wandlungen = 0
+
+    def writeto(self, addr, daten):
+        if bytes(daten) == b"\xAC\x33\x00":
+            self.wandlungen += 1
+
+    def readfrom(self, addr, n):
+        return bytes(self.rahmen[:n])
+
+    def readfrom_into(self, addr, buf):
+        buf[:] = self.rahmen
+        if self.crc_fehler:
+            self.crc_fehler -= 1
+            buf[6] ^= 0xFF
+
+
+@pytest.fixture(autouse=True)
+def ohne_wartezeit(monkeypatch):
+    monkeypatch.setattr(ahtx0.time, "sleep", lambda s: None)
+
+
+def test_measurement_eine_wandlung():
+    bus = FakeI2C(hum_raw=0x80000, temp_raw=0x60000)
+    sensor = ahtx0.AHT20(bus)
+    temp, hum = sensor.measurement()
+    assert bus.wandlungen == 1
+    assert temp == pytest.approx(0x60000 * 200 / 1048576 - 50)
+    assert hum == pytest.approx(50.0)
+    assert (sensor.temp_raw, sensor.hum_raw) == (0x60000, 0x80000)
+
+
+def test_crc_fehler_wird_wiederholt():
+    bus = FakeI2C(hum_raw=0x40000, temp_raw=0x55555, crc_fehler=2)
+    temp, hum = ahtx0.AHT20(bus).measurement()
+    assert hum == pytest.approx(25.0)
+
+
+def test_dauerhafter_crc_fehler():
+    bus = FakeI2C(hum_raw=0x40000, temp_raw=0x55555, crc_fehler=3)
+    with pytest.raises(RuntimeError):
+        ahtx0.AHT20(bus).measurement()
@@ -0,0 +1,257 @@
+import random
+import struct
+import sys
+import types
+
+import pytest
+
+
+class FakePin:
+    IN = 0
+
+    def __init__(self, pin, mode=None):
+        self.pin = pin
+
+
+class FakeI2C:
+    """AXP202/AXP192 als Registerabbild, zählt jede Bustransaktion."""
+
+    def __init__(self, chip=0x41, seed=1):
+        zufall = random.Random(seed)
+        self.register = bytearray(zufall.randrange(256) for _ in range(256))
+        self.register[0x03] = chip
+        self.lesungen = []
+        self.schreibungen = []
+
+    def readfrom_mem_into(self, addr, reg, puffer):
+        self.lesungen.append((reg, len(puffer)))
+        puffer[:] = self.register[reg:reg + len(puffer)]
+
+    def writeto_mem(self, addr, reg, daten):
+        self.schreibungen.append((reg, bytes(daten)))
+        self.register[reg:reg + len(daten)] = daten
+
+    def writeto(self, addr, daten):
+        # X-Powers-Format: Paare aus Register und Wert; IRQ-Status wird durch
+        # Schreiben von 1 gelöscht
+        self.schreibungen.append((None, bytes(daten)))
+        for i in range(0, len(daten), 2):
+            self.register[daten[i]] &= ~daten[i + 1] & 0xFF
+
+    def vergiss(self):
+        self.lesungen.clear()
+        self.schreibungen.clear()
+
+
+@pytest.fixture
+def axp202c(monkeypatch):
+    """Importiert axp202c mit Attrappen für machine, micropython und ustruct."""
+    machine = types.ModuleType("machine")
+    machine.Pin, machine.SoftI2C = FakePin, None
+    micropython = types.ModuleType("micropython")
+    micropython.const = lambda x: x
+    monkeypatch.setitem(sys.modules, "machine", machine)
+    monkeypatch.setitem(sys.modules, "micropython", micropython)
+    monkeypatch.setitem(sys.modules, "ustruct", struct)
+    monkeypatch.delitem(sys.modules, "axp202c", raising=False)
+    import axp202c
+    monkeypatch.setitem(sys.modules, "axp202c", axp202c)
+    return axp202c
+
+
+def pmu_mit_bus(axp202c, chip=0x41, **kwargs):
+    bus = FakeI2C(chip)
+    pmu = axp202c.PMU(i2c=bus, **kwargs)
+    bus.vergiss()
+    return pmu, bus
+
+
+GETTER = {
+    "acin_voltage": "getAcinVoltage",
+    "acin_current": "getAcinCurrent",
+    "vbus_voltage": "getVbusVoltage",
+    "vbus_current": "getVbusCurrent",
+    "temp": "getTemp",
+    "ts_temp": "getTSTemp",
+    "gpio0_voltage": "getGPIO0Voltage",
+    "gpio1_voltage": "getGPIO1Voltage",
+    "batt_inpower": "getBattInpower",
+    "batt_voltage": "getBattVoltage",
+    "batt_charge_current": "getBattChargeCurrent",
+    "batt_discharge_current": "getBattDischargeCurrent",
+    "ips_out_voltage": "getSysIPSOUTVoltage",
+}
+
+
+@pytest.mark.parametrize("chip", [0x41, 0x03])
+def test_snapshot_wie_einzelne_getter(axp202c, chip):
+    pmu, bus = pmu_mit_bus(axp202c, chip)
+    einzeln = {name: getattr(pmu, getter)() for name, getter in GETTER.items()}
+    # Vorher 27 Einzelbyte-Lesungen, jetzt eine je Getter
+    assert len(bus.lesungen) == 13
+    bus.vergiss()
+
+    assert pmu.snapshot() == einzeln
+    assert bus.lesungen == [(0x56, 10), (0x62, 6), (0x70, 16)]
+    assert bus.schreibungen == []
+
+
+def test_snapshot_stimmt_mit_registerbytes(axp202c):
+    pmu, bus = pmu_mit_bus(axp202c)
+    bus.register[0x56:0x58] = bytes((0x12, 0x0A))  # ACIN 0x12A * 1,7 mV
+    bus.register[0x78:0x7A] = bytes((0xD2, 0x05))  # Batterie 0xD25 * 1,1 mV
+    werte = pmu.snapshot()
+    assert werte["acin_voltage"] == pytest.approx(0x12A * 1.7)
+    assert werte["batt_voltage"] == pytest.approx(0xD25 * 1.1)
+
+
+def test_irq_in_einem_burst(axp202c):
+    pmu, bus = pmu_mit_bus(axp202c)
+    bus.register[0x48:0x4D] = bytes((0x01, 0x02, 0x04, 0x08, 0x10))
+    pmu.readIRQ()
+    assert bus.lesungen == [(0x48, 5)]
+    assert bytes(pmu.irqbuf) == bytes((0x01, 0x02, 0x04, 0x08, 0x10))
+
+    pmu.clearIRQ()
+    assert len(bus.schreibungen) == 1
+    assert bus.register[0x48:0x4D] == bytes(5)
+    assert bytes(pmu.irqbuf) == bytes(5)
+
+
+def test_irq_axp192(axp202c):
+    pmu, bus = pmu_mit_bus(axp202c, 0x03)
+    bus.register[0x44:0x48] = bytes((1, 2, 3, 4))
+    bus.register[0x4D] = 5
+    pmu.readIRQ()
+    # INTSTS5 liegt beim AXP192 nicht direkt hinter INTSTS4
+    assert bus.lesungen == [(0x44, 4), (0x4D, 1)]
+    assert bytes(pmu.irqbuf) == bytes((1, 2, 3, 4, 5))
+
+    pmu.clearIRQ()
+    assert len(bus.schreibungen) == 1
+    assert bus.register[0x44:0x48] == bytes(4) and bus.register[0x4D] == 0
+
+
+def test_shadow_sync_beim_start(axp202c):
+    bus = FakeI2C()
+    pmu = axp202c.PMU(i2c=bus, shadow=True)
+    # Chip-ID, dann ein Burst je Block
+    assert bus.lesungen == [(0x03, 1)] + [(start, laenge) for start, laenge in axp202c._SHADOW_BLOCKS]
+    assert len(pmu.shadow) == sum(laenge for _, laenge in axp202c._SHADOW_BLOCKS)
+
+
+def test_setter_ohne_rueckleseung(axp202c):
+    pmu, bus = pmu_mit_bus(axp202c, shadow=True)
+    bus.register[0x12] = 0x00
+    pmu.shadow[0x12] = 0x00
+    pmu.enablePower(2)
+    pmu.enablePower(4)
+    pmu.disablePower(2)
+    pmu.enableIRQ(0x0101)
+    pmu.setLDO4Voltage(3)
+    assert bus.lesungen == []
+    assert bus.register[0x12] == 0x10
+    assert pmu.shadow[0x12] == 0x10
+
+    # Ohne Cache liest jeder Setter das Register zuerst
+    pmu, bus = pmu_mit_bus(axp202c)
+    pmu.enablePower(2)
+    assert bus.lesungen == [(0x12, 1)]
+
+
+def test_register_ausserhalb_der_bloecke_nie_im_cache(axp202c):
+    pmu, bus = pmu_mit_bus(axp202c, shadow=True)
+    adc_speed = axp202c.AXP202_ADC_SPEED
+    assert not pmu._is_shadowed(adc_speed)
+    pmu.getAdcSamplingRate()
+    pmu.getAdcSamplingRate()
+    assert bus.lesungen == [(adc_speed, 1)] * 2
+    pmu.write_byte(adc_speed, 0x40)
+    pmu.read_config(adc_speed)
+    assert adc_speed not in pmu.shadow
+
+
+def test_verify_meldet_abweichung(axp202c):
+    pmu, bus = pmu_mit_bus(axp202c, shadow=True, verify=True)
+    pmu.enablePower(2)
+    assert pmu.verify_shadow() == {}
+    # Jemand anderes ändert das Register am Cache vorbei
+    bus.register[0x12] ^= 0x01
+    assert pmu.verify_shadow() == {0x12: (pmu.shadow[0x12], bus.register[0x12])}
+    with pytest.raises(RuntimeError):
+        pmu.enablePower(4)
+
+
+def test_invalidate_und_sync_lesen_neu(axp202c):
+    pmu, bus = pmu_mit_bus(axp202c, shadow=True)
+    alt_12, alt_40 = pmu.shadow[0x12], pmu.shadow[0x40]
+    bus.register[0x12] = alt_12 ^ 0xFF
+    bus.register[0x40] = alt_40 ^ 0xFF
+    # Der Cache sieht die Änderung am Bus vorbei nicht
+    assert pmu.read_config(0x12) == alt_12
+    assert pmu.read_config(0x40) == alt_40
+    assert bus.lesungen == []
+
+    pmu.invalidate(0x12)
+    assert pmu.read_config(0x12) == alt_12 ^ 0xFF
+    assert bus.lesungen == [(0x12, 1)]
+    assert pmu.read_config(0x12) == alt_12 ^ 0xFF
+    assert pmu.read_config(0x40) == alt_40
+    assert len(bus.lesungen) == 1
+
+    pmu.sync()
+    assert pmu.read_config(0x40) == alt_40 ^ 0xFF
+    assert len(bus.lesungen) == 1 + len(axp202c._SHADOW_BLOCKS)
+
+    pmu.invalidate()
+    assert pmu.shadow == {}
+    bus.vergiss()
+    assert pmu.read_config(0x40) == alt_40 ^ 0xFF
+    assert bus.lesungen == [(0x40, 1)]
+
+
+@pytest.mark.parametrize("shadow", [False, True])
+def test_adc_kanal_2_schreibt_adc_en2(axp202c, shadow):
+    pmu, bus = pmu_mit_bus(axp202c, shadow=shadow)
+    bus.register[0x82] = 0x00
+    bus.register[0x83] = 0x00
+    if shadow:
+        pmu.sync()
+    pmu.enableADC(2, 7)
+    assert bus.register[0x83] == 0x80 and bus.register[0x82] == 0x00
+    pmu.disableADC(2, 7)
+    pmu.enableADC(1, 0)
+    assert bus.register[0x83] == 0x00 and bus.register[0x82] == 0x01
+    assert [reg for reg, _ in bus.schreibungen] == [0x83, 0x83, 0x82]
+
+
+@pytest.mark.parametrize("adc_speed, rate", [(0x00, 25), (0x40, 50), (0x80, 100), (0xC0, 200)])
+def test_coulombzaehler(axp202c, adc_speed, rate):
+    pmu, bus = pmu_mit_bus(axp202c)
+    # Untere Bits von ADC_SPEED gehören zu anderen Einstellungen
+    bus.register[0x84] = adc_speed | 0x35
+    bus.register[0xB0:0xB8] = bytes((0x00, 0x01, 0x23, 0x45, 0x00, 0x02, 0x00, 0x00))
+    assert pmu.getAdcSamplingRate() == rate
+    bus.vergiss()
+
+    assert pmu.getCoulombCounters() == (0x012345, 0x020000)
+    assert bus.lesungen == [(0xB0, 8)]
+    # Datenblatt: 65536 * 0,5 * (Laden - Entladen) / 3600 / ADC-Rate [mAh]
+    assert pmu.getCoulombData() == pytest.approx(32768 * (0x012345 - 0x020000) / 3600 / rate)
+
+
+def test_coulombzaehler_nullpunkt_und_steuerung(axp202c):
+    pmu, bus = pmu_mit_bus(axp202c)
+    bus.register[0x84] = 0x80
+    bus.register[0xB0:0xB8] = bytes((0x00, 0x00, 0x0E, 0x10) * 2)
+    assert pmu.getCoulombData() == 0
+
+    # 22500 Schritte Entladung bei 100 Hz: 32768 * 22500 / 3600 / 100 = 2048 mAh
+    bus.register[0xB0:0xB8] = bytes(4) + (22500).to_bytes(4, "big")
+    assert pmu.getCoulombData() == pytest.approx(-2048)
+
+    pmu.enableCoulombcounter()
+    pmu.clearCoulombcounter()
+    pmu.stopCoulombcounter()
+    pmu.disableCoulombcounter()
+    assert bus.schreibungen == [(0xB8, bytes((wert,))) for wert in (0x80, 0xA0, 0xC0, 0x00)]
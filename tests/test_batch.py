@@ -0,0 +1,62 @@
+import math
+from array import array
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import batch
+
+
+def taupunkt_skalar(temp, rh):
+    # Referenz: berechne_taupunkt aus main.py
+    a, b = 17.27, 237.7
+    alpha = ((a * temp) / (b + temp)) + math.log(rh / 100.0)
+    return (b * alpha) / (a - alpha)
+
+
+def status_skalar(tp_innen, tp_aussen, grenze=2.0):
+    # Referenz: Bedingungen aus entscheide_lueften
+    if tp_aussen < (tp_innen - grenze):
+        return batch.GRUEN
+    elif tp_aussen >= tp_innen:
+        return batch.ROT
+    return batch.GELB
+
+
+def test_taupunkt_wie_skalar():
+    temp = np.linspace(-40.0, 80.0, 241)
+    rh = np.linspace(0.5, 100.0, 200)
+    tt, hh = np.meshgrid(temp, rh)
+    tp = batch.berechne_taupunkt(tt, hh)
+    for t, h, wert in zip(tt.ravel(), hh.ravel(), tp.ravel()):
+        assert wert == pytest.approx(taupunkt_skalar(t, h), rel=1e-12, abs=1e-12)
+
+
+def test_entscheidung_wie_skalar():
+    rng = np.random.default_rng(1)
+    tp_innen = rng.uniform(-10, 25, 5000)
+    tp_aussen = tp_innen + rng.uniform(-6, 3, 5000)
+    status = batch.entscheide(tp_innen, tp_aussen)
+    erwartet = [status_skalar(i, a) for i, a in zip(tp_innen, tp_aussen)]
+    assert status.tolist() == erwartet
+
+
+def test_rh_null_und_nan_ohne_ausnahme():
+    tp_innen, tp_aussen, status = batch.werte_aus(
+        [20.0, 20.0, float("nan"), 20.0],
+        [0.0, 50.0, 50.0, -3.0],
+        [10.0, 10.0, 10.0, 10.0],
+        [60.0, float("nan"), 60.0, 60.0],
+    )
+    assert np.isnan(tp_innen[[0, 2, 3]]).all()
+    assert np.isnan(tp_aussen[1])
+    assert status.tolist() == [batch.UNGUELTIG] * 4
+
+
+def test_puffer_als_eingabe():
+    temp = array("f", [21.5, 5.0])
+    rh = array("f", [55.0, 80.0])
+    tp = batch.berechne_taupunkt(memoryview(temp), rh)
+    assert tp[0] == pytest.approx(taupunkt_skalar(temp[0], rh[0]))
+    assert tp[1] == pytest.approx(taupunkt_skalar(temp[1], rh[1]))
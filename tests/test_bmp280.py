@@ -0,0 +1,115 @@
+import random
+import struct
+
+import pytest
+
+import bmp280
+
+# Kalibrierbeispiel aus dem Datenblatt (Kap. 3.12)
+DATENBLATT = (27504, 26435, -1000, 36477, -10685, 3024, 2855, 140, -7, 15500, -14600, 6000)
+
+
+def referenz(calib, adc_T, adc_p):
+    """Bisherige Kompensation von BMP280.temperature/pressure, unverändert."""
+    T1, T2, T3, P1, P2, P3, P4, P5, P6, P7, P8, P9 = calib
+    var1 = (((adc_T >> 3) - (T1 << 1)) * T2) >> 11
+    var2 = (((((adc_T >> 4) - T1) * ((adc_T >> 4) - T1)) >> 12) * T3) >> 14
+    t_fine = var1 + var2
+    T = (t_fine * 5 + 128) >> 8
+    var1 = t_fine - 128000
+    var2 = var1 * var1 * P6
+    var2 = var2 + ((var1 * P5) << 17)
+    var2 = var2 + (P4 << 35)
+    var1 = ((var1 * var1 * P3) >> 8) + ((var1 * P2) << 12)
+    var1 = (((1 << 47) + var1) * P1) >> 33
+    if var1 == 0:
+        return T / 100.0, 0
+    p = 1048576 - adc_p
+    p = ((p << 31) - var2) * 3125 // var1
+    var1 = (P9 * (p >> 13) * (p >> 13)) >> 25
+    var2 = (P8 * p) >> 19
+    p = ((p + var1 + var2) >> 8) + (P7 << 4)
+    return T / 100.0, p / 25600.0
+
+
+class FakeI2C:
+    def __init__(self, calib):
+        self.calib = struct.pack("<HhhHhhhhhhhh", *calib)
+        self.register = {}
+        self.daten = bytes(6)
+
+    def writeto_mem(self, addr, reg, daten):
+        self.register.setdefault(reg, []).append(bytes(daten)[0])
+
+    def readfrom_mem(self, addr, reg, n):
+        assert reg == 0x88 and n == 24
+        return self.calib
+
+    def readfrom_mem_into(self, addr, reg, buf):
+        assert reg == 0xF7
+        buf[:] = self.daten
+
+    def setze_adc(self, adc_t, adc_p):
+        self.daten = bytes((adc_p >> 12, (adc_p >> 4) & 0xFF, (adc_p & 0x0F) << 4,
+                            adc_t >> 12, (adc_t >> 4) & 0xFF, (adc_t & 0x0F) << 4))
+
+
+def test_datenblattbeispiel():
+    bus = FakeI2C(DATENBLATT)
+    bus.setze_adc(519888, 415148)
+    temp, druck = bmp280.BMP280(bus).measurement()
+    assert temp == 25.08
+    assert druck == pytest.approx(1006.5327, abs=1e-3)
+
+
+def test_ganzzahl_bitgleich_mit_bisheriger_kompensation():
+    rnd = random.Random(280)
+    for _ in range(200):
+        calib = (rnd.randint(26000, 29000), rnd.randint(25000, 27500), rnd.randint(-1500, -500),
+                 rnd.randint(35000, 38500), rnd.randint(-11500, -10000), rnd.randint(2500, 3500),
+                 rnd.randint(2000, 9000), rnd.randint(-300, 300), rnd.randint(-10, -4),
+                 rnd.randint(15000, 16000), rnd.randint(-15000, -13000), rnd.randint(4000, 7000))
+        bus = FakeI2C(calib)
+        sensor = bmp280.BMP280(bus)
+        for _ in range(50):
+            adc_t = rnd.randint(380000, 660000)
+            adc_p = rnd.randint(200000, 600000)
+            bus.setze_adc(adc_t, adc_p)
+            assert sensor.collect() == referenz(calib, adc_t, adc_p)
+
+
+def test_gleitkomma_nahe_ganzzahl():
+    rnd = random.Random(1)
+    bus = FakeI2C(DATENBLATT)
+    ganz = bmp280.BMP280(bus)
+    gleit = bmp280.BMP280(bus, use_float=True)
+    for _ in range(500):
+        bus.setze_adc(rnd.randint(400000, 600000), rnd.randint(250000, 550000))
+        t_ganz, p_ganz = ganz.collect()
+        t_gleit, p_gleit = gleit.collect()
+        assert t_gleit == pytest.approx(t_ganz, abs=0.01)
+        assert p_gleit == pytest.approx(p_ganz, abs=0.01)
+
+
+def test_register_und_forced_modus(monkeypatch):
+    monkeypatch.setattr(bmp280.time, "ticks_ms", lambda: 1000, raising=False)
+    monkeypatch.setattr(bmp280.time, "ticks_add", lambda t, d: t + d, raising=False)
+    bus = FakeI2C(DATENBLATT)
+    # Standard entspricht der bisherigen Einstellung 0x27 / 0xA0
+    bmp280.BMP280(bus)
+    assert bus.register == {0xF4: [0x27], 0xF5: [0xA0]}
+
+    bus = FakeI2C(DATENBLATT)
+    sensor = bmp280.BMP280(bus, forced=True, profile="standard")
+    # x1/x4, Sleep-Modus, IIR 4
+    assert bus.register == {0xF4: [0x2C], 0xF5: [0xA8]}
+    assert sensor.start() == 1000 + sensor.duration_ms
+    assert bus.register[0xF4][-1] == 0x2D
+
+
+def test_messdauer():
+    # Datenblatt Tab. 13: maximale Messdauer 6.4 / 8.7 / 13.3 / 22.5 / 43.2 ms
+    erwartet = {"ultra_low_power": 7, "low_power": 9, "standard": 14,
+                "high_resolution": 23, "ultra_high_resolution": 44}
+    for name, (osrs_t, osrs_p, _) in bmp280.PROFILES.items():
+        assert bmp280.measurement_time_ms(osrs_t, osrs_p) == erwartet[name]
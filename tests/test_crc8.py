@@ -0,0 +1,57 @@
+import pytest
+
+import crc8
+import sht4x
+
+
+def test_datenblatt_beispiel():
+    # Sensirion-Datenblatt: CRC(0xBEEF) = 0x92
+    assert crc8.crc8(b"\xBE\xEF") == 0x92
+    assert crc8.crc8_bitweise(b"\xBE\xEF") == 0x92
+
+
+def test_tabelle_gleich_bitweise_fuer_alle_worte():
+    for wort in range(0x10000):
+        daten = bytes((wort >> 8, wort & 0xFF))
+        assert crc8.crc8(daten) == crc8.crc8_bitweise(daten)
+
+
+def test_crc8_mit_versatz():
+    daten = bytearray(b"\x00\x00\xBE\xEF\x00")
+    assert crc8.crc8(memoryview(daten), 2, 2) == 0x92
+
+
+class FakeI2C:
+    def __init__(self, antwort):
+        self.antwort = bytes(antwort)
+        self.geschrieben = []
+
+    def writeto(self, addr, daten):
+        self.geschrieben.append(bytes(daten))
+
+    def readfrom_into(self, addr, buf):
+        buf[:] = self.antwort
+
+
+def rahmen(temp_raw, hum_raw):
+    t = bytes((temp_raw >> 8, temp_raw & 0xFF))
+    h = bytes((hum_raw >> 8, hum_raw & 0xFF))
+    return t + bytes((crc8.crc8(t),)) + h + bytes((crc8.crc8(h),))
+
+
+def test_sht4x_messung():
+    bus = FakeI2C(rahmen(0x6666, 0x8000))
+    sensor = sht4x.SHT4x(bus)
+    temp, hum = sensor.measurements('medium')
+    assert bus.geschrieben == [b"\xF6"]
+    assert temp == pytest.approx(-45 + 175 * 0x6666 / 65535)
+    assert hum == pytest.approx(100 * 0x8000 / 65535)
+    assert (sensor.temp_raw, sensor.hum_raw) == (0x6666, 0x8000)
+
+
+def test_sht4x_crc_fehler():
+    daten = bytearray(rahmen(0x6666, 0x8000))
+    daten[5] ^= 1
+    sensor = sht4x.SHT4x(FakeI2C(daten))
+    assert sensor.measure_raw() is False
+    assert sensor.measurements() == (None, None)
@@ -0,0 +1,134 @@
+import dashboard
+
+
+class FakeFont:
+    WIDTH = 8
+    HEIGHT = 8
+
+
+ZEICHEN = 8 * 8 * 2 + 11
+
+
+class FakeTFT:
+    def __init__(self):
+        self.aufrufe = []
+
+    def fill(self, farbe):
+        self.aufrufe.append(("fill", farbe))
+
+    def fill_rect(self, x, y, breite, hoehe, farbe):
+        self.aufrufe.append(("fill_rect", x, y, breite, hoehe, farbe))
+
+    def text(self, font, text, x, y, farbe, hintergrund):
+        self.aufrufe.append(("text", text, x, y, farbe))
+
+
+def aufbau():
+    tft = FakeTFT()
+    db = dashboard.Dashboard(tft, FakeFont, 172, 320)
+    db.hinzu(dashboard.Label(15, 35, "Temp: "))
+    feld = db.hinzu(dashboard.Wertfeld(63, 35, 7, "{:.1f} C"))
+    leiste = db.hinzu(dashboard.Statusleiste(200, 172, 120))
+    return tft, db, feld, leiste
+
+
+def test_erstes_bild_vollstaendig():
+    tft, db, feld, leiste = aufbau()
+    feld.setze(21.34)
+    leiste.setze("OK", 0x07E0)
+    gesendet = db.zeichne()
+    assert tft.aufrufe[0] == ("fill", 0)
+    assert ("text", "Temp: ", 15, 35, 0xFFFF) in tft.aufrufe
+    assert ("text", "21.3 C", 63, 35, 0xFFFF) in tft.aufrufe
+    # Nach dem Füllen ist nichts zu löschen
+    assert [a for a in tft.aufrufe if a[0] == "fill_rect"] == [("fill_rect", 0, 200, 172, 120, 0x07E0)]
+    assert gesendet == db.bytes_gesendet == db.bytes_gesamt
+    assert gesendet > 172 * 320 * 2
+
+
+def test_nur_geaenderte_zeichen():
+    tft, db, feld, leiste = aufbau()
+    feld.setze(21.34)
+    leiste.setze("OK", 0x07E0)
+    db.zeichne()
+    tft.aufrufe.clear()
+
+    feld.setze(21.4)
+    assert db.zeichne() == ZEICHEN
+    assert tft.aufrufe == [("text", "4", 63 + 3 * 8, 35, 0xFFFF)]
+
+    tft.aufrufe.clear()
+    assert db.zeichne() == 0
+    assert tft.aufrufe == []
+
+
+def test_farbwechsel_zeichnet_feld_neu():
+    tft, db, feld, _ = aufbau()
+    feld.setze(21.3)
+    db.zeichne()
+    tft.aufrufe.clear()
+    feld.setze(21.3, farbe=0xF800)
+    assert db.zeichne() == 6 * ZEICHEN
+    assert tft.aufrufe == [("text", "21.3 C", 63, 35, 0xF800)]
+
+
+def test_kuerzerer_text_loescht_rest():
+    tft, db, feld, _ = aufbau()
+    feld.setze(-10.5)
+    db.zeichne()
+    tft.aufrufe.clear()
+    feld.setze(9.5)
+    db.zeichne()
+    assert tft.aufrufe == [
+        ("text", "9.5 C", 63, 35, 0xFFFF),
+        ("fill_rect", 63 + 5 * 8, 35, 2 * 8, 8, 0),
+    ]
+
+
+def test_zu_langer_text_wird_abgeschnitten():
+    feld = dashboard.Wertfeld(0, 0, 4, "{:.1f}")
+    feld.setze(1234.5)
+    tft = FakeTFT()
+    feld.zeichne(tft, FakeFont)
+    assert tft.aufrufe[0][1] == "1234"
+
+
+def test_statusleiste_nur_bei_aenderung():
+    tft, db, _, leiste = aufbau()
+    leiste.setze("Lueften!", 0x07E0)
+    db.zeichne()
+    tft.aufrufe.clear()
+    leiste.setze("Lueften!", 0x07E0)
+    assert db.zeichne() == 0
+    leiste.setze("Nicht lueften!", 0xF800)
+    db.zeichne()
+    assert tft.aufrufe == [
+        ("fill_rect", 0, 200, 172, 120, 0xF800),
+        ("text", "Nicht lueften!", (172 - 14 * 8) // 2, 215, 0xFFFF),
+    ]
+
+
+def test_invalidiere_baut_alles_neu_auf():
+    tft, db, feld, leiste = aufbau()
+    feld.setze(21.3)
+    leiste.setze("OK", 0x07E0)
+    voll = db.zeichne()
+    tft.aufrufe.clear()
+    db.invalidiere()
+    assert db.zeichne() == voll
+    assert tft.aufrufe[0] == ("fill", 0)
+    assert db.bytes_gesamt == 2 * voll
+
+
+class BlockTFT(FakeTFT):
+    def text_block(self, font, text, x, y, farbe, hintergrund):
+        self.aufrufe.append(("text_block", text, x, y, farbe))
+
+
+def test_text_block_ein_fenster_je_abschnitt():
+    tft = BlockTFT()
+    feld = dashboard.Wertfeld(63, 35, 7, "{:.1f} C")
+    feld.geloescht()
+    feld.setze(21.3)
+    assert feld.zeichne(tft, FakeFont) == 6 * 8 * 8 * 2 + 11
+    assert tft.aufrufe == [("text_block", "21.3 C", 63, 35, 0xFFFF)]
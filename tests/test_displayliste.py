@@ -0,0 +1,56 @@
+import displayliste
+
+
+class FakeTFT:
+    def __init__(self):
+        self.aufrufe = []
+
+    def fill_rect(self, x, y, breite, hoehe, farbe):
+        self.aufrufe.append((x, y, breite, hoehe, farbe))
+
+
+class ListenTFT:
+    def __init__(self):
+        self.listen = []
+
+    def draw_list(self, puffer, anzahl):
+        self.listen.append([tuple(puffer[i:i + 5]) for i in range(0, anzahl * 5, 5)])
+        return 3
+
+
+def test_aufnahme_und_ersatzweise_einzeln():
+    tft = FakeTFT()
+    dl = displayliste.Displayliste(tft, 172, 320)
+    dl.hline(10, 20, 30, 0xF800)
+    dl.vline(10, 20, 5, 0x07E0)
+    dl.pixel(1, 2, 0xFFFF)
+    assert tft.aufrufe == []
+    assert dl.flush() == 9
+    assert tft.aufrufe == [(10, 20, 30, 1, 0xF800), (10, 20, 1, 5, 0x07E0), (1, 2, 1, 1, 0xFFFF)]
+    assert dl.anzahl == 0
+    assert dl.flush() == 0
+
+
+def test_beschneiden():
+    tft = FakeTFT()
+    dl = displayliste.Displayliste(tft, 172, 320)
+    dl.fill_rect(-5, -5, 10, 10, 1)
+    dl.fill_rect(170, 318, 10, 10, 2)
+    dl.fill_rect(200, 0, 10, 10, 3)
+    dl.rect(0, 0, 172, 320, 4)
+    dl.flush()
+    assert tft.aufrufe == [
+        (0, 0, 5, 5, 1), (170, 318, 2, 2, 2),
+        (0, 0, 172, 1, 4), (0, 319, 172, 1, 4), (0, 0, 1, 320, 4), (171, 0, 1, 320, 4),
+    ]
+
+
+def test_volle_liste_wird_gezeichnet():
+    tft = ListenTFT()
+    dl = displayliste.Displayliste(tft, 172, 320, groesse=2)
+    for x in range(5):
+        dl.pixel(x, 0, 0xFFFF)
+    assert [len(liste) for liste in tft.listen] == [2, 2]
+    dl.flush()
+    assert tft.listen[-1] == [(4, 0, 1, 1, 0xFFFF)]
+    assert dl.befehle == 3
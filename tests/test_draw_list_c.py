@@ -0,0 +1,148 @@
+"""dl_reduce()/dl_group() aus csrc/src/draw_list.h, mit dem Host-Compiler übersetzt.
+
+Geprüft wird der C-Code, der auch im Treiber steckt: Zufallslisten werden
+einmal in Zeichenreihenfolge gemalt und einmal reduziert und fensterweise
+gestreamt wie in draw_list(); beide Bilder müssen gleich sein. Außerdem
+müssen die Python-Nachbildungen im Emulator dasselbe Ergebnis liefern.
+"""
+
+import ctypes
+import pathlib
+import random
+import shutil
+import subprocess
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import st7789_emulator as emu
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+BREITE, HOEHE = 24, 16
+
+HARNESS = r"""
+#include "draw_list.h"
+
+size_t reduce(uint16_t *list, size_t count) {
+    return dl_reduce((dl_rect_t *)list, count);
+}
+
+size_t group(const uint16_t *list, size_t i, size_t n, int *rows) {
+    bool r;
+    size_t end = dl_group((const dl_rect_t *)list, i, n, &r);
+    *rows = r;
+    return end;
+}
+
+size_t rect_size(void) {
+    return sizeof(dl_rect_t);
+}
+"""
+
+
+@pytest.fixture(scope="module")
+def dl(tmp_path_factory):
+    compiler = shutil.which("cc") or shutil.which("gcc") or shutil.which("clang")
+    if compiler is None:
+        pytest.skip("kein C-Compiler")
+    verzeichnis = tmp_path_factory.mktemp("draw_list")
+    quelle = verzeichnis / "harness.c"
+    quelle.write_text(HARNESS)
+    bibliothek = verzeichnis / "draw_list.so"
+    subprocess.run([compiler, "-std=c99", "-Wall", "-Werror", "-O1", "-shared", "-fPIC",
+                    "-I", str(ROOT / "csrc" / "src"), str(quelle), "-o", str(bibliothek)],
+                   check=True)
+    lib = ctypes.CDLL(str(bibliothek))
+    lib.reduce.restype = lib.group.restype = lib.rect_size.restype = ctypes.c_size_t
+    lib.reduce.argtypes = (ctypes.POINTER(ctypes.c_uint16), ctypes.c_size_t)
+    lib.group.argtypes = (ctypes.POINTER(ctypes.c_uint16), ctypes.c_size_t, ctypes.c_size_t,
+                          ctypes.POINTER(ctypes.c_int))
+    assert lib.rect_size() == 10
+    return lib
+
+
+def c_reduziere(dl, liste):
+    puffer = (ctypes.c_uint16 * (5 * len(liste)))(*[w for r in liste for w in r])
+    n = dl.reduce(puffer, len(liste))
+    reduziert = [list(puffer[5 * i:5 * i + 5]) for i in range(n)]
+    gruppen = []
+    i = 0
+    zeilen = ctypes.c_int()
+    while i < n:
+        ende = dl.group(puffer, i, n, ctypes.byref(zeilen))
+        gruppen.append((i, ende, bool(zeilen.value)))
+        i = ende
+    return reduziert, gruppen
+
+
+def male(liste):
+    bild = [[0] * BREITE for _ in range(HOEHE)]
+    for x, y, w, h, farbe in liste:
+        for yy in range(y, y + h):
+            bild[yy][x:x + w] = [farbe] * w
+    return bild
+
+
+def streame(liste, gruppen):
+    """Schreibt jede Gruppe wie draw_list() durch ein Fenster (RAMWR zeilenweise)."""
+    bild = [[0] * BREITE for _ in range(HOEHE)]
+    for i, ende, zeilen in gruppen:
+        a, letzte = liste[i], liste[ende - 1]
+        x0, y0 = a[0], a[1]
+        x1, y1 = letzte[0] + letzte[2] - 1, letzte[1] + letzte[3] - 1
+        if zeilen:
+            pixel = [r[4] for _ in range(a[3]) for r in liste[i:ende] for _ in range(r[2])]
+        else:
+            pixel = [r[4] for r in liste[i:ende] for _ in range(r[2] * r[3])]
+        # Genau so viele Pixel wie das Fenster fasst, sonst liefe es über
+        assert len(pixel) == (x1 - x0 + 1) * (y1 - y0 + 1)
+        breite = x1 - x0 + 1
+        for k, farbe in enumerate(pixel):
+            bild[y0 + k // breite][x0 + k % breite] = farbe
+    return bild
+
+
+def zufallsliste(zufall):
+    liste = []
+    for _ in range(zufall.randrange(1, 40)):
+        if zufall.random() < 0.6:
+            # Raster aus 4x4-Kacheln: viele bündige Nachbarn zum Vereinigen
+            w, h = 4 * zufall.randrange(1, 3), 4 * zufall.randrange(1, 3)
+            x, y = 4 * zufall.randrange(0, (BREITE - w) // 4 + 1), 4 * zufall.randrange(0, (HOEHE - h) // 4 + 1)
+        else:
+            w, h = zufall.randrange(0, 8), zufall.randrange(0, 6)
+            x, y = zufall.randrange(0, BREITE - w + 1), zufall.randrange(0, HOEHE - h + 1)
+        liste.append([x, y, w, h, zufall.randrange(1, 4)])
+    return liste
+
+
+def test_wie_zeichenreihenfolge(dl):
+    zufall = random.Random(16)
+    gesamt = reduziert_gesamt = 0
+    for _ in range(2000):
+        liste = zufallsliste(zufall)
+        reduziert, gruppen = c_reduziere(dl, liste)
+        assert streame(reduziert, gruppen) == male(liste)
+        gesamt += len(liste)
+        reduziert_gesamt += len(gruppen)
+    # Die Reduktion lohnt sich überhaupt
+    assert reduziert_gesamt < 0.8 * gesamt
+
+
+def test_emulator_wie_c(dl):
+    zufall = random.Random(17)
+    for _ in range(1000):
+        liste = zufallsliste(zufall)
+        reduziert, gruppen = c_reduziere(dl, liste)
+        python = emu._dl_reduziere([list(r) for r in liste])
+        assert python == reduziert
+        assert [(i,) + emu._dl_gruppe(python, i) for i, _, _ in gruppen] == gruppen
+
+
+def test_sortiert_nur_ohne_ueberlappung(dl):
+    # Überlappen sich zwei Rechtecke, bleibt die Zeichenreihenfolge
+    liste = [[4, 4, 8, 8, 1], [0, 0, 6, 6, 2]]
+    assert c_reduziere(dl, liste)[0] == liste
+    liste = [[8, 8, 4, 4, 1], [0, 0, 4, 4, 2]]
+    assert c_reduziere(dl, liste)[0] == [[0, 0, 4, 4, 2], [8, 8, 4, 4, 1]]
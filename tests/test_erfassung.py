@@ -0,0 +1,212 @@
+import pytest
+
+import ahtx0
+import erfassung
+import sht4x
+from crc8 import crc8
+
+
+class FakeUhr:
+    """Ersetzt ticks_ms/sleep_ms; die Zeit läuft nur beim Schlafen."""
+
+    def __init__(self, start=0):
+        self.jetzt = start
+        self.geschlafen = 0
+        self.bus_us = 0  # Buszeit, die Sensoren vorrücken lassen
+
+    def ticks_us(self):
+        return self.jetzt * 1000 + self.bus_us
+
+    def ticks_ms(self):
+        return self.jetzt
+
+    def ticks_add(self, t, delta):
+        return t + delta
+
+    def ticks_diff(self, a, b):
+        return a - b
+
+    def sleep_ms(self, ms):
+        self.geschlafen += ms
+        self.jetzt += ms
+
+    def sleep(self, s):
+        self.sleep_ms(int(s * 1000))
+
+
+@pytest.fixture
+def uhr(monkeypatch):
+    uhr = FakeUhr()
+    for modul in (erfassung, sht4x, ahtx0):
+        for name in ("ticks_ms", "ticks_us", "ticks_add", "ticks_diff", "sleep_ms", "sleep"):
+            monkeypatch.setattr(modul.time, name, getattr(uhr, name), raising=False)
+    return uhr
+
+
+class FakeSensor:
+    def __init__(self, uhr, dauer, wert, protokoll):
+        self.uhr = uhr
+        self.dauer = dauer
+        self.wert = wert
+        self.protokoll = protokoll
+
+    def start(self):
+        self.bereit = self.uhr.jetzt + self.dauer
+        return self.bereit
+
+    def collect(self):
+        assert self.uhr.jetzt >= self.bereit, "Ergebnis vor Fertigstellung gelesen"
+        self.protokoll.append(self.wert)
+        return self.wert
+
+
+def test_wartezeit_ist_die_laengste_wandlung(uhr):
+    protokoll = []
+    sensoren = [
+        FakeSensor(uhr, 9, "sht", protokoll),
+        FakeSensor(uhr, 80, "aht", protokoll),
+        FakeSensor(uhr, 0, "bmp", protokoll),
+    ]
+    assert erfassung.erfasse(sensoren) == ["sht", "aht", "bmp"]
+    assert protokoll == ["bmp", "sht", "aht"]
+    assert uhr.geschlafen == 80
+
+
+def test_fehler_wird_weitergereicht(uhr):
+    class Defekt(FakeSensor):
+        def collect(self):
+            raise RuntimeError("Sensor busy")
+
+    with pytest.raises(RuntimeError):
+        erfassung.erfasse([Defekt(uhr, 5, None, [])])
+
+
+class FakeBus:
+    """SHT4x (0x44) und AHT20 (0x38) an einem Bus."""
+
+    def __init__(self):
+        t, h = b"\x66\x66", b"\x80\x00"
+        self.sht = t + bytes((crc8(t),)) + h + bytes((crc8(h),))
+        aht = bytearray(b"\x18\x80\x00\x06\x00\x00\x00")
+        aht[6] = crc8(aht, 0, 6)
+        self.aht = bytes(aht)
+
+    def writeto(self, addr, daten):
+        pass
+
+    def readfrom(self, addr, n):
+        return self.aht[:n]
+
+    def readfrom_into(self, addr, buf):
+        buf[:] = self.sht if addr == 0x44 else self.aht
+
+
+def test_sht4x_und_aht20_zweiphasig(uhr):
+    bus = FakeBus()
+    innen = sht4x.SHT4x(bus)
+    aussen = ahtx0.AHT20(bus)
+    uhr.geschlafen = 0
+    (innen_t, innen_rh), (aussen_t, aussen_rh) = erfassung.erfasse((innen, aussen))
+    assert uhr.geschlafen == 80
+    assert (innen_t, innen_rh) == innen.measurements()
+    assert (aussen_t, aussen_rh) == pytest.approx((0x60000 * 200 / 1048576 - 50, 50.0))
+
+
+class PlanSensor:
+    """Sensor mit Busdauer und optionaler Genauigkeit in start()."""
+
+    def __init__(self, uhr, dauer, wert, bus_us=200):
+        self.uhr = uhr
+        self.dauer = dauer
+        self.wert = wert
+        self.bus_us = bus_us
+        self.starts = []
+
+    def start(self, praezision=None):
+        self.uhr.bus_us += self.bus_us
+        self.starts.append(praezision)
+        return self.uhr.jetzt + self.dauer
+
+    def collect(self):
+        self.uhr.bus_us += self.bus_us
+        if isinstance(self.wert, Exception):
+            raise self.wert
+        return self.wert
+
+
+def test_plan_periode(uhr):
+    innen = PlanSensor(uhr, 9, (21.0, 55.0))
+    druck = PlanSensor(uhr, 6, (20.0, 1013.0))
+    plan = erfassung.Erfassungsplan(
+        (innen, druck), (erfassung.Richtlinie(), erfassung.Richtlinie(periode=3)),
+        namen=("innen", "druck"))
+    for zyklus in range(4):
+        druck.wert = (20.0, 1013.0 + zyklus)
+        ergebnisse = plan.erfasse()
+    assert len(innen.starts) == 4 and len(druck.starts) == 2
+    # Im ausgelassenen Zyklus gilt das letzte Ergebnis
+    assert ergebnisse[1] == (20.0, 1016.0)
+    assert plan.statistik["druck"]["ausgelassen"] == 2
+    assert plan.statistik["druck"]["messungen"] == 2
+
+
+def test_plan_genauigkeit_nach_lage(uhr):
+    innen = PlanSensor(uhr, 9, (21.0, 55.0))
+    plan = erfassung.Erfassungsplan(
+        (innen,), (erfassung.Richtlinie(toleranz=0.2, praezision=erfassung.AUTO),))
+    plan.erfasse()                      # vor der ersten Entscheidung: genau
+    plan.melde_abstand(3.0)
+    plan.erfasse()                      # weit weg, noch kein Vergleich: mittel
+    plan.erfasse()                      # stabil: grob
+    innen.wert = (21.5, 55.0)
+    plan.erfasse()                      # noch grob, die Änderung zeigt erst das Ergebnis
+    plan.erfasse()                      # instabil: mittel
+    plan.melde_abstand(0.4)
+    plan.erfasse()                      # nahe der Grenze
+    assert innen.starts == ["high", "medium", "low", "low", "medium", "high"]
+    assert uhr.geschlafen == 6 * 9
+
+
+def test_plan_laesst_stabilen_sensor_aus(uhr):
+    aussen = PlanSensor(uhr, 80, (12.0, 70.0))
+    plan = erfassung.Erfassungsplan(
+        (aussen,), (erfassung.Richtlinie(toleranz=0.2, auslassen=2),))
+    plan.melde_abstand(3.0)
+    for _ in range(5):
+        plan.erfasse()
+    # gelesen, stabil gelesen, 2x ausgelassen, gelesen
+    assert len(aussen.starts) == 3
+    # Nahe der Grenze entfallen auch schon geplante Auslassungen
+    plan.melde_abstand(0.5)
+    for _ in range(3):
+        plan.erfasse()
+    assert len(aussen.starts) == 6
+
+
+def test_plan_busstatistik_und_fehler(uhr):
+    innen = PlanSensor(uhr, 9, (21.0, 55.0), bus_us=150)
+    druck = PlanSensor(uhr, 6, (20.0, 1013.0), bus_us=400)
+    plan = erfassung.Erfassungsplan(
+        (innen, druck), (erfassung.Richtlinie(praezision=erfassung.AUTO),
+                         erfassung.Richtlinie(periode=2)),
+        namen=("innen", "druck"))
+    plan.erfasse()
+    assert plan.statistik["innen"]["bus_us"] == 300
+    assert plan.statistik["druck"]["bus_us"] == 800
+    assert plan.bericht() == "innen 300 us (high), druck 800 us"
+    plan.erfasse()
+    assert plan.bericht() == "innen 300 us (high), druck -"
+    assert plan.statistik["innen"]["bus_summe_us"] == 600
+
+    druck.wert = OSError(5)
+    with pytest.raises(OSError):
+        plan.erfasse()
+    assert plan.statistik["druck"]["fehler"] == 1
+    # Nach dem Fehler wird der Drucksensor trotz Periode sofort neu gelesen
+    druck.wert = (20.0, 1012.0)
+    assert plan.erfasse()[1] == (20.0, 1012.0)
+
+
+def test_plan_ungueltige_periode():
+    with pytest.raises(ValueError):
+        erfassung.Richtlinie(periode=0)
@@ -0,0 +1,139 @@
+import pytest
+
+import focaltouch
+import gesten
+from focaltouch import EVENT_CONTACT, EVENT_DOWN, EVENT_NONE, EVENT_UP
+
+
+def punkt(x, y, finger, ereignis):
+    return bytes((ereignis << 6 | x >> 8, x & 0xFF, finger << 4 | y >> 8, y & 0xFF, 0x40, 0x00))
+
+
+LEER = bytes([0xFF] * 6)
+
+
+class FakeI2C:
+    """FT6236 mit einem Registerabbild ab 0x00."""
+
+    def __init__(self):
+        self.register = bytearray(256)
+        self.register[0xA1:0xA9] = bytes((0x30, 0x03, 0x64, 0x00, 0x01, 0x00, 0x00, 0x11))
+        self.lesungen = []
+        self.fehler = False
+
+    def melde(self, *punkte):
+        aktiv = [p for p in punkte if p[0] >> 6 != EVENT_UP]
+        self.register[0x02] = len(aktiv)
+        self.register[0x03:0x0F] = (b"".join(punkte) + LEER + LEER)[:12]
+
+    def readfrom_mem_into(self, addr, reg, puffer):
+        if self.fehler:
+            raise OSError(5)
+        self.lesungen.append((reg, len(puffer)))
+        puffer[:] = self.register[reg:reg + len(puffer)]
+
+    def writeto_mem(self, addr, reg, daten):
+        self.register[reg:reg + len(daten)] = daten
+
+
+class FakePin:
+    IRQ_FALLING = 2
+
+    def __init__(self):
+        self.handler = None
+
+    def irq(self, trigger=None, handler=None):
+        self.handler = handler
+
+
+@pytest.fixture
+def touch():
+    return focaltouch.FocalTouch(FakeI2C())
+
+
+def test_erkennung_und_abfrage(touch):
+    assert touch.chip == "FT6236"
+    touch.bus.melde(punkt(100, 200, 0, EVENT_CONTACT), punkt(3, 4095, 1, EVENT_DOWN))
+    touch.bus.lesungen.clear()
+    assert touch.touched == 2
+    assert touch.touches == [{"x": 100, "y": 200, "id": 0}, {"x": 3, "y": 4095, "id": 1}]
+    # 1 Byte Anzahl, 14 Byte Bericht statt 32
+    assert touch.bus.lesungen == [(0x02, 1), (0x01, 14)]
+
+
+def ereignisse(touch):
+    satz = [0] * 4
+    ergebnis = []
+    while touch.read_event(satz):
+        ergebnis.append(tuple(satz))
+    return ergebnis
+
+
+def test_irq_schreibt_ringpuffer(touch):
+    pin = FakePin()
+    touch.bus.lesungen.clear()
+    touch.enable_irq(pin, size=4)
+    assert touch.bus.register[0xA4] == 1
+    # Ohne Berührung wird nichts gelesen
+    assert touch.bus.lesungen == []
+    touch.bus.melde(punkt(10, 20, 0, EVENT_DOWN))
+    pin.handler(pin)
+    touch.bus.melde(punkt(12, 22, 0, EVENT_CONTACT), punkt(50, 60, 1, EVENT_DOWN))
+    pin.handler(pin)
+    # Abheben des letzten Fingers: Anzahl 0, Punkt trägt das Ereignis
+    touch.bus.melde(punkt(13, 23, 0, EVENT_UP))
+    pin.handler(pin)
+    assert touch.pending == 4
+    assert ereignisse(touch) == [(10, 20, 0, EVENT_DOWN), (12, 22, 0, EVENT_CONTACT),
+                                 (50, 60, 1, EVENT_DOWN), (13, 23, 0, EVENT_UP)]
+    assert touch.pending == 0
+    assert all(laenge == 14 for _, laenge in touch.bus.lesungen)
+
+
+def test_irq_voller_puffer_und_busfehler(touch):
+    pin = FakePin()
+    touch.enable_irq(pin, size=2)
+    touch.bus.melde(punkt(1, 1, 0, EVENT_CONTACT))
+    for _ in range(3):
+        pin.handler(pin)
+    assert (touch.pending, touch.dropped) == (2, 1)
+    touch.bus.fehler = True
+    pin.handler(pin)
+    assert touch.errors == 1
+    touch.bus.fehler = False
+    # Kein Ereignis (0b11) wird nicht gespeichert
+    ereignisse(touch)
+    touch.bus.melde(punkt(1, 1, 0, EVENT_NONE))
+    pin.handler(pin)
+    assert touch.pending == 0
+    touch.disable_irq()
+    assert pin.handler is None and not touch.irq_enabled
+
+
+@pytest.mark.parametrize("ende, geste", [
+    ((105, 95), gesten.TIPPEN),
+    ((30, 110), gesten.WISCHEN_LINKS),
+    ((180, 90), gesten.WISCHEN_RECHTS),
+    ((110, 20), gesten.WISCHEN_OBEN),
+    ((95, 190), gesten.WISCHEN_UNTEN),
+    ((125, 100), gesten.KEINE),
+])
+def test_gesten(ende, geste):
+    erkenner = gesten.Gesten()
+    assert erkenner.ereignis(100, 100, 0, EVENT_DOWN) == gesten.KEINE
+    assert erkenner.ereignis(120, 100, 0, EVENT_CONTACT) == gesten.KEINE
+    # Zweiter Finger wird ignoriert
+    assert erkenner.ereignis(10, 10, 1, EVENT_DOWN) == gesten.KEINE
+    assert erkenner.ereignis(10, 10, 1, EVENT_UP) == gesten.KEINE
+    assert erkenner.ereignis(*ende, 0, EVENT_UP) == geste
+
+
+def test_gesten_aus_ringpuffer(touch):
+    pin = FakePin()
+    touch.enable_irq(pin)
+    for x, ereignis in ((100, EVENT_DOWN), (60, EVENT_CONTACT), (20, EVENT_UP)):
+        touch.bus.melde(punkt(x, 50, 0, ereignis))
+        pin.handler(pin)
+    erkenner = gesten.Gesten()
+    assert erkenner.lies(touch) == gesten.WISCHEN_LINKS
+    assert erkenner.lies(touch) == gesten.KEINE
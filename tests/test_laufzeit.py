@@ -0,0 +1,223 @@
+import time
+
+import pytest
+
+import erfassung
+import laufzeit
+import takt
+from laufzeit import asyncio
+from psychrometrie import MAGNUS
+
+
+@pytest.fixture(autouse=True)
+def ticks(monkeypatch):
+    t0 = time.monotonic_ns()
+    monkeypatch.setattr(time, "ticks_ms", lambda: (time.monotonic_ns() - t0) // 1000000, raising=False)
+    monkeypatch.setattr(time, "ticks_us", lambda: (time.monotonic_ns() - t0) // 1000, raising=False)
+    monkeypatch.setattr(time, "ticks_add", lambda t, d: t + d, raising=False)
+    monkeypatch.setattr(time, "ticks_diff", lambda a, b: a - b, raising=False)
+
+
+def test_warteschlange_verdraengt_aeltesten():
+    async def ablauf():
+        q = laufzeit.Warteschlange(2)
+        assert q.put(1) and q.put(2)
+        assert q.put(3) is False
+        assert q.verworfen == 1
+        assert [await q.get(), await q.get()] == [2, 3]
+        assert len(q) == 0
+        with pytest.raises(IndexError):
+            q.get_nowait()
+
+    asyncio.run(ablauf())
+
+
+def test_warteschlange_weckt_wartenden():
+    async def ablauf():
+        q = laufzeit.Warteschlange()
+        aufgabe = asyncio.create_task(q.get())
+        await asyncio.sleep(0)
+        q.put("x")
+        return await asyncio.wait_for(aufgabe, 1)
+
+    assert asyncio.run(ablauf()) == "x"
+
+
+def test_entscheide():
+    assert laufzeit.entscheide(10.0, 7.0, 2.0) == laufzeit.GRUEN
+    assert laufzeit.entscheide(10.0, 9.0, 2.0) == laufzeit.GELB
+    assert laufzeit.entscheide(10.0, 10.0, 2.0) == laufzeit.ROT
+
+
+class FakeSensor:
+    def __init__(self, dauer_ms, wert):
+        self.dauer_ms = dauer_ms
+        self.wert = wert
+
+    def start(self):
+        return time.ticks_add(time.ticks_ms(), self.dauer_ms)
+
+    def collect(self):
+        if isinstance(self.wert, Exception):
+            raise self.wert
+        return self.wert
+
+
+def lauf(sensoren, zyklen=1, **kwargs):
+    leds, anzeigen = [], []
+
+    async def ablauf():
+        app = laufzeit.Laufzeit(
+            sensoren, MAGNUS, 2.0, leds.append,
+            lambda status, daten: anzeigen.append((status, daten)),
+            intervall=10, **kwargs)
+        tasks = app.starte()
+        while app.statistik["zyklen"] < zyklen:
+            await asyncio.sleep(0.005)
+        for task in tasks:
+            task.cancel()
+        return app
+
+    app = asyncio.run(asyncio.wait_for(ablauf(), 2))
+    return app, leds, anzeigen
+
+
+def test_ein_zyklus():
+    app, leds, anzeigen = lauf((
+        FakeSensor(9, (21.0, 55.0)),
+        FakeSensor(30, (12.0, 70.0)),
+        FakeSensor(0, (12.5, 1013.25)),
+    ))
+    assert leds == [laufzeit.GRUEN]
+    status, daten = anzeigen[0]
+    assert status == laufzeit.GRUEN
+    assert daten[:5] == (21.0, 55.0, 12.0, 70.0, 1013.25)
+    assert daten[5] == pytest.approx(MAGNUS.taupunkt(21.0, 55.0))
+    assert app.statistik["erfassung_ms"] >= 30
+
+
+def test_sensorfehler_laesst_leds_stehen():
+    _, leds, anzeigen = lauf((
+        FakeSensor(0, RuntimeError("AHT20 busy")),
+        FakeSensor(0, (12.0, 70.0)),
+        FakeSensor(0, (12.5, 1013.25)),
+    ))
+    assert leds == []
+    assert anzeigen[0][0] == laufzeit.FEHLER
+
+
+class FakeTouch:
+    """Wird einmal kurz berührt."""
+
+    def __init__(self):
+        self.abfragen = 0
+
+    @property
+    def touched(self):
+        self.abfragen += 1
+        return 1 if self.abfragen == 2 else 0
+
+    @property
+    def touches(self):
+        return [{"x": 1, "y": 2, "id": 0}]
+
+
+def test_beruehrung_loest_messung_aus():
+    # Ohne Touch käme die zweite Messung erst nach dem Intervall von 10 s
+    app, _, anzeigen = lauf((
+        FakeSensor(0, (21.0, 55.0)),
+        FakeSensor(0, (20.0, 70.0)),
+        FakeSensor(0, (12.5, 1013.25)),
+    ), zyklen=2, touch=FakeTouch(), touch_intervall_ms=5)
+    assert [status for status, _ in anzeigen] == [laufzeit.ROT, laufzeit.ROT]
+    assert app.statistik["latenz_max_ms"] < 1000
+
+
+class IrqTouch:
+    """FocalTouch im IRQ-Modus, der Ringpuffer enthält ein Tippen."""
+
+    irq_enabled = True
+
+    def __init__(self):
+        self.saetze = [(50, 60, 0, 0), (52, 61, 0, 1)]
+
+    def read_event(self, satz):
+        if not self.saetze:
+            return False
+        for i, wert in enumerate(self.saetze.pop(0)):
+            satz[i] = wert
+        return True
+
+    @property
+    def touched(self):
+        raise AssertionError("im IRQ-Modus wird der Bus nicht abgefragt")
+
+
+def test_geste_im_irq_modus_loest_messung_aus():
+    app, _, anzeigen = lauf((
+        FakeSensor(0, (21.0, 55.0)),
+        FakeSensor(0, (20.0, 70.0)),
+        FakeSensor(0, (12.5, 1013.25)),
+    ), zyklen=2, touch=IrqTouch(), touch_intervall_ms=5)
+    assert len(anzeigen) == 2
+
+
+def test_takt_verkuerzt_intervall():
+    # Innen und außen gleicher Taupunkt: auf der GELB/ROT-Grenze, also min_s
+    takt_geber = takt.Takt(2.0, min_s=0.02, max_s=10)
+    sensoren = (FakeSensor(2, (21.0, 55.0)), FakeSensor(5, (21.0, 55.0)),
+                FakeSensor(1, (21.0, 1013.25)))
+    app, leds, _ = lauf(sensoren, zyklen=3, takt=takt_geber)
+    assert leds[:3] == [laufzeit.ROT] * 3
+    assert takt_geber.intervall_s == 0.02
+
+
+def test_erfassungsplan():
+    sensoren = (FakeSensor(2, (21.0, 55.0)), FakeSensor(5, (12.0, 70.0)),
+                FakeSensor(1, (21.0, 1013.25)))
+    plan = erfassung.Erfassungsplan(sensoren, (erfassung.Richtlinie(), erfassung.Richtlinie(),
+                                               erfassung.Richtlinie(periode=5)))
+    takt_geber = takt.Takt(2.0, min_s=0.02, max_s=0.02)
+    app, leds, anzeigen = lauf(sensoren, zyklen=3, takt=takt_geber, plan=plan)
+    assert leds[:3] == [laufzeit.GRUEN] * 3
+    assert anzeigen[2][1][4] == 1013.25
+    # Taupunktabstand 4,9 K: weit weg von beiden Grenzen
+    assert not plan.nahe
+    assert plan.statistik["2"]["messungen"] == 1
+    assert plan.statistik["2"]["ausgelassen"] >= 2
+
+
+def test_grenzabstand():
+    assert laufzeit.grenzabstand(10.0, 7.0, 2.0) == 1.0
+    assert laufzeit.grenzabstand(10.0, 9.5, 2.0) == 0.5
+    assert laufzeit.grenzabstand(10.0, 12.0, 2.0) == 2.0
+
+
+class FakeProtokoll:
+    """Nimmt nur die allokationsfreien Aufrufe an, erfasse() fehlt absichtlich."""
+
+    def __init__(self):
+        self.saetze = []
+
+    def neu(self, *werte):
+        self.saetze.append(werte)
+
+    def fehler(self):
+        self.saetze.append("fehler")
+
+    def faellig(self):
+        return False
+
+
+@pytest.mark.parametrize("innen, erwartet", [
+    ((21.0, 55.0), [(2100, 5500, 1200, 7000, 10132, 0)]),
+    (RuntimeError("AHT20 busy"), ["fehler"]),
+])
+def test_protokoll_ueber_neu(innen, erwartet):
+    log = FakeProtokoll()
+    lauf((
+        FakeSensor(0, innen),
+        FakeSensor(0, (12.0, 70.0)),
+        FakeSensor(0, (12.5, 1013.25)),
+    ), protokoll=log)
+    assert log.saetze == erwartet
@@ -0,0 +1,150 @@
+import math
+import random
+
+import pytest
+
+import protokoll
+from laufzeit import FEHLER, GELB
+
+RTC_START = 1_760_000_000
+
+
+class FakeUhr:
+    def __init__(self):
+        self.jetzt = 0
+
+    def ticks_ms(self):
+        return self.jetzt
+
+    def ticks_diff(self, a, b):
+        return a - b
+
+    def time(self):
+        return RTC_START + self.jetzt / 1000
+
+
+@pytest.fixture
+def uhr(monkeypatch):
+    uhr = FakeUhr()
+    for name in ("ticks_ms", "ticks_diff", "time"):
+        monkeypatch.setattr(protokoll.time, name, getattr(uhr, name), raising=False)
+    return uhr
+
+
+def tag(uhr, log, anzahl=1440, schritt_ms=60_000):
+    """Ein Tag im Minutentakt mit Tagesgang und Sensorrauschen."""
+    zufall = random.Random(1)
+    saetze = []
+    for i in range(anzahl):
+        phase = 2 * math.pi * i / 1440
+        werte = (round((21 + 0.5 * math.sin(phase)) * 100 + zufall.gauss(0, 3)),
+                 round((50 + 3 * math.sin(phase)) * 100 + zufall.gauss(0, 6)),
+                 round((12 + 5 * math.sin(phase - 1)) * 100 + zufall.gauss(0, 3)),
+                 round((70 - 15 * math.sin(phase - 1)) * 100 + zufall.gauss(0, 8)),
+                 10132 if i % 30 else 10133)
+        status = 1 if 600 < i < 700 else 0
+        log.neu(*werte, status)
+        saetze.append((RTC_START + uhr.jetzt // 1000,) + werte + (status,))
+        uhr.jetzt += schritt_ms
+        if log.faellig():
+            log.flush()
+    return saetze
+
+
+def test_ein_tag_passt_in_wenige_kb(uhr, tmp_path):
+    log = protokoll.Protokoll(str(tmp_path / "m"))
+    saetze = tag(uhr, log)
+    log.flush_alle()
+    assert len(log) == 0 and log.verworfen == 0
+    pfade = log.dateien_alt_nach_neu()
+    assert pfade == [log.pfad(0)]
+    groesse = (tmp_path / "m_0.bin").stat().st_size
+    assert groesse == log.statistik["bytes"] < 8 * 1024
+    # Jeder Block höchstens block_bytes groß
+    assert log.statistik["bloecke"] * 512 >= groesse
+    assert protokoll.lies(pfade) == saetze
+
+
+def test_flush_schreibt_hoechstens_einen_block(uhr, tmp_path):
+    log = protokoll.Protokoll(str(tmp_path / "m"), groesse=512, block_bytes=128)
+    for i in range(300):
+        log.neu(2100 + i % 7, 5000, 1200, 7000, 10130)
+        uhr.jetzt += 60_000
+    geschrieben = log.flush()
+    assert 0 < geschrieben < 300 and len(log) == 300 - geschrieben
+    assert log.statistik["bytes"] <= 128
+    log.flush_alle()
+    assert len(protokoll.lies([log.pfad(0)])) == 300
+
+
+def test_ringpuffer_verwirft_aelteste(uhr, tmp_path):
+    log = protokoll.Protokoll(str(tmp_path / "m"), groesse=4)
+    for i in range(6):
+        assert log.neu(i, 0, 0, 0, 0) is (i < 4)
+        uhr.jetzt += 1000
+    assert log.verworfen == 2 and log.faellig()
+    log.flush_alle()
+    assert [satz[1] for satz in protokoll.lies([log.pfad(0)])] == [2, 3, 4, 5]
+
+
+def test_dateiwechsel_ueberschreibt_aelteste(uhr, tmp_path):
+    name = str(tmp_path / "m")
+    log = protokoll.Protokoll(name, dateien=2, datei_bytes=600, block_bytes=256)
+    saetze = tag(uhr, log, anzahl=400)
+    log.flush_alle()
+    pfade = log.dateien_alt_nach_neu()
+    assert len(pfade) == 2
+    gelesen = protokoll.lies(pfade)
+    # Die ältesten Sätze sind überschrieben, der Rest ist lückenlos
+    assert 0 < len(gelesen) < 400 and gelesen == saetze[-len(gelesen):]
+    # Nach einem Neustart geht es in der neuesten Datei weiter
+    neu = protokoll.Protokoll(name, dateien=2, datei_bytes=600, block_bytes=256)
+    assert (neu._datei, neu._datei_groesse) == (log._datei, log._datei_groesse)
+
+
+def test_beschaedigter_block_wird_uebersprungen(uhr, tmp_path):
+    log = protokoll.Protokoll(str(tmp_path / "m"), block_bytes=64)
+    saetze = tag(uhr, log, anzahl=40)
+    log.flush_alle()
+    daten = bytearray((tmp_path / "m_0.bin").read_bytes())
+    gelesen = protokoll.lies([log.pfad(0)])
+    assert gelesen == saetze
+    daten[12] ^= 0xFF  # erster Block
+    rest = list(protokoll.dekodiere(bytes(daten)))
+    assert rest and rest == saetze[-len(rest):] and len(rest) < 40
+
+
+def test_erfasse_mit_fehler(uhr, tmp_path):
+    log = protokoll.Protokoll(str(tmp_path / "m"))
+    log.erfasse(GELB, (21.234, 55.0, 12.0, 70.5, 1013.25, 11.6, 6.7))
+    uhr.jetzt += 60_000
+    log.erfasse(FEHLER, OSError(5))
+    log.flush()
+    gelesen = protokoll.lies([log.pfad(0)])
+    assert gelesen[0] == (RTC_START, 2123, 5500, 1200, 7050, 10132, 1)
+    assert gelesen[1] == (RTC_START + 60,) + (protokoll.UNGUELTIG,) * 5 + (3,)
+
+
+def test_faellig_nach_hoechstalter(uhr, tmp_path):
+    log = protokoll.Protokoll(str(tmp_path / "m"), max_alter_s=1800)
+    assert not log.faellig()
+    # Messintervall 900 s: der Füllstand allein würde erst nach ~21 h melden
+    log.neu(2100, 5000, 1200, 7000, 10130)
+    uhr.jetzt += 900_000
+    log.neu(2101, 5000, 1200, 7000, 10130)
+    assert not log.faellig()
+    uhr.jetzt += 900_000
+    assert log.faellig()
+    assert log.flush() == 2 and not log.faellig()
+
+    ohne = protokoll.Protokoll(str(tmp_path / "o"), max_alter_s=None)
+    ohne.neu(2100, 5000, 1200, 7000, 10130)
+    uhr.jetzt += 86_400_000
+    assert not ohne.faellig()
+
+
+def test_fehler_ohne_messwerte(uhr, tmp_path):
+    log = protokoll.Protokoll(str(tmp_path / "m"))
+    log.fehler()
+    log.flush()
+    assert protokoll.lies([log.pfad(0)]) == [(RTC_START,) + (protokoll.UNGUELTIG,) * 5 + (3,)]
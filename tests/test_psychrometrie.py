@@ -0,0 +1,55 @@
+import math
+
+import pytest
+
+import psychrometrie as psy
+
+
+def taupunkt_alt(temp, rh):
+    # bisherige berechne_taupunkt aus main.py
+    a, b = 17.27, 237.7
+    alpha = ((a * temp) / (b + temp)) + math.log(rh / 100.0)
+    return (b * alpha) / (a - alpha)
+
+
+@pytest.mark.parametrize("temp", [-20.0, 0.0, 12.5, 35.0])
+@pytest.mark.parametrize("rh", [5.0, 50.0, 99.0])
+def test_magnus_identisch_zur_alten_funktion(temp, rh):
+    assert psy.MAGNUS.taupunkt(temp, rh) == taupunkt_alt(temp, rh)
+
+
+@pytest.mark.parametrize("name", sorted(psy.FORMELN))
+def test_taupunkt_bei_sattigung_gleich_temperatur(name):
+    formel = psy.FORMELN[name]
+    for temp in (-10.0, 0.0, 20.0):
+        assert formel.taupunkt(temp, 100.0) == pytest.approx(temp, abs=1e-6)
+
+
+@pytest.mark.parametrize("name", ["magnus", "buck", "sonntag"])
+def test_taupunkt_ist_umkehrung_des_saettigungsdrucks(name):
+    formel = psy.FORMELN[name]
+    referenz = psy.Sonntag(iterationen=10)
+    for temp in (-5.0, 10.0, 25.0, 40.0):
+        for rh in (20.0, 60.0):
+            e = psy.dampfdruck(temp, rh, formel)
+            # Taupunkt: dort ist der Sättigungsdruck gleich dem Partialdruck
+            tp = formel.taupunkt(temp, rh)
+            assert formel.saettigungsdampfdruck(tp) == pytest.approx(e, rel=2e-3)
+            assert tp == pytest.approx(referenz.taupunkt(temp, rh), abs=0.2)
+
+
+def test_saettigungsdruck_referenzwerte():
+    # 6.112 hPa bei 0 °C, 23.39 hPa bei 20 °C (WMO)
+    for formel in (psy.MAGNUS, psy.BUCK, psy.SONNTAG):
+        assert formel.saettigungsdampfdruck(0.0) == pytest.approx(6.11, abs=0.01)
+        assert formel.saettigungsdampfdruck(20.0) == pytest.approx(23.37, abs=0.05)
+    assert psy.MAGNUS_EIS.saettigungsdampfdruck(-10.0) == pytest.approx(2.60, abs=0.01)
+
+
+def test_abgeleitete_groessen():
+    # 20 °C, 50 %, 1013.25 hPa
+    assert psy.absolute_feuchte(20.0, 50.0) == pytest.approx(8.65, abs=0.05)
+    assert psy.mischungsverhaeltnis(20.0, 50.0, 1013.25) == pytest.approx(7.26, abs=0.05)
+    assert psy.enthalpie(20.0, 50.0, 1013.25) == pytest.approx(38.6, abs=0.2)
+    # geringerer Druck -> mehr Wasserdampf je kg trockener Luft
+    assert psy.mischungsverhaeltnis(20.0, 50.0, 900.0) > psy.mischungsverhaeltnis(20.0, 50.0, 1013.25)
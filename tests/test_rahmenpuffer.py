@@ -0,0 +1,161 @@
+import random
+
+import pytest
+
+import dashboard
+import rahmenpuffer
+
+BREITE = 172
+HOEHE = 320
+ROT = 0xF800
+WEISS = 0xFFFF
+CYAN = 0x07FF
+
+
+def baue_font(breite, hoehe, seed):
+    rnd = random.Random(seed)
+
+    class Font:
+        WIDTH = breite
+        HEIGHT = hoehe
+        FIRST = 0x20
+        LAST = 0x7F
+        FONT = bytes(rnd.randrange(256) for _ in range(96 * hoehe * breite // 8))
+
+    return Font
+
+
+FONT8 = baue_font(8, 8, 1)
+FONT16 = baue_font(16, 16, 2)
+
+
+class FakePanel:
+    """Setzt die RGB565-Daten aus blit_buffer in ein Pixelbild um."""
+
+    def __init__(self):
+        self.bild = [[None] * BREITE for _ in range(HOEHE)]
+        self.blits = []
+
+    def blit_buffer(self, puffer, x, y, breite, hoehe):
+        self.blits.append((x, y, breite, hoehe))
+        daten = bytes(puffer[:breite * hoehe * 2])
+        for n in range(breite * hoehe):
+            self.bild[y + n // breite][x + n % breite] = daten[2 * n] << 8 | daten[2 * n + 1]
+
+
+class AsyncPanel(FakePanel):
+    def __init__(self):
+        super().__init__()
+        self.quellen = []
+
+    def blit_buffer_async(self, puffer, x, y, breite, hoehe):
+        self.quellen.append(id(puffer))
+        self.blit_buffer(puffer, x, y, breite, hoehe)
+
+
+class Referenz:
+    """Naives Pixelbild als Vergleich."""
+
+    def __init__(self, farbe=0):
+        self.bild = [[farbe] * BREITE for _ in range(HOEHE)]
+
+    def fill_rect(self, x, y, breite, hoehe, farbe):
+        for yy in range(max(y, 0), min(y + hoehe, HOEHE)):
+            for xx in range(max(x, 0), min(x + breite, BREITE)):
+                self.bild[yy][xx] = farbe
+
+    def text(self, font, text, x, y, farbe, hintergrund):
+        wide = font.WIDTH // 8
+        for c in text.encode():
+            if x + font.WIDTH > BREITE:
+                break
+            idx = (c - font.FIRST) * font.HEIGHT * wide
+            for zeile in range(font.HEIGHT):
+                for spalte in range(font.WIDTH):
+                    bit = font.FONT[idx + zeile * wide + spalte // 8] >> (7 - spalte % 8) & 1
+                    self.bild[y + zeile][x + spalte] = farbe if bit else hintergrund
+            x += font.WIDTH
+
+
+def test_fill_sendet_ganzes_bild_in_baendern():
+    panel = FakePanel()
+    fb = rahmenpuffer.Palettenpuffer(panel, BREITE, HOEHE)
+    assert len(fb.puffer) == BREITE * HOEHE // 2
+    fb.fill(ROT)
+    assert fb.flush() == BREITE * HOEHE * 2 + 20 * 11
+    assert len(panel.blits) == 20
+    assert all(p == ROT for zeile in panel.bild for p in zeile)
+    assert fb.flush() == 0
+
+
+@pytest.mark.parametrize("x, y, breite, hoehe", [
+    (15, 35, 1, 1), (16, 35, 1, 3), (15, 35, 2, 2), (15, 200, 157, 120), (-3, -2, 10, 10),
+    (165, 310, 20, 20),
+])
+def test_fill_rect_wie_referenz(x, y, breite, hoehe):
+    panel = FakePanel()
+    fb = rahmenpuffer.Palettenpuffer(panel, BREITE, HOEHE)
+    ref = Referenz()
+    fb.fill(0)
+    fb.flush()
+    fb.fill_rect(x, y, breite, hoehe, ROT)
+    ref.fill_rect(x, y, breite, hoehe, ROT)
+    fb.flush()
+    assert panel.bild == ref.bild
+
+
+@pytest.mark.parametrize("font", [FONT8, FONT16])
+@pytest.mark.parametrize("x", [15, 16, 95])
+def test_text_wie_referenz(font, x):
+    panel = FakePanel()
+    fb = rahmenpuffer.Palettenpuffer(panel, BREITE, HOEHE)
+    ref = Referenz(ROT)
+    fb.fill(ROT)
+    fb.text(font, "Taupunkt: 12.3 C", x, 65, WEISS, 0)
+    ref.text(font, "Taupunkt: 12.3 C", x, 65, WEISS, 0)
+    fb.flush()
+    assert panel.bild == ref.bild
+
+
+def test_nur_geaenderte_kacheln():
+    panel = FakePanel()
+    fb = rahmenpuffer.Palettenpuffer(panel, BREITE, HOEHE)
+    fb.fill(0)
+    fb.flush()
+    panel.blits.clear()
+    # Zeichen über zwei Kacheln: ein gemeinsames Fenster
+    fb.text(FONT8, "4", 91, 35, WEISS, 0)
+    assert fb.flush() == 32 * 16 * 2 + 11
+    assert panel.blits == [(80, 32, 32, 16)]
+
+
+def test_palette_hoechstens_16_farben():
+    fb = rahmenpuffer.Palettenpuffer(FakePanel(), BREITE, HOEHE)
+    for farbe in range(1, 16):
+        fb.fill_rect(0, 0, 2, 2, farbe)
+    assert fb.farbindex(15) == 15
+    with pytest.raises(ValueError):
+        fb.fill_rect(0, 0, 2, 2, 16)
+
+
+def test_async_wechselt_baender():
+    panel = AsyncPanel()
+    fb = rahmenpuffer.Palettenpuffer(panel, BREITE, HOEHE)
+    fb.fill(CYAN)
+    fb.flush()
+    assert len(set(panel.quellen)) == 2
+    assert all(a != b for a, b in zip(panel.quellen, panel.quellen[1:]))
+    assert all(p == CYAN for zeile in panel.bild for p in zeile)
+
+
+def test_dashboard_zaehlt_busbytes_des_puffers():
+    panel = FakePanel()
+    fb = rahmenpuffer.Palettenpuffer(panel, BREITE, HOEHE)
+    db = dashboard.Dashboard(fb, FONT8, BREITE, HOEHE)
+    feld = db.hinzu(dashboard.Wertfeld(63, 35, 7, "{:.1f} C"))
+    feld.setze(21.3)
+    assert db.zeichne() == BREITE * HOEHE * 2 + 20 * 11
+    feld.setze(21.4)
+    # Geänderte Ziffer bei x=87..94 liegt in einer Kachel
+    assert db.zeichne() == 16 * 16 * 2 + 11
+    assert db.bytes_gesamt == BREITE * HOEHE * 2 + 20 * 11 + 16 * 16 * 2 + 11
@@ -0,0 +1,135 @@
+import pathlib
+import random
+
+import pytest
+
+import dashboard
+import rlefont
+import ziffern_24x40
+from tools import rle_font
+
+WEISS = 0xFFFF
+ROT = 0xF800
+
+
+class Panel:
+    """Pixelbild aus fill_rect-Aufrufen."""
+
+    def __init__(self, breite=172, hoehe=100):
+        self.bild = [[0] * breite for _ in range(hoehe)]
+
+    def fill_rect(self, x, y, breite, hoehe, farbe):
+        for yy in range(y, y + hoehe):
+            for xx in range(x, x + breite):
+                self.bild[yy][xx] = farbe
+
+
+class WriteTFT:
+    RLE = 1
+
+    def __init__(self):
+        self.aufrufe = []
+
+    def write(self, font, text, x, y, farbe, hintergrund):
+        self.aufrufe.append(("write", text, x))
+
+    def fill_rect(self, x, y, breite, hoehe, farbe):
+        self.aufrufe.append(("fill_rect", x, breite))
+
+
+def test_erzeugter_font_ist_aktuell():
+    pfad = pathlib.Path(ziffern_24x40.__file__)
+    erwartet = rle_font.font_module(rle_font.render_digits(24, 40), "digits --width 24 --height 40")
+    assert pfad.read_text(encoding="utf-8") == erwartet
+
+
+def test_kodierung_umkehrbar():
+    rnd = random.Random(5)
+    for _ in range(50):
+        breite, hoehe = rnd.randrange(1, 40), rnd.randrange(1, 50)
+        zeilen = [[int(rnd.random() < 0.3) for _ in range(breite)] for _ in range(hoehe)]
+        daten = rle_font.encode_glyph(zeilen)
+        assert rle_font.decode_glyph(daten, breite, hoehe) == zeilen
+
+
+def test_kleiner_als_bitmap():
+    roh = sum((b * ziffern_24x40.HEIGHT + 7) // 8 for b in ziffern_24x40.WIDTHS)
+    assert len(ziffern_24x40.BITMAPS) * 4 < roh
+
+
+@pytest.mark.parametrize("zeichen", rle_font.DIGIT_CHARS)
+def test_rechtecke_ergeben_glyphe(zeichen):
+    offset, breite = rlefont.glyphe(ziffern_24x40, zeichen)
+    panel = Panel(breite, ziffern_24x40.HEIGHT)
+    for x, y, w, h in rlefont.rechtecke(ziffern_24x40, offset):
+        panel.fill_rect(x, y, w, h, 1)
+    assert panel.bild == rle_font.render_digits(24, 40)[zeichen]
+
+
+def test_zeichen_ausserhalb_des_fonts():
+    assert rlefont.glyphe(ziffern_24x40, "x") is None
+    assert rlefont.breite(ziffern_24x40, "1x.") == 24 + 8
+    assert rlefont.zeichne(Panel(), ziffern_24x40, "x", 0, 0, WEISS, 0) == (0, 0)
+
+
+def test_grosswert_zeichnet_nur_geaenderte_glyphen():
+    tft = WriteTFT()
+    feld = dashboard.Grosswert(15, 200, ziffern_24x40, 5, "{:.1f}°")
+    feld.geloescht()
+    feld.setze(21.3)
+    assert feld.zeichne(tft, None) == (3 * 24 + 8 + 16) * 40 * 2 + 5 * 11
+    assert [a[1] for a in tft.aufrufe] == ["2", "1", ".", "3", "°"]
+    tft.aufrufe.clear()
+    feld.setze(21.4)
+    assert feld.zeichne(tft, None) == 24 * 40 * 2 + 11
+    assert tft.aufrufe == [("write", "4", 15 + 56)]
+    assert feld.zeichne(tft, None) == 0
+    # Kürzer und verschoben: alles ab der ersten Abweichung, Rest löschen
+    tft.aufrufe.clear()
+    feld.setze(9.0)
+    feld.zeichne(tft, None)
+    assert tft.aufrufe == [("write", "9", 15), ("write", ".", 39), ("write", "0", 47),
+                           ("write", "°", 71), ("fill_rect", 87, 24)]
+
+
+def test_write_ohne_rle_zeichnet_rechtecke():
+    # Ältere Firmware: write() vorhanden, aber ohne RLE-Dekoder
+    class AlterTreiber(Panel):
+        def write(self, *args):
+            raise AssertionError("write() würde die Läufe als Bitmap zeichnen")
+
+    panel, alt = Panel(), AlterTreiber()
+    erwartet = rlefont.zeichne(panel, ziffern_24x40, "7", 3, 4, WEISS, 0)
+    assert rlefont.zeichne(alt, ziffern_24x40, "7", 3, 4, WEISS, 0) == erwartet
+    assert alt.bild == panel.bild
+
+
+def test_grosswert_unbekannt_loescht_ganzes_feld():
+    tft = WriteTFT()
+    feld = dashboard.Grosswert(15, 200, ziffern_24x40, 5, "{:.0f}%")
+    feld.setze(55)
+    feld.zeichne(tft, None)
+    assert tft.aufrufe[-1] == ("fill_rect", 15 + 72, 5 * 24 - 72)
+
+
+def test_grosswert_ueber_fill_rect_wie_font():
+    panel = Panel()
+    feld = dashboard.Grosswert(10, 20, ziffern_24x40, 5, "{:.1f}°", WEISS)
+    feld.setze(-3.5)
+    feld.zeichne(panel, None)
+    glyphen = rle_font.render_digits(24, 40)
+    x = 10
+    for zeichen in "-3.5°":
+        for y, zeile in enumerate(glyphen[zeichen]):
+            assert panel.bild[20 + y][x:x + len(zeile)] == [WEISS if p else 0 for p in zeile]
+        x += len(glyphen[zeichen][0])
+    feld.setze(-3.5, ROT)
+    feld.zeichne(panel, None)
+    assert panel.bild[20 + 38][10 + 4] == 0 and ROT in panel.bild[20 + 19]
+
+
+def test_grosswert_kuerzt_auf_feldbreite():
+    feld = dashboard.Grosswert(0, 0, ziffern_24x40, 3, "{:.1f}°")
+    feld.setze(123.4)
+    assert rlefont.breite(ziffern_24x40, feld._text) <= 72
+    assert feld._text == "123"
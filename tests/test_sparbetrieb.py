@@ -0,0 +1,309 @@
+import math
+
+import pytest
+
+import laufzeit
+import protokoll
+import sparbetrieb
+import takt
+from psychrometrie import MAGNUS
+
+
+class FakeUhr:
+    """Ersetzt ticks_ms/sleep; die Zeit läuft nur beim Schlafen."""
+
+    def __init__(self):
+        self.jetzt = 0
+
+    def ticks_ms(self):
+        return self.jetzt
+
+    def ticks_add(self, t, delta):
+        return t + delta
+
+    def ticks_diff(self, a, b):
+        return a - b
+
+    def sleep_ms(self, ms):
+        self.jetzt += ms
+
+    def sleep(self, s):
+        self.sleep_ms(int(s * 1000))
+
+
+class FakeMachine:
+    PWRON_RESET = 1
+    WDT_RESET = 3
+
+    def __init__(self, uhr):
+        self.uhr = uhr
+        self.schlaf = []
+        # rp2: deepsleep endet mit einem Watchdog-Reset
+        self.ursache = self.WDT_RESET
+
+    def reset_cause(self):
+        return self.ursache
+
+    def lightsleep(self, ms):
+        self.schlaf.append(("leicht", ms))
+        self.uhr.sleep_ms(ms)
+
+    def deepsleep(self, ms):
+        # Auf dem Pico folgt ein Neustart, die Tests bauen danach neu auf
+        self.schlaf.append(("tief", ms))
+
+
+@pytest.fixture
+def uhr(monkeypatch):
+    uhr = FakeUhr()
+    for name in ("ticks_ms", "ticks_add", "ticks_diff", "sleep_ms", "sleep"):
+        monkeypatch.setattr(sparbetrieb.time, name, getattr(uhr, name), raising=False)
+    monkeypatch.setattr(sparbetrieb, "machine", FakeMachine(uhr))
+    return uhr
+
+
+class FakeSensor:
+    def __init__(self, uhr, dauer_ms, wert):
+        self.uhr = uhr
+        self.dauer_ms = dauer_ms
+        self.wert = wert
+        self.aufrufe = []
+
+    def start(self):
+        self.aufrufe.append("start")
+        return self.uhr.jetzt + self.dauer_ms
+
+    def collect(self):
+        if isinstance(self.wert, Exception):
+            raise self.wert
+        return self.wert
+
+
+class FakeBMP(FakeSensor):
+    def sleep(self):
+        self.aufrufe.append("sleep")
+
+    def wake(self):
+        self.aufrufe.append("wake")
+
+
+class FakeTFT:
+    def __init__(self):
+        self.schlaeft = False
+
+    def sleep_mode(self, wert):
+        self.schlaeft = wert
+
+
+class FakePin:
+    def __init__(self):
+        self.wert = 1
+
+    def on(self):
+        self.wert = 1
+
+    def off(self):
+        self.wert = 0
+
+
+class FakePMU:
+    """Coulombzähler, den der Test von Hand herunterzählt."""
+
+    def __init__(self):
+        self.mah = 100.0
+        self.aktiviert = 0
+
+    def enableCoulombcounter(self):
+        self.aktiviert += 1
+
+    def getCoulombData(self):
+        return self.mah
+
+
+def betrieb(uhr, tmp_path, modus=sparbetrieb.LEICHT, sensoren=None, pmu=None, anzeige_s=2):
+    leds, anzeigen = [], []
+    sensoren = sensoren or (FakeSensor(uhr, 9, (21.0, 55.0)), FakeSensor(uhr, 80, (12.0, 70.0)),
+                            FakeBMP(uhr, 6, (12.5, 1013.25)))
+    app = sparbetrieb.Sparbetrieb(
+        sensoren, MAGNUS, 2.0, leds.append, lambda status, daten: anzeigen.append(status),
+        intervall=900, modus=modus, tft=FakeTFT(), backlight=FakePin(),
+        anzeige_s=anzeige_s, pmu=pmu, zustand=sparbetrieb.Zustand(str(tmp_path / "zustand.bin")))
+    return app, leds, anzeigen
+
+
+def test_zustand_rundreise(tmp_path):
+    pfad = str(tmp_path / "zustand.bin")
+    zustand = sparbetrieb.Zustand(pfad)
+    assert zustand.lade() is False
+    zustand.zyklus = 7
+    zustand.status = laufzeit.GELB
+    zustand.modus = sparbetrieb.TIEF
+    zustand.daten = (21.0, 55.0, 12.0, 70.0, 1013.0, 11.6, 6.7)
+    zustand.schlaf_ms = 899_000
+    zustand.strom[sparbetrieb.TIEF] = [2, 1.5]
+    zustand.speichere()
+    geladen = sparbetrieb.Zustand(pfad)
+    assert geladen.lade()
+    assert (geladen.zyklus, geladen.status, geladen.modus) == (7, laufzeit.GELB, sparbetrieb.TIEF)
+    assert geladen.daten == pytest.approx(zustand.daten)
+    assert geladen.coulomb_mah is None and geladen.schlaf_ms == 899_000
+    assert geladen.mittlerer_strom(sparbetrieb.TIEF) == 0.75
+    assert geladen.mittlerer_strom(sparbetrieb.LEICHT) is None
+    (tmp_path / "zustand.bin").write_bytes(b"TPZ1kaputt")
+    assert sparbetrieb.Zustand(pfad).lade() is False
+
+
+def test_zustand_im_rtc_speicher():
+    class FakeRTC:
+        inhalt = b""
+
+        def memory(self, daten=None):
+            if daten is None:
+                return self.inhalt
+            self.inhalt = bytes(daten)
+
+    rtc = FakeRTC()
+    zustand = sparbetrieb.Zustand("gibt/es/nicht", rtc=rtc)
+    zustand.status = laufzeit.ROT
+    zustand.speichere()
+    assert len(rtc.inhalt) == 70
+    geladen = sparbetrieb.Zustand("gibt/es/nicht", rtc=rtc)
+    assert geladen.lade() and geladen.status == laufzeit.ROT
+
+
+def test_leichtschlaf_legt_alles_schlafen(uhr, tmp_path):
+    app, leds, anzeigen = betrieb(uhr, tmp_path)
+    app.run(zyklen=2)
+    assert leds == [laufzeit.GRUEN, laufzeit.GRUEN]
+    assert anzeigen == [laufzeit.GRUEN, laufzeit.GRUEN]
+    assert app.tft.schlaeft and app.backlight.wert == 0
+    assert app.sensoren[2].aufrufe == ["wake", "start", "sleep"] * 2
+    # Messung 80 ms, SLPOUT 5 ms, Anzeige 2 s, der Rest des Intervalls wird geschlafen
+    assert sparbetrieb.machine.schlaf == [("leicht", 900_000 - 2085)] * 2
+    assert uhr.jetzt == 2 * 900_000
+    assert app.zustand.zyklus == 2
+
+
+def test_wach_laesst_display_an(uhr, tmp_path, monkeypatch):
+    geschlafen = []
+    monkeypatch.setattr(sparbetrieb.time, "sleep", lambda s: geschlafen.append(s))
+    app, _, _ = betrieb(uhr, tmp_path, modus=sparbetrieb.WACH)
+    app.zyklus()
+    assert not app.tft.schlaeft and app.backlight.wert == 1
+    assert app.sensoren[2].aufrufe == ["wake", "start"]
+    assert geschlafen == []
+
+
+def test_tiefschlaf_stellt_leds_aus_zustand_wieder_her(uhr, tmp_path):
+    pmu = FakePMU()
+    app, leds, _ = betrieb(uhr, tmp_path, modus=sparbetrieb.TIEF, pmu=pmu, anzeige_s=0)
+    uhr.jetzt = 300  # Start bis zur ersten Messung
+    app.run(zyklen=1)
+    assert pmu.aktiviert == 1
+    assert leds == [laufzeit.GRUEN]
+    schlaf_ms = 900_000 - 380
+    assert sparbetrieb.machine.schlaf == [("tief", schlaf_ms)]
+    assert app.strom_ma is None  # erster Zyklus: noch kein Vergleich
+
+    # Neustart nach deepsleep: ticks beginnen wieder bei 0
+    uhr.jetzt = 0
+    pmu.mah -= 1.0  # 1 mAh über den ganzen Zyklus
+    sensoren = (FakeSensor(uhr, 9, (21.0, 55.0)), FakeSensor(uhr, 80, (20.0, 70.0)),
+                FakeBMP(uhr, 6, (12.5, 1013.25)))
+    app, leds, anzeigen = betrieb(uhr, tmp_path, modus=sparbetrieb.TIEF, pmu=pmu,
+                                  sensoren=sensoren, anzeige_s=0)
+    assert app.wecken() and leds == [laufzeit.GRUEN]
+    assert sensoren[0].aufrufe == []
+    uhr.jetzt = 300
+    app.zyklus()
+    assert leds == [laufzeit.GRUEN, laufzeit.ROT]
+    assert anzeigen == []
+    assert app.strom_ma == pytest.approx(1.0 * 3_600_000 / (schlaf_ms + 380))
+    assert app.zustand.mittlerer_strom(sparbetrieb.TIEF) == pytest.approx(app.strom_ma)
+
+
+def test_kaltstart_misst_keinen_strom(uhr, tmp_path):
+    pmu = FakePMU()
+    app, _, _ = betrieb(uhr, tmp_path, modus=sparbetrieb.TIEF, pmu=pmu, anzeige_s=0)
+    app.run(zyklen=1)
+
+    # Stunden später eingeschaltet: der Zählerstand passt zu keiner Schlafdauer
+    uhr.jetzt = 0
+    pmu.mah -= 40.0
+    sparbetrieb.machine.ursache = sparbetrieb.machine.PWRON_RESET
+    app, _, _ = betrieb(uhr, tmp_path, modus=sparbetrieb.TIEF, pmu=pmu, anzeige_s=0)
+    app.run(zyklen=1)
+    assert app.strom_ma is None
+    assert app.zustand.mittlerer_strom(sparbetrieb.TIEF) is None
+    assert app.zustand.coulomb_mah == pmu.mah
+
+    # Der nächste Zyklus nach deepsleep misst wieder
+    uhr.jetzt = 0
+    pmu.mah -= 1.0
+    sparbetrieb.machine.ursache = sparbetrieb.machine.WDT_RESET
+    app, _, _ = betrieb(uhr, tmp_path, modus=sparbetrieb.TIEF, pmu=pmu, anzeige_s=0)
+    app.run(zyklen=1)
+    assert app.strom_ma == pytest.approx(1.0 * 3_600_000 / 900_000)
+    assert app.zustand.strom[sparbetrieb.TIEF][0] == 1
+
+
+def test_nach_tiefschlaf_je_port(monkeypatch):
+    class ESP32:
+        DEEPSLEEP_RESET = 4
+        WDT_RESET = 3
+        ursache = 4
+
+        def reset_cause(self):
+            return self.ursache
+
+    esp32 = ESP32()
+    monkeypatch.setattr(sparbetrieb, "machine", esp32)
+    assert sparbetrieb.nach_tiefschlaf()
+    esp32.ursache = esp32.WDT_RESET
+    assert not sparbetrieb.nach_tiefschlaf()
+    monkeypatch.setattr(sparbetrieb, "machine", None)
+    assert not sparbetrieb.nach_tiefschlaf()
+
+
+def test_sensorfehler_behaelt_letzten_zustand(uhr, tmp_path):
+    app, leds, anzeigen = betrieb(uhr, tmp_path)
+    app.zyklus()
+    app.sensoren[0].wert = OSError(5)
+    app.zyklus()
+    assert leds == [laufzeit.GRUEN]
+    assert anzeigen == [laufzeit.GRUEN, laufzeit.FEHLER]
+    geladen = sparbetrieb.Zustand(app.zustand.pfad)
+    assert geladen.lade() and geladen.status == laufzeit.GRUEN and geladen.zyklus == 2
+    assert not math.isnan(geladen.daten[0])
+
+
+def test_unbekannter_modus(tmp_path):
+    with pytest.raises(ValueError):
+        sparbetrieb.Sparbetrieb((), MAGNUS, 2.0, None, None, modus="koma")
+
+
+def test_takt_bestimmt_schlafdauer(uhr, tmp_path):
+    app, leds, _ = betrieb(uhr, tmp_path, modus=sparbetrieb.TIEF, anzeige_s=0)
+    app.takt = takt.Takt(2.0)
+    uhr.jetzt = 300
+    schlaf_ms = app.zyklus()
+    assert schlaf_ms == int(app.takt.intervall_s * 1000) - 380 < 900_000 - 380
+
+    # Nach dem Neustart übernimmt der Takt Status und letzte Messung
+    uhr.jetzt = 0
+    app, _, _ = betrieb(uhr, tmp_path, modus=sparbetrieb.TIEF, anzeige_s=0)
+    app.takt = takt.Takt(2.0)
+    assert app.wecken()
+    assert app.takt.status == laufzeit.GRUEN
+    uhr.jetzt = 300
+    app.zyklus()
+    assert app.takt.rate == pytest.approx(0.0, abs=1e-6)  # Zustand speichert float32
+
+
+def test_protokoll_vor_tiefschlaf_gesichert(uhr, tmp_path):
+    app, _, _ = betrieb(uhr, tmp_path, modus=sparbetrieb.TIEF, anzeige_s=0)
+    app.protokoll = protokoll.Protokoll(str(tmp_path / "m"))
+    app.zyklus()
+    assert len(app.protokoll) == 0
+    saetze = protokoll.lies([app.protokoll.pfad(0)])
+    assert [satz[1:] for satz in saetze] == [(2100, 5500, 1200, 7000, 10132, 0)]
@@ -0,0 +1,174 @@
+import importlib
+import math
+import os
+import pathlib
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import st7789_emulator as emu
+import verlauf
+from displayliste import Displayliste
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+GOLDEN = pathlib.Path(__file__).parent / "golden"
+# GOLDEN_AKTUALISIEREN=1 pytest ... schreibt die Vergleichsbilder neu
+AKTUALISIEREN = os.environ.get("GOLDEN_AKTUALISIEREN") == "1"
+FONT = emu.platzhalterfont()
+
+
+def panel(rotation=0):
+    tft = emu.ST7789(emu.SPI(0, baudrate=30_000_000), 172, 320, rotation=rotation)
+    tft.init()
+    tft.zaehler_zuruecksetzen()
+    return tft
+
+
+def vergleiche_golden(name, bild):
+    pfad = GOLDEN / name
+    if AKTUALISIEREN:
+        emu.speichere_png(pfad, bild)
+    # Ein fehlendes Vergleichsbild darf nicht stillschweigend neu entstehen
+    assert pfad.exists(), "%s fehlt, mit GOLDEN_AKTUALISIEREN=1 erzeugen" % pfad
+    assert np.array_equal(emu.lies_png(pfad), emu.rgb888(bild)), name
+
+
+def test_fill_rect_und_zaehler():
+    tft = panel()
+    tft.fill_rect(10, 20, 5, 4, emu.RED)
+    assert (tft.befehle, tft.bytes_gesendet) == (3, 11 + 5 * 4 * 2)
+    bild = tft.bild()
+    assert (bild[20:24, 10:15] == emu.RED).all()
+    assert bild.sum() == emu.RED * 20
+    # init(): sieben Befehle und ein fill_rect, zaehler_zuruecksetzen() lässt command_count() stehen
+    assert tft.command_count(True) == 7 + 3 + 3 and tft.command_count() == 0
+
+
+def test_fenster_ausserhalb_wird_verworfen_wie_im_treiber():
+    tft = panel()
+    tft.fill_rect(0, 0, 2, 2, emu.BLUE)
+    tft.zaehler_zuruecksetzen()
+    # Rechter Rand wird auf width statt width - 1 begrenzt: set_window()
+    # verwirft das Fenster, die Daten laufen im vorigen weiter
+    tft.fill_rect(165, 0, 20, 1, emu.RED)
+    assert (tft.befehle, tft.bytes_gesendet) == (0, 40)
+    assert (tft.bild()[0:2, 0:2] == emu.RED).all()
+
+
+def test_text_und_text_block():
+    tft = panel()
+    tft.text(FONT, "AB", 8, 16, emu.WHITE, emu.BLUE)
+    assert (tft.befehle, tft.bytes_gesendet) == (6, 2 * (11 + 128))
+    einzeln = tft.bild()
+    tft = panel()
+    tft.text_block(FONT, "AB", 8, 16, emu.WHITE, emu.BLUE)
+    assert (tft.befehle, tft.bytes_gesendet) == (3, 11 + 256)
+    assert np.array_equal(tft.bild(), einzeln)
+    # Glyphe 'A' (0x41): Rahmen plus Bit 0 und Bit 6 des Codes
+    assert (einzeln[16, 8:15] == emu.WHITE).all()
+    assert einzeln[16, 15] == emu.BLUE
+
+
+def test_blit_buffer_big_endian():
+    tft = panel()
+    tft.blit_buffer(bytes((0xF8, 0x00, 0x07, 0xE0)), 3, 4, 2, 1)
+    assert list(tft.bild()[4, 3:5]) == [emu.RED, emu.GREEN]
+
+
+@pytest.mark.parametrize("rotation", [0, 1, 2, 3])
+def test_rotation_gleiches_bild(rotation):
+    tft = panel(rotation)
+    tft.fill_rect(5, 7, 30, 2, emu.CYAN)
+    tft.text(FONT, "x", 40, 50, emu.YELLOW, emu.BLACK)
+    bild = tft.bild()
+    assert bild.shape == (tft.height(), tft.width())
+    assert (bild[7:9, 5:35] == emu.CYAN).all()
+    referenz = panel(0)
+    referenz.text(FONT, "x", 0, 0, emu.YELLOW, emu.BLACK)
+    assert np.array_equal(bild[50:58, 40:48], referenz.bild()[0:8, 0:8])
+
+
+def test_verlauf_golden_im_emulator():
+    # Gleiches Vergleichsbild wie test_verlauf mit dessen Panel-Nachbildung
+    tft = panel(1)
+    diagramm = verlauf.Verlaufsdiagramm(tft, 100, 150, 40, 12, 5, 35, farben=(emu.WHITE, emu.CYAN))
+    for i in range(55):
+        diagramm.neu(10 + 6 * math.sin(i / 4), 14 + 0.5 * i)
+    zeichen = {emu.BLACK: ".", emu.WHITE: "#", emu.CYAN: "o"}
+    text = "".join("".join(zeichen[p] for p in zeile) + "\n"
+                   for zeile in tft.bild()[150:162, 100:140])
+    assert text == (GOLDEN / "verlauf.txt").read_text()
+
+
+def test_draw_list_wie_einzeln_mit_weniger_befehlen():
+    def szene(ziel):
+        for y in range(0, 100, 10):
+            ziel.fill_rect(0, y, 172, 1, emu.BLUE)
+        for i in range(8):
+            ziel.fill_rect(10 + 20 * i, 150, 16, 40, emu.GREEN)
+            ziel.fill_rect(10 + 20 * i, 190, 16, 10, emu.GREEN)
+        ziel.fill_rect(50, 0, 20, 20, emu.RED)
+
+    direkt = panel()
+    szene(direkt)
+    liste_panel = panel()
+    liste = Displayliste(liste_panel, 172, 320)
+    szene(liste)
+    befehle = liste.flush()
+    assert befehle == liste_panel.befehle
+    assert np.array_equal(direkt.bild(), liste_panel.bild())
+    assert liste_panel.befehle < direkt.befehle
+
+
+def test_png_rundreise(tmp_path):
+    bild = np.array([[emu.RED, emu.GREEN], [emu.BLUE, emu.WHITE]], np.uint16)
+    emu.speichere_png(tmp_path / "b.png", bild)
+    rgb = emu.lies_png(tmp_path / "b.png")
+    assert rgb.tolist() == [[[255, 0, 0], [0, 255, 0]], [[0, 0, 255], [255, 255, 255]]]
+
+
+@pytest.fixture
+def installiert(monkeypatch):
+    """Emulator als st7789 und machine-Attrappe, nach dem Test wieder entfernt."""
+    for name in ("st7789", "machine", "vga1_8x8", "vga1_16x32", "taupunktsteuerung",
+                 "lib.display_st7789", "config"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    return emu.installiere()
+
+
+DATEN = (21.3, 55.0, 4.2, 80.0, 1013.0, 11.9, 1.0)
+
+
+@pytest.mark.parametrize("rahmenpuffer", [True, False])
+def test_dashboard_golden(installiert, monkeypatch, rahmenpuffer):
+    steuerung = importlib.import_module("taupunktsteuerung")
+    monkeypatch.setattr(steuerung, "RAHMENPUFFER", rahmenpuffer)
+    tft = panel()
+    anzeige = steuerung.baue_dashboard(tft, steuerung.font)
+    steuerung.zeige_dashboard("Lueften empfohlen", steuerung.STATUS_GRUEN, DATEN, anzeige)
+    # Framebuffer und direktes Zeichnen ergeben dasselbe Bild
+    vergleiche_golden("dashboard.png", tft.bild())
+
+    tft.zaehler_zuruecksetzen()
+    gemeldet = steuerung.zeige_dashboard(
+        "Lueften empfohlen", steuerung.STATUS_GRUEN, DATEN[:5] + (12.0, 1.0), anzeige)
+    assert gemeldet == tft.bytes_gesendet
+    # Geänderte Ziffern: weniger als 1 % eines vollen Bildes
+    assert tft.bytes_gesendet < 172 * 320 * 2 // 100
+
+
+def test_init_display_und_show_status(installiert):
+    display = importlib.import_module("lib.display_st7789")
+    tft = display.init_display()
+    assert (tft.width(), tft.height()) == (320, 172)
+    spec = importlib.util.spec_from_file_location("pico_main", ROOT / "micropython" / "main.py")
+    pico_main = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(pico_main)
+    tft.zaehler_zuruecksetzen()
+    pico_main.show_status(tft, "Sensorfehler!", installiert.RED)
+    bild = tft.bild()
+    assert bild[0, 0] == installiert.RED
+    assert installiert.WHITE in bild[10:18, 10:10 + 13 * 8]
+    assert tft.bytes_gesendet == 11 + 320 * 172 * 2 + 13 * (11 + 128)
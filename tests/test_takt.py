@@ -0,0 +1,74 @@
+import time
+
+import pytest
+
+import takt
+from laufzeit import GELB, GRUEN, ROT
+
+
+@pytest.fixture(autouse=True)
+def ticks(monkeypatch):
+    monkeypatch.setattr(time, "ticks_diff", lambda a, b: a - b, raising=False)
+
+
+def d(takt_geber, abstand, zeit_ms):
+    """Entscheidung für tp_innen = 10 °C und tp_aussen = 10 °C + abstand."""
+    return takt_geber.entscheide(10.0, 10.0 + abstand, zeit_ms)
+
+
+@pytest.mark.parametrize("abstand, intervall", [
+    (-8.0, 900),   # weit unter der GRUEN/GELB-Grenze
+    (-2.0, 60),    # auf der Grenze
+    (-0.5, 200),   # 0,5 K unter der GELB/ROT-Grenze: 60 + 840 * 0,5 / 3
+    (4.0, 900),
+])
+def test_intervall_aus_abstand(abstand, intervall):
+    takt_geber = takt.Takt(2.0)
+    d(takt_geber, abstand, 0)
+    assert takt_geber.intervall_s == pytest.approx(intervall)
+
+
+def test_rate_verkuerzt_nur_bei_annaeherung():
+    takt_geber = takt.Takt(2.0)
+    d(takt_geber, -8.0, 0)
+    # 2 K in 600 s auf die Grenze zu: noch 4 K, halbe Zeit bis dorthin
+    d(takt_geber, -6.0, 600_000)
+    assert takt_geber.rate == pytest.approx(2 / 600)
+    assert takt_geber.intervall_s == pytest.approx(600)
+
+    takt_geber = takt.Takt(2.0)
+    d(takt_geber, -6.0, 0)
+    d(takt_geber, -8.0, 600_000)
+    assert takt_geber.intervall_s == 900
+
+
+def test_rate_ignoriert_kurze_abstaende():
+    takt_geber = takt.Takt(2.0)
+    d(takt_geber, -8.0, 0)
+    d(takt_geber, -5.0, 500)
+    assert takt_geber.rate is None
+    d(takt_geber, -6.0, 600_000)
+    assert takt_geber.rate == pytest.approx(2 / 600)
+
+
+def test_hysterese():
+    takt_geber = takt.Takt(2.0, hysterese=0.3)
+    verlauf = [d(takt_geber, abstand, i * 60_000)
+               for i, abstand in enumerate((-3.0, -1.9, -1.6, -1.9, -2.2, -2.4, 0.1, 0.4, -0.2))]
+    # Bei 0,1 ist die GELB/ROT-Grenze nur um 0,1 K überschritten, GELB/GRUEN weit
+    assert verlauf == [GRUEN, GRUEN, GELB, GELB, GELB, GRUEN, GELB, ROT, ROT]
+
+
+def test_vorgabe():
+    takt_geber = takt.Takt(2.0)
+    takt_geber.vorgabe(ROT, 10.0, 10.5, -600_000)
+    # Ohne Vorgabe wäre -0.1 GELB
+    assert d(takt_geber, -0.1, 0) == ROT
+    assert takt_geber.rate == pytest.approx(-0.6 / 600)
+
+
+def test_ungueltige_grenzen():
+    with pytest.raises(ValueError):
+        takt.Takt(2.0, min_s=0)
+    with pytest.raises(ValueError):
+        takt.Takt(2.0, min_s=900, max_s=60)
@@ -0,0 +1,74 @@
+import math
+
+import pytest
+
+import taupunkt_fix as fix
+
+MAX_FEHLER = 0.025  # °C, siehe Modulkopf
+
+
+def taupunkt_float(temp, rh):
+    # Referenz: berechne_taupunkt aus main.py
+    a, b = 17.27, 237.7
+    alpha = ((a * temp) / (b + temp)) + math.log(rh / 100.0)
+    return (b * alpha) / (a - alpha)
+
+
+def test_ln_tabelle_jeder_eintrag():
+    assert len(fix._LN) == 65
+    for i, wert in enumerate(fix._LN):
+        assert wert == round(math.log(1 + i / 64) * 32768), i
+
+
+def test_magnus_tabelle_jeder_eintrag():
+    assert len(fix._MAGNUS) == 101
+    for i, wert in enumerate(fix._MAGNUS):
+        t = (fix._T_MIN + i * fix._T_SCHRITT) / 100
+        assert wert == round(17.27 * t / (237.7 + t) * 32768), i
+
+
+def test_konstanten():
+    assert fix._Q15_LN2 == round(math.log(2) * 32768)
+    assert fix._Q15_LN_SHT4X == round(math.log(65535) * 32768)
+    assert fix._Q15_LN_AHT20 == round(20 * math.log(2) * 32768)
+    assert fix._Q15_LN_1PROZENT == round(math.log(0.01) * 32768)
+    assert fix._Q15_A == round(17.27 * 32768)
+
+
+@pytest.mark.parametrize("x", [1, 2, 3, 655, 1000, 32767, 32768, 50000, 65535, 1 << 20])
+def test_ln(x):
+    assert fix._ln_q15(x) / 32768 == pytest.approx(math.log(x), abs=1e-4)
+
+
+def test_sht4x_gegen_float():
+    for t_raw in range(0, 65536, 257):
+        for rh_raw in range(656, 65536, 331):
+            temp = -45 + (175 * (t_raw / 65535.0))
+            rh = 100 * (rh_raw / 65535.0)
+            fehler = abs(fix.taupunkt_sht4x(t_raw, rh_raw) / 100 - taupunkt_float(temp, rh))
+            assert fehler < MAX_FEHLER, (t_raw, rh_raw)
+
+
+def test_aht20_gegen_float():
+    for t_raw in range(0, 1 << 20, 4099):
+        for rh_raw in range(10486, 1 << 20, 5303):
+            temp = t_raw * 200 / 1048576 - 50
+            rh = rh_raw * 100 / 1048576
+            fehler = abs(fix.taupunkt_aht20(t_raw, rh_raw) / 100 - taupunkt_float(temp, rh))
+            assert fehler < MAX_FEHLER, (t_raw, rh_raw)
+
+
+def test_rh_null_wird_begrenzt():
+    # RH = 0 darf keine Ausnahme werfen und entspricht 1 %
+    t_raw = 26214  # ca. 25 °C
+    assert fix.taupunkt_sht4x(t_raw, 0) == fix.taupunkt_sht4x(t_raw, 655)
+
+
+def test_zwischenwerte_bleiben_small_int():
+    grenze = 1 << 30
+    for t_centi in range(fix._T_MIN, fix._T_MAX + 1, 50):
+        for ln_rh in (fix._Q15_LN_1PROZENT, 0):
+            g = fix._magnus_q15(t_centi) + ln_rh
+            r = (g << 11) // ((fix._Q15_A - g + 16) >> 5)
+            assert abs(g << 11) < grenze
+            assert abs(r * fix._B_CENTI) < grenze
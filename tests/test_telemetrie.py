@@ -0,0 +1,86 @@
+import io
+
+import telemetrie
+from laufzeit import FEHLER, GELB, GRUEN, ROT
+from protokoll import UNGUELTIG
+
+DATEN = (21.37, 48.5, 9.04, 81.25, 1013.2, 10.12, 6.0)
+
+
+def sende(anzahl, status=GELB, daten=DATEN):
+    strom = io.BytesIO()
+    sender = telemetrie.Sender(strom)
+    for i in range(anzahl):
+        sender.sende(status, daten, zeit=1000 * i)
+    return strom.getvalue()
+
+
+def test_rundreise():
+    daten = sende(1)
+    assert len(daten) == telemetrie.RAHMEN_BYTES
+    assert daten[:2] == telemetrie.SYNC
+    rahmen, zeilen = telemetrie.Empfaenger().futter(daten)
+    assert zeilen == []
+    assert rahmen == [(0, 0, 2137, 4850, 904, 8125, 10132, 1012, 600, 1)]
+    assert "Status: gelb" in telemetrie.als_text(rahmen[0])
+
+
+def test_fehlerrahmen_ohne_werte():
+    daten = sende(1, FEHLER, "Sensorfehler")
+    (satz,), _ = telemetrie.Empfaenger().futter(daten)
+    assert satz[2:9] == (UNGUELTIG,) * 7
+    assert satz[9] == 3
+    assert "Sensorfehler" in telemetrie.als_text(satz)
+
+
+def test_beliebige_stuecke():
+    daten = sende(20)
+    empfaenger = telemetrie.Empfaenger()
+    rahmen = []
+    for i in range(0, len(daten), 7):
+        rahmen += empfaenger.futter(daten[i:i + 7])[0]
+    assert [satz[0] for satz in rahmen] == list(range(20))
+    assert empfaenger.statistik["verloren"] == 0
+
+
+def test_text_zwischen_rahmen():
+    strom = io.BytesIO()
+    sender = telemetrie.Sender(strom)
+    sender.sende(GRUEN, DATEN, zeit=0)
+    strom.write(b"Fehler: I2C timeout\r\n")
+    sender.sende(ROT, DATEN, zeit=1)
+    empfaenger = telemetrie.Empfaenger()
+    rahmen, zeilen = empfaenger.futter(strom.getvalue())
+    assert [satz[9] for satz in rahmen] == [0, 2]
+    assert zeilen == ["Fehler: I2C timeout"]
+
+
+def test_resync_nach_stoerung():
+    daten = bytearray(sende(5))
+    # Rahmen 1 beschädigen, Rahmen 3 um ein Byte kürzen
+    daten[telemetrie.RAHMEN_BYTES + 10] ^= 0xFF
+    del daten[3 * telemetrie.RAHMEN_BYTES + 5]
+    empfaenger = telemetrie.Empfaenger()
+    rahmen, _ = empfaenger.futter(bytes(daten))
+    assert [satz[0] for satz in rahmen] == [0, 2, 4]
+    assert empfaenger.statistik["verloren"] == 2
+    assert empfaenger.statistik["crc_fehler"] >= 2
+
+
+def test_nummer_laeuft_ueber():
+    strom = io.BytesIO()
+    sender = telemetrie.Sender(strom)
+    sender.nummer = 0xFFFF
+    sender.sende(GRUEN, DATEN, zeit=0)
+    sender.sende(GRUEN, DATEN, zeit=0)
+    empfaenger = telemetrie.Empfaenger()
+    rahmen, _ = empfaenger.futter(strom.getvalue())
+    assert [satz[0] for satz in rahmen] == [0xFFFF, 0]
+    assert empfaenger.statistik["verloren"] == 0
+
+
+def test_kleiner_als_textzeile():
+    innen_t, innen_rh, aussen_t, aussen_rh, _, tp_innen, tp_aussen = DATEN
+    zeile = (f"Innen: {innen_t:.1f}C/{innen_rh:.1f}% -> {tp_innen:.1f}C | "
+             f"Aussen: {aussen_t:.1f}C/{aussen_rh:.1f}% -> {tp_aussen:.1f}C\n")
+    assert len(sende(1)) < len(zeile)
@@ -0,0 +1,143 @@
+import math
+import pathlib
+
+import pytest
+
+import verlauf
+
+GOLDEN = pathlib.Path(__file__).parent / "golden"
+
+# Rotationstabelle des C-Treibers für 172x320: (madctl, breite, hoehe, colstart, rowstart)
+ROTATIONEN = (
+    (0x00, 172, 320, 34, 0),
+    (0x60, 320, 172, 0, 34),
+    (0xC0, 172, 320, 34, 0),
+    (0xA0, 320, 172, 0, 34),
+)
+WEISS = 0xFFFF
+CYAN = 0x07FF
+
+
+class PanelEmulator:
+    """
+    ST7789 mit 240x320 Bildspeicher: Fensteradressen laufen über MADCTL
+    (MV/MX/MY) in den Speicher, die Anzeige liest ihn mit VSCRDEF/VSCSAD aus.
+    """
+
+    def __init__(self, rotation=0):
+        self.speicher = [[0] * 240 for _ in range(320)]
+        self.tfa, self.vsa, self.vssa = 0, 320, 0
+        self.befehle = []
+        self.rotation(rotation)
+
+    def rotation(self, r):
+        self._madctl, self.breite, self.hoehe, self.colstart, self.rowstart = ROTATIONEN[r]
+
+    def madctl(self):
+        return self._madctl
+
+    def _adresse(self, x, y):
+        spalte, zeile = x + self.colstart, y + self.rowstart
+        if self._madctl & 0x20:
+            spalte, zeile = zeile, spalte
+        if self._madctl & 0x80:
+            zeile = 319 - zeile
+        if self._madctl & 0x40:
+            spalte = 239 - spalte
+        return zeile, spalte
+
+    def vscrdef(self, tfa, vsa, bfa):
+        assert tfa + vsa + bfa == 320
+        self.tfa, self.vsa = tfa, vsa
+        self.befehle.append("vscrdef")
+
+    def vscsad(self, vssa):
+        assert self.tfa <= vssa < self.tfa + self.vsa
+        self.vssa = vssa
+        self.befehle.append("vscsad")
+
+    def fill_rect(self, x, y, breite, hoehe, farbe):
+        for yy in range(y, y + hoehe):
+            for xx in range(x, x + breite):
+                zeile, spalte = self._adresse(xx, yy)
+                self.speicher[zeile][spalte] = farbe
+        self.befehle.append("fill_rect")
+
+    def blit_buffer(self, puffer, x, y, breite, hoehe):
+        assert 0 <= x and x + breite <= self.breite and 0 <= y and y + hoehe <= self.hoehe
+        for n in range(breite * hoehe):
+            zeile, spalte = self._adresse(x + n % breite, y + n // breite)
+            self.speicher[zeile][spalte] = puffer[2 * n] << 8 | puffer[2 * n + 1]
+        self.befehle.append("blit_buffer")
+
+    def bildschirm(self, x, y, breite, hoehe):
+        """Sichtbares Bild im Rechteck, in Bildschirmkoordinaten."""
+        bild = []
+        for yy in range(y, y + hoehe):
+            zeile = []
+            for xx in range(x, x + breite):
+                p, spalte = self._adresse(xx, yy)
+                if self.tfa <= p < self.tfa + self.vsa:
+                    p = self.tfa + (self.vssa - self.tfa + p - self.tfa) % self.vsa
+                zeile.append(self.speicher[p][spalte])
+            bild.append(zeile)
+        return bild
+
+
+def als_text(bild):
+    zeichen = {0: ".", WEISS: "#", CYAN: "o"}
+    return "\n".join("".join(zeichen[p] for p in zeile) for zeile in bild) + "\n"
+
+
+def messreihe(n):
+    return [(10 + 6 * math.sin(i / 4), 14 + 0.5 * i) for i in range(n)]
+
+
+# Quer: Diagramm 40x12 bei (100, 150); hochkant: 12x40 bei (150, 100)
+FLAECHE = {0: (150, 100, 12, 40), 1: (100, 150, 40, 12), 2: (150, 100, 12, 40), 3: (100, 150, 40, 12)}
+
+
+def zeichne(rotation, werte):
+    panel = PanelEmulator(rotation)
+    diagramm = verlauf.Verlaufsdiagramm(panel, *FLAECHE[rotation], 5, 35, farben=(WEISS, CYAN))
+    for w in werte:
+        diagramm.neu(*w)
+    return panel, diagramm
+
+
+@pytest.mark.parametrize("rotation", [0, 1, 2, 3])
+def test_golden(rotation):
+    # 55 Werte auf 40 Spalten: der Scrollbereich ist schon übergelaufen
+    panel, _ = zeichne(rotation, messreihe(55))
+    bild = panel.bildschirm(*FLAECHE[rotation])
+    if rotation in (0, 2):
+        # Hochkant läuft die Zeit nach unten und die Werte nach rechts:
+        # zum Vergleich in die Querlage drehen
+        bild = [list(spalte) for spalte in zip(*bild)][::-1]
+    erwartet = (GOLDEN / "verlauf.txt").read_text()
+    assert als_text(bild) == erwartet
+
+
+def test_konstante_kosten_je_wert():
+    panel, diagramm = zeichne(1, messreihe(3))
+    panel.befehle.clear()
+    diagramm.neu(12.0, 20.0)
+    assert panel.befehle == ["vscsad", "blit_buffer"]
+
+
+def test_rotation_zeichnet_verlauf_neu():
+    werte = messreihe(55)
+    panel, diagramm = zeichne(1, werte)
+    diagramm.rotation(3)
+    assert panel.befehle.count("vscrdef") == 2
+    nachher = panel.bildschirm(*FLAECHE[3])
+    assert als_text(nachher) == (GOLDEN / "verlauf.txt").read_text()
+    assert len(diagramm.werte()) == 40
+    assert diagramm.werte()[-1] == pytest.approx(werte[-1])
+
+
+def test_luecke():
+    panel, diagramm = zeichne(1, [(10.0, None), (10.0, None)])
+    bild = panel.bildschirm(*FLAECHE[1])
+    assert not any(p == CYAN for zeile in bild for p in zeile)
+    assert diagramm.werte()[0] == (10.0, None)
@@ -0,0 +1,137 @@
+import time
+
+import pytest
+
+import laufzeit
+import zweikern
+from laufzeit import asyncio
+from psychrometrie import MAGNUS
+
+
+@pytest.fixture(autouse=True)
+def ticks(monkeypatch):
+    t0 = time.monotonic_ns()
+    monkeypatch.setattr(time, "ticks_ms", lambda: (time.monotonic_ns() - t0) // 1000000, raising=False)
+    monkeypatch.setattr(time, "ticks_add", lambda t, d: t + d, raising=False)
+    monkeypatch.setattr(time, "ticks_diff", lambda a, b: a - b, raising=False)
+
+
+def test_briefkasten_behaelt_neuesten():
+    kasten = zweikern.Briefkasten()
+    assert len(kasten) == 0
+    assert kasten.put(1)
+    assert kasten.put(2) is False
+    assert kasten.verworfen == 1
+    assert kasten.get_nowait() == 2
+    with pytest.raises(IndexError):
+        kasten.get_nowait()
+
+
+class FakeSensor:
+    def __init__(self, dauer_ms, wert):
+        self.dauer_ms = dauer_ms
+        self.wert = wert
+
+    def start(self):
+        return time.ticks_add(time.ticks_ms(), self.dauer_ms)
+
+    def collect(self):
+        return self.wert
+
+
+class LangsameAnzeige:
+    """Braucht dauer_ms je Bild, wie ein volles Bild über SPI."""
+
+    def __init__(self, dauer_ms):
+        self.dauer_ms = dauer_ms
+        self.bilder = []
+
+    def __call__(self, status, daten):
+        time.sleep(self.dauer_ms / 1000)
+        self.bilder.append((status, daten))
+
+
+SENSOREN = (FakeSensor(0, (21.0, 55.0)), FakeSensor(0, (12.0, 70.0)),
+            FakeSensor(0, (12.5, 1013.25)))
+
+
+def lauf(anzeige, kern=None, zyklen=1):
+    async def ablauf():
+        app = laufzeit.Laufzeit(SENSOREN, MAGNUS, 2.0, lambda status: None, anzeige,
+                                intervall=10, anzeigekern=kern)
+        app.starte()
+        while app.statistik["zyklen"] < zyklen:
+            await asyncio.sleep(0.005)
+        return app
+
+    app = asyncio.run(asyncio.wait_for(ablauf(), 2))
+    return app
+
+
+def test_kern1_zeichnet_ohne_kern0_aufzuhalten():
+    anzeige = LangsameAnzeige(150)
+    kern = zweikern.Anzeigekern(anzeige, intervall_ms=2)
+    app = lauf(anzeige, kern)
+    assert kern.laeuft
+    # Kern 0 übergibt nur den Schnappschuss
+    assert app.statistik["anzeige_ms"] < 50
+    while kern.statistik()["bilder"] == 0:
+        time.sleep(0.005)
+    app.stoppe()
+    assert not kern.laeuft
+    assert [status for status, _ in anzeige.bilder] == [laufzeit.GRUEN]
+    assert anzeige.bilder[0][1][:5] == (21.0, 55.0, 12.0, 70.0, 1013.25)
+    statistik = kern.statistik()
+    assert statistik["bilder"] == 1
+    assert statistik["zeichnen_ms"] >= 150
+    assert statistik["latenz_ms"] >= statistik["zeichnen_ms"]
+
+
+def test_ein_kern_wartet_auf_die_anzeige():
+    anzeige = LangsameAnzeige(150)
+    app = lauf(anzeige)
+    assert app.statistik["anzeige_ms"] >= 150
+    assert app.statistik["latenz_ms"] >= 150
+
+
+def test_anzeigefehler_beendet_kern1_nicht():
+    bilder = []
+
+    def zeige(status, daten):
+        if not bilder:
+            bilder.append(None)
+            raise OSError(5)
+        bilder.append(status)
+
+    kern = zweikern.Anzeigekern(zeige, intervall_ms=1)
+    kern.starte()
+    kern.put((time.ticks_ms(), laufzeit.ROT, ()))
+    while kern.statistik()["fehler"] == 0:
+        time.sleep(0.001)
+    kern.put((time.ticks_ms(), laufzeit.GELB, ()))
+    while kern.statistik()["bilder"] == 0:
+        time.sleep(0.001)
+    kern.stoppe()
+    assert bilder == [None, laufzeit.GELB]
+
+
+class FakeTouch:
+    def __init__(self):
+        self.abfragen = 0
+
+    @property
+    def touched(self):
+        self.abfragen += 1
+        return 1 if self.abfragen == 3 else 0
+
+    @property
+    def touches(self):
+        return [{"x": 1, "y": 2, "id": 0}]
+
+
+def test_touch_auf_kern1_loest_messung_aus():
+    anzeige = LangsameAnzeige(0)
+    kern = zweikern.Anzeigekern(anzeige, touch=FakeTouch(), intervall_ms=2)
+    app = lauf(anzeige, kern, zyklen=2)
+    app.stoppe()
+    assert app.statistik["zyklen"] == 2